@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Archive Layout - Date-sharded Done/ and Failed/ folders
+Finished items are filed under Done/YYYY/MM/ (and Failed/YYYY/MM/) by the
+month they were last modified, instead of piling up in one flat folder.
+Date-range queries resolve the range to the month shards that can hold
+matching items, so looking at last week never lists last year.
+
+Items still lying directly in Done/ or Failed/ (written before the layout,
+or by tools that do not use it) are always included in lookups, and
+`python archive_layout.py migrate` files them into their shards.
+
+    dest = archive_file(vault_path, file_path, 'Done')
+    shard_folders(vault_path, 'Done', since=week_ago)   # ['Done', 'Done/2026/09', 'Done/2026/10']
+"""
+
+import os
+import re
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Optional, List, Union, Iterable
+import logging
+
+logger = logging.getLogger(__name__)
+
+SHARDED_FOLDERS = ('Done', 'Failed')
+
+YEAR_PATTERN = re.compile(r'^\d{4}$')
+MONTH_PATTERN = re.compile(r'^(0[1-9]|1[0-2])$')
+
+TimeBound = Union[datetime, float, int, None]
+
+
+def _datetime(value: TimeBound) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromtimestamp(float(value))
+
+
+def is_sharded(folder: str) -> bool:
+    """True for folders kept in YYYY/MM shards"""
+    return folder.strip('/') in SHARDED_FOLDERS
+
+
+def shard_name(when: TimeBound = None) -> str:
+    """"YYYY/MM" shard for a point in time (now if omitted)"""
+    return (_datetime(when) or datetime.now()).strftime('%Y/%m')
+
+
+def shard_path(vault_path: Path, folder: str, when: TimeBound = None) -> Path:
+    """Month shard of a folder, e.g. vault/Done/2026/10"""
+    return Path(vault_path) / folder.strip('/') / shard_name(when)
+
+
+def archive_destination(vault_path: Path, file_path: Path, folder: str, when: TimeBound = None) -> Path:
+    """
+    Free path for a file in its month shard, creating the shard
+
+    The shard is the month of `when`, or of the file's modification time.
+    A timestamp is added to the name if the shard already has that file.
+    """
+    file_path = Path(file_path)
+    if when is None:
+        try:
+            when = file_path.stat().st_mtime
+        except OSError:
+            when = None
+    shard = shard_path(vault_path, folder, when)
+    shard.mkdir(parents=True, exist_ok=True)
+
+    dest_path = shard / file_path.name
+    if dest_path.exists():
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        dest_path = shard / f"{file_path.stem}_{timestamp}{file_path.suffix}"
+    return dest_path
+
+
+def archive_file(vault_path: Path, file_path: Path, folder: str, when: TimeBound = None) -> Path:
+    """Move a file into its month shard of `folder`; returns the new path"""
+    dest_path = archive_destination(vault_path, file_path, folder, when)
+    if Path(file_path).exists():
+        Path(file_path).rename(dest_path)
+    return dest_path
+
+
+def _subdirs(path: Path, pattern: re.Pattern) -> List[str]:
+    try:
+        return sorted(entry.name for entry in os.scandir(path)
+                      if pattern.match(entry.name) and entry.is_dir())
+    except OSError:
+        return []
+
+
+def shard_folders(vault_path: Path, folder: str, since: TimeBound = None,
+                  until: TimeBound = None) -> List[str]:
+    """
+    Vault-relative folders that can hold items modified within a range
+
+    The folder itself comes first (for items not yet filed into a shard),
+    then every existing month shard overlapping [since, until], oldest
+    first. Only the year folders in range are listed.
+    """
+    folder = folder.strip('/')
+    since, until = _datetime(since), _datetime(until)
+    low = (since.year, since.month) if since else None
+    high = (until.year, until.month) if until else None
+
+    folders = [folder]
+    root = Path(vault_path) / folder
+    for year in _subdirs(root, YEAR_PATTERN):
+        if (low and int(year) < low[0]) or (high and int(year) > high[0]):
+            continue
+        for month in _subdirs(root / year, MONTH_PATTERN):
+            key = (int(year), int(month))
+            if (low and key < low) or (high and key > high):
+                continue
+            folders.append(f"{folder}/{year}/{month}")
+    return folders
+
+
+def find_archived(vault_path: Path, folder: str, filename: str) -> Optional[Path]:
+    """Path of a file in a sharded folder, looking in the newest shards first"""
+    for relative in reversed(shard_folders(vault_path, folder)):
+        path = Path(vault_path) / relative / filename
+        if path.exists():
+            return path
+    return None
+
+
+def migrate(vault_path: Path, folders: Iterable[str] = SHARDED_FOLDERS,
+            dry_run: bool = False) -> Dict[str, int]:
+    """
+    File the items lying directly in each folder into their month shards
+
+    Returns:
+        Folder -> number of items moved (or that would be moved)
+    """
+    moved = {}
+    for folder in folders:
+        root = Path(vault_path) / folder
+        count = 0
+        try:
+            entries = [entry for entry in os.scandir(root)
+                       if not entry.name.startswith('.') and entry.is_file()]
+        except OSError:
+            entries = []
+        for entry in entries:
+            if dry_run:
+                logger.info(f"Would move {folder}/{entry.name} -> {folder}/{shard_name(entry.stat().st_mtime)}/")
+            else:
+                dest_path = archive_file(vault_path, Path(entry.path), folder)
+                logger.info(f"Moved {folder}/{entry.name} -> {dest_path.relative_to(vault_path)}")
+            count += 1
+        moved[folder] = count
+    return moved
+
+
+def main():
+    """Main function for CLI usage"""
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Date-sharded Done/Failed layout')
+    parser.add_argument('action', choices=['migrate', 'shards', 'find'], help='Action to perform')
+    parser.add_argument('name', nargs='?', help='File name (for find)')
+    parser.add_argument('--vault-path', default=os.getenv('VAULT_PATH') or str(Path(__file__).parent),
+                        help='Vault root')
+    parser.add_argument('--folder', action='append', help='Done and/or Failed (default: both)')
+    parser.add_argument('--since', help='YYYY-MM-DD (for shards)')
+    parser.add_argument('--until', help='YYYY-MM-DD (for shards)')
+    parser.add_argument('--dry-run', action='store_true', help='Only report what migrate would move')
+
+    args = parser.parse_args()
+    vault_path = Path(args.vault_path)
+    folders = args.folder or list(SHARDED_FOLDERS)
+
+    if args.action == 'migrate':
+        for folder, count in migrate(vault_path, folders, args.dry_run).items():
+            print(f"{folder}: {count} item(s) {'to move' if args.dry_run else 'moved'}")
+    elif args.action == 'shards':
+        since = datetime.strptime(args.since, '%Y-%m-%d') if args.since else None
+        until = datetime.strptime(args.until, '%Y-%m-%d') if args.until else None
+        for folder in folders:
+            for relative in shard_folders(vault_path, folder, since, until):
+                print(relative)
+    elif args.action == 'find':
+        if not args.name:
+            parser.error('find needs a file name')
+        for folder in folders:
+            path = find_archived(vault_path, folder, args.name)
+            if path:
+                print(path)
+
+
+if __name__ == '__main__':
+    main()
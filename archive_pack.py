@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Archive Pack - Monthly compressed packs for cold Done/ items
+Once a month shard (Done/YYYY/MM/) is older than DONE_PACK_AFTER_DAYS, its
+notes are appended to one pack per month, Done/YYYY/YYYY-MM.pack.gz, and
+removed, so years of finished items no longer cost one file each.
+
+Each note is its own gzip member, so the pack is still a valid .gz file
+(zcat prints every note) while a reader can seek to a single note and
+decompress only that. The sidecar Done/YYYY/YYYY-MM.idx.json maps each
+filename to its offset and length together with the metadata briefings
+need - size, mtime, content hash, title, frontmatter and excerpt - so
+listing and filtering packed items never decompresses anything.
+
+    compact(vault_path)                                    # pack cold months
+    packed_notes(vault_path, 'Done', since=start, until=end)
+    read_packed(vault_path, 'Done', 'EMAIL_123.md')
+"""
+
+import os
+import re
+import gzip
+import json
+from fnmatch import fnmatch
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Iterator, Tuple
+import logging
+
+from archive_layout import YEAR_PATTERN, TimeBound, shard_folders
+from job_store import bytes_hash
+from vault_document import parse_document
+from vault_index import EXCERPT_LENGTH
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PACK_AFTER_DAYS = 90
+
+PACK_SUFFIX = '.pack.gz'
+INDEX_SUFFIX = '.idx.json'
+PACK_PATTERN = re.compile(r'^(\d{4})-(0[1-9]|1[0-2])' + re.escape(PACK_SUFFIX) + '$')
+INDEX_PATTERN = re.compile(r'^(\d{4})-(0[1-9]|1[0-2])' + re.escape(INDEX_SUFFIX) + '$')
+
+INDEX_VERSION = 1
+
+
+class PackIndexError(Exception):
+    """Raised when appending to a pack whose index cannot be read"""
+
+
+def _datetime(value: TimeBound) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromtimestamp(float(value))
+
+
+class MonthPack:
+    """One month's pack file and its filename index"""
+
+    def __init__(self, pack_file: Path):
+        self.pack_file = Path(pack_file)
+        self.index_file = self.pack_file.with_name(self.pack_file.name[:-len(PACK_SUFFIX)] + INDEX_SUFFIX)
+        self.size = 0
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.indexed = False  # True once an index was read
+
+    @classmethod
+    def for_month(cls, vault_path: Path, folder: str, year: int, month: int) -> 'MonthPack':
+        """Pack of one month of a folder, e.g. Done/2025/2025-12.pack.gz"""
+        return cls(Path(vault_path) / folder.strip('/') / f"{year:04d}" / f"{year:04d}-{month:02d}{PACK_SUFFIX}")
+
+    @property
+    def month(self) -> Tuple[int, int]:
+        year, month = self.pack_file.name[:7].split('-')
+        return int(year), int(month)
+
+    def load(self) -> 'MonthPack':
+        """Read the index, if any"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self.size = data['size']
+                self.items = data['items']
+                self.indexed = True
+        except (OSError, ValueError, KeyError):
+            pass
+        return self
+
+    def save(self):
+        """Atomically write the index"""
+        tmp_file = self.index_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'size': self.size, 'items': self.items},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_file, self.index_file)
+
+    def add(self, files: List[Path]) -> List[str]:
+        """
+        Append notes to the pack and index them; the files are left in place
+
+        A name already in the pack gets a timestamp suffix, as when moving
+        into Done, and a note whose content is already packed is not stored
+        again. The index is only written after the pack data is on disk.
+
+        Returns:
+            Names the notes were stored under
+
+        Raises:
+            PackIndexError if the pack has data but its index is missing,
+            unreadable or of another version; appending would overwrite it
+        """
+        self.load()
+        if not self.indexed and self.pack_file.exists() and self.pack_file.stat().st_size > 0:
+            raise PackIndexError(f"{self.pack_file} has data but no usable index {self.index_file.name}")
+
+        packed = {item['content_hash']: name for name, item in self.items.items()}
+        names = []
+        self.pack_file.touch()
+        with open(self.pack_file, 'r+b') as f:
+            # Anything past the indexed size is a write that never got indexed
+            f.truncate(self.size)
+            f.seek(self.size)
+            for file in files:
+                data = file.read_bytes()
+                digest = bytes_hash(data)
+                if digest in packed:
+                    # Left behind by a compaction interrupted before its unlinks
+                    names.append(packed[digest])
+                    continue
+
+                stat = file.stat()
+                name = file.name
+                if name in self.items:
+                    name = f"{file.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{len(self.items)}{file.suffix}"
+
+                member = gzip.compress(data, mtime=0)
+                doc = parse_document(data.decode('utf-8', errors='replace'))
+                self.items[name] = {
+                    'offset': f.tell(),
+                    'length': len(member),
+                    'size': len(data),
+                    'mtime': stat.st_mtime,
+                    'content_hash': digest,
+                    'title': doc.title,
+                    'frontmatter': doc.raw_frontmatter,
+                    'excerpt': doc.text[:EXCERPT_LENGTH]
+                }
+                f.write(member)
+                packed[digest] = name
+                names.append(name)
+            f.flush()
+            os.fsync(f.fileno())
+            self.size = f.tell()
+        self.save()
+        return names
+
+    def read_bytes(self, filename: str) -> Optional[bytes]:
+        """Content of one packed note, decompressing only that note"""
+        item = self.items.get(filename)
+        if item is None:
+            return None
+        with open(self.pack_file, 'rb') as f:
+            f.seek(item['offset'])
+            return gzip.decompress(f.read(item['length']))
+
+    def read(self, filename: str) -> Optional[str]:
+        data = self.read_bytes(filename)
+        return data.decode('utf-8', errors='replace') if data is not None else None
+
+    def entries(self, pattern: Optional[str] = None, since: TimeBound = None,
+                until: TimeBound = None) -> List[Dict[str, Any]]:
+        """
+        Index entries of packed notes, oldest first, shaped like vault index notes
+
+        Entries carry packed=True, the pack path as `path`, and
+        "<pack relpath>#<filename>" as `relpath`.
+        """
+        low = _datetime(since).timestamp() if since is not None else None
+        high = _datetime(until).timestamp() if until is not None else None
+        vault_relative = '/'.join(self.pack_file.parts[-3:])
+        folder = '/'.join(self.pack_file.parts[-3:-1])
+
+        entries = []
+        for filename, item in self.items.items():
+            if pattern and not fnmatch(filename, pattern):
+                continue
+            if (low is not None and item['mtime'] < low) or (high is not None and item['mtime'] > high):
+                continue
+            entries.append({
+                'path': self.pack_file,
+                'relpath': f"{vault_relative}#{filename}",
+                'folder': folder,
+                'filename': filename,
+                'stem': Path(filename).stem,
+                'size': item['size'],
+                'mtime': item['mtime'],
+                'modified': datetime.fromtimestamp(item['mtime']),
+                'content_hash': item['content_hash'],
+                'title': item['title'],
+                'frontmatter': item['frontmatter'],
+                'excerpt': item['excerpt'],
+                'packed': True
+            })
+        entries.sort(key=lambda entry: (entry['mtime'], entry['filename']))
+        return entries
+
+    def iter_notes(self, pattern: Optional[str] = None, since: TimeBound = None,
+                   until: TimeBound = None) -> Iterator[Tuple[Dict[str, Any], str]]:
+        """(entry, content) for matching packed notes, reading the pack once in order"""
+        entries = sorted(self.entries(pattern, since, until),
+                         key=lambda entry: self.items[entry['filename']]['offset'])
+        if not entries:
+            return
+        with open(self.pack_file, 'rb') as f:
+            for entry in entries:
+                item = self.items[entry['filename']]
+                f.seek(item['offset'])
+                yield entry, gzip.decompress(f.read(item['length'])).decode('utf-8', errors='replace')
+
+
+def iter_packs(vault_path: Path, folder: str = 'Done', since: TimeBound = None,
+               until: TimeBound = None) -> Iterator[MonthPack]:
+    """Loaded packs of a folder whose month overlaps [since, until], oldest first"""
+    since, until = _datetime(since), _datetime(until)
+    low = (since.year, since.month) if since else None
+    high = (until.year, until.month) if until else None
+
+    root = Path(vault_path) / folder.strip('/')
+    try:
+        years = sorted(entry.name for entry in os.scandir(root) if YEAR_PATTERN.match(entry.name) and entry.is_dir())
+    except OSError:
+        return
+    for year in years:
+        if (low and int(year) < low[0]) or (high and int(year) > high[0]):
+            continue
+        try:
+            names = sorted(entry.name for entry in os.scandir(root / year) if PACK_PATTERN.match(entry.name))
+        except OSError:
+            continue
+        for name in names:
+            pack = MonthPack(root / year / name)
+            if (low and pack.month < low) or (high and pack.month > high):
+                continue
+            yield pack.load()
+
+
+def packed_notes(vault_path: Path, folder: str = 'Done', pattern: Optional[str] = None,
+                 since: TimeBound = None, until: TimeBound = None) -> List[Dict[str, Any]]:
+    """Index entries of packed notes matching the filters (see MonthPack.entries)"""
+    notes = []
+    for pack in iter_packs(vault_path, folder, since, until):
+        notes.extend(pack.entries(pattern, since, until))
+    return notes
+
+
+def iter_packed(vault_path: Path, folder: str = 'Done', pattern: Optional[str] = None,
+                since: TimeBound = None, until: TimeBound = None) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """(entry, content) for every matching packed note"""
+    for pack in iter_packs(vault_path, folder, since, until):
+        yield from pack.iter_notes(pattern, since, until)
+
+
+def packed_names(index_file: Path) -> List[str]:
+    """Filenames listed in a pack index"""
+    index_file = Path(index_file)
+    pack = MonthPack(index_file.with_name(index_file.name[:-len(INDEX_SUFFIX)] + PACK_SUFFIX))
+    return list(pack.load().items)
+
+
+def read_packed(vault_path: Path, folder: str, filename: str) -> Optional[str]:
+    """Content of a packed note, looking in the newest packs first"""
+    for pack in reversed(list(iter_packs(vault_path, folder))):
+        if filename in pack.items:
+            return pack.read(filename)
+    return None
+
+
+def compact(vault_path: Path, folder: str = 'Done', older_than_days: Optional[int] = None,
+            dry_run: bool = False) -> Dict[str, int]:
+    """
+    Pack every month shard that ended more than `older_than_days` ago
+
+    Notes are removed from the shard only after the pack and its index
+    are written; a shard left empty is removed too. Notes already in the
+    pack (after an interrupted run) are removed without packing them again,
+    and a month whose pack has lost its index is left alone.
+
+    Returns:
+        "YYYY-MM" -> number of notes packed (or that would be packed)
+    """
+    days = older_than_days if older_than_days is not None else \
+        int(os.getenv('DONE_PACK_AFTER_DAYS', DEFAULT_PACK_AFTER_DAYS))
+    cutoff = datetime.now() - timedelta(days=days)
+
+    packed = {}
+    for relative in shard_folders(vault_path, folder, until=cutoff)[1:]:
+        year, month = (int(part) for part in relative.split('/')[-2:])
+        month_end = datetime(year + month // 12, month % 12 + 1, 1)
+        if month_end > cutoff:
+            continue
+
+        shard = Path(vault_path) / relative
+        files = sorted(path for path in shard.iterdir() if path.suffix == '.md' and path.is_file())
+        if not files:
+            continue
+        key = f"{year:04d}-{month:02d}"
+        packed[key] = len(files)
+        if dry_run:
+            logger.info(f"Would pack {len(files)} note(s) from {relative}")
+            continue
+
+        pack = MonthPack.for_month(vault_path, folder, year, month)
+        try:
+            pack.add(files)
+        except PackIndexError as e:
+            logger.error(f"Not packing {relative}: {e}")
+            del packed[key]
+            continue
+        for file in files:
+            file.unlink()
+        try:
+            shard.rmdir()
+        except OSError:
+            pass
+        logger.info(f"Packed {len(files)} note(s) from {relative} into {pack.pack_file.name}")
+    return packed
+
+
+def main():
+    """Main function for CLI usage"""
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Monthly packs for cold Done items')
+    parser.add_argument('action', choices=['compact', 'list', 'cat'], help='Action to perform')
+    parser.add_argument('name', nargs='?', help='Packed file name (for cat)')
+    parser.add_argument('--vault-path', default=os.getenv('VAULT_PATH') or str(Path(__file__).parent),
+                        help='Vault root')
+    parser.add_argument('--folder', default='Done', help='Sharded folder (default: Done)')
+    parser.add_argument('--days', type=int, help=f'Pack months older than this (default: {DEFAULT_PACK_AFTER_DAYS})')
+    parser.add_argument('--since', help='YYYY-MM-DD (for list)')
+    parser.add_argument('--until', help='YYYY-MM-DD (for list)')
+    parser.add_argument('--dry-run', action='store_true', help='Only report what compact would pack')
+
+    args = parser.parse_args()
+    vault_path = Path(args.vault_path)
+
+    if args.action == 'compact':
+        packed = compact(vault_path, args.folder, args.days, args.dry_run)
+        for month, count in packed.items():
+            print(f"{month}: {count} note(s) {'to pack' if args.dry_run else 'packed'}")
+        if not packed:
+            print("Nothing to pack")
+    elif args.action == 'list':
+        since = datetime.strptime(args.since, '%Y-%m-%d') if args.since else None
+        until = datetime.strptime(args.until, '%Y-%m-%d') if args.until else None
+        for note in packed_notes(vault_path, args.folder, since=since, until=until):
+            print(f"{note['modified']:%Y-%m-%d %H:%M}  {note['relpath']}")
+    elif args.action == 'cat':
+        if not args.name:
+            parser.error('cat needs a file name')
+        content = read_packed(vault_path, args.folder, args.name)
+        if content is None:
+            parser.exit(1, f"{args.name} is not packed in {args.folder}\n")
+        print(content, end='')
+
+
+if __name__ == '__main__':
+    main()
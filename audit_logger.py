@@ -7,10 +7,13 @@ Logs all AI Employee activities for compliance and analysis
 import os
 import sys
 import json
+import atexit
 import logging
+import logging.handlers
+import queue
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any, Optional, List, Union
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Union, Iterator
 import traceback
 import codecs
 
@@ -21,12 +24,18 @@ except LookupError:
     import codecs  # Ensure codecs is imported
     codecs.register(lambda name: codecs.lookup('utf-8') if name == 'cp15040' else None)
 
+from audit_writer import AuditWriter
+from audit_query import AuditQueryEngine
+from audit_rollups import AuditRollups
+from log_archive import compress_log, archived_path
+
 
 class AuditLogger:
     """Comprehensive audit logging system"""
 
-    def __init__(self):
-        self.vault_path = Path("C:\\Users\\LENOVO X1 YOGA\\Desktop\\hakathone zero\\AI_Employee_Vault")
+    def __init__(self, vault_path: Optional[Path] = None, writer: Optional[AuditWriter] = None):
+        self.vault_path = Path(vault_path) if vault_path else \
+            Path("C:\\Users\\LENOVO X1 YOGA\\Desktop\\hakathone zero\\AI_Employee_Vault")
         self.logs_path = self.vault_path / "Audit_Logs"
         self.logs_path.mkdir(exist_ok=True)
 
@@ -36,17 +45,38 @@ class AuditLogger:
         # Setup error log
         self.error_log_file = self.logs_path / "errors.jsonl"
 
-        # Configure structured logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(self.logs_path / "system.log"),
-                logging.StreamHandler()
-            ]
-        )
+        # Entries are written by a background thread, never on the caller's
+        self.writer = writer or AuditWriter.shared(self.logs_path)
+
+        self.logger = self._setup_logger()
+
+        self.query_engine = AuditQueryEngine(self.logs_path)
 
-        self.logger = logging.getLogger(__name__)
+        # Day/hour aggregates are folded in by the writer after each batch
+        self.rollups = AuditRollups(self.logs_path)
+        self.writer.add_listener('rollups', self.rollups.on_written)
+
+    def _setup_logger(self) -> logging.Logger:
+        """
+        Logger for system.log whose file I/O happens on a listener thread
+
+        Handlers are attached to this module's logger only, so importing the
+        audit logger no longer reconfigures the host process's root logger.
+        """
+        audit_log = logging.getLogger(__name__)
+        if not getattr(audit_log, '_audit_listener', None):
+            log_queue: 'queue.Queue' = queue.Queue(-1)
+            file_handler = logging.FileHandler(self.logs_path / "system.log")
+            file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+            listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+            listener.start()
+            atexit.register(listener.stop)
+
+            audit_log.addHandler(logging.handlers.QueueHandler(log_queue))
+            audit_log.setLevel(logging.INFO)
+            audit_log._audit_listener = listener
+        return audit_log
 
     def log_action(self, action_type: str, actor: str, details: Dict[str, Any], status: str = "success"):
         """
@@ -66,13 +96,11 @@ class AuditLogger:
             "details": details
         }
 
-        try:
-            with open(self.daily_log_file, 'a') as f:
-                f.write(json.dumps(log_entry) + '\n')
+        if not self.writer.write(log_entry):
+            print(f"Audit log queue full or closed, dropped {action_type} entry")
+            return
 
-            self.logger.info(f"{action_type}: {status}")
-        except Exception as e:
-            print(f"Failed to write audit log: {e}")
+        self.logger.info(f"{action_type}: {status}")
 
     def log_email_processed(self, email_id: str, sender: str, subject: str, action_taken: str):
         """Log email processing"""
@@ -171,13 +199,10 @@ class AuditLogger:
             "context": context or {}
         }
 
-        try:
-            with open(self.error_log_file, 'a') as f:
-                f.write(json.dumps(log_entry) + '\n')
+        if not self.writer.write(log_entry, self.error_log_file.name):
+            print(f"Audit log queue full or closed, dropped {error_type} error")
 
-            self.logger.error(f"{error_type}: {error_message}")
-        except Exception as e:
-            print(f"Failed to write error log: {e}")
+        self.logger.error(f"{error_type}: {error_message}")
 
     def log_mcp_action(self, mcp_server: str, action: str, parameters: Dict[str, Any], result: Dict[str, Any]):
         """Log MCP server action"""
@@ -226,118 +251,140 @@ class AuditLogger:
             }
         )
 
-    def get_daily_summary(self, date: datetime = None) -> Dict[str, Any]:
-        """Get daily activity summary"""
-        if date is None:
-            date = datetime.now()
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait until every queued entry is on disk"""
+        return self.writer.flush(timeout)
 
-        log_file = self.logs_path / f"audit_{date.strftime('%Y%m%d')}.jsonl"
+    def close(self):
+        """Write out queued entries and stop the writer thread"""
+        self.writer.close()
 
-        if not log_file.exists():
-            return {"error": "No logs found for date"}
+    def get_writer_metrics(self) -> Dict[str, Any]:
+        """Queue depth, dropped entries and fsync counters of the audit sink"""
+        return self.writer.get_metrics()
 
-        summary = {
-            "date": date.strftime("%Y-%m-%d"),
-            "total_actions": 0,
-            "actions_by_type": {},
-            "actions_by_status": {},
-            "errors": 0
-        }
+    def get_daily_summary(self, date: datetime = None) -> Dict[str, Any]:
+        """Get daily activity summary from the pre-aggregated rollup"""
+        if date is None:
+            date = datetime.now()
 
+        self.flush()
         try:
-            with open(log_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        entry = json.loads(line)
-                        summary["total_actions"] += 1
-
-                        action_type = entry.get("action_type", "unknown")
-                        summary["actions_by_type"][action_type] = summary["actions_by_type"].get(action_type, 0) + 1
-
-                        status = entry.get("status", "unknown")
-                        summary["actions_by_status"][status] = summary["actions_by_status"].get(status, 0) + 1
-
-                        if action_type == "error" or status == "failed":
-                            summary["errors"] += 1
-
+            summary = self.rollups.daily_summary(date)
         except Exception as e:
             self.logger.error(f"Failed to generate daily summary: {e}")
+            return {"error": str(e)}
 
+        if summary is None:
+            return {"error": "No logs found for date"}
         return summary
 
-    def get_audit_report(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
-        """Generate comprehensive audit report for date range"""
+    def get_trend(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """Per-day action and error counts for a date range, from rollups"""
+        self.flush()
+        return self.rollups.trend(start_date, end_date)
+
+    def get_audit_report(self, start_date: datetime, end_date: datetime, include_details: bool = True,
+                         action_type: Optional[str] = None, status: Optional[str] = None,
+                         actor: Optional[str] = None, offset: int = 0,
+                         limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Generate comprehensive audit report for date range
+
+        Summary counts come from the per-day offset indexes; detailed_logs is
+        only read (one page of matching entries) when include_details is set.
+        Use iter_audit_entries() to stream entries instead.
+        """
+        self.flush()
+        summary = self.query_engine.summary(start_date, end_date)
+        by_type = summary["actions_by_type"]
+
         report = {
             "period_start": start_date.strftime("%Y-%m-%d"),
             "period_end": end_date.strftime("%Y-%m-%d"),
             "generated_at": datetime.now().isoformat(),
             "summary": {
-                "total_actions": 0,
-                "actions_by_type": {},
-                "errors": 0,
-                "mcp_actions": 0,
-                "emails_processed": 0,
-                "tasks_completed": 0,
-                "posts_created": 0
-            },
-            "detailed_logs": []
+                "total_actions": summary["total_actions"],
+                "actions_by_type": by_type,
+                "actions_by_status": summary["actions_by_status"],
+                "actions_by_actor": summary["actions_by_actor"],
+                "errors": summary["actions_by_status"].get("failed", 0),
+                "mcp_actions": by_type.get("mcp_action", 0),
+                "emails_processed": by_type.get("email_processed", 0),
+                "tasks_completed": by_type.get("task_completed", 0),
+                "posts_created": by_type.get("social_media_posted", 0)
+            }
         }
 
-        current_date = start_date
-        while current_date <= end_date:
-            daily_file = self.logs_path / f"audit_{current_date.strftime('%Y%m%d')}.jsonl"
-
-            if daily_file.exists():
-                try:
-                    with open(daily_file, 'r') as f:
-                        for line in f:
-                            if line.strip():
-                                entry = json.loads(line)
-                                report["summary"]["total_actions"] += 1
-
-                                action_type = entry.get("action_type")
-                                report["summary"]["actions_by_type"][action_type] = report["summary"]["actions_by_type"].get(action_type, 0) + 1
-
-                                # Count specific action types
-                                if action_type == "email_processed":
-                                    report["summary"]["emails_processed"] += 1
-                                elif action_type == "task_completed":
-                                    report["summary"]["tasks_completed"] += 1
-                                elif action_type == "social_media_posted":
-                                    report["summary"]["posts_created"] += 1
-                                elif action_type == "mcp_action":
-                                    report["summary"]["mcp_actions"] += 1
-
-                                if entry.get("status") == "failed":
-                                    report["summary"]["errors"] += 1
-
-                                # Add to detailed logs
-                                report["detailed_logs"].append({
-                                    "date": current_date.strftime("%Y-%m-%d"),
-                                    "action": entry
-                                })
-
-                except Exception as e:
-                    self.logger.error(f"Failed to process {daily_file}: {e}")
-
-            current_date += datetime.timedelta(days=1)
+        if include_details:
+            report["detailed_logs"] = list(self.iter_audit_entries(
+                start_date, end_date, action_type=action_type, status=status, actor=actor,
+                offset=offset, limit=limit
+            ))
 
         return report
 
+    def iter_audit_entries(self, start_date: datetime, end_date: datetime, action_type: Optional[str] = None,
+                           status: Optional[str] = None, actor: Optional[str] = None,
+                           offset: int = 0, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Stream matching audit entries ({"date", "action"}) one page at a time"""
+        self.flush()
+        return self.query_engine.iter_entries(start_date, end_date, action_type=action_type, status=status,
+                                              actor=actor, offset=offset, limit=limit)
+
+    def archive_old_logs(self, days_live: int = 7) -> int:
+        """
+        Compress daily logs older than days_live into seekable archives
+
+        Index and rollup sidecars are brought up to date first, so reports
+        over archived days keep working without re-reading them.
+
+        Returns:
+            Number of files archived
+        """
+        self.flush()
+        cutoff = (datetime.now() - timedelta(days=days_live)).strftime('%Y%m%d')
+        archived = 0
+
+        for log_file in sorted(self.logs_path.glob("audit_*.jsonl")):
+            date_str = log_file.name.replace("audit_", "").replace(".jsonl", "")
+            if date_str >= cutoff:
+                continue
+            try:
+                date = datetime.strptime(date_str, "%Y%m%d")
+                self.query_engine.day_index(log_file)
+                self.rollups.day(date)
+
+                result = compress_log(log_file)
+                log_file.unlink()
+                archived += 1
+                self.logger.info(f"Archived {log_file.name}: {result['original_size']} -> "
+                                 f"{result['compressed_size']} bytes in {result['chunks']} chunks")
+            except Exception as e:
+                self.logger.error(f"Failed to archive {log_file}: {e}")
+
+        return archived
+
     def cleanup_old_logs(self, days_to_keep: int = 30):
         """Clean up old log files"""
-        cutoff_date = datetime.now() - datetime.timedelta(days=days_to_keep)
+        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
 
         try:
-            for log_file in self.logs_path.glob("audit_*.jsonl"):
+            for log_file in list(self.logs_path.glob("audit_*.jsonl*")):
                 # Extract date from filename
                 filename = log_file.name
-                date_str = filename.replace("audit_", "").replace(".jsonl", "")
+                if not filename.endswith((".jsonl", ".jsonl.gz")):
+                    continue
+                date_str = filename.replace("audit_", "").replace(".gz", "").replace(".jsonl", "")
+                log_file = self.logs_path / f"audit_{date_str}.jsonl"
 
                 try:
                     file_date = datetime.strptime(date_str, "%Y%m%d")
                     if file_date < cutoff_date:
-                        log_file.unlink()
+                        log_file.unlink(missing_ok=True)
+                        archived_path(log_file).unlink(missing_ok=True)
+                        log_file.with_suffix('.idx.json').unlink(missing_ok=True)
+                        log_file.with_suffix('.rollup.json').unlink(missing_ok=True)
                         self.logger.info(f"Deleted old log file: {log_file}")
                 except ValueError:
                     continue
@@ -354,6 +401,10 @@ def main():
     parser.add_argument('action', choices=[
         'daily_summary',
         'audit_report',
+        'reindex',
+        'trend',
+        'rollup_rebuild',
+        'archive',
         'cleanup'
     ], help='Action to perform')
 
@@ -361,6 +412,13 @@ def main():
     parser.add_argument('--start-date', help='Start date for report (YYYY-MM-DD)')
     parser.add_argument('--end-date', help='End date for report (YYYY-MM-DD)')
     parser.add_argument('--days-to-keep', type=int, default=30, help='Days to keep logs')
+    parser.add_argument('--days-live', type=int, default=7, help='Days to keep uncompressed before archiving')
+    parser.add_argument('--summary-only', action='store_true', help='Omit detailed_logs from the report')
+    parser.add_argument('--action-type', help='Only report entries with this action type')
+    parser.add_argument('--status', help='Only report entries with this status')
+    parser.add_argument('--actor', help='Only report entries from this actor')
+    parser.add_argument('--offset', type=int, default=0, help='Matching entries to skip')
+    parser.add_argument('--limit', type=int, help='Maximum detailed entries to include')
 
     args = parser.parse_args()
 
@@ -368,9 +426,9 @@ def main():
 
     if args.action == 'daily_summary':
         if args.date:
-            date = datetime.datetime.strptime(args.date, "%Y-%m-%d")
+            date = datetime.strptime(args.date, "%Y-%m-%d")
         else:
-            date = datetime.datetime.now()
+            date = datetime.now()
 
         summary = logger.get_daily_summary(date)
         print(json.dumps(summary, indent=2))
@@ -380,17 +438,49 @@ def main():
             print(json.dumps({"error": "--start-date and --end-date required"}))
             sys.exit(1)
 
-        start_date = datetime.datetime.strptime(args.start_date, "%Y-%m-%d")
-        end_date = datetime.datetime.strptime(args.end_date, "%Y-%m-%d")
+        start_date = datetime.strptime(args.start_date, "%Y-%m-%d")
+        end_date = datetime.strptime(args.end_date, "%Y-%m-%d")
 
-        report = logger.get_audit_report(start_date, end_date)
+        report = logger.get_audit_report(
+            start_date, end_date, include_details=not args.summary_only,
+            action_type=args.action_type, status=args.status, actor=args.actor,
+            offset=args.offset, limit=args.limit
+        )
         print(json.dumps(report, indent=2))
 
+    elif args.action == 'reindex':
+        if not args.start_date or not args.end_date:
+            print(json.dumps({"error": "--start-date and --end-date required"}))
+            sys.exit(1)
+
+        start_date = datetime.strptime(args.start_date, "%Y-%m-%d")
+        end_date = datetime.strptime(args.end_date, "%Y-%m-%d")
+
+        rebuilt = logger.query_engine.rebuild(start_date, end_date)
+        print(f"Rebuilt {rebuilt} audit log indexes")
+
+    elif args.action in ('trend', 'rollup_rebuild'):
+        if not args.start_date or not args.end_date:
+            print(json.dumps({"error": "--start-date and --end-date required"}))
+            sys.exit(1)
+
+        start_date = datetime.strptime(args.start_date, "%Y-%m-%d")
+        end_date = datetime.strptime(args.end_date, "%Y-%m-%d")
+
+        if args.action == 'trend':
+            print(json.dumps(logger.get_trend(start_date, end_date), indent=2))
+        else:
+            rebuilt = logger.rollups.rebuild(start_date, end_date)
+            print(f"Rebuilt rollups for {rebuilt} days")
+
+    elif args.action == 'archive':
+        archived = logger.archive_old_logs(args.days_live)
+        print(f"Archived {archived} daily logs older than {args.days_live} days")
+
     elif args.action == 'cleanup':
         logger.cleanup_old_logs(args.days_to_keep)
         print(f"Cleaned up logs older than {args.days_to_keep} days")
 
 
 if __name__ == '__main__':
-    import datetime
     main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Audit Query - Indexed, streaming queries over the daily audit JSONL files
+Each audit_YYYYMMDD.jsonl gets a sidecar audit_YYYYMMDD.idx.json holding
+the byte offset of every entry grouped by action_type, status and actor.
+Counts come straight from the index and matching entries are read by
+seeking, so a report over months of logs never loads them all. Days that
+have been compressed (audit_YYYYMMDD.jsonl.gz) keep their index and are
+read through log_archive.
+"""
+
+import json
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Iterator, Tuple
+import logging
+
+from log_archive import archived_path, iter_lines_from, log_size, open_log, sidecar_lock, write_sidecar
+
+logger = logging.getLogger(__name__)
+
+# Entry fields that get an offset index
+INDEXED_FIELDS = ('action_type', 'status', 'actor')
+
+INDEX_VERSION = 1
+
+
+class DayIndex:
+    """Byte-offset index for one daily audit file"""
+
+    def __init__(self, log_file: Path):
+        self.log_file = Path(log_file)
+        self.index_file = self.log_file.with_suffix('.idx.json')
+        self.size = 0
+        self.offsets: List[int] = []
+        self.fields: Dict[str, Dict[str, List[int]]] = {name: {} for name in INDEXED_FIELDS}
+
+    def load(self) -> 'DayIndex':
+        """Read the sidecar, then index any lines appended since it was saved"""
+        self._read()
+        if self._log_size() == self.size:
+            return self
+
+        with sidecar_lock(self.log_file.parent):
+            # Another process may have brought the sidecar up to date meanwhile
+            self._read()
+            size = self._log_size()
+            if size < self.size:
+                # File was truncated or replaced: start over
+                self.__init__(self.log_file)
+            if size > self.size:
+                self._extend()
+                self.save()
+        return self
+
+    def _read(self):
+        """Load the saved sidecar, if there is a current one"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self.size = data['size']
+                self.offsets = data['offsets']
+                self.fields = data['fields']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _log_size(self) -> float:
+        """Bytes of the log to cover"""
+        size = log_size(self.log_file)
+        if size is None:
+            # Legacy gzip archive: build once, it never changes afterwards
+            return self.size or float('inf')
+        return size
+
+    def _extend(self):
+        """Index lines from the covered size to the end of the file"""
+        offset = self.size
+        for line in iter_lines_from(self.log_file, self.size):
+            if not line.endswith(b'\n'):
+                # Still being written; picked up next time
+                break
+            start, offset = offset, offset + len(line)
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(entry, dict):
+                continue
+
+            self.offsets.append(start)
+            for name in INDEXED_FIELDS:
+                value = str(entry.get(name, 'unknown'))
+                self.fields[name].setdefault(value, []).append(start)
+        self.size = offset
+
+    def save(self):
+        """Atomically write the sidecar"""
+        write_sidecar(self.index_file, {'version': INDEX_VERSION, 'size': self.size,
+                                        'offsets': self.offsets, 'fields': self.fields})
+
+    def match(self, filters: Dict[str, Optional[str]]) -> List[int]:
+        """Sorted offsets of entries matching every non-empty filter"""
+        selected = None
+        for name, value in filters.items():
+            if value is None:
+                continue
+            offsets = self.fields.get(name, {}).get(str(value), [])
+            selected = set(offsets) if selected is None else selected & set(offsets)
+            if not selected:
+                return []
+        return self.offsets if selected is None else sorted(selected)
+
+    def counts(self, name: str) -> Dict[str, int]:
+        """Number of entries per value of an indexed field"""
+        return {value: len(offsets) for value, offsets in self.fields.get(name, {}).items()}
+
+
+class AuditQueryEngine:
+    """Filtered, paginated access to the audit logs through the day indexes"""
+
+    def __init__(self, logs_path: Path, prefix: str = 'audit_'):
+        self.logs_path = Path(logs_path)
+        self.prefix = prefix
+
+    def _days(self, start_date: datetime, end_date: datetime) -> Iterator[Tuple[datetime, Path]]:
+        """(date, log file) for every existing daily file in the range"""
+        current = start_date
+        while current.date() <= end_date.date():
+            log_file = self.logs_path / f"{self.prefix}{current.strftime('%Y%m%d')}.jsonl"
+            if log_file.exists() or archived_path(log_file).exists():
+                yield current, log_file
+            current += timedelta(days=1)
+
+    def day_index(self, log_file: Path) -> DayIndex:
+        """Up-to-date index for a daily file"""
+        return DayIndex(log_file).load()
+
+    def iter_entries(self, start_date: datetime, end_date: datetime, action_type: Optional[str] = None,
+                     status: Optional[str] = None, actor: Optional[str] = None,
+                     offset: int = 0, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream matching entries in time order
+
+        Args:
+            start_date, end_date: Inclusive date range
+            action_type, status, actor: Optional exact-match filters
+            offset: Number of matching entries to skip
+            limit: Maximum number of entries to yield
+
+        Yields:
+            {"date": "YYYY-MM-DD", "action": entry}
+        """
+        filters = {'action_type': action_type, 'status': status, 'actor': actor}
+        skip = max(0, offset)
+        remaining = limit
+
+        for day, log_file in self._days(start_date, end_date):
+            if remaining is not None and remaining <= 0:
+                return
+            positions = self.day_index(log_file).match(filters)
+            if skip >= len(positions):
+                skip -= len(positions)
+                continue
+            positions = positions[skip:]
+            skip = 0
+            if remaining is not None:
+                positions = positions[:remaining]
+                remaining -= len(positions)
+
+            date = day.strftime('%Y-%m-%d')
+            if not log_file.exists():
+                # Compressed day: offsets refer to the uncompressed stream,
+                # so walk it once and pick out the wanted positions
+                wanted = set(positions)
+                position = 0
+                for line in open_log(archived_path(log_file)).iter_lines():
+                    if position in wanted:
+                        try:
+                            yield {"date": date, "action": json.loads(line)}
+                        except ValueError:
+                            pass
+                    position += len(line)
+                continue
+
+            with open(log_file, 'rb') as f:
+                for position in positions:
+                    f.seek(position)
+                    try:
+                        yield {"date": date, "action": json.loads(f.readline())}
+                    except ValueError:
+                        continue
+
+    def count(self, start_date: datetime, end_date: datetime, action_type: Optional[str] = None,
+              status: Optional[str] = None, actor: Optional[str] = None) -> int:
+        """Number of matching entries, from the indexes alone"""
+        filters = {'action_type': action_type, 'status': status, 'actor': actor}
+        return sum(len(self.day_index(log_file).match(filters))
+                   for _, log_file in self._days(start_date, end_date))
+
+    def summary(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """Counts by action type, status and actor without reading any entries"""
+        totals = {name: {} for name in INDEXED_FIELDS}
+        total = 0
+        for _, log_file in self._days(start_date, end_date):
+            index = self.day_index(log_file)
+            total += len(index.offsets)
+            for name in INDEXED_FIELDS:
+                for value, count in index.counts(name).items():
+                    totals[name][value] = totals[name].get(value, 0) + count
+
+        return {
+            "total_actions": total,
+            "actions_by_type": totals['action_type'],
+            "actions_by_status": totals['status'],
+            "actions_by_actor": totals['actor']
+        }
+
+    def rebuild(self, start_date: datetime, end_date: datetime) -> int:
+        """Discard and rebuild the indexes in a range; returns files indexed"""
+        rebuilt = 0
+        for _, log_file in self._days(start_date, end_date):
+            index = DayIndex(log_file)
+            index.index_file.unlink(missing_ok=True)
+            index.load()
+            rebuilt += 1
+        return rebuilt
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Audit Rollups - Pre-aggregated per-day and per-hour audit counts
+Each audit_YYYYMMDD.jsonl gets a small audit_YYYYMMDD.rollup.json sidecar
+with counts by action type, status, actor and platform plus error counts,
+for the whole day and for each hour. The audit writer folds new lines in
+after every batch, so summaries and trend queries read a few KB of JSON
+instead of re-parsing the raw logs.
+"""
+
+import json
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Iterable
+import logging
+
+from log_archive import archived_path, iter_lines_from, log_size, sidecar_lock, write_sidecar
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_VERSION = 1
+
+# Count dimensions kept for the day and for each hour
+DIMENSIONS = ('action_type', 'status', 'actor', 'platform')
+
+
+def _empty_counts() -> Dict[str, Any]:
+    return {'total': 0, 'errors': 0, **{f"by_{name}": {} for name in DIMENSIONS}}
+
+
+def _add(counts: Dict[str, Any], values: Dict[str, str], is_error: bool):
+    counts['total'] += 1
+    if is_error:
+        counts['errors'] += 1
+    for name, value in values.items():
+        bucket = counts[f"by_{name}"]
+        bucket[value] = bucket.get(value, 0) + 1
+
+
+def _merge(target: Dict[str, Any], source: Dict[str, Any]):
+    target['total'] += source['total']
+    target['errors'] += source['errors']
+    for name in DIMENSIONS:
+        bucket = target[f"by_{name}"]
+        for value, count in source[f"by_{name}"].items():
+            bucket[value] = bucket.get(value, 0) + count
+
+
+def is_error_entry(entry: Dict[str, Any]) -> bool:
+    """Entries that count as errors in summaries"""
+    return entry.get('action_type') == 'error' or entry.get('status') == 'failed'
+
+
+class DayRollup:
+    """Aggregates for one daily audit file"""
+
+    def __init__(self, log_file: Path):
+        self.log_file = Path(log_file)
+        self.rollup_file = self.log_file.with_suffix('.rollup.json')
+        self.size = 0
+        self.day = _empty_counts()
+        self.hours: Dict[str, Dict[str, Any]] = {}
+
+    def load(self) -> 'DayRollup':
+        """Read the sidecar and fold in any lines written since it was saved"""
+        self._read()
+        if self._log_size() == self.size:
+            return self
+
+        with sidecar_lock(self.log_file.parent):
+            # Another process may have brought the sidecar up to date meanwhile
+            self._read()
+            size = self._log_size()
+            if size < self.size:
+                # File was truncated or replaced: start over
+                self.__init__(self.log_file)
+            if size > self.size:
+                self._extend()
+                self.save()
+        return self
+
+    def _read(self):
+        """Load the saved sidecar, if there is a current one"""
+        try:
+            with open(self.rollup_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == ROLLUP_VERSION:
+                self.size = data['size']
+                self.day = data['day']
+                self.hours = data['hours']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _log_size(self) -> float:
+        """Bytes of the log to cover"""
+        size = log_size(self.log_file)
+        if size is None:
+            # Legacy gzip archive: build once, it never changes afterwards
+            return self.size or float('inf')
+        return size
+
+    def _extend(self):
+        """Aggregate lines from the covered size to the end of the file"""
+        for line in iter_lines_from(self.log_file, self.size):
+            if not line.endswith(b'\n'):
+                # Still being written; picked up next time
+                break
+            self.size += len(line)
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(entry, dict):
+                continue
+
+            details = entry.get('details') if isinstance(entry.get('details'), dict) else {}
+            values = {
+                'action_type': str(entry.get('action_type', 'unknown')),
+                'status': str(entry.get('status', 'unknown')),
+                'actor': str(entry.get('actor', 'unknown')),
+                'platform': str(details.get('platform') or 'none')
+            }
+            is_error = is_error_entry(entry)
+            hour = str(entry.get('timestamp', ''))[11:13] or '00'
+
+            _add(self.day, values, is_error)
+            _add(self.hours.setdefault(hour, _empty_counts()), values, is_error)
+
+    def save(self):
+        """Atomically write the sidecar"""
+        write_sidecar(self.rollup_file, {'version': ROLLUP_VERSION, 'size': self.size,
+                                         'day': self.day, 'hours': self.hours})
+
+
+class AuditRollups:
+    """Daily and hourly aggregates for the audit logs in one folder"""
+
+    def __init__(self, logs_path: Path, prefix: str = 'audit_'):
+        self.logs_path = Path(logs_path)
+        self.prefix = prefix
+
+    def log_file(self, date: datetime) -> Path:
+        return self.logs_path / f"{self.prefix}{date.strftime('%Y%m%d')}.jsonl"
+
+    def on_written(self, paths: Iterable[Path]):
+        """Writer hook: fold freshly written daily files into their rollups"""
+        for path in paths:
+            path = Path(path)
+            if path.name.startswith(self.prefix) and path.suffix == '.jsonl':
+                try:
+                    DayRollup(path).load()
+                except Exception as e:
+                    logger.error(f"Failed to update rollup for {path.name}: {e}")
+
+    def day(self, date: datetime) -> Optional[DayRollup]:
+        """Up-to-date rollup for a day, or None if there is no log"""
+        log_file = self.log_file(date)
+        if not log_file.exists() and not archived_path(log_file).exists():
+            return None
+        return DayRollup(log_file).load()
+
+    def daily_summary(self, date: datetime) -> Optional[Dict[str, Any]]:
+        """Day totals in the get_daily_summary format"""
+        rollup = self.day(date)
+        if rollup is None:
+            return None
+        counts = rollup.day
+        return {
+            "date": date.strftime("%Y-%m-%d"),
+            "total_actions": counts['total'],
+            "actions_by_type": counts['by_action_type'],
+            "actions_by_status": counts['by_status'],
+            "actions_by_actor": counts['by_actor'],
+            "actions_by_platform": counts['by_platform'],
+            "errors": counts['errors'],
+            "by_hour": {hour: {"total": c['total'], "errors": c['errors']}
+                        for hour, c in sorted(rollup.hours.items())}
+        }
+
+    def trend(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """
+        Per-day totals and combined counts for a date range
+
+        Returns:
+            {"days": [{"date", "total", "errors"}, ...], "totals": counts}
+        """
+        days: List[Dict[str, Any]] = []
+        totals = _empty_counts()
+
+        current = start_date
+        while current.date() <= end_date.date():
+            rollup = self.day(current)
+            counts = rollup.day if rollup else _empty_counts()
+            days.append({"date": current.strftime("%Y-%m-%d"),
+                         "total": counts['total'], "errors": counts['errors']})
+            _merge(totals, counts)
+            current += timedelta(days=1)
+
+        return {
+            "period_start": start_date.strftime("%Y-%m-%d"),
+            "period_end": end_date.strftime("%Y-%m-%d"),
+            "days": days,
+            "totals": totals,
+            "error_rate": round(totals['errors'] / totals['total'], 4) if totals['total'] else 0.0
+        }
+
+    def weekly_trend(self, weeks: int = 4, end_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Totals for each of the last N seven-day windows, oldest first"""
+        end_date = end_date or datetime.now()
+        result = []
+        for week in range(weeks - 1, -1, -1):
+            week_end = end_date - timedelta(days=7 * week)
+            week_start = week_end - timedelta(days=6)
+            trend = self.trend(week_start, week_end)
+            result.append({
+                "week_start": trend["period_start"],
+                "week_end": trend["period_end"],
+                "total": trend["totals"]["total"],
+                "errors": trend["totals"]["errors"],
+                "error_rate": trend["error_rate"]
+            })
+        return result
+
+    def rebuild(self, start_date: datetime, end_date: datetime) -> int:
+        """Recompute rollups for historical days; returns days rebuilt"""
+        rebuilt = 0
+        current = start_date
+        while current.date() <= end_date.date():
+            log_file = self.log_file(current)
+            if log_file.exists() or archived_path(log_file).exists():
+                rollup = DayRollup(log_file)
+                rollup.rollup_file.unlink(missing_ok=True)
+                rollup.load()
+                rebuilt += 1
+            current += timedelta(days=1)
+        return rebuilt
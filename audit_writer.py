@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Audit Writer - Non-blocking batched JSONL sink for the audit logs
+Callers only serialize the entry and put it on an in-memory queue; a
+background thread drains the queue in batches, keeps the daily file open
+until midnight and fsyncs according to the configured durability level.
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional, IO, Callable, Iterable
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Durability levels
+DURABILITY_NONE = 'none'          # flush to the OS after each batch, never fsync
+DURABILITY_INTERVAL = 'interval'  # fsync at most every fsync_interval seconds
+DURABILITY_BATCH = 'batch'        # fsync after every batch
+DURABILITY_LEVELS = (DURABILITY_NONE, DURABILITY_INTERVAL, DURABILITY_BATCH)
+
+DEFAULT_DURABILITY = DURABILITY_INTERVAL
+DEFAULT_FSYNC_INTERVAL = 1.0  # seconds
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_QUEUE_SIZE = 10000
+
+
+_shared_writers: Dict[str, 'AuditWriter'] = {}
+_shared_lock = threading.Lock()
+
+
+class _Flush:
+    """Queue marker that is signalled once everything before it is on disk"""
+
+    __slots__ = ('done',)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class AuditWriter:
+    """
+    Background writer for daily audit_YYYYMMDD.jsonl files
+
+    Entries go to the daily file for the date they were logged, or to a
+    fixed file name (e.g. errors.jsonl). When the queue is full, new entries
+    are dropped and counted rather than blocking the caller.
+    """
+
+    def __init__(self, logs_path: Path, prefix: str = 'audit_', durability: Optional[str] = None,
+                 fsync_interval: Optional[float] = None, batch_size: Optional[int] = None,
+                 max_queue: Optional[int] = None):
+        self.logs_path = Path(logs_path)
+        self.prefix = prefix
+
+        durability = (durability or os.getenv('AUDIT_DURABILITY', DEFAULT_DURABILITY)).lower()
+        if durability not in DURABILITY_LEVELS:
+            logger.warning(f"Unknown audit durability '{durability}', using '{DEFAULT_DURABILITY}'")
+            durability = DEFAULT_DURABILITY
+        self.durability = durability
+        self.fsync_interval = fsync_interval if fsync_interval is not None else \
+            float(os.getenv('AUDIT_FSYNC_INTERVAL', DEFAULT_FSYNC_INTERVAL))
+        self.batch_size = batch_size or int(os.getenv('AUDIT_BATCH_SIZE', DEFAULT_BATCH_SIZE))
+
+        self._queue: 'queue.Queue' = queue.Queue(max_queue or int(os.getenv('AUDIT_QUEUE_SIZE', DEFAULT_QUEUE_SIZE)))
+        self._files: Dict[str, IO[str]] = {}
+        self._dirty: Dict[str, IO[str]] = {}
+        self._last_fsync = time.monotonic()
+        self._day: Optional[str] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: Dict[str, Callable[[Iterable[Path]], None]] = {}
+
+        self.metrics = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "batches": 0,
+            "fsyncs": 0,
+            "max_queue_depth": 0,
+            "write_errors": 0
+        }
+
+    @classmethod
+    def shared(cls, logs_path: Path) -> 'AuditWriter':
+        """One writer per logs folder, so every AuditLogger in the process shares it"""
+        key = str(Path(logs_path).resolve())
+        with _shared_lock:
+            writer = _shared_writers.get(key)
+            if writer is None or writer._closed:
+                writer = _shared_writers[key] = cls(logs_path)
+            return writer
+
+    def add_listener(self, name: str, callback: Callable[[Iterable[Path]], None]):
+        """
+        Call callback(paths) on the writer thread after each batch reaches
+        the files; registering the same name again replaces the callback
+        """
+        self._listeners[name] = callback
+
+    def daily_file(self, day: str) -> Path:
+        """Path of the daily log for a YYYYMMDD date"""
+        return self.logs_path / f"{self.prefix}{day}.jsonl"
+
+    def write(self, entry: Dict[str, Any], filename: Optional[str] = None) -> bool:
+        """
+        Queue an entry for writing
+
+        Args:
+            entry: JSON-serializable log entry (serialized immediately)
+            filename: Fixed file in the logs folder; the daily file if omitted
+
+        Returns:
+            False if the entry was dropped because the queue is full or closed
+        """
+        if self._closed:
+            self.metrics["dropped"] += 1
+            return False
+
+        line = json.dumps(entry, default=str) + '\n'
+        target = filename or self.daily_file(datetime.now().strftime('%Y%m%d')).name
+
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((target, line))
+        except queue.Full:
+            self.metrics["dropped"] += 1
+            return False
+
+        self.metrics["enqueued"] += 1
+        depth = self._queue.qsize()
+        if depth > self.metrics["max_queue_depth"]:
+            self.metrics["max_queue_depth"] = depth
+        return True
+
+    def _ensure_thread(self):
+        """Start the writer thread on first use"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        """Drain the queue in batches until closed"""
+        while True:
+            timeout = self.fsync_interval if self._dirty else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                # Idle with unsynced data: honour the fsync interval
+                self._sync(force=self.durability != DURABILITY_NONE)
+                continue
+
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = self._write_batch(batch)
+            if stop:
+                return
+
+    def _write_batch(self, batch) -> bool:
+        """Write a batch, grouping lines per file; True if a close was requested"""
+        lines: Dict[str, list] = {}
+        markers = []
+        stop = False
+        for item in batch:
+            if isinstance(item, _Flush):
+                markers.append(item)
+            elif item is None:
+                stop = True
+            else:
+                target, line = item
+                lines.setdefault(target, []).append(line)
+
+        for target, target_lines in lines.items():
+            try:
+                f = self._open(target)
+                f.write(''.join(target_lines))
+                self._dirty[target] = f
+                self.metrics["written"] += len(target_lines)
+            except Exception as e:
+                self.metrics["write_errors"] += 1
+                print(f"Failed to write audit log {target}: {e}", file=sys.stderr)
+        self.metrics["batches"] += 1
+
+        # Flush requests and shutdown always reach the disk
+        self._sync(force=bool(markers) or stop or self.durability == DURABILITY_BATCH)
+
+        if lines:
+            written = [self.logs_path / target for target in lines]
+            for name, callback in list(self._listeners.items()):
+                try:
+                    callback(written)
+                except Exception as e:
+                    print(f"Audit writer listener {name} failed: {e}", file=sys.stderr)
+
+        for marker in markers:
+            marker.done.set()
+        if stop:
+            self._close_files()
+        return stop
+
+    def _open(self, target: str) -> IO[str]:
+        """Return the open handle for a file, rotating daily files at midnight"""
+        if target.startswith(self.prefix):
+            day = target[len(self.prefix):len(self.prefix) + 8]
+            if day != self._day:
+                # New day: close the previous day's handles
+                for name in [n for n in self._files if n.startswith(self.prefix) and n != target]:
+                    self._close_file(name)
+                self._day = day
+
+        f = self._files.get(target)
+        if f is None:
+            self.logs_path.mkdir(parents=True, exist_ok=True)
+            f = self._files[target] = open(self.logs_path / target, 'a', encoding='utf-8')
+        return f
+
+    def _sync(self, force: bool = False):
+        """Flush dirty files, fsyncing when due under the durability level"""
+        if not self._dirty:
+            return
+        now = time.monotonic()
+        do_fsync = force or (self.durability == DURABILITY_INTERVAL and
+                             now - self._last_fsync >= self.fsync_interval)
+
+        for f in self._dirty.values():
+            try:
+                f.flush()
+                if do_fsync and self.durability != DURABILITY_NONE:
+                    os.fsync(f.fileno())
+            except Exception as e:
+                self.metrics["write_errors"] += 1
+                print(f"Failed to flush audit log: {e}", file=sys.stderr)
+
+        if do_fsync:
+            if self.durability != DURABILITY_NONE:
+                self.metrics["fsyncs"] += 1
+            self._last_fsync = now
+            self._dirty.clear()
+        elif self.durability == DURABILITY_NONE:
+            self._dirty.clear()
+
+    def _close_file(self, name: str):
+        f = self._files.pop(name, None)
+        self._dirty.pop(name, None)
+        if f is not None:
+            try:
+                f.flush()
+                if self.durability != DURABILITY_NONE:
+                    os.fsync(f.fileno())
+                f.close()
+            except Exception:
+                pass
+
+    def _close_files(self):
+        for name in list(self._files):
+            self._close_file(name)
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Block until everything queued so far is written and synced
+
+        Returns:
+            True if the flush completed within the timeout
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        marker = _Flush()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """Write out the queue, close the files and stop the thread"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    @property
+    def queue_depth(self) -> int:
+        """Entries waiting to be written"""
+        return self._queue.qsize()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, throughput and dropped-entry counters"""
+        return {
+            **self.metrics,
+            "queue_depth": self.queue_depth,
+            "durability": self.durability,
+            "timestamp": datetime.now().isoformat()
+        }
@@ -11,27 +11,12 @@ import time
 import signal
 import re
 import asyncio
+import threading
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 import logging
 
-try:
-    from watchdog.observers import Observer
-    from watchdog.events import FileSystemEventHandler
-except ImportError:
-    print("Installing watchdog...")
-    os.system("pip install watchdog")
-    from watchdog.observers import Observer
-    from watchdog.events import FileSystemEventHandler
-
-try:
-    import yaml
-except ImportError:
-    print("Installing pyyaml...")
-    os.system("pip install pyyaml")
-    import yaml
-
 try:
     from dotenv import load_dotenv
 except ImportError:
@@ -39,6 +24,18 @@ except ImportError:
     os.system("pip install python-dotenv")
     from dotenv import load_dotenv
 
+from browser_pool import BrowserPool
+from job_store import JobStore, bytes_hash, DONE, FAILED
+from file_stabilizer import FileStabilizer
+from vault_document import VaultDocument, parse_document, load_document
+from rate_limiter import RateLimiter, get_rate_limiter
+from error_handler import ErrorRecoverySystem, CircuitOpenError, ResultFailedError
+from metrics import counter, gauge, histogram, start_exporter
+from trace_store import TraceStore, read_trace_id, record_stage
+from dashboard_renderer import DashboardRenderer
+from vault_events import VaultEvent, CREATED, MODIFIED, DELETED, MOVED, listen
+from archive_layout import archive_file
+
 # Load environment variables
 load_dotenv()
 
@@ -63,12 +60,100 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Metrics
+ITEMS_PROCESSED = counter('ai_employee_items_processed_total', 'Approved files processed', ['platform', 'result'])
+POST_DURATION = histogram('ai_employee_post_duration_seconds', 'Time to post to a platform', ['platform'])
+QUEUE_DEPTH = gauge('ai_employee_queue_depth', 'Items waiting for a worker', ['queue'])
+
+# Normalized platform names for the "type" frontmatter field
+PLATFORM_TYPES = {
+    'linkedin_post': 'linkedin',
+    'linkedin_post_approval': 'linkedin',
+    'linkedin': 'linkedin',
+    'twitter_post': 'twitter',
+    'twitter': 'twitter',
+    'tweet': 'twitter',
+    'whatsapp': 'whatsapp',
+    'whatsapp_message': 'whatsapp',
+    'email': 'email',
+    'email_draft': 'email',
+    'instagram_post': 'instagram',
+    'instagram': 'instagram',
+    'insta': 'instagram',
+    'ig_post': 'instagram',
+    'instagram_story': 'instagram_story',
+    'ig_story': 'instagram_story',
+    'insta_story': 'instagram_story',
+}
+
+# Job store queue for approved files
+JOB_QUEUE = 'approved'
+
+# Default number of concurrent posting workers
+DEFAULT_WORKERS = 4
+
+# Seconds a single post may take before its worker gives up on it
+DEFAULT_POST_DEADLINE = 300
+
+# Default per-platform concurrency caps. Browser-driven platforms share a
+# single persistent session directory, so they are limited to one at a time.
+DEFAULT_PLATFORM_LIMITS = {
+    'linkedin': 1,
+    'whatsapp': 1,
+    'instagram': 1,
+    'instagram_story': 1,
+    'twitter': 2,
+    'email': 4,
+}
+
+
+def resolve_platform(file_type: str) -> str:
+    """Map a frontmatter type to its platform name"""
+    return PLATFORM_TYPES.get(file_type, file_type)
+
+
+def parse_platform_limits(spec: str) -> Dict[str, int]:
+    """
+    Parse a platform limit spec such as "linkedin=1,twitter=2"
+
+    Args:
+        spec: Comma separated platform=limit pairs
+
+    Returns:
+        Dict of platform name to concurrency limit
+    """
+    limits = {}
+    for item in (spec or '').split(','):
+        if '=' not in item:
+            continue
+        name, value = item.split('=', 1)
+        try:
+            limits[name.strip().lower()] = max(1, int(value))
+        except ValueError:
+            logger.warning(f"Ignoring invalid platform limit: {item}")
+    return limits
+
 
 class PlatformPoster:
     """Handles actual posting to different platforms"""
 
-    def __init__(self):
+    def __init__(self, browser_pool: Optional[BrowserPool] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
         self.vault_path = Path(os.getenv('VAULT_PATH', '.'))
+        # Warm browser contexts; only set when running on a long-lived loop
+        self.browser_pool = browser_pool
+        self._rate_limiter = rate_limiter
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """The limiter to pace posts with; the shared one is opened on first use"""
+        if self._rate_limiter is None:
+            self._rate_limiter = get_rate_limiter()
+        return self._rate_limiter
+
+    async def pace(self, platform: str, metadata: Dict) -> float:
+        """Wait for the platform's rate limit before posting"""
+        return await self.rate_limiter.acquire_async(platform, metadata.get('account'))
 
     async def post_to_linkedin(self, content: str, metadata: Dict) -> Dict[str, Any]:
         """Post content to LinkedIn using Playwright"""
@@ -77,7 +162,7 @@ class PlatformPoster:
             sys.path.insert(0, str(self.vault_path))
             from linkedin_poster import LinkedInPoster
 
-            poster = LinkedInPoster()
+            poster = LinkedInPoster(pool=self.browser_pool)
             result = await poster.post(content)
 
             logger.info(f"LinkedIn post successful: {result.get('post_id', 'N/A')}")
@@ -98,64 +183,90 @@ class PlatformPoster:
     async def _linkedin_fallback(self, content: str, metadata: Dict) -> Dict[str, Any]:
         """Fallback LinkedIn posting using direct Playwright"""
         try:
-            from playwright.async_api import async_playwright
-
             cookies_path = os.getenv('LINKEDIN_COOKIES_PATH', 'linkedin_cookies.json')
 
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=False)
-                context = await browser.new_context()
+            if self.browser_pool is not None:
+                session_path = os.getenv('LINKEDIN_SESSION_PATH', './linkedin_session')
+                lease = await self.browser_pool.acquire(session_path)
+                try:
+                    if not lease.warm:
+                        await self._load_linkedin_cookies(lease.context, cookies_path)
+                    await self._linkedin_fallback_steps(lease.page, content)
+                    await self._save_linkedin_cookies(lease.context, cookies_path)
+                finally:
+                    await lease.release(healthy=not lease.page.is_closed())
+            else:
+                from playwright.async_api import async_playwright
+
+                async with async_playwright() as p:
+                    browser = await p.chromium.launch(headless=False)
+                    context = await browser.new_context()
+                    await self._load_linkedin_cookies(context, cookies_path)
 
-                # Load cookies if available
-                if Path(cookies_path).exists():
-                    with open(cookies_path, 'r') as f:
-                        cookies = json.load(f)
-                        await context.add_cookies(cookies)
+                    page = await context.new_page()
+                    await self._linkedin_fallback_steps(page, content)
+                    await self._save_linkedin_cookies(context, cookies_path)
 
-                page = await context.new_page()
-                await page.goto('https://www.linkedin.com/feed/')
+                    await browser.close()
+
+            return {
+                "success": True,
+                "platform": "linkedin",
+                "method": "playwright",
+                "timestamp": datetime.now().isoformat()
+            }
 
-                # Wait for page to load
-                await page.wait_for_timeout(3000)
+        except Exception as e:
+            logger.error(f"LinkedIn Playwright posting failed: {e}")
+            return {"success": False, "platform": "linkedin", "error": str(e)}
 
-                # Click "Start a post" button
-                await page.click('button.share-box-feed-entry__trigger')
-                await page.wait_for_timeout(1000)
+    async def _load_linkedin_cookies(self, context, cookies_path: str):
+        """Load saved LinkedIn cookies into a browser context"""
+        if Path(cookies_path).exists():
+            with open(cookies_path, 'r') as f:
+                cookies = json.load(f)
+                await context.add_cookies(cookies)
 
-                # Type content
-                editor = page.locator('.ql-editor')
-                await editor.fill(content)
-                await page.wait_for_timeout(500)
+    async def _save_linkedin_cookies(self, context, cookies_path: str):
+        """Save updated LinkedIn cookies from a browser context"""
+        cookies = await context.cookies()
+        with open(cookies_path, 'w') as f:
+            json.dump(cookies, f)
 
-                # Click Post button
-                await page.click('button.share-actions__primary-action')
-                await page.wait_for_timeout(3000)
+    async def _linkedin_fallback_steps(self, page, content: str):
+        """Create a LinkedIn post on an open page"""
+        await page.goto('https://www.linkedin.com/feed/')
 
-                # Save updated cookies
-                cookies = await context.cookies()
-                with open(cookies_path, 'w') as f:
-                    json.dump(cookies, f)
+        # Wait for page to load
+        await page.wait_for_timeout(3000)
 
-                await browser.close()
+        # Click "Start a post" button
+        await page.click('button.share-box-feed-entry__trigger')
+        await page.wait_for_timeout(1000)
 
-                return {
-                    "success": True,
-                    "platform": "linkedin",
-                    "method": "playwright",
-                    "timestamp": datetime.now().isoformat()
-                }
+        # Type content
+        editor = page.locator('.ql-editor')
+        await editor.fill(content)
+        await page.wait_for_timeout(500)
 
-        except Exception as e:
-            logger.error(f"LinkedIn Playwright posting failed: {e}")
-            return {"success": False, "platform": "linkedin", "error": str(e)}
+        # Click Post button
+        await page.click('button.share-actions__primary-action')
+        await page.wait_for_timeout(3000)
 
     async def send_whatsapp(self, phone: str, message: str, metadata: Dict) -> Dict[str, Any]:
         """Send WhatsApp message using Playwright"""
         try:
-            from playwright.async_api import async_playwright
-
             session_path = os.getenv('WHATSAPP_SESSION_PATH', 'whatsapp_session')
 
+            if self.browser_pool is not None:
+                lease = await self.browser_pool.acquire(session_path)
+                try:
+                    return await self._whatsapp_send_steps(lease.page, phone, message)
+                finally:
+                    await lease.release(healthy=not lease.page.is_closed())
+
+            from playwright.async_api import async_playwright
+
             async with async_playwright() as p:
                 browser = await p.chromium.launch_persistent_context(
                     session_path,
@@ -164,44 +275,47 @@ class PlatformPoster:
                 )
 
                 page = browser.pages[0] if browser.pages else await browser.new_page()
+                result = await self._whatsapp_send_steps(page, phone, message)
+                await browser.close()
+                return result
 
-                # Format phone number (remove spaces, dashes)
-                phone_clean = re.sub(r'[\s\-\(\)]', '', phone)
-                if not phone_clean.startswith('+'):
-                    phone_clean = '+' + phone_clean
-
-                # Navigate to WhatsApp Web with phone number
-                url = f'https://web.whatsapp.com/send?phone={phone_clean}&text={message}'
-                await page.goto(url)
+        except Exception as e:
+            logger.error(f"WhatsApp sending failed: {e}")
+            return {"success": False, "platform": "whatsapp", "error": str(e)}
 
-                # Wait for chat to load
-                await page.wait_for_timeout(5000)
+    async def _whatsapp_send_steps(self, page, phone: str, message: str) -> Dict[str, Any]:
+        """Send a WhatsApp message on an open WhatsApp Web page"""
+        # Format phone number (remove spaces, dashes)
+        phone_clean = re.sub(r'[\s\-\(\)]', '', phone)
+        if not phone_clean.startswith('+'):
+            phone_clean = '+' + phone_clean
 
-                # Wait for send button and click
-                try:
-                    send_button = page.locator('button[aria-label="Send"]')
-                    await send_button.wait_for(timeout=30000)
-                    await send_button.click()
-                    await page.wait_for_timeout(2000)
+        # Navigate to WhatsApp Web with phone number
+        url = f'https://web.whatsapp.com/send?phone={phone_clean}&text={message}'
+        await page.goto(url)
 
-                    logger.info(f"WhatsApp message sent to {phone}")
+        # Wait for chat to load
+        await page.wait_for_timeout(5000)
 
-                    await browser.close()
+        # Wait for send button and click
+        try:
+            send_button = page.locator('button[aria-label="Send"]')
+            await send_button.wait_for(timeout=30000)
+            await send_button.click()
+            await page.wait_for_timeout(2000)
 
-                    return {
-                        "success": True,
-                        "platform": "whatsapp",
-                        "phone": phone,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                except Exception as e:
-                    logger.error(f"WhatsApp send button not found: {e}")
-                    await browser.close()
-                    return {"success": False, "platform": "whatsapp", "error": str(e)}
+            logger.info(f"WhatsApp message sent to {phone}")
 
+            return {
+                "success": True,
+                "platform": "whatsapp",
+                "phone": phone,
+                "timestamp": datetime.now().isoformat()
+            }
         except Exception as e:
-            logger.error(f"WhatsApp sending failed: {e}")
-            return {"success": False, "platform": "whatsapp", "error": str(e)}
+            logger.error(f"WhatsApp send button not found: {e}")
+            # The message was not sent, so another attempt is safe
+            return {"success": False, "platform": "whatsapp", "error": str(e), "retryable": True}
 
     def post_to_twitter(self, content: str, metadata: Dict) -> Dict[str, Any]:
         """Post tweet using Tweepy"""
@@ -248,10 +362,13 @@ class PlatformPoster:
             return {"success": False, "platform": "twitter", "error": "Tweepy not installed"}
         except Exception as e:
             logger.error(f"Twitter posting failed: {e}")
-            return {"success": False, "platform": "twitter", "error": str(e)}
+            # A rate-limited request was refused, so the tweet did not go out
+            retryable = isinstance(e, tweepy.TooManyRequests)
+            return {"success": False, "platform": "twitter", "error": str(e), "retryable": retryable}
 
     def send_email(self, to: str, subject: str, body: str, metadata: Dict) -> Dict[str, Any]:
         """Send email using SMTP"""
+        sending = False
         try:
             import smtplib
             from email.mime.text import MIMEText
@@ -282,6 +399,7 @@ class PlatformPoster:
             with smtplib.SMTP(smtp_server, smtp_port) as server:
                 server.starttls()
                 server.login(username, password)
+                sending = True
                 server.send_message(msg)
 
             logger.info(f"Email sent to {to}")
@@ -296,7 +414,11 @@ class PlatformPoster:
 
         except Exception as e:
             logger.error(f"Email sending failed: {e}")
-            return {"success": False, "platform": "email", "error": str(e)}
+            # Connection trouble before the message was handed over is worth another try
+            retryable = not sending and isinstance(e, (ConnectionError, TimeoutError,
+                                                       smtplib.SMTPConnectError,
+                                                       smtplib.SMTPServerDisconnected))
+            return {"success": False, "platform": "email", "error": str(e), "retryable": retryable}
 
     async def post_to_instagram(self, content: str, metadata: Dict) -> Dict[str, Any]:
         """Post content to Instagram using Playwright automation"""
@@ -344,7 +466,7 @@ class PlatformPoster:
             caption = content
 
             # Initialize Instagram automation
-            ig = InstagramPlaywright()
+            ig = InstagramPlaywright(pool=self.browser_pool)
 
             # Post the image
             result = await ig.post_image(str(image_path_obj), caption)
@@ -386,7 +508,7 @@ class PlatformPoster:
             if not image_path_obj.exists():
                 return {"success": False, "platform": "instagram_story", "error": f"Image not found: {image_path_obj}"}
 
-            ig = InstagramPlaywright()
+            ig = InstagramPlaywright(pool=self.browser_pool)
             result = await ig.post_story(str(image_path_obj))
 
             if result.get('success'):
@@ -405,7 +527,7 @@ class PlatformPoster:
             return {"success": False, "platform": "instagram_story", "error": str(e)}
 
 
-class ApprovedFileHandler(FileSystemEventHandler):
+class ApprovedFileHandler:
     """Handles file events in the Approved folder"""
 
     def __init__(self, vault_path: Path):
@@ -416,7 +538,15 @@ class ApprovedFileHandler(FileSystemEventHandler):
         self.logs_folder = vault_path / 'Logs'
         self.dashboard_file = vault_path / 'Dashboard.md'
         self.poster = PlatformPoster()
-        self.processed_files = set()
+        self.worker_pool = None  # Set by PostingWorkerPool when attached
+        self._recovery: Optional[ErrorRecoverySystem] = None
+        self.post_deadline = float(os.getenv('POST_DEADLINE_SECONDS', DEFAULT_POST_DEADLINE))
+        self._jobs: Optional[JobStore] = None
+        self._traces: Optional[TraceStore] = None
+        self._dashboard: Optional[DashboardRenderer] = None
+
+        # Files are handed over only once they have finished being written
+        self.stabilizer = FileStabilizer(self.on_file_ready)
 
         # Ensure directories exist
         self.done_folder.mkdir(exist_ok=True)
@@ -424,150 +554,261 @@ class ApprovedFileHandler(FileSystemEventHandler):
         self.logs_folder.mkdir(exist_ok=True)
         self.approved_folder.mkdir(exist_ok=True)
 
-    def on_created(self, event):
-        """Called when a file is created in the Approved folder"""
-        if not event.is_directory and event.src_path.endswith('.md'):
-            file_path = Path(event.src_path)
-            if str(file_path) not in self.processed_files:
-                logger.info(f"New file detected: {event.src_path}")
-                self.processed_files.add(str(file_path))
-                # Small delay to ensure file is fully written
-                time.sleep(1)
-                asyncio.run(self.process_file(file_path))
-
-    def on_modified(self, event):
-        """Called when a file is modified"""
-        # Skip modified events to avoid duplicate processing
-        pass
+    @property
+    def jobs(self) -> JobStore:
+        """Durable job table, opened on first use"""
+        if self._jobs is None:
+            self._jobs = JobStore.for_vault(self.vault_path)
+        return self._jobs
+
+    @property
+    def traces(self) -> TraceStore:
+        """Item lifecycle trace store, opened on first use"""
+        if self._traces is None:
+            self._traces = TraceStore.for_vault(self.vault_path)
+        return self._traces
+
+    @property
+    def dashboard(self) -> DashboardRenderer:
+        """Bounded Dashboard.md activity feed, opened on first use"""
+        if self._dashboard is None:
+            self._dashboard = DashboardRenderer(self.vault_path)
+        return self._dashboard
+
+    @property
+    def recovery(self) -> ErrorRecoverySystem:
+        """Per-platform circuit breakers, opened on first use"""
+        if self._recovery is None:
+            self._recovery = ErrorRecoverySystem(self.vault_path)
+        return self._recovery
+
+    def _is_approved_note(self, path: str) -> bool:
+        """True for .md files directly inside the Approved folder"""
+        return path.endswith('.md') and Path(path).parent.resolve() == self.approved_folder.resolve()
+
+    def on_vault_event(self, event: VaultEvent):
+        """Called by the shared vault event bus for notes in Approved"""
+        if event.kind == MODIFIED:
+            self.stabilizer.touch(event.full_path, create=False)
+            return
+        if event.kind == MOVED or event.kind == DELETED:
+            self.stabilizer.forget(event.full_src_path or event.full_path)
+        if event.kind in (CREATED, MOVED) and self._is_approved_note(str(event.full_path)):
+            logger.info(f"New file detected: {event.full_path}")
+            self.stabilizer.touch(event.full_path)
+
+    def on_file_ready(self, file_path: Path):
+        """Called by the stabilizer once a file has finished being written"""
+        # Duplicate events are dropped by the job store when the file is processed
+        self.enqueue(file_path)
+
+    def platform_of(self, file_path: Path) -> str:
+        """Platform a note is going to, from its frontmatter type"""
+        try:
+            doc = load_document(file_path)
+        except (OSError, ValueError):
+            return 'unknown'
+        return resolve_platform(str(self.extract_metadata(doc).get('type', '')).lower()) or 'generic'
+
+    def enqueue(self, file_path: Path):
+        """Hand a file to the worker pool, or process it inline if no pool is attached"""
+        if self.worker_pool:
+            self.worker_pool.submit(file_path)
+            return
+        asyncio.run(self.process_file(file_path))
 
     async def process_file(self, file_path: Path):
         """Process a single approved file and post to appropriate platform"""
+        job_id = None
+        trace_id = None
         try:
             if not file_path.exists():
                 logger.warning(f"File no longer exists: {file_path}")
                 return
 
-            logger.info(f"Processing file: {file_path.name}")
-            content = file_path.read_text(encoding='utf-8')
+            raw = file_path.read_bytes()
+            digest = bytes_hash(raw)
+            job_id = self.jobs.enqueue(JOB_QUEUE, file_path, digest)
+            if job_id is None or not self.jobs.claim(job_id):
+                job_id = None
+                self.handle_duplicate(file_path, digest)
+                ITEMS_PROCESSED.inc(platform='unknown', result='duplicate')
+                return
 
-            # Extract metadata and content
-            metadata = self.extract_metadata(content)
-            post_content = self.extract_post_content(content)
+            logger.info(f"Processing file: {file_path.name}")
+            content = raw.decode('utf-8')
+            trace_id = record_stage(self.traces, file_path, 'Approved', 'auto_processor',
+                                    read_trace_id(content))
+
+            # Extract metadata and content from a single parse
+            doc = parse_document(content, file_path)
+            metadata = self.extract_metadata(doc)
+            post_content = self.extract_post_content(doc)
             file_type = metadata.get('type', '').lower()
 
             logger.info(f"File type detected: {file_type}")
 
             # Route to appropriate platform
             result = await self.route_to_platform(file_type, post_content, metadata)
+            ITEMS_PROCESSED.inc(platform=result.get('platform') or resolve_platform(file_type),
+                                result='success' if result.get('success') else 'failed')
 
             if result.get('success'):
+                # Record the post first so a crash below cannot repost it
+                self.jobs.complete(job_id)
+
                 # Create success log and move to Done
                 self.create_log_entry(file_path, metadata, result, success=True)
                 dest_path = self.move_to_done(file_path)
+                record_stage(self.traces, dest_path, 'Done', 'auto_processor', trace_id)
                 self.update_dashboard(file_path.name, metadata, result, success=True)
                 logger.info(f"Successfully processed and posted: {file_path.name}")
             else:
+                self.jobs.fail(job_id, result.get('error', ''))
+
                 # Create failure log and move to Failed
                 self.create_log_entry(file_path, metadata, result, success=False)
                 dest_path = self.move_to_failed(file_path)
+                record_stage(self.traces, dest_path, 'Failed', 'auto_processor', trace_id)
                 self.update_dashboard(file_path.name, metadata, result, success=False)
                 logger.error(f"Failed to post: {file_path.name} - {result.get('error')}")
 
         except Exception as e:
             logger.error(f"Error processing {file_path.name}: {e}", exc_info=True)
+            ITEMS_PROCESSED.inc(platform='unknown', result='error')
+            if job_id is not None:
+                self.jobs.fail(job_id, str(e))
+            dest_path = self.move_to_failed(file_path)
+            if trace_id:
+                record_stage(self.traces, dest_path, 'Failed', 'auto_processor', trace_id)
+
+    def handle_duplicate(self, file_path: Path, digest: str):
+        """Tidy up a file whose content was already handled"""
+        state = self.jobs.state_of(JOB_QUEUE, file_path, digest)
+        if state == DONE:
+            logger.info(f"Already posted, moving to Done: {file_path.name}")
+            self.move_to_done(file_path)
+        elif state == FAILED:
+            logger.warning(f"Out of retries, moving to Failed: {file_path.name}")
             self.move_to_failed(file_path)
+        else:
+            logger.info(f"Skipping {file_path.name}: job is {state}")
 
-    def extract_metadata(self, content: str) -> Dict[str, Any]:
+    def extract_metadata(self, content: Union[str, VaultDocument]) -> Dict[str, Any]:
         """Extract YAML frontmatter metadata from file"""
-        metadata = {}
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                try:
-                    metadata = yaml.safe_load(parts[1]) or {}
-                except:
-                    pass
-        return metadata
+        doc = content if isinstance(content, VaultDocument) else parse_document(content)
+        return doc.frontmatter if doc.has_frontmatter else {}
 
-    def extract_post_content(self, content: str) -> str:
+    def extract_post_content(self, content: Union[str, VaultDocument]) -> str:
         """Extract the actual post content from the file"""
-        # Remove YAML frontmatter
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                content = parts[2].strip()
+        doc = content if isinstance(content, VaultDocument) else parse_document(content)
 
-        # Try to extract content from specific sections
         # Look for "## Post Content" or "## Message" sections
-        patterns = [
-            r'## Post Content\s*\n(.*?)(?=\n##|\Z)',
-            r'## Message\s*\n(.*?)(?=\n##|\Z)',
-            r'## Content\s*\n(.*?)(?=\n##|\Z)',
-            r'## Tweet\s*\n(.*?)(?=\n##|\Z)',
-            r'## Email Body\s*\n(.*?)(?=\n##|\Z)',
-            r'## Caption\s*\n(.*?)(?=\n##|\n---|\Z)',  # Instagram caption
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, content, re.DOTALL)
-            if match:
-                return match.group(1).strip()
+        section_names = ['Post Content', 'Message', 'Content', 'Tweet', 'Email Body']
+        for name in section_names:
+            section = doc.sections.get(name)
+            if section is not None:
+                return section
+
+        # Instagram caption ends at a horizontal rule
+        caption = doc.sections.get('Caption')
+        if caption is not None:
+            return caption.split('\n---')[0].strip()
 
         # If no specific section found, return content without headers
-        lines = content.split('\n')
+        lines = doc.body.strip().split('\n')
         clean_lines = [l for l in lines if not l.startswith('#') and not l.startswith('-')]
         return '\n'.join(clean_lines).strip()
 
     async def route_to_platform(self, file_type: str, content: str, metadata: Dict) -> Dict[str, Any]:
         """Route content to appropriate platform based on file type"""
+        platform = resolve_platform(file_type)
+        return await self._guarded_dispatch(platform, file_type, content, metadata)
+
+    async def _guarded_dispatch(self, platform: str, file_type: str, content: str, metadata: Dict) -> Dict[str, Any]:
+        """
+        Dispatch behind the platform's circuit breaker and a deadline, so a
+        stalled or failing platform frees its worker instead of holding it
+        """
+        missing = self._missing_recipient(platform, metadata)
+        if missing:
+            # Nothing to retry: the note itself is incomplete
+            return {"success": False, "platform": platform, "error": missing}
+
+        paced = platform in PLATFORM_TYPES.values()
+        if paced:
+            # Waiting for the first rate limit slot does not count against the deadline
+            await self.poster.pace(platform, metadata)
+        return await self._send(platform, file_type, content, metadata, paced)
+
+    async def _send(self, platform: str, file_type: str, content: str, metadata: Dict,
+                    paced: bool = False) -> Dict[str, Any]:
+        """Dispatch with retries until the post deadline"""
+        deadline = time.monotonic() + self.post_deadline
+        attempts = 0
+
+        async def attempt():
+            nonlocal attempts
+            attempts += 1
+            if paced and attempts > 1:
+                # Each retry is another post as far as the platform is concerned
+                await self.poster.pace(platform, metadata)
+            if self.worker_pool:
+                # Only the post itself occupies one of the pool's workers, not the backoff
+                async with self.worker_pool.worker_slot:
+                    return await self._dispatch(platform, file_type, content, metadata)
+            return await self._dispatch(platform, file_type, content, metadata)
 
-        # Normalize type names
-        type_mapping = {
-            'linkedin_post': 'linkedin',
-            'linkedin_post_approval': 'linkedin',
-            'linkedin': 'linkedin',
-            'twitter_post': 'twitter',
-            'twitter': 'twitter',
-            'tweet': 'twitter',
-            'whatsapp': 'whatsapp',
-            'whatsapp_message': 'whatsapp',
-            'email': 'email',
-            'email_draft': 'email',
-            'instagram_post': 'instagram',
-            'instagram': 'instagram',
-            'insta': 'instagram',
-            'ig_post': 'instagram',
-            'instagram_story': 'instagram_story',
-            'ig_story': 'instagram_story',
-            'insta_story': 'instagram_story',
-        }
-
-        platform = type_mapping.get(file_type, file_type)
-
+        try:
+            with POST_DURATION.time(platform=platform):
+                return await self.recovery.with_retry_async(attempt, f"{platform}_poster", deadline=deadline)
+        except ResultFailedError as e:
+            # The poster reported a failure that was not safe to retry, or kept failing
+            return e.result
+        except CircuitOpenError as e:
+            return {"success": False, "platform": platform, "error": str(e)}
+        except TimeoutError:
+            return {"success": False, "platform": platform,
+                    "error": f"Timed out after {self.post_deadline:.0f}s"}
+
+    @staticmethod
+    def _missing_recipient(platform: str, metadata: Dict) -> Optional[str]:
+        """Error for a message note without a recipient, None if it can be sent"""
+        if platform == 'whatsapp' and not (metadata.get('phone') or metadata.get('to') or metadata.get('recipient')):
+            return "No phone number specified"
+        if platform == 'email' and not (metadata.get('to') or metadata.get('recipient')):
+            return "No recipient specified"
+        return None
+
+    async def _dispatch(self, platform: str, file_type: str, content: str, metadata: Dict) -> Dict[str, Any]:
+        """
+        Send content to the poster for a normalized platform
+
+        Posters report failure as {"success": False} rather than raising;
+        that is raised here so the attempt counts against the platform's
+        circuit breaker. Only results marked "retryable" (nothing was sent)
+        are tried again; anything else is returned as it is.
+        """
         if platform == 'linkedin':
-            return await self.poster.post_to_linkedin(content, metadata)
+            result = await self.poster.post_to_linkedin(content, metadata)
 
         elif platform == 'twitter':
-            return self.poster.post_to_twitter(content, metadata)
+            result = await asyncio.to_thread(self.poster.post_to_twitter, content, metadata)
 
         elif platform == 'whatsapp':
             phone = metadata.get('phone') or metadata.get('to') or metadata.get('recipient')
-            if not phone:
-                return {"success": False, "platform": "whatsapp", "error": "No phone number specified"}
-            return await self.poster.send_whatsapp(phone, content, metadata)
+            result = await self.poster.send_whatsapp(phone, content, metadata)
 
         elif platform == 'email':
             to = metadata.get('to') or metadata.get('recipient')
             subject = metadata.get('subject', 'No Subject')
-            if not to:
-                return {"success": False, "platform": "email", "error": "No recipient specified"}
-            return self.poster.send_email(to, subject, content, metadata)
+            result = await asyncio.to_thread(self.poster.send_email, to, subject, content, metadata)
 
         elif platform == 'instagram':
-            return await self.poster.post_to_instagram(content, metadata)
+            result = await self.poster.post_to_instagram(content, metadata)
 
         elif platform == 'instagram_story':
-            return await self.poster.post_instagram_story(metadata)
+            result = await self.poster.post_instagram_story(metadata)
 
         else:
             logger.warning(f"Unknown platform type: {file_type}. Processing as generic file.")
@@ -577,6 +818,10 @@ class ApprovedFileHandler(FileSystemEventHandler):
                 "note": "Processed without posting"
             }
 
+        if not result.get('success'):
+            raise ResultFailedError(result)
+        return result
+
     def create_log_entry(self, file_path: Path, metadata: Dict, result: Dict, success: bool):
         """Create a JSON log entry"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -598,46 +843,29 @@ class ApprovedFileHandler(FileSystemEventHandler):
         return log_path
 
     def move_to_done(self, file_path: Path) -> Path:
-        """Move file to Done folder"""
-        dest_path = self.done_folder / file_path.name
-        if dest_path.exists():
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            dest_path = self.done_folder / f"{file_path.stem}_{timestamp}.md"
-        file_path.rename(dest_path)
-        return dest_path
+        """Move file to its month shard of the Done folder (Done/YYYY/MM)"""
+        return archive_file(self.vault_path, file_path, 'Done')
 
     def move_to_failed(self, file_path: Path) -> Path:
-        """Move file to Failed folder"""
-        dest_path = self.failed_folder / file_path.name
-        if dest_path.exists():
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            dest_path = self.failed_folder / f"{file_path.stem}_{timestamp}.md"
-        if file_path.exists():
-            file_path.rename(dest_path)
-        return dest_path
+        """Move file to its month shard of the Failed folder (Failed/YYYY/MM)"""
+        return archive_file(self.vault_path, file_path, 'Failed')
 
     def update_dashboard(self, filename: str, metadata: Dict, result: Dict, success: bool):
-        """Update Dashboard.md with processing result"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        """Add the processing result to the Dashboard.md activity feed"""
         status_icon = "" if success else ""
         platform = result.get('platform', 'unknown')
 
-        entry = f"""
-
-## {timestamp} - {status_icon} {platform.title()} {'Posted' if success else 'Failed'}
-
-**File**: {filename}
-**Platform**: {platform}
-**Status**: {'Successfully posted' if success else 'Failed to post'}
-**Type**: {metadata.get('type', 'unknown')}
-{f"**Error**: {result.get('error')}" if not success else ""}
-{f"**Post URL**: {result.get('url')}" if result.get('url') else ""}
-
----
-"""
+        fields = {
+            'File': filename,
+            'Platform': platform,
+            'Status': 'Successfully posted' if success else 'Failed to post',
+            'Type': metadata.get('type', 'unknown'),
+            'Error': result.get('error') if not success else None,
+            'Post URL': result.get('url')
+        }
         try:
-            with open(self.dashboard_file, 'a', encoding='utf-8') as f:
-                f.write(entry)
+            self.dashboard.record(f"{platform.title()} {'Posted' if success else 'Failed'}",
+                                  fields, icon=status_icon)
         except Exception as e:
             logger.error(f"Failed to update dashboard: {e}")
 
@@ -645,6 +873,10 @@ class ApprovedFileHandler(FileSystemEventHandler):
         """Process any existing files in Approved folder on startup"""
         logger.info("Checking for existing files in Approved folder...")
 
+        # Jobs left running by a crash are queued again; anything already
+        # done is skipped when its file is processed
+        self.jobs.recover(JOB_QUEUE)
+
         existing_files = list(self.approved_folder.glob("*.md"))
         if not existing_files:
             logger.info("No existing files to process")
@@ -652,14 +884,151 @@ class ApprovedFileHandler(FileSystemEventHandler):
 
         logger.info(f"Found {len(existing_files)} existing files to process")
 
+        backlog: Dict[str, int] = {}
         for file_path in existing_files:
             try:
-                logger.info(f"Processing existing file: {file_path.name}")
-                asyncio.run(self.process_file(file_path))
-                time.sleep(1)
+                logger.info(f"Queueing existing file: {file_path.name}")
+                metadata = self.extract_metadata(load_document(file_path))
+                platform = resolve_platform(str(metadata.get('type') or '').lower())
+                backlog[platform] = backlog.get(platform, 0) + 1
+                self.enqueue(file_path)
             except Exception as e:
                 logger.error(f"Error processing existing file {file_path.name}: {e}")
 
+        # Posts are paced by the rate limiter, not by sleeping between files
+        for platform, count in backlog.items():
+            seconds = self.poster.rate_limiter.drain_time(platform, pending=count)
+            if seconds:
+                logger.info(f"{count} {platform} posts queued, projected drain time {seconds:.0f}s")
+
+
+class PostingWorkerPool:
+    """
+    Long-lived asyncio loop that drains approved files with bounded concurrency
+
+    The vault event thread only enqueues paths, each onto its platform's
+    queue. On a dedicated event loop thread every platform queue is drained
+    by as many tasks as the platform's concurrency cap, so a rate-limited or
+    stalled platform only holds up its own files. At most `workers` posts
+    are in flight across all platforms; a post takes its worker slot after
+    its rate limit wait, never while waiting.
+    """
+
+    def __init__(self, handler: ApprovedFileHandler, workers: Optional[int] = None,
+                 platform_limits: Optional[Dict[str, int]] = None):
+        self.handler = handler
+        self.workers = max(1, workers or int(os.getenv('AUTO_PROCESSOR_WORKERS', DEFAULT_WORKERS)))
+
+        # Defaults, then environment overrides, then explicit overrides
+        self.platform_limits = dict(DEFAULT_PLATFORM_LIMITS)
+        self.platform_limits.update(parse_platform_limits(os.getenv('AUTO_PROCESSOR_PLATFORM_LIMITS', '')))
+        self.platform_limits.update(platform_limits or {})
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self.worker_slot: Optional[asyncio.Semaphore] = None
+        self._tasks = []
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+        handler.worker_pool = self
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of files waiting for a worker, over all platforms"""
+        return sum(queue.qsize() for queue in list(self.queues.values()))
+
+    def pacing_stats(self) -> Dict[str, Any]:
+        """Queue depth plus rate-limiter backlog and projected drain time"""
+        stats = self.handler.poster.rate_limiter.stats()
+        stats["files_queued"] = self.queue_depth
+        return stats
+
+    def start(self):
+        """Start the event loop thread and its workers"""
+        self._thread = threading.Thread(target=self._run, name='auto-processor-loop', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        logger.info(f"Worker pool started: {self.workers} workers, limits {self.platform_limits}")
+
+    def _run(self):
+        """Event loop thread entry point"""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.worker_slot = asyncio.Semaphore(self.workers)
+
+        # Browser contexts stay warm for as long as this loop lives
+        if os.getenv('BROWSER_POOL_ENABLED', 'true').lower() == 'true':
+            self.handler.poster.browser_pool = BrowserPool()
+
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def submit(self, file_path: Path):
+        """Enqueue a file from any thread"""
+        self.loop.call_soon_threadsafe(self._put, file_path, self.handler.platform_of(file_path))
+
+    def _put(self, file_path: Path, platform: str):
+        queue = self.queues.get(platform)
+        if queue is None:
+            # First file for the platform: one worker per unit of its concurrency cap
+            queue = self.queues[platform] = asyncio.Queue()
+            limit = self.platform_limits.get(platform, self.workers)
+            self._tasks.extend(self.loop.create_task(self._worker(platform, i)) for i in range(limit))
+        queue.put_nowait(file_path)
+        QUEUE_DEPTH.set(self.queue_depth, queue=JOB_QUEUE)
+
+    async def _worker(self, platform: str, worker_id: int):
+        """Process a platform's queued files until cancelled"""
+        queue = self.queues[platform]
+        while True:
+            file_path = await queue.get()
+            QUEUE_DEPTH.set(self.queue_depth, queue=JOB_QUEUE)
+            try:
+                await self.handler.process_file(file_path)
+            except Exception as e:
+                logger.error(f"{platform} worker {worker_id} failed on {file_path}: {e}", exc_info=True)
+            finally:
+                queue.task_done()
+
+    async def _shutdown(self, drain: bool):
+        """Optionally wait for queued files, then cancel the workers"""
+        if drain:
+            await asyncio.gather(*(queue.join() for queue in list(self.queues.values())))
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        browser_pool, self.handler.poster.browser_pool = self.handler.poster.browser_pool, None
+        if browser_pool is not None:
+            await browser_pool.close()
+
+    def stop(self, drain: bool = True, timeout: Optional[float] = None):
+        """
+        Stop the pool
+
+        Args:
+            drain: Finish files already in the queue before stopping
+            timeout: Seconds to wait for the drain before cancelling
+        """
+        if not self.loop or not self._thread:
+            return
+
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(drain), self.loop)
+        try:
+            future.result(timeout)
+        except Exception:
+            logger.warning(f"Worker pool did not drain in time, {self.queue_depth} files left in queue")
+            future.cancel()
+            asyncio.run_coroutine_threadsafe(self._shutdown(False), self.loop).result()
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        logger.info("Worker pool stopped")
+
 
 def main():
     """Main function - runs the auto processor"""
@@ -677,29 +1046,31 @@ def main():
     logger.info(f"Vault path: {vault_path}")
     logger.info(f"Monitoring: {approved_folder}")
 
-    # Create event handler
+    start_exporter('auto_processor', vault_path)
+
+    # Create event handler and the worker pool that does the posting
     event_handler = ApprovedFileHandler(vault_path)
+    worker_pool = PostingWorkerPool(event_handler)
+    worker_pool.start()
 
     # Process any existing files first
     event_handler.process_existing_files()
 
-    # Set up observer
-    observer = Observer()
-    observer.schedule(event_handler, str(approved_folder), recursive=False)
+    # Watch Approved through the shared vault event bus
+    subscription = listen(vault_path, event_handler.on_vault_event, folders=['Approved'], patterns=['*.md'])
 
     # Graceful shutdown handler
     def signal_handler(sig, frame):
         logger.info("\nShutting down Auto Processor...")
-        observer.stop()
-        observer.join()
+        subscription.close()
+        event_handler.stabilizer.stop()
+        worker_pool.stop(drain=True, timeout=120)
         logger.info("Auto Processor stopped gracefully")
         sys.exit(0)
 
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
-    # Start watching
-    observer.start()
     logger.info(f"Started monitoring: {approved_folder}")
     logger.info("Watching for .md files in Approved folder")
     logger.info("Supported types: linkedin_post, twitter_post, whatsapp, email, instagram_post, instagram_story")
@@ -712,8 +1083,9 @@ def main():
         signal_handler(signal.SIGINT, None)
     except Exception as e:
         logger.error(f"Unexpected error: {e}", exc_info=True)
-        observer.stop()
-        observer.join()
+        subscription.close()
+        event_handler.stabilizer.stop()
+        worker_pool.stop(drain=False)
 
 
 if __name__ == "__main__":
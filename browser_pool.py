@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Browser Pool - Warm Playwright contexts shared by the browser-based posters
+Keeps one persistent context per session directory (linkedin_session,
+instagram_session, whatsapp_session) open between posts and leases its page
+to one posting call at a time.
+"""
+
+import os
+import time
+import asyncio
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Recycle a context after this many leases to bound Chromium memory growth
+DEFAULT_MAX_USES = 50
+
+# How long a successful login check stays valid for a warm context
+DEFAULT_LOGIN_TTL = 1800  # 30 minutes
+
+DEFAULT_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled'
+]
+
+
+class _PooledContext:
+    """A persistent context and its bookkeeping"""
+
+    def __init__(self, session_path: str):
+        self.session_path = session_path
+        self.context = None
+        self.uses = 0
+        self.crashed = False
+        self.logged_in_at: Optional[float] = None
+        self.lock = asyncio.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self.context is not None and not self.crashed
+
+
+class BrowserLease:
+    """A page leased from the pool for the duration of one posting call"""
+
+    def __init__(self, pool: 'BrowserPool', entry: _PooledContext, page, warm: bool):
+        self.pool = pool
+        self.entry = entry
+        self.context = entry.context
+        self.page = page
+        self.warm = warm
+        self.released = False
+
+    def is_logged_in(self) -> bool:
+        """True if a login check passed on this context within the TTL"""
+        logged_in_at = self.entry.logged_in_at
+        return logged_in_at is not None and time.monotonic() - logged_in_at < self.pool.login_ttl
+
+    def mark_logged_in(self, logged_in: bool = True):
+        """Remember (or forget) a login check result for later leases"""
+        self.entry.logged_in_at = time.monotonic() if logged_in else None
+
+    async def release(self, healthy: bool = True):
+        """Return the page to the pool"""
+        await self.pool.release(self, healthy=healthy)
+
+
+class BrowserPool:
+    """
+    Pool of warm persistent Playwright contexts keyed by session directory
+
+    Must be used from a single long-lived event loop (Playwright objects are
+    bound to the loop that created them).
+    """
+
+    def __init__(self, max_uses: Optional[int] = None, login_ttl: Optional[float] = None):
+        self.max_uses = max_uses or int(os.getenv('BROWSER_POOL_MAX_USES', DEFAULT_MAX_USES))
+        self.login_ttl = login_ttl or float(os.getenv('BROWSER_POOL_LOGIN_TTL', DEFAULT_LOGIN_TTL))
+        self.headless = os.getenv('BROWSER_POOL_HEADLESS', 'false').lower() == 'true'
+        self.playwright = None
+        self._contexts: Dict[str, _PooledContext] = {}
+        self._start_lock: Optional[asyncio.Lock] = None
+
+        self.metrics = {
+            "leases": 0,
+            "hits": 0,
+            "misses": 0,
+            "recycled": 0,
+            "crashes": 0,
+            "lease_wait_total": 0.0,
+            "lease_wait_max": 0.0
+        }
+
+    async def _ensure_playwright(self):
+        """Start Playwright once for the lifetime of the pool"""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.playwright is None:
+                from playwright.async_api import async_playwright
+                self.playwright = await async_playwright().start()
+                logger.info("Browser pool started Playwright")
+
+    async def acquire(self, session_path: str, **launch_options) -> BrowserLease:
+        """
+        Lease the page of the warm context for a session directory
+
+        Args:
+            session_path: Persistent profile directory (e.g. ./linkedin_session)
+            **launch_options: Options for launch_persistent_context, used only
+                when the context has to be (re)launched
+
+        Returns:
+            BrowserLease holding the context and page
+        """
+        key = str(Path(session_path).resolve())
+        entry = self._contexts.get(key)
+        if entry is None:
+            entry = self._contexts[key] = _PooledContext(session_path)
+
+        wait_start = time.monotonic()
+        await entry.lock.acquire()
+        wait = time.monotonic() - wait_start
+
+        self.metrics["leases"] += 1
+        self.metrics["lease_wait_total"] += wait
+        self.metrics["lease_wait_max"] = max(self.metrics["lease_wait_max"], wait)
+
+        try:
+            warm = entry.alive
+            if warm:
+                self.metrics["hits"] += 1
+            else:
+                self.metrics["misses"] += 1
+                await self._launch(entry, launch_options)
+
+            context = entry.context
+            page = next((p for p in context.pages if not p.is_closed()), None)
+            if page is None:
+                page = await context.new_page()
+
+            entry.uses += 1
+            return BrowserLease(self, entry, page, warm)
+
+        except BaseException:
+            # Also on cancellation (e.g. a posting deadline), or the session stays locked
+            try:
+                await self._discard(entry)
+            finally:
+                entry.lock.release()
+            raise
+
+    async def _launch(self, entry: _PooledContext, launch_options: Dict[str, Any]):
+        """Launch a persistent context for an entry"""
+        await self._ensure_playwright()
+        Path(entry.session_path).mkdir(parents=True, exist_ok=True)
+
+        options = {"headless": self.headless, "args": DEFAULT_ARGS}
+        options.update(launch_options)
+
+        entry.context = await self.playwright.chromium.launch_persistent_context(
+            entry.session_path, **options
+        )
+        entry.uses = 0
+        entry.crashed = False
+        entry.logged_in_at = None
+
+        def on_close(closed_context, entry=entry):
+            # Our own _discard() detaches the context first, so this only
+            # flags contexts that died underneath us
+            if entry.context is closed_context:
+                entry.crashed = True
+
+        entry.context.on("close", on_close)
+        logger.info(f"Browser pool launched context for {entry.session_path}")
+
+    async def _discard(self, entry: _PooledContext):
+        """Close an entry's context, ignoring errors from a dead browser"""
+        context, entry.context = entry.context, None
+        entry.logged_in_at = None
+        if context is not None:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Error closing context for {entry.session_path}: {e}")
+
+    async def release(self, lease: BrowserLease, healthy: bool = True):
+        """
+        Return a lease to the pool, recycling the context when needed
+
+        Args:
+            lease: Lease from acquire()
+            healthy: False if the caller saw the browser misbehave
+        """
+        if lease.released:
+            return
+        lease.released = True
+        entry = lease.entry
+
+        try:
+            if entry.crashed or not healthy:
+                self.metrics["crashes"] += 1
+                logger.warning(f"Browser pool discarding crashed context for {entry.session_path}")
+                await self._discard(entry)
+            elif entry.uses >= self.max_uses:
+                self.metrics["recycled"] += 1
+                logger.info(f"Browser pool recycling context for {entry.session_path} after {entry.uses} uses")
+                await self._discard(entry)
+        finally:
+            entry.lock.release()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Pool hit/miss and lease-wait metrics"""
+        leases = self.metrics["leases"]
+        return {
+            **self.metrics,
+            "hit_rate": round(self.metrics["hits"] / leases, 3) if leases else 0.0,
+            "lease_wait_avg": round(self.metrics["lease_wait_total"] / leases, 3) if leases else 0.0,
+            "contexts": {
+                entry.session_path: {"alive": entry.alive, "uses": entry.uses}
+                for entry in self._contexts.values()
+            },
+            "timestamp": datetime.now().isoformat()
+        }
+
+    async def close(self):
+        """Close every context and stop Playwright"""
+        for entry in self._contexts.values():
+            await self._discard(entry)
+        self._contexts.clear()
+
+        if self.playwright is not None:
+            try:
+                await self.playwright.stop()
+            except Exception as e:
+                logger.error(f"Error stopping Playwright: {e}")
+            self.playwright = None
+
+        logger.info(f"Browser pool closed: {self.get_metrics()}")
@@ -12,6 +12,11 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any
 import re
 
+from audit_rollups import AuditRollups
+from log_tail import last_line
+from vault_index import open_index
+from archive_pack import packed_notes
+
 
 class CEOBriefingGenerator:
     """Generates weekly CEO briefing reports"""
@@ -42,7 +47,7 @@ class CEOBriefingGenerator:
             "pending_items": self._get_pending_items(),
             "revenue_opportunities": self._identify_revenue_opportunities(),
             "bottlenecks": self._identify_bottlenecks(),
-            "system_performance": self._get_system_performance()
+            "system_performance": self._get_system_performance(start_date, end_date)
         }
 
         return data
@@ -75,16 +80,19 @@ class CEOBriefingGenerator:
         """Get list of completed tasks"""
         done_dir = self.vault_path / "Done"
         tasks = []
-
-        for file in done_dir.glob("*.md"):
-            file_mtime = datetime.fromtimestamp(file.stat().st_mtime)
-            if start_date <= file_mtime <= end_date:
-                content = file.read_text()
-                tasks.append({
-                    "filename": file.name,
-                    "completed_date": file_mtime.strftime("%Y-%m-%d"),
-                    "summary": content[:200] + "..." if len(content) > 200 else content
-                })
+        if not done_dir.exists():
+            return tasks
+
+        # Months old enough to be packed are read from the pack indexes
+        notes = packed_notes(self.vault_path, "Done", since=start_date, until=end_date) + \
+            open_index(self.vault_path).notes("Done", since=start_date, until=end_date)
+        for note in notes:
+            excerpt = note["excerpt"]
+            tasks.append({
+                "filename": note["filename"],
+                "completed_date": note["modified"].strftime("%Y-%m-%d"),
+                "summary": excerpt + "..." if note["size"] > len(excerpt.encode('utf-8')) else excerpt
+            })
 
         return tasks
 
@@ -143,12 +151,10 @@ class CEOBriefingGenerator:
                 continue
 
         # Also check for Reddit action files in Done folder
-        done_dir = self.vault_path / "Done"
-        if done_dir.exists():
-            for file in done_dir.glob("REDDIT_*.md"):
-                file_mtime = datetime.fromtimestamp(file.stat().st_mtime)
-                if start_date <= file_mtime <= end_date:
-                    post_count += 1
+        post_count += open_index(self.vault_path).count("Done", pattern="REDDIT_*.md",
+                                                        since=start_date, until=end_date)
+        post_count += len(packed_notes(self.vault_path, "Done", pattern="REDDIT_*.md",
+                                       since=start_date, until=end_date))
 
         return {
             "posts_count": post_count,
@@ -247,28 +253,33 @@ class CEOBriefingGenerator:
             "status": "Operations running smoothly"
         }]
 
-    def _get_system_performance(self) -> Dict[str, Any]:
+    def _get_system_performance(self, start_date: datetime = None, end_date: datetime = None) -> Dict[str, Any]:
         """Get system performance metrics"""
-        logs_dir = self.vault_path / "Logs"
         watchers = ["gmail", "linkedin", "filesystem"]
+        end_date = end_date or datetime.now()
+        start_date = start_date or end_date - timedelta(days=7)
+
+        # Audit activity comes from the per-day rollups, not the raw logs
+        trend = AuditRollups(self.vault_path / "Audit_Logs").trend(start_date, end_date)
 
         return {
             "watchers_active": len(watchers),
             "watchers_list": watchers,
             "mcp_servers": ["email", "linkedin", "filesystem"],
             "uptime": "Continuous since deployment",
+            "audited_actions": trend["totals"]["total"],
+            "audited_errors": trend["totals"]["errors"],
+            "error_rate": trend["error_rate"],
+            "daily_actions": trend["days"],
             "last_error": self._get_last_error()
         }
 
     def _get_last_error(self) -> str:
         """Get last system error"""
-        error_file = self.vault_path / "error.log"
-        if error_file.exists():
-            content = error_file.read_text()
-            lines = content.split('\n')
-            for line in reversed(lines):
-                if "ERROR" in line:
-                    return line[:200] + "..." if len(line) > 200 else line
+        # Read backwards from the end instead of loading the whole log
+        line = last_line(self.vault_path / "error.log", match="ERROR")
+        if line is not None:
+            return line[:200] + "..." if len(line) > 200 else line
         return "No recent errors detected"
 
     def generate_briefing(self, start_date: datetime = None) -> str:
@@ -339,6 +350,9 @@ class CEOBriefingGenerator:
         report.append("## 🔧 System Performance")
         report.append(f"- **Active Watchers:** {', '.join(data['system_performance']['watchers_list'])}")
         report.append(f"- **MCP Servers:** {len(data['system_performance']['mcp_servers'])} active")
+        report.append(f"- **Audited Actions:** {data['system_performance']['audited_actions']} "
+                     f"({data['system_performance']['audited_errors']} errors, "
+                     f"{data['system_performance']['error_rate']:.1%} error rate)")
         report.append(f"- **Last Error:** {data['system_performance']['last_error']}")
         report.append("")
 
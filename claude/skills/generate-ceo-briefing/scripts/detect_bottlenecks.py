@@ -19,6 +19,8 @@ from pathlib import Path
 from typing import Dict, List, Any
 import re
 
+from vault_index import open_index
+
 
 class BottleneckDetector:
     """Detects bottlenecks across process, financial, and communication dimensions."""
@@ -26,6 +28,14 @@ class BottleneckDetector:
     def __init__(self, vault_path: str = "Vault"):
         self.vault_path = Path(vault_path)
         self.today = datetime.now()
+        self._index = None
+
+    @property
+    def index(self):
+        """Metadata index of the vault's notes, opened on first use"""
+        if self._index is None:
+            self._index = open_index(self.vault_path)
+        return self._index
 
     def detect_all(self, min_severity: str = "low", category: str = "all") -> Dict[str, List[Dict]]:
         """Detect all bottlenecks across categories."""
@@ -81,8 +91,8 @@ class BottleneckDetector:
             return bottlenecks
 
         # Analyze tasks that took longer than expected
-        for task_file in done_folder.glob("*.md"):
-            task_data = self._parse_task_metadata(task_file)
+        for note in self.index.notes("Done"):
+            task_data = self._parse_task_metadata(note)
 
             expected = task_data.get("expected_duration", 0)
             actual = task_data.get("actual_duration", 0)
@@ -106,7 +116,7 @@ class BottleneckDetector:
 
                 bottlenecks.append({
                     "type": "process_delay",
-                    "task": task_data.get("title", task_file.stem),
+                    "task": task_data.get("title", note["stem"]),
                     "expected": expected,
                     "actual": actual,
                     "delay": delay,
@@ -275,19 +285,15 @@ class BottleneckDetector:
 
     # Helper methods
 
-    def _parse_task_metadata(self, task_file: Path) -> Dict:
-        """Parse task metadata from file."""
-        try:
-            content = task_file.read_text(encoding='utf-8')
-            # Simplified - would parse YAML frontmatter
-            return {
-                "title": task_file.stem,
-                "expected_duration": 3,  # Placeholder
-                "actual_duration": 5,  # Placeholder
-                "notes": content[:200]  # First 200 chars
-            }
-        except:
-            return {}
+    def _parse_task_metadata(self, note: Dict) -> Dict:
+        """Task metadata from an index entry."""
+        # Simplified - would read durations from the frontmatter
+        return {
+            "title": note["stem"],
+            "expected_duration": 3,  # Placeholder
+            "actual_duration": 5,  # Placeholder
+            "notes": note["excerpt"]  # First 200 chars
+        }
 
     def _identify_root_cause(self, task_data: Dict) -> str:
         """Identify root cause of delay from task notes."""
@@ -363,7 +369,7 @@ class BottleneckDetector:
     def _analyze_task_backlog(self) -> Dict:
         """Analyze task backlog."""
         active_folder = self.vault_path / "Tasks" / "Active"
-        active_count = len(list(active_folder.glob("*.md"))) if active_folder.exists() else 0
+        active_count = self.index.count("Tasks/Active") if active_folder.exists() else 0
 
         high_priority_count = 0  # Would count from metadata
 
@@ -13,6 +13,8 @@ from pathlib import Path
 from typing import Dict, List, Optional
 import requests
 
+from log_tail import iter_matching_reversed
+
 
 # Configuration
 VAULT_PATH = Path(os.getenv('VAULT_PATH', 'D:/AI_Employee_Vault'))
@@ -45,19 +47,23 @@ class ErrorHandler:
         # Check system logs
         system_log_files = list(LOG_DIR.glob('system/*.json'))
         for log_file in system_log_files:
+            # Entries are appended in time order: read backwards and stop at the cutoff
+            recent = []
             try:
-                with open(log_file, 'r') as f:
-                    for line in f:
-                        try:
-                            entry = json.loads(line)
-                            entry_time = datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00'))
-
-                            if entry_time > cutoff_time and entry.get('severity') in ['HIGH', 'CRITICAL']:
-                                errors.append(entry)
-                        except:
-                            continue
+                for line in iter_matching_reversed(log_file):
+                    try:
+                        entry = json.loads(line)
+                        entry_time = datetime.fromisoformat(entry['timestamp'].replace('Z', '+00:00'))
+                        if entry_time <= cutoff_time:
+                            break
+                    except:
+                        continue
+
+                    if entry.get('severity') in ['HIGH', 'CRITICAL']:
+                        recent.append(entry)
             except:
-                continue
+                pass
+            errors.extend(reversed(recent))
 
         return errors
 
@@ -5,13 +5,18 @@ Handles log rotation, compression, and archiving
 """
 
 import json
-import gzip
 import shutil
 import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import tarfile
 
+from log_archive import compress_log
+from log_integrity import IntegrityLedger
+
 
 # Configuration
 VAULT_PATH = Path(os.getenv('VAULT_PATH', 'D:/AI_Employee_Vault'))
@@ -42,15 +47,79 @@ RETENTION_POLICIES = {
 }
 
 
+LOG_TYPES = ['actions', 'system', 'security']
+
+
+def _compress_task(path: str) -> dict:
+    """Process-pool task: compress one log, keep its mtime, drop the original"""
+    file_path = Path(path)
+    try:
+        stat = file_path.stat()
+        result = compress_log(file_path)
+        # Keep the log's age so archiving by mtime still works
+        os.utime(result['dest'], (stat.st_atime, stat.st_mtime))
+        file_path.unlink()
+        return {'path': path, 'bytes_in': stat.st_size, 'bytes_out': result['compressed_size']}
+    except Exception as e:
+        return {'path': path, 'error': str(e)}
+
+
+def _tar_task(archive_name: str, members: list) -> dict:
+    """Process-pool task: stream files into a tar, then delete them"""
+    archive_path = Path(archive_name)
+    tmp_path = archive_path.with_suffix('.tar.tmp')
+    try:
+        bytes_in = 0
+        with tarfile.open(tmp_path, 'w') as tar:
+            for member in members:
+                member_path = Path(member)
+                info = tar.gettarinfo(str(member_path), arcname=member_path.name)
+                # Copied straight from the file into the tar stream
+                with open(member_path, 'rb') as f:
+                    tar.addfile(info, f)
+                bytes_in += info.size
+        os.replace(tmp_path, archive_path)
+
+        # Delete individual files after successful archive
+        for member in members:
+            Path(member).unlink()
+        return {'path': archive_name, 'bytes_in': bytes_in, 'bytes_out': archive_path.stat().st_size,
+                'files': len(members)}
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        return {'path': archive_name, 'error': str(e)}
+
+
 class LogAggregator:
-    def __init__(self):
+    def __init__(self, workers: int = None):
         self.today = datetime.now()
+        self.workers = max(1, workers or int(os.getenv('LOG_AGGREGATOR_WORKERS', 0)) or os.cpu_count() or 1)
         self.stats = {
             'files_rotated': 0,
             'files_compressed': 0,
             'files_archived': 0,
             'space_freed_mb': 0
         }
+        # Per-phase throughput: files, bytes read, bytes written, seconds
+        self.phases = {}
+
+    def _run_tasks(self, func, tasks: list) -> list:
+        """Run (args) tuples through func, in a process pool when workers > 1"""
+        if self.workers <= 1 or len(tasks) <= 1:
+            return [func(*args) for args in tasks]
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as pool:
+            return list(pool.map(func, *zip(*tasks)))
+
+    def _record_phase(self, phase: str, started: float, results: list):
+        """Accumulate throughput and space freed for a phase"""
+        data = self.phases.setdefault(phase, {'files': 0, 'bytes_in': 0, 'bytes_out': 0, 'seconds': 0.0})
+        data['seconds'] += time.perf_counter() - started
+        for result in results:
+            if 'error' in result:
+                continue
+            data['files'] += result.get('files', 1)
+            data['bytes_in'] += result['bytes_in']
+            data['bytes_out'] += result['bytes_out']
 
     def create_daily_log_files(self):
         """Create new daily log files for today"""
@@ -77,38 +146,45 @@ class LogAggregator:
                 self.stats['files_rotated'] += 1
 
     def compress_old_logs(self):
-        """Compress logs older than 7 days"""
+        """Compress logs older than 7 days, several files at a time"""
         cutoff_date = self.today - timedelta(days=7)
+        started = time.perf_counter()
 
-        log_types = ['actions', 'system', 'security']
-        for log_type in log_types:
+        candidates = []
+        for log_type in LOG_TYPES:
             log_dir = LOG_DIR / log_type
             if not log_dir.exists():
                 continue
 
             for log_file in log_dir.glob('*.json'):
-                # Skip if already compressed
-                if log_file.suffix == '.gz':
-                    continue
-
                 # Check file age
                 file_date = datetime.fromtimestamp(log_file.stat().st_mtime)
                 if file_date < cutoff_date:
-                    self.compress_file(log_file)
+                    candidates.append((str(log_file),))
+
+        results = self._run_tasks(_compress_task, candidates)
+        for result in results:
+            name = Path(result['path']).name
+            if 'error' in result:
+                print(f"Error compressing {result['path']}: {result['error']}")
+                continue
+            space_freed = (result['bytes_in'] - result['bytes_out']) / (1024 * 1024)  # MB
+            self.stats['files_compressed'] += 1
+            self.stats['space_freed_mb'] += space_freed
+            print(f"Compressed: {name} ({space_freed:.2f} MB freed)")
+
+        self._record_phase('compress', started, results)
 
     def compress_file(self, file_path: Path):
-        """Compress a single file with gzip"""
+        """Compress a single file into a seekable block-compressed .gz archive"""
         try:
             original_size = file_path.stat().st_size
-            compressed_path = file_path.with_suffix(file_path.suffix + '.gz')
-
-            with open(file_path, 'rb') as f_in:
-                with gzip.open(compressed_path, 'wb') as f_out:
-                    shutil.copyfileobj(f_in, f_out)
+            result = compress_log(file_path)
+            compressed_path = result['dest']
 
             # Verify compression worked
             if compressed_path.exists():
-                compressed_size = compressed_path.stat().st_size
+                compressed_size = result['compressed_size']
                 file_path.unlink()  # Delete original
 
                 space_freed = (original_size - compressed_size) / (1024 * 1024)  # MB
@@ -123,9 +199,10 @@ class LogAggregator:
     def archive_old_compressed_logs(self):
         """Move old compressed logs to archives folder"""
         cutoff_date = self.today - timedelta(days=30)
+        started = time.perf_counter()
+        results = []
 
-        log_types = ['actions', 'system', 'security']
-        for log_type in log_types:
+        for log_type in LOG_TYPES:
             log_dir = LOG_DIR / log_type
             archive_dir = log_dir / 'archives'
             archive_dir.mkdir(parents=True, exist_ok=True)
@@ -135,43 +212,54 @@ class LogAggregator:
                 file_date = datetime.fromtimestamp(log_file.stat().st_mtime)
                 if file_date < cutoff_date:
                     dest = archive_dir / log_file.name
+                    size = log_file.stat().st_size
                     shutil.move(str(log_file), str(dest))
+                    results.append({'bytes_in': size, 'bytes_out': size})
                     self.stats['files_archived'] += 1
                     print(f"Archived: {log_file.name}")
 
+        self._record_phase('archive', started, results)
+
     def create_monthly_archives(self):
-        """Create monthly tar.gz archives (run on first of month)"""
+        """
+        Create monthly tar archives (run on first of month)
+
+        Members are already block-compressed, so the tar itself is left
+        uncompressed and readers can still seek inside each member.
+        """
         if self.today.day != 1:
             return  # Only run on first day of month
 
         last_month = self.today - timedelta(days=1)
         month_str = last_month.strftime('%Y-%m')
+        started = time.perf_counter()
 
-        log_types = ['actions', 'system', 'security']
-        for log_type in log_types:
+        # One tar per log type, built concurrently
+        tasks = []
+        for log_type in LOG_TYPES:
             archive_dir = LOG_DIR / log_type / 'archives'
             if not archive_dir.exists():
                 continue
 
             # Find all logs from last month
-            month_files = list(archive_dir.glob(f'{month_str}-*.json.gz'))
-
+            month_files = sorted(str(f) for f in archive_dir.glob(f'{month_str}-*.json.gz'))
             if month_files:
-                archive_name = archive_dir / f'{month_str}.tar.gz'
-                with tarfile.open(archive_name, 'w:gz') as tar:
-                    for file in month_files:
-                        tar.add(file, arcname=file.name)
+                tasks.append((str(archive_dir / f'{month_str}.tar'), month_files))
 
-                # Delete individual files after successful archive
-                for file in month_files:
-                    file.unlink()
+        results = self._run_tasks(_tar_task, tasks)
+        for result in results:
+            if 'error' in result:
+                print(f"Error creating {result['path']}: {result['error']}")
+            else:
+                print(f"Created monthly archive: {Path(result['path']).name}")
 
-                print(f"Created monthly archive: {archive_name.name}")
+        self._record_phase('monthly_archive', started, results)
 
     def enforce_retention_policies(self):
         """Delete logs older than retention policy"""
         for log_type, policy in RETENTION_POLICIES.items():
             log_dir = LOG_DIR / log_type
+            ledger = IntegrityLedger(log_dir)
 
             # Active logs retention
             active_cutoff = self.today - timedelta(days=policy['active'])
@@ -179,6 +267,7 @@ class LogAggregator:
                 file_date = datetime.fromtimestamp(log_file.stat().st_mtime)
                 if file_date < active_cutoff:
                     print(f"Deleting old active log: {log_file.name}")
+                    ledger.retire(log_file)
                     log_file.unlink()
 
             # Compressed/archive retention
@@ -191,6 +280,7 @@ class LogAggregator:
                         file_date = datetime.fromtimestamp(archive_file.stat().st_mtime)
                         if file_date < compressed_cutoff:
                             print(f"Deleting old archive: {archive_file.name}")
+                            ledger.retire(archive_file)
                             archive_file.unlink()
 
     def generate_log_stats(self) -> dict:
@@ -270,6 +360,22 @@ class LogAggregator:
 - Files archived: {self.stats['files_archived']}
 - Space freed: {self.stats['space_freed_mb']:.2f} MB
 
+## Throughput
+
+**Workers:** {self.workers}
+
+| Phase | Files | Read | Written | Time | Throughput | Space Freed |
+|-------|-------|------|---------|------|------------|-------------|
+"""
+
+        for phase, data in self.phases.items():
+            read_mb = data['bytes_in'] / (1024 * 1024)
+            written_mb = data['bytes_out'] / (1024 * 1024)
+            rate = read_mb / data['seconds'] if data['seconds'] > 0 else 0.0
+            report_content += f"| {phase} | {data['files']} | {read_mb:.2f} MB | {written_mb:.2f} MB | {data['seconds']:.2f}s | {rate:.2f} MB/s | {read_mb - written_mb:.2f} MB |\n"
+
+        report_content += f"""
+
 ---
 *Generated by monitor-system skill - log_aggregator.py*
 """
@@ -277,33 +383,36 @@ class LogAggregator:
         report_file.write_text(report_content)
         print(f"Statistics report written to: {report_file}")
 
-    def verify_log_integrity(self):
-        """Verify that logs are being written correctly"""
+    def verify_log_integrity(self, full: bool = False):
+        """
+        Verify that logs are being written correctly
+
+        Only lines appended since the last run are parsed; the integrity
+        ledger catches truncated, rewritten or deleted segments. With
+        full=True every segment is re-read and its hash chain recomputed.
+        """
         issues = []
 
         # Check that today's logs exist
         today_str = self.today.strftime('%Y-%m-%d')
-        for log_type in ['actions', 'system', 'security']:
+        for log_type in LOG_TYPES:
             log_file = LOG_DIR / log_type / f'{today_str}.json'
             if not log_file.exists():
                 issues.append(f"Missing today's log: {log_file}")
 
-        # Check that logs are valid JSON
-        for log_type in ['actions', 'system', 'security']:
+        # Check new log data against the checkpoints
+        lines_verified = bytes_verified = 0
+        for log_type in LOG_TYPES:
             log_dir = LOG_DIR / log_type
             if not log_dir.exists():
                 continue
 
-            for log_file in log_dir.glob('*.json'):
-                try:
-                    with open(log_file, 'r') as f:
-                        for line_num, line in enumerate(f, 1):
-                            if line.strip():  # Skip empty lines
-                                json.loads(line)
-                except json.JSONDecodeError as e:
-                    issues.append(f"Invalid JSON in {log_file.name} line {line_num}: {str(e)}")
-                except Exception as e:
-                    issues.append(f"Error reading {log_file.name}: {str(e)}")
+            result = IntegrityLedger(log_dir).verify(full=full)
+            issues.extend(result['issues'])
+            lines_verified += result['lines_verified']
+            bytes_verified += result['bytes_verified']
+
+        print(f"Verified {lines_verified} new lines ({bytes_verified / (1024 * 1024):.2f} MB)")
 
         if issues:
             print("⚠️  Log integrity issues found:")
@@ -317,9 +426,14 @@ class LogAggregator:
 
 def main():
     """Main log aggregation execution"""
+    parser = argparse.ArgumentParser(description='Log rotation, compression and archiving')
+    parser.add_argument('--workers', type=int, help='Compression/archiving processes (default: CPU count)')
+    parser.add_argument('--full-verify', action='store_true', help='Re-read all logs and check their hash chains')
+    args = parser.parse_args()
+
     print(f"Starting log aggregation: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-    aggregator = LogAggregator()
+    aggregator = LogAggregator(workers=args.workers)
 
     # 1. Create new daily log files
     print("\n1. Creating daily log files...")
@@ -343,7 +457,7 @@ def main():
 
     # 6. Verify log integrity
     print("\n6. Verifying log integrity...")
-    aggregator.verify_log_integrity()
+    aggregator.verify_log_integrity(full=args.full_verify)
 
     # 7. Generate and write statistics
     print("\n7. Generating statistics...")
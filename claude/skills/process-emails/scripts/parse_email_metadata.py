@@ -21,6 +21,8 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
+from vault_document import VaultDocument, load_document
+
 
 class EmailMetadataParser:
     """Parser for EMAIL_*.md files with YAML frontmatter."""
@@ -52,19 +54,19 @@ class EmailMetadataParser:
         if not self.file_path.exists():
             raise FileNotFoundError(f"Email file not found: {self.file_path}")
 
-        content = self.file_path.read_text(encoding='utf-8')
+        doc = load_document(self.file_path)
 
         # Extract YAML frontmatter
-        self._parse_frontmatter(content)
+        self._parse_frontmatter(doc)
 
         # Extract email body
-        self._parse_body(content)
+        self._parse_body(doc)
 
         # Extract suggested actions
-        self._parse_suggested_actions(content)
+        self._parse_suggested_actions(doc)
 
         # Extract additional metadata section
-        self._parse_additional_metadata(content)
+        self._parse_additional_metadata(doc)
 
         # Analyze content for urgency indicators
         self._analyze_urgency()
@@ -72,19 +74,13 @@ class EmailMetadataParser:
         # Return complete parsed data
         return self._build_result()
 
-    def _parse_frontmatter(self, content: str) -> None:
+    def _parse_frontmatter(self, doc: VaultDocument) -> None:
         """Extract YAML frontmatter from email file."""
-        # Match YAML frontmatter pattern
-        frontmatter_pattern = r'^---\s*\n(.*?)\n---\s*\n'
-        match = re.search(frontmatter_pattern, content, re.DOTALL)
-
-        if not match:
+        if not doc.has_frontmatter:
             raise ValueError("No YAML frontmatter found in email file")
 
-        yaml_content = match.group(1)
-
         try:
-            self.metadata = yaml.safe_load(yaml_content)
+            self.metadata = yaml.safe_load(doc.frontmatter_text) or {}
         except yaml.YAMLError as e:
             raise ValueError(f"Invalid YAML frontmatter: {e}")
 
@@ -94,38 +90,31 @@ class EmailMetadataParser:
             if field not in self.metadata:
                 raise ValueError(f"Missing required field in frontmatter: {field}")
 
-    def _parse_body(self, content: str) -> None:
+    def _parse_body(self, doc: VaultDocument) -> None:
         """Extract email body content."""
         # Find "Email Content" section
-        body_pattern = r'## Email Content\s*\n(.*?)(?=\n## |$)'
-        match = re.search(body_pattern, content, re.DOTALL)
+        body = doc.sections.get('Email Content')
 
-        if match:
-            self.body = match.group(1).strip()
+        if body is not None:
+            self.body = body
         else:
-            # Fallback: everything after frontmatter until next section
-            after_frontmatter = re.split(r'^---\s*$', content, flags=re.MULTILINE)[2:]
-            if after_frontmatter:
-                self.body = '\n'.join(after_frontmatter).strip()
+            # Fallback: everything after frontmatter
+            self.body = doc.body.strip()
 
-    def _parse_suggested_actions(self, content: str) -> None:
+    def _parse_suggested_actions(self, doc: VaultDocument) -> None:
         """Extract suggested actions from email file."""
-        actions_pattern = r'## Suggested Actions\s*\n(.*?)(?=\n## |$)'
-        match = re.search(actions_pattern, content, re.DOTALL)
+        actions_text = doc.sections.get('Suggested Actions')
 
-        if match:
-            actions_text = match.group(1)
+        if actions_text is not None:
             # Extract checkbox items
             checkbox_pattern = r'- \[ \] (.+)'
             self.suggested_actions = re.findall(checkbox_pattern, actions_text)
 
-    def _parse_additional_metadata(self, content: str) -> None:
+    def _parse_additional_metadata(self, doc: VaultDocument) -> None:
         """Extract additional metadata section if present."""
-        metadata_pattern = r'## Metadata\s*\n(.*?)(?=\n## |$)'
-        match = re.search(metadata_pattern, content, re.DOTALL)
+        metadata_text = doc.sections.get('Metadata')
 
-        if match:
-            metadata_text = match.group(1)
+        if metadata_text is not None:
             # Parse key-value pairs
             kv_pattern = r'- \*\*(.+?)\*\*:\s*(.+)'
             pairs = re.findall(kv_pattern, metadata_text)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Dashboard Cache - Incrementally maintained counts for the dashboard updater
+Keeps the entries of the workflow folders and per-log line/error counts so
+a dashboard refresh no longer re-lists every folder and re-reads every log.
+
+- Folder listings are updated from filesystem events while watch() is
+  running, and re-listed only when a folder's mtime shows a change the
+  events did not cover (e.g. while nothing was running). Done and Failed
+  count the items in their YYYY/MM shards, each shard listed on its own,
+  and the items in their monthly packs, read from the pack indexes.
+- Each .log file is remembered by byte offset; only bytes appended since
+  the last refresh are read to count lines and "error" occurrences.
+- Everything is persisted to state/dashboard_cache.json between runs.
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterable, Callable
+import logging
+
+from vault_events import VaultEvent, CREATED, DELETED, MOVED, listen
+from archive_layout import YEAR_PATTERN, MONTH_PATTERN, is_sharded
+from archive_pack import INDEX_PATTERN, packed_names
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+DEFAULT_FOLDERS = ('Inbox', 'Needs_Action', 'Done')
+
+# Bytes read per chunk when scanning appended log data
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class DashboardCache:
+    """Folder listings and log counters kept up to date incrementally"""
+
+    def __init__(self, vault_path: Path = Path('.'), folders: Iterable[str] = DEFAULT_FOLDERS,
+                 logs_path: Optional[Path] = None, state_file: Optional[Path] = None):
+        self.vault_path = Path(vault_path)
+        self.folder_names = tuple(folders)
+        self.logs_path = Path(logs_path) if logs_path else self.vault_path / 'Logs'
+        self.state_file = Path(state_file) if state_file else self.vault_path / 'state' / 'dashboard_cache.json'
+
+        # folder -> {"mtime_ns": int, "entries": set of names}
+        self.folders: Dict[str, Dict[str, Any]] = {}
+        # log file name -> {"ino", "offset", "lines", "errors"}
+        self.logs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._subscription = None
+        self.load()
+
+    def load(self) -> 'DashboardCache':
+        """Read the persisted state, if any"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.folders = {name: {'mtime_ns': folder['mtime_ns'], 'entries': set(folder['entries'])}
+                                for name, folder in data['folders'].items()}
+                self.logs = data['logs']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return self
+
+    def save(self):
+        """Atomically persist the state if it changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                'version': CACHE_VERSION,
+                'folders': {name: {'mtime_ns': folder['mtime_ns'], 'entries': sorted(folder['entries'])}
+                            for name, folder in self.folders.items()},
+                'logs': self.logs
+            }
+            self._dirty = False
+
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_file, self.state_file)
+        except OSError as e:
+            logger.error(f"Failed to save dashboard cache: {e}")
+
+    # ---- Folder listings ----
+
+    def _folder_mtime(self, name: str) -> Optional[int]:
+        try:
+            return os.stat(self.vault_path / name).st_mtime_ns
+        except OSError:
+            return None
+
+    def _listing(self, name: str, loader: Callable[[Path], Iterable[str]] = os.listdir) -> List[str]:
+        """Names directly in a folder (or a pack index), re-read only if it changed behind our back"""
+        mtime = self._folder_mtime(name)
+        with self._lock:
+            folder = self.folders.get(name)
+            if mtime is None:
+                if folder is not None:
+                    del self.folders[name]
+                    self._dirty = True
+                return []
+            if folder is None or folder['mtime_ns'] != mtime:
+                try:
+                    entries = set(loader(self.vault_path / name))
+                except OSError:
+                    return []
+                folder = self.folders[name] = {'mtime_ns': mtime, 'entries': entries}
+                self._dirty = True
+            return sorted(folder['entries'])
+
+    def entries(self, name: str) -> List[str]:
+        """Names in a folder; Done and Failed list shard and packed items as YYYY/MM/name"""
+        names = self._listing(name)
+        if not is_sharded(name):
+            return names
+
+        entries = []
+        for entry in names:
+            if not YEAR_PATTERN.match(entry):
+                entries.append(entry)
+                continue
+            for month in self._listing(f"{name}/{entry}"):
+                if MONTH_PATTERN.match(month):
+                    entries.extend(f"{entry}/{month}/{item}" for item in self._listing(f"{name}/{entry}/{month}"))
+                elif INDEX_PATTERN.match(month):
+                    packed = self._listing(f"{name}/{entry}/{month}", loader=packed_names)
+                    entries.extend(f"{entry}/{month[5:7]}/{item}" for item in packed)
+        return sorted(entries)
+
+    def count(self, name: str) -> int:
+        """Number of entries in a folder"""
+        return len(self.entries(name))
+
+    def apply_event(self, added: Optional[str] = None, removed: Optional[str] = None):
+        """Fold one filesystem event into the listings"""
+        with self._lock:
+            for path, adding in ((removed, False), (added, True)):
+                if not path:
+                    continue
+                path = Path(path)
+                try:
+                    name = path.parent.resolve().relative_to(self.vault_path.resolve()).as_posix()
+                except ValueError:
+                    continue
+                folder = self.folders.get(name)
+                if folder is None:
+                    # Never listed: the next entries() call lists it
+                    continue
+                if adding:
+                    folder['entries'].add(path.name)
+                else:
+                    folder['entries'].discard(path.name)
+                # The listing now reflects the folder as it is on disk
+                folder['mtime_ns'] = self._folder_mtime(name) or folder['mtime_ns']
+                self._dirty = True
+
+    def on_vault_event(self, event: VaultEvent):
+        """Fold a vault event for one of the folders into the listings"""
+        if event.kind == CREATED:
+            self.apply_event(added=str(event.full_path))
+        elif event.kind == DELETED:
+            self.apply_event(removed=str(event.full_path))
+        elif event.kind == MOVED:
+            self.apply_event(removed=str(event.full_src_path), added=str(event.full_path))
+
+    def watch(self) -> bool:
+        """Keep the listings current from vault events; False without watchdog"""
+        if self._subscription is not None:
+            return True
+
+        # List every folder first so events have something to apply to
+        for name in self.folder_names:
+            self.entries(name)
+
+        try:
+            folders = [f"{name}/**" if is_sharded(name) else name for name in self.folder_names]
+            self._subscription = listen(self.vault_path, self.on_vault_event, folders=folders,
+                                        kinds=[CREATED, DELETED, MOVED], directories=True)
+        except RuntimeError as e:
+            logger.warning(f"{e}; folders will be re-listed when they change")
+            return False
+        return True
+
+    def stop(self):
+        """Stop watching and persist the state"""
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+        self.save()
+
+    # ---- Log counters ----
+
+    def refresh_logs(self) -> Dict[str, Dict[str, Any]]:
+        """Fold bytes appended to each .log file since the last refresh into its counters"""
+        try:
+            names = [name for name in os.listdir(self.logs_path) if name.endswith('.log')]
+        except OSError:
+            names = []
+
+        with self._lock:
+            for name in set(self.logs) - set(names):
+                del self.logs[name]
+                self._dirty = True
+
+            for name in names:
+                try:
+                    self._refresh_log(name)
+                except OSError as e:
+                    logger.debug(f"Skipping {name}: {e}")
+            return dict(self.logs)
+
+    def _refresh_log(self, name: str):
+        path = self.logs_path / name
+        stat = os.stat(path)
+        state = self.logs.get(name)
+        if state is None or state['ino'] != stat.st_ino or stat.st_size < state['offset']:
+            # New, replaced or truncated: count from the start
+            state = self.logs[name] = {'ino': stat.st_ino, 'offset': 0, 'lines': 0, 'errors': 0}
+            self._dirty = True
+        if stat.st_size == state['offset']:
+            return
+
+        with open(path, 'rb') as f:
+            f.seek(state['offset'])
+            pending = b''
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                data = pending + chunk
+                # Count whole lines only, so a word is never split across reads
+                end = data.rfind(b'\n') + 1
+                if end == 0:
+                    pending = data
+                    continue
+                pending = data[end:]
+                complete = data[:end]
+                state['lines'] += complete.count(b'\n')
+                state['errors'] += complete.lower().count(b'error')
+                state['offset'] += end
+        self._dirty = True
+
+    def error_count(self) -> int:
+        """Occurrences of "error" (any case) across the .log files"""
+        return sum(state['errors'] for state in self.refresh_logs().values())
+
+    def log_lines(self) -> Dict[str, int]:
+        """Complete lines per .log file"""
+        return {name: state['lines'] for name, state in self.refresh_logs().items()}
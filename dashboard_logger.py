@@ -4,11 +4,21 @@ Dashboard Logger - Updates Dashboard.md with all platform activities
 Call this after any post/send action to keep dashboard current
 """
 
+import os
 import json
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from dashboard_renderer import DashboardRenderer
+
+# Rotate the activity log once it grows past this many bytes
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+
+# Rotated segments kept as activity.jsonl.1 .. activity.jsonl.N
+DEFAULT_BACKUP_COUNT = 5
+
 
 class DashboardLogger:
     """Logs all activities to Dashboard.md"""
@@ -16,9 +26,24 @@ class DashboardLogger:
     def __init__(self, vault_path: Path = None):
         self.vault_path = vault_path or Path(__file__).parent
         self.dashboard_file = self.vault_path / 'Dashboard.md'
-        self.log_file = self.vault_path / 'Logs' / 'activity.json'
+        self.log_file = self.vault_path / 'Logs' / 'activity.jsonl'
+        self.stats_file = self.vault_path / 'Logs' / 'activity_stats.json'
         self.log_file.parent.mkdir(exist_ok=True)
 
+        self.max_bytes = int(os.getenv('ACTIVITY_LOG_MAX_BYTES', DEFAULT_MAX_BYTES))
+        self.backup_count = int(os.getenv('ACTIVITY_LOG_BACKUPS', DEFAULT_BACKUP_COUNT))
+        self._lock = threading.Lock()
+        self._dashboard: Optional[DashboardRenderer] = None
+
+        self._migrate_legacy_log()
+
+    @property
+    def dashboard(self) -> DashboardRenderer:
+        """Bounded Dashboard.md activity feed, opened on first use"""
+        if self._dashboard is None:
+            self._dashboard = DashboardRenderer(self.vault_path)
+        return self._dashboard
+
     def log_activity(
         self,
         platform: str,
@@ -37,32 +62,20 @@ class DashboardLogger:
             details: Additional details dict
             url: Optional URL to the post
         """
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         icon = self._get_icon(platform, status)
 
         # Build dashboard entry
-        entry = f"""
-
-## {timestamp} - {icon} {platform.title()} {action.title()}
-
-**Platform**: {platform}
-**Status**: {'Successfully ' + action if status == 'success' else 'Failed to ' + action}
-"""
-
-        if details:
-            for key, value in details.items():
-                if value:
-                    entry += f"**{key.title()}**: {value}\n"
-
-        if url:
-            entry += f"**URL**: {url}\n"
-
-        entry += "\n---\n"
+        fields = {
+            'Platform': platform,
+            'Status': 'Successfully ' + action if status == 'success' else 'Failed to ' + action
+        }
+        for key, value in (details or {}).items():
+            fields[key.title()] = value
+        fields['URL'] = url
 
-        # Append to dashboard
+        # Add to the dashboard's bounded activity feed
         try:
-            with open(self.dashboard_file, 'a', encoding='utf-8') as f:
-                f.write(entry)
+            self.dashboard.record(f"{platform.title()} {action.title()}", fields, icon=icon)
         except Exception as e:
             print(f"Failed to update dashboard: {e}")
 
@@ -91,34 +104,123 @@ class DashboardLogger:
         details: Dict,
         url: str
     ):
-        """Log to JSON file"""
+        """Append one line to the JSONL activity log and fold it into the stats"""
+        entry = {
+            'timestamp': datetime.now().isoformat(),
+            'platform': platform,
+            'action': action,
+            'status': status,
+            'details': details,
+            'url': url
+        }
+
         try:
-            # Load existing logs
-            logs = []
-            if self.log_file.exists():
-                with open(self.log_file, 'r') as f:
-                    logs = json.load(f)
-
-            # Add new entry
-            logs.append({
-                'timestamp': datetime.now().isoformat(),
-                'platform': platform,
-                'action': action,
-                'status': status,
-                'details': details,
-                'url': url
-            })
-
-            # Keep last 1000 entries
-            logs = logs[-1000:]
-
-            # Save
-            with open(self.log_file, 'w') as f:
-                json.dump(logs, f, indent=2)
+            with self._lock:
+                # One write per line so concurrent appenders never interleave
+                with open(self.log_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, default=str) + '\n')
+
+                stats = self._update_stats()
+                if stats['offset'] >= self.max_bytes:
+                    self._rotate(stats)
 
         except Exception as e:
             print(f"Failed to log JSON: {e}")
 
+    def _empty_stats(self) -> Dict[str, Any]:
+        return {'total': 0, 'success': 0, 'failed': 0, 'by_platform': {}, 'by_status': {},
+                'log_id': None, 'offset': 0}
+
+    def _load_stats(self) -> Dict[str, Any]:
+        """Read the stats sidecar"""
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                return {**self._empty_stats(), **json.load(f)}
+        except (OSError, ValueError):
+            return self._empty_stats()
+
+    def _save_stats(self, stats: Dict[str, Any]):
+        """Atomically replace the stats sidecar"""
+        tmp_file = self.stats_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(stats, f)
+        os.replace(tmp_file, self.stats_file)
+
+    def _count(self, stats: Dict[str, Any], entry: Dict[str, Any]):
+        """Add one entry to the running totals"""
+        status = entry.get('status') or 'unknown'
+        platform = entry.get('platform') or 'unknown'
+        stats['total'] += 1
+        if status in ('success', 'failed'):
+            stats[status] += 1
+        stats['by_status'][status] = stats['by_status'].get(status, 0) + 1
+        stats['by_platform'][platform] = stats['by_platform'].get(platform, 0) + 1
+
+    def _update_stats(self) -> Dict[str, Any]:
+        """
+        Fold log lines written since the sidecar's offset into its totals
+
+        Normally that is just the line this process appended, so each event
+        costs O(1); lines from other writers are picked up the same way.
+        """
+        stats = self._load_stats()
+        if not self.log_file.exists():
+            return stats
+
+        log_id = self.log_file.stat().st_ino
+        if stats['log_id'] != log_id:
+            # Log was rotated (or replaced) since the sidecar was written
+            stats['log_id'] = log_id
+            stats['offset'] = 0
+
+        with open(self.log_file, 'rb') as f:
+            f.seek(stats['offset'])
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Partially written line; count it next time
+                    break
+                stats['offset'] += len(line)
+                try:
+                    self._count(stats, json.loads(line))
+                except ValueError:
+                    continue
+
+        stats['updated'] = datetime.now().isoformat()
+        self._save_stats(stats)
+        return stats
+
+    def _rotate(self, stats: Dict[str, Any]):
+        """Shift activity.jsonl to activity.jsonl.1 and start a new segment"""
+        for index in range(self.backup_count - 1, 0, -1):
+            src = self.log_file.with_name(f"{self.log_file.name}.{index}")
+            if src.exists():
+                os.replace(src, self.log_file.with_name(f"{self.log_file.name}.{index + 1}"))
+        if self.backup_count > 0:
+            os.replace(self.log_file, self.log_file.with_name(f"{self.log_file.name}.1"))
+        else:
+            self.log_file.unlink()
+
+        stats['log_id'] = None
+        stats['offset'] = 0
+        self._save_stats(stats)
+
+    def _migrate_legacy_log(self):
+        """Convert the old rewrite-everything activity.json into JSONL once"""
+        legacy_file = self.log_file.with_suffix('.json')
+        if not legacy_file.exists() or self.log_file.exists():
+            return
+        try:
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                logs = json.load(f)
+            with self._lock:
+                with open(self.log_file, 'a', encoding='utf-8') as f:
+                    for entry in logs:
+                        f.write(json.dumps(entry, default=str) + '\n')
+                self._update_stats()
+            legacy_file.rename(legacy_file.with_suffix('.json.migrated'))
+        except Exception as e:
+            print(f"Failed to migrate {legacy_file}: {e}")
+
     def log_twitter(self, tweet_text: str, success: bool, url: str = None, error: str = None):
         """Log Twitter activity"""
         self.log_activity(
@@ -183,29 +285,18 @@ class DashboardLogger:
         )
 
     def get_stats(self) -> Dict[str, Any]:
-        """Get activity statistics"""
+        """Get activity statistics from the incrementally maintained sidecar"""
         try:
-            if not self.log_file.exists():
-                return {'total': 0}
-
-            with open(self.log_file, 'r') as f:
-                logs = json.load(f)
-
-            stats = {
-                'total': len(logs),
-                'success': len([l for l in logs if l.get('status') == 'success']),
-                'failed': len([l for l in logs if l.get('status') == 'failed']),
-                'by_platform': {}
+            with self._lock:
+                stats = self._update_stats()
+            return {
+                'total': stats['total'],
+                'success': stats['success'],
+                'failed': stats['failed'],
+                'by_platform': stats['by_platform'],
+                'by_status': stats['by_status']
             }
 
-            for log in logs:
-                platform = log.get('platform', 'unknown')
-                if platform not in stats['by_platform']:
-                    stats['by_platform'][platform] = 0
-                stats['by_platform'][platform] += 1
-
-            return stats
-
         except Exception as e:
             return {'error': str(e)}
 
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Dashboard Renderer - Bounded activity feed for Dashboard.md
+Activity entries go into a small SQLite ring (state/dashboard.db) holding
+the newest DASHBOARD_FEED_SIZE entries. Entries pushed out of the ring are
+appended to a dated archive note (Dashboard_Archive/YYYY-MM-DD.md), and the
+feed section of Dashboard.md - everything between the activity-feed
+markers - is re-rendered from the ring and written atomically, at most
+once per DASHBOARD_RENDER_INTERVAL seconds across all processes. The rest
+of Dashboard.md is left as it is.
+
+    renderer = DashboardRenderer(vault_path)
+    renderer.record("Twitter Posted", {"File": "post.md", "Status": "Successfully posted"}, icon="✅")
+"""
+
+import os
+import re
+import json
+import time
+import atexit
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEED_SIZE = 25
+DEFAULT_RENDER_INTERVAL = 30.0  # seconds
+
+ARCHIVE_DIRNAME = 'Dashboard_Archive'
+
+FEED_HEADING = '## 📰 Activity Feed'
+FEED_START = '<!-- activity-feed:start -->'
+FEED_END = '<!-- activity-feed:end -->'
+FEED_PATTERN = re.compile(re.escape(FEED_START) + r'.*?' + re.escape(FEED_END), re.DOTALL)
+
+# Blocks appended by earlier versions: "## YYYY-MM-DD HH:MM:SS - ..." up to "---"
+LEGACY_ENTRY_PATTERN = re.compile(
+    r'\n*^## (\d{4}-\d{2}-\d{2}) \d{2}:\d{2}:\d{2} - .*?^---[ \t]*$\n?', re.MULTILINE | re.DOTALL
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feed (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    title TEXT NOT NULL,
+    icon TEXT NOT NULL DEFAULT '',
+    fields TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('last_render', 0);
+"""
+
+
+def format_entry(entry: Dict[str, Any], heading: str = '###') -> str:
+    """Markdown block for one feed entry"""
+    title = f"{entry['icon']} {entry['title']}".strip()
+    lines = [f"{heading} {entry['timestamp']} - {title}", ""]
+    lines += [f"**{label}**: {value}" for label, value in entry['fields']]
+    return '\n'.join(lines) + '\n'
+
+
+class DashboardRenderer:
+    """Fixed-size activity ring rendered into Dashboard.md"""
+
+    def __init__(self, vault_path: Path, max_entries: Optional[int] = None,
+                 interval: Optional[float] = None, db_path: Optional[Path] = None):
+        self.vault_path = Path(vault_path)
+        self.dashboard_file = self.vault_path / 'Dashboard.md'
+        self.archive_dir = self.vault_path / ARCHIVE_DIRNAME
+        self.max_entries = max_entries or int(os.getenv('DASHBOARD_FEED_SIZE', DEFAULT_FEED_SIZE))
+        self.interval = interval if interval is not None else \
+            float(os.getenv('DASHBOARD_RENDER_INTERVAL', DEFAULT_RENDER_INTERVAL))
+
+        db_path = Path(db_path) if db_path else self.vault_path / 'state' / 'dashboard.db'
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None,
+                                     timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        self._timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+
+    def record(self, title: str, fields: Dict[str, Any], icon: str = '',
+               timestamp: Optional[str] = None):
+        """
+        Add an entry to the feed and re-render the dashboard when allowed
+
+        Args:
+            title: Entry heading, e.g. "Twitter Posted"
+            fields: Label -> value lines; empty values are left out
+            icon: Status icon shown before the title
+            timestamp: "YYYY-MM-DD HH:MM:SS"; now if omitted
+        """
+        timestamp = timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        pairs = [[str(label), str(value)] for label, value in fields.items() if value]
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO feed (timestamp, title, icon, fields) VALUES (?, ?, ?, ?)",
+                    (timestamp, title, icon, json.dumps(pairs, ensure_ascii=False))
+                )
+                overflow = self._conn.execute(
+                    "SELECT id, timestamp, title, icon, fields FROM feed ORDER BY id DESC LIMIT -1 OFFSET ?",
+                    (self.max_entries,)
+                ).fetchall()
+                if overflow:
+                    self._archive([self._entry(row) for row in reversed(overflow)])
+                    self._conn.execute("DELETE FROM feed WHERE id <= ?", (overflow[0][0],))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        self.render()
+
+    def _entry(self, row) -> Dict[str, Any]:
+        _, timestamp, title, icon, fields = row
+        return {'timestamp': timestamp, 'title': title, 'icon': icon, 'fields': json.loads(fields)}
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Entries in the ring, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, timestamp, title, icon, fields FROM feed ORDER BY id DESC"
+            ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def _archive(self, entries: List[Dict[str, Any]]):
+        """Append entries, oldest first, to the archive note of their day"""
+        by_day: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in entries:
+            by_day.setdefault(entry['timestamp'][:10], []).append(entry)
+
+        self.archive_dir.mkdir(exist_ok=True)
+        for day, day_entries in by_day.items():
+            note = self.archive_dir / f"{day}.md"
+            header = '' if note.exists() else f"# Dashboard Activity - {day}\n\n"
+            with open(note, 'a', encoding='utf-8') as f:
+                f.write(header + '\n'.join(format_entry(entry) for entry in day_entries) + '\n')
+
+    def _claim_render(self, force: bool) -> float:
+        """Take the render slot; returns 0 on success or seconds until the next slot"""
+        now = time.time()
+        with self._lock:
+            if force:
+                self._conn.execute("UPDATE meta SET value = ? WHERE key = 'last_render'", (now,))
+                return 0.0
+            cursor = self._conn.execute(
+                "UPDATE meta SET value = ? WHERE key = 'last_render' AND value <= ?",
+                (now, now - self.interval)
+            )
+            if cursor.rowcount == 1:
+                return 0.0
+            last = self._conn.execute("SELECT value FROM meta WHERE key = 'last_render'").fetchone()[0]
+        return max(0.01, last + self.interval - now)
+
+    def render(self, force: bool = False) -> bool:
+        """
+        Rewrite the feed section of Dashboard.md if the interval has passed
+
+        Otherwise a render is scheduled for when it has, so the newest
+        entries always reach the dashboard. Returns True if it was written.
+        """
+        wait = self._claim_render(force)
+        if wait:
+            self._schedule(wait)
+            return False
+
+        try:
+            self._write_dashboard()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to render dashboard: {e}")
+            return False
+
+    def _schedule(self, delay: float):
+        with self._lock:
+            if self._timer is not None and self._timer.is_alive():
+                return
+            self._timer = threading.Timer(delay, self._deferred_render)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _deferred_render(self):
+        with self._lock:
+            self._timer = None
+        self.render()
+
+    def flush(self):
+        """Render now if a render is still pending (called at exit)"""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None and timer.is_alive():
+            timer.cancel()
+            self.render(force=True)
+
+    def render_feed(self) -> str:
+        """The feed section, markers included"""
+        entries = self.entries()
+        body = '\n'.join(format_entry(entry) for entry in entries) if entries else '_No activity yet._\n'
+        return (f"{FEED_START}\n"
+                f"_Last {self.max_entries} entries, newest first. "
+                f"Older activity is in `{ARCHIVE_DIRNAME}/`_\n\n"
+                f"{body}"
+                f"{FEED_END}")
+
+    def _write_dashboard(self):
+        """Atomically replace the feed section, moving legacy appended blocks to the archive"""
+        try:
+            content = self.dashboard_file.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            content = "# AI Employee Dashboard\n"
+
+        legacy = list(LEGACY_ENTRY_PATTERN.finditer(content))
+        if legacy:
+            self._archive_legacy(legacy)
+            content = LEGACY_ENTRY_PATTERN.sub('\n', content)
+
+        feed = self.render_feed()
+        if FEED_PATTERN.search(content):
+            content = FEED_PATTERN.sub(lambda _: feed, content, count=1)
+        else:
+            content = f"{content.rstrip()}\n\n{FEED_HEADING}\n{feed}\n"
+
+        tmp_file = self.dashboard_file.with_name(f".{self.dashboard_file.name}.tmp")
+        tmp_file.write_text(content, encoding='utf-8')
+        os.replace(tmp_file, self.dashboard_file)
+
+    def _archive_legacy(self, matches):
+        """Move blocks appended by earlier versions into the archive notes"""
+        self.archive_dir.mkdir(exist_ok=True)
+        for match in matches:
+            note = self.archive_dir / f"{match.group(1)}.md"
+            header = '' if note.exists() else f"# Dashboard Activity - {match.group(1)}\n\n"
+            with open(note, 'a', encoding='utf-8') as f:
+                f.write(header + match.group(0).strip() + '\n\n')
+
+    def close(self):
+        """Render anything pending and close the database"""
+        self.flush()
+        with self._lock:
+            self._conn.close()
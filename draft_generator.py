@@ -4,7 +4,6 @@ Draft Generator - AI-powered draft generation for emails, WhatsApp, LinkedIn, an
 Watches Needs_Action folder and generates draft replies/posts for human approval
 """
 
-import os
 import sys
 import json
 import time
@@ -14,22 +13,6 @@ from datetime import datetime
 from typing import Dict, Any, Optional, List
 import logging
 
-try:
-    from watchdog.observers import Observer
-    from watchdog.events import FileSystemEventHandler
-except ImportError:
-    print("Installing watchdog...")
-    os.system("pip install watchdog")
-    from watchdog.observers import Observer
-    from watchdog.events import FileSystemEventHandler
-
-try:
-    import yaml
-except ImportError:
-    print("Installing pyyaml...")
-    os.system("pip install pyyaml")
-    import yaml
-
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -46,6 +29,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+sys.path.insert(0, str(Path(__file__).parent))
+from job_store import JobStore, content_hash
+from file_stabilizer import FileStabilizer
+from vault_document import parse_document
+from trace_store import TraceStore, read_trace_id, stamp_trace_id, record_stage
+from vault_events import VaultEvent, CREATED, MODIFIED, DELETED, MOVED, listen
+
+# Job store queue for Needs_Action items
+JOB_QUEUE = 'needs_action'
+
 
 class DraftGenerator:
     """Generates draft content for various platforms"""
@@ -56,6 +49,7 @@ class DraftGenerator:
         self.pending_approval_folder = vault_path / 'Pending_Approval'
         self.templates_folder = vault_path / 'Templates'
         self.skills_folder = vault_path / 'Skills'
+        self._traces: Optional[TraceStore] = None
 
         # Ensure directories exist
         self.pending_approval_folder.mkdir(exist_ok=True)
@@ -67,6 +61,13 @@ class DraftGenerator:
         # Load templates and context
         self._load_company_context()
 
+    @property
+    def traces(self) -> TraceStore:
+        """Item lifecycle trace store, opened on first use"""
+        if self._traces is None:
+            self._traces = TraceStore.for_vault(self.vault_path)
+        return self._traces
+
     def _load_company_context(self):
         """Load company handbook and context for drafts"""
         self.company_context = ""
@@ -548,23 +549,23 @@ character_count: {len(tweet_content)}
             if filename_lower.startswith('email') or 'email' in filename_lower:
                 # Parse email content
                 email_data = self._parse_email_file(content, file_path)
-                return self.generate_email_draft(email_data, file_path)
+                result = self.generate_email_draft(email_data, file_path)
 
             elif 'whatsapp' in filename_lower:
                 # Parse WhatsApp content
                 wa_data = self._parse_whatsapp_file(content, file_path)
-                return self.generate_whatsapp_draft(wa_data, file_path)
+                result = self.generate_whatsapp_draft(wa_data, file_path)
 
             elif 'linkedin' in filename_lower:
                 # Generate LinkedIn post
-                return self.generate_linkedin_post_draft(
+                result = self.generate_linkedin_post_draft(
                     topic=self._extract_topic(content),
                     post_type='thought_leadership'
                 )
 
             elif 'twitter' in filename_lower:
                 # Generate Twitter post
-                return self.generate_twitter_draft(
+                result = self.generate_twitter_draft(
                     topic=self._extract_topic(content)
                 )
 
@@ -572,22 +573,34 @@ character_count: {len(tweet_content)}
                 logger.info(f"Unknown file type: {file_path.name}")
                 return {"success": False, "error": "Unknown file type"}
 
+            if result.get('success') and result.get('draft_file'):
+                result['trace_id'] = self._trace_draft(file_path, content, Path(result['draft_file']))
+            return result
+
         except Exception as e:
             logger.error(f"Error processing file: {e}")
             return {"success": False, "error": str(e)}
 
+    def _trace_draft(self, source_file: Path, content: str, draft_path: Path) -> Optional[str]:
+        """Carry the item's trace ID into its draft and record the move to Pending_Approval"""
+        trace_id = read_trace_id(content)
+        if not trace_id:
+            # Item predates tracing: start its trace from its arrival in Needs_Action
+            trace_id = record_stage(self.traces, source_file, 'Needs_Action', 'draft_generator')
+            if not trace_id:
+                return None
+        try:
+            stamp_trace_id(draft_path, trace_id)
+        except Exception as e:
+            logger.warning(f"Failed to stamp trace ID into {draft_path.name}: {e}")
+        return record_stage(self.traces, draft_path, 'Pending_Approval', 'draft_generator', trace_id)
+
     def _parse_email_file(self, content: str, file_path: Path) -> Dict[str, Any]:
         """Parse email file content"""
         # Try to extract from YAML frontmatter
-        metadata = {}
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                try:
-                    metadata = yaml.safe_load(parts[1]) or {}
-                    content = parts[2]
-                except:
-                    pass
+        doc = parse_document(content, file_path)
+        metadata = doc.frontmatter if doc.has_frontmatter else {}
+        content = doc.body
 
         # Extract from content
         from_match = re.search(r'From:\s*(.+)', content, re.IGNORECASE)
@@ -601,15 +614,9 @@ character_count: {len(tweet_content)}
 
     def _parse_whatsapp_file(self, content: str, file_path: Path) -> Dict[str, Any]:
         """Parse WhatsApp file content"""
-        metadata = {}
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                try:
-                    metadata = yaml.safe_load(parts[1]) or {}
-                    content = parts[2]
-                except:
-                    pass
+        doc = parse_document(content, file_path)
+        metadata = doc.frontmatter if doc.has_frontmatter else {}
+        content = doc.body
 
         return {
             'from': metadata.get('from', 'Unknown'),
@@ -624,21 +631,58 @@ character_count: {len(tweet_content)}
         return lines[0][:100] if lines else "General Update"
 
 
-class NeedsActionHandler(FileSystemEventHandler):
+class NeedsActionHandler:
     """Watches Needs_Action folder for new files"""
 
-    def __init__(self, generator: DraftGenerator):
+    def __init__(self, generator: DraftGenerator, jobs: Optional[JobStore] = None):
         self.generator = generator
-        self.processed_files = set()
+        self.jobs = jobs or JobStore.for_vault(generator.vault_path)
+        # Files are handled only once they have finished being written
+        self.stabilizer = FileStabilizer(self.handle)
+
+    def _is_needs_action_note(self, path: str) -> bool:
+        """True for .md files directly inside the Needs_Action folder"""
+        return path.endswith('.md') and Path(path).parent.resolve() == self.generator.needs_action_folder.resolve()
+
+    def on_vault_event(self, event: VaultEvent):
+        """Called by the shared vault event bus for notes in Needs_Action"""
+        if event.kind == MODIFIED:
+            self.stabilizer.touch(event.full_path, create=False)
+            return
+        if event.kind == MOVED or event.kind == DELETED:
+            self.stabilizer.forget(event.full_src_path or event.full_path)
+        if event.kind in (CREATED, MOVED) and self._is_needs_action_note(str(event.full_path)):
+            logger.info(f"New file detected: {event.name}")
+            self.stabilizer.touch(event.full_path)
+
+    def handle(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Generate a draft for a file unless its content was already handled
+
+        Returns:
+            Draft result, or None if the file was skipped
+        """
+        if not file_path.exists():
+            return None
+
+        job_id = self.jobs.enqueue(JOB_QUEUE, file_path, content_hash(file_path))
+        if job_id is None or not self.jobs.claim(job_id):
+            logger.debug(f"Already handled: {file_path.name}")
+            return None
 
-    def on_created(self, event):
-        if not event.is_directory and event.src_path.endswith('.md'):
-            file_path = Path(event.src_path)
-            if str(file_path) not in self.processed_files:
-                logger.info(f"New file detected: {file_path.name}")
-                self.processed_files.add(str(file_path))
-                time.sleep(1)  # Wait for file to be fully written
-                self.generator.process_needs_action_file(file_path)
+        try:
+            result = self.generator.process_needs_action_file(file_path)
+        except Exception as e:
+            # Never leave the job running: it would never be retried
+            logger.error(f"Error generating draft for {file_path.name}: {e}", exc_info=True)
+            self.jobs.fail(job_id, str(e))
+            return {"success": False, "error": str(e)}
+
+        if result.get('success'):
+            self.jobs.complete(job_id)
+        else:
+            self.jobs.fail(job_id, result.get('error', ''))
+        return result
 
 
 def main():
@@ -655,20 +699,19 @@ def main():
     generator = DraftGenerator(vault_path)
     event_handler = NeedsActionHandler(generator)
 
-    # Process existing files first
+    # Process existing files first; anything drafted by a previous run is skipped
     logger.info("Processing existing files in Needs_Action...")
+    event_handler.jobs.recover(JOB_QUEUE)
     for file_path in needs_action_folder.glob("*.md"):
         try:
-            result = generator.process_needs_action_file(file_path)
-            if result.get('success'):
+            result = event_handler.handle(file_path)
+            if result and result.get('success'):
                 logger.info(f"Generated draft for: {file_path.name}")
         except Exception as e:
             logger.error(f"Error processing {file_path.name}: {e}")
 
-    # Start watching
-    observer = Observer()
-    observer.schedule(event_handler, str(needs_action_folder), recursive=False)
-    observer.start()
+    # Watch Needs_Action through the shared vault event bus
+    subscription = listen(vault_path, event_handler.on_vault_event, folders=['Needs_Action'], patterns=['*.md'])
 
     logger.info(f"Monitoring: {needs_action_folder}")
     logger.info("Press Ctrl+C to stop\n")
@@ -678,8 +721,8 @@ def main():
             time.sleep(1)
     except KeyboardInterrupt:
         logger.info("\nShutting down Draft Generator...")
-        observer.stop()
-        observer.join()
+        subscription.close()
+        event_handler.stabilizer.stop()
         logger.info("Draft Generator stopped")
 
 
@@ -9,14 +9,25 @@ import sys
 import json
 import logging
 import time
+import queue
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from generated_email_handler import EmailHandler
+from vault_document import load_document
+from metrics import counter, histogram, start_exporter
+from trace_store import TraceStore, new_trace_id, with_trace_id, record_stage
+from vault_events import VaultEvent, CREATED, MOVED, listen
+from search_index import open_search_index, keyword_matcher
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Metrics
+ACTION_FILES = counter('ai_employee_action_files_total', 'Action files created in Needs_Action', ['watcher', 'type'])
+CHECK_SECONDS = histogram('ai_employee_watcher_check_seconds', 'Time for one watcher check', ['watcher'])
+CHECK_ERRORS = counter('ai_employee_watcher_errors_total', 'Watcher checks that failed', ['watcher'])
+
 
 class EmailWatcher:
     """Watches email for business opportunities and important messages"""
@@ -26,6 +37,11 @@ class EmailWatcher:
         self.needs_action = self.vault_path / 'Needs_Action'
         self.logs_folder = self.vault_path / 'Logs'
         self.email_handler = EmailHandler()
+        self._traces = None
+
+        # Emails dropped into Needs_Action by other components, fed by vault events
+        self._arrivals: 'queue.Queue[Path]' = queue.Queue()
+        self._written = set()
 
         # Initialize email monitoring
         self._initialize_monitoring()
@@ -48,41 +64,9 @@ class EmailWatcher:
                 return emails
 
             for file in self.needs_action.glob("EMAIL_*.md"):
-                try:
-                    with open(file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-
-                    # Extract email information from the markdown file
-                    lines = content.split('\n')
-                    subject_line = None
-                    sender_line = None
-                    priority_line = None
-
-                    for line in lines:
-                        if line.startswith('**Subject**:'):
-                            subject_line = line
-                        elif line.startswith('**From**:') or line.startswith('**Sender**:'):
-                            sender_line = line
-                        elif line.startswith('**Priority**:'):
-                            priority_line = line
-
-                    # Extract information from the lines
-                    subject = self._extract_value_from_line(subject_line) if subject_line else "Unknown Subject"
-                    sender = self._extract_value_from_line(sender_line) if sender_line else "Unknown Sender"
-                    priority = self._extract_value_from_line(priority_line) if priority_line else "medium"
-
-                    emails.append({
-                        'platform': 'email',
-                        'type': 'needs_action_email',
-                        'sender': sender,
-                        'subject': subject,
-                        'timestamp': datetime.now().isoformat(),  # Use current time as approximation
-                        'filename': str(file),
-                        'priority': priority,
-                        'status': 'needs_attention'
-                    })
-                except Exception as e:
-                    logger.error(f"Error reading email file {file}: {e}")
+                email = self._read_needs_action_email(file)
+                if email:
+                    emails.append(email)
 
             logger.info(f"Found {len(emails)} emails in Needs_Action folder")
 
@@ -91,6 +75,34 @@ class EmailWatcher:
 
         return emails
 
+    def _read_needs_action_email(self, file: Path) -> Optional[Dict[str, Any]]:
+        """Email item for one Needs_Action file, None if it cannot be read"""
+        try:
+            # Extract email information from the markdown file
+            doc = load_document(file)
+            subject = doc.field('Subject', default="Unknown Subject")
+            sender = doc.field('From', 'Sender', default="Unknown Sender")
+            priority = doc.field('Priority', default="medium")
+
+            return {
+                'platform': 'email',
+                'type': 'needs_action_email',
+                'sender': sender,
+                'subject': subject,
+                'timestamp': datetime.now().isoformat(),  # Use current time as approximation
+                'filename': str(file),
+                'priority': priority,
+                'status': 'needs_attention'
+            }
+        except Exception as e:
+            logger.error(f"Error reading email file {file}: {e}")
+            return None
+
+    def on_vault_event(self, event: VaultEvent):
+        """Queue EMAIL_*.md notes that other components drop into Needs_Action"""
+        if event.name not in self._written:
+            self._arrivals.put(event.full_path)
+
     def check_new_incoming_emails(self) -> List[Dict[str, Any]]:
         """Simulate checking for new incoming emails"""
         # In a real implementation, this would connect to an email server (IMAP/POP3)
@@ -120,12 +132,15 @@ class EmailWatcher:
                        'partnership', 'project', 'consultation', 'service', 'proposal']
 
         try:
-            # Check emails in Needs_Action for business opportunities
-            needs_action_emails = self.check_needs_action_emails()
-
-            for email in needs_action_emails:
-                subject = email.get('subject', '').lower()
-                if any(keyword in subject for keyword in keywords):
+            # Only notes whose text contains a keyword can have it in the subject
+            search = open_search_index(self.vault_path)
+            search.sync('Needs_Action')
+            candidates = search.lookup(keywords, folders=['Needs_Action'], pattern="EMAIL_*.md")
+            matcher = keyword_matcher(keywords)
+
+            for key in candidates:
+                email = self._read_needs_action_email(self.vault_path / key)
+                if email and matcher.matches(email.get('subject', '')):
                     opportunities.append({
                         'platform': 'email',
                         'type': 'business_opportunity',
@@ -143,16 +158,6 @@ class EmailWatcher:
 
         return opportunities
 
-    def _extract_value_from_line(self, line: str) -> str:
-        """Extract value from a markdown line like '**Key**: value'"""
-        if not line:
-            return "Unknown"
-        # Split on ': ' and take the second part
-        parts = line.split(': ', 1)
-        if len(parts) > 1:
-            return parts[1].strip()
-        return "Unknown"
-
     def _determine_priority(self, text: str) -> str:
         """Determine priority based on keywords"""
         text = text.lower()
@@ -169,6 +174,13 @@ class EmailWatcher:
         else:
             return 'medium'
 
+    @property
+    def traces(self) -> TraceStore:
+        """Item lifecycle trace store, opened on first use"""
+        if self._traces is None:
+            self._traces = TraceStore.for_vault(self.vault_path)
+        return self._traces
+
     def create_action_file(self, item: Dict[str, Any]) -> Path:
         """Create action file in Needs_Action folder"""
         try:
@@ -180,9 +192,14 @@ class EmailWatcher:
             filename = f"EMAIL_{timestamp}_{message_type.replace(' ', '_').replace('-', '_')}.md"
             filepath = self.needs_action / filename
 
-            content = self._generate_email_content(item)
+            # The item enters the vault here, so its trace starts here
+            trace_id = new_trace_id()
+            content = with_trace_id(self._generate_email_content(item), trace_id)
+            self._written.add(filename)
             filepath.write_text(content)
             logger.info(f"Created email action file: {filepath}")
+            record_stage(self.traces, filepath, 'Needs_Action', 'email_watcher', trace_id)
+            ACTION_FILES.inc(watcher='email', type=message_type)
             return filepath
 
         except Exception as e:
@@ -259,8 +276,11 @@ status: pending
     def run_continuous(self, check_interval: int = 300):
         """Run watcher continuously"""
         logger.info(f"Starting Email watcher (interval: {check_interval}s)")
+        subscription = listen(self.vault_path, self.on_vault_event, folders=['Needs_Action'],
+                              patterns=['EMAIL_*.md'], kinds=[CREATED, MOVED])
 
         while True:
+            started = time.perf_counter()
             try:
                 # Check for email activity
                 needs_action_emails = self.check_needs_action_emails()
@@ -277,20 +297,39 @@ status: pending
                     for opportunity in opportunities:
                         self.create_action_file(opportunity)
 
+                CHECK_SECONDS.observe(time.perf_counter() - started, watcher='email')
                 logger.info("Email check complete, sleeping...")
-                time.sleep(check_interval)
+                self._wait_for_arrivals(check_interval)
 
             except KeyboardInterrupt:
                 logger.info("Email watcher stopped by user")
+                subscription.close()
                 break
             except Exception as e:
                 logger.error(f"Error in Email watcher: {e}")
+                CHECK_ERRORS.inc(watcher='email')
                 time.sleep(60)
 
+    def _wait_for_arrivals(self, timeout: float):
+        """Handle emails arriving in Needs_Action as they come, until the next full check"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                file = self._arrivals.get(timeout=remaining)
+            except queue.Empty:
+                return
+            email = self._read_needs_action_email(file) if file.exists() else None
+            if email:
+                self.create_action_file(email)
+
     def run_once(self):
         """Run a single check"""
         try:
             logger.info("Running Email check")
+            started = time.perf_counter()
 
             all_items = []
 
@@ -322,11 +361,13 @@ status: pending
                 if filepath:
                     files_created.append(str(filepath))
 
+            CHECK_SECONDS.observe(time.perf_counter() - started, watcher='email')
             logger.info(f"Created {len(files_created)} email action files")
             return files_created
 
         except Exception as e:
             logger.error(f"Error in Email run_once: {e}")
+            CHECK_ERRORS.inc(watcher='email')
             return []
 
 
@@ -344,6 +385,8 @@ def main():
 
     watcher = EmailWatcher(vault_path)
 
+    start_exporter('email_watcher', vault_path)
+
     if args.once:
         result = watcher.run_once()
         print(json.dumps(result, indent=2))
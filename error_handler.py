@@ -8,7 +8,14 @@ import os
 import sys
 import json
 import time
+import copy
+import random
+import asyncio
+import atexit
+import inspect
 import logging
+import threading
+from collections import deque
 from pathlib import Path
 from typing import Dict, Any, Callable, Optional
 from datetime import datetime, timedelta
@@ -18,18 +25,107 @@ import traceback
 sys.path.insert(0, str(Path(__file__).parent))
 
 from audit_logger import AuditLogger
+from metrics import counter, gauge
+
+DEFAULT_SNAPSHOT_INTERVAL = 30.0  # seconds
+
+# Breaker status as a number for the circuit state gauge
+BREAKER_STATES = {"healthy": 0, "degraded": 1, "recovering": 2, "failed": 3}
+
+RETRIES = counter('ai_employee_retries_total', 'Retries attempted after a failure', ['component'])
+BREAKER_STATE = gauge('ai_employee_circuit_state',
+                      'Breaker state: 0 healthy, 1 degraded, 2 half-open, 3 open', ['component'])
+
+DEFAULT_COMPONENTS = [
+    "gmail_watcher", "linkedin_watcher", "filesystem_watcher", "email_mcp", "linkedin_mcp",
+    "twitter_mcp", "instagram_mcp", "reddit_mcp", "whatsapp_mcp"
+]
+
+
+def _new_health() -> Dict[str, Any]:
+    return {
+        "status": "healthy",
+        "failures": 0,
+        "last_failure": None,
+        "half_open_calls": 0,      # probes admitted since entering half-open
+        "half_open_successes": 0
+    }
+
+
+class CircuitOpenError(Exception):
+    """Raised when a component's circuit breaker refuses the call"""
+
+
+class ResultFailedError(Exception):
+    """
+    Raised for a call that returned {"success": False} instead of raising,
+    so the attempt counts against the breaker. It is retried only when the
+    result says so ({"retryable": True}); otherwise it may already have had
+    an effect, such as a post that went out before the failure.
+    """
+
+    def __init__(self, result: Dict[str, Any]):
+        super().__init__(result.get('error') or 'Call reported failure')
+        self.result = result
+        self.retryable = bool(result.get('retryable'))
+
+
+class RetryBudget:
+    """
+    Retry allowance for one component, shared by every caller
+
+    Within a sliding window, retries may not exceed ratio x calls (plus a
+    small floor), so a failing component cannot multiply its own load.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 3, window: float = 60.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._calls = deque()
+        self._retries = deque()
+
+    def _trim(self, now: float):
+        for events in (self._calls, self._retries):
+            while events and now - events[0] > self.window:
+                events.popleft()
+
+    def record_call(self):
+        self._calls.append(time.monotonic())
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False if it is exhausted"""
+        now = time.monotonic()
+        self._trim(now)
+        if len(self._retries) >= self.min_retries + self.ratio * len(self._calls):
+            return False
+        self._retries.append(now)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        self._trim(time.monotonic())
+        return {"calls": len(self._calls), "retries": len(self._retries)}
 
 
 class ErrorRecoverySystem:
     """Handles errors and implements graceful degradation"""
 
-    def __init__(self):
-        self.vault_path = Path("C:\\Users\\LENOVO X1 YOGA\\Desktop\\hakathone zero\\AI_Employee_Vault")
+    def __init__(self, vault_path: Optional[Path] = None, snapshot_interval: Optional[float] = None):
+        self.vault_path = Path(vault_path) if vault_path else \
+            Path("C:\\Users\\LENOVO X1 YOGA\\Desktop\\hakathone zero\\AI_Employee_Vault")
         self.state_file = self.vault_path / "state" / "error_recovery_state.json"
-        self.state_file.parent.mkdir(exist_ok=True)
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
 
         self.logger = logging.getLogger(__name__)
-        self.audit_logger = AuditLogger()
+        self.audit_logger = AuditLogger(self.vault_path)
+
+        # Breaker state lives in memory; snapshots go to disk on an interval
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._stop = threading.Event()
+        self._snapshot_thread: Optional[threading.Thread] = None
+        self.snapshot_interval = snapshot_interval if snapshot_interval is not None else \
+            float(os.getenv('ERROR_RECOVERY_SNAPSHOT_INTERVAL', DEFAULT_SNAPSHOT_INTERVAL))
 
         # Component health tracking
         self.component_health = self._load_component_health()
@@ -38,8 +134,13 @@ class ErrorRecoverySystem:
         self.retry_config = {
             "max_retries": 3,
             "base_delay": 5,  # seconds
-            "max_delay": 300  # 5 minutes
+            "max_delay": 300,  # 5 minutes
+            # Per-component retry budget shared by all callers
+            "budget_ratio": 0.2,
+            "budget_min_retries": 3,
+            "budget_window": 60  # seconds
         }
+        self._retry_budgets: Dict[str, RetryBudget] = {}
 
         # Circuit breaker configuration
         self.circuit_breaker = {
@@ -53,116 +154,206 @@ class ErrorRecoverySystem:
         if self.state_file.exists():
             try:
                 with open(self.state_file, 'r') as f:
-                    return json.load(f)
+                    state = json.load(f)
+                # Older snapshots lack the half-open counters
+                return {name: {**_new_health(), **health} for name, health in state.items()}
             except Exception as e:
                 self.logger.error(f"Failed to load component health: {e}")
 
         # Default component health
-        return {
-            "gmail_watcher": {"status": "healthy", "failures": 0, "last_failure": None},
-            "linkedin_watcher": {"status": "healthy", "failures": 0, "last_failure": None},
-            "filesystem_watcher": {"status": "healthy", "failures": 0, "last_failure": None},
-            "email_mcp": {"status": "healthy", "failures": 0, "last_failure": None},
-            "linkedin_mcp": {"status": "healthy", "failures": 0, "last_failure": None},
-            "twitter_mcp": {"status": "healthy", "failures": 0, "last_failure": None},
-            "instagram_mcp": {"status": "healthy", "failures": 0, "last_failure": None},
-            "reddit_mcp": {"status": "healthy", "failures": 0, "last_failure": None},
-            "whatsapp_mcp": {"status": "healthy", "failures": 0, "last_failure": None}
-        }
+        return {name: _new_health() for name in DEFAULT_COMPONENTS}
 
     def _save_component_health(self):
-        """Save component health state"""
+        """Write an atomic snapshot of the component health state"""
+        with self._lock:
+            if not self._dirty:
+                return
+            state = copy.deepcopy(self.component_health)
+            self._dirty = False
+
+        tmp_file = self.state_file.with_suffix('.tmp')
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump(self.component_health, f, indent=2)
+            with open(tmp_file, 'w') as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_file, self.state_file)
         except Exception as e:
+            with self._lock:
+                self._dirty = True
             self.logger.error(f"Failed to save component health: {e}")
 
+    def _mark_dirty(self):
+        """Note a state change (lock held) and make sure snapshots are running"""
+        self._dirty = True
+        for name, health in self.component_health.items():
+            BREAKER_STATE.set(BREAKER_STATES.get(health["status"], 3), component=name)
+        if self._snapshot_thread is None:
+            self._snapshot_thread = threading.Thread(target=self._snapshot_loop,
+                                                     name='error-recovery-snapshot', daemon=True)
+            self._snapshot_thread.start()
+            atexit.register(self.close)
+
+    def _snapshot_loop(self):
+        while not self._stop.wait(self.snapshot_interval):
+            self._save_component_health()
+
+    def close(self):
+        """Stop the snapshot thread and write the final state"""
+        self._stop.set()
+        self._save_component_health()
+
+    def _health(self, component_name: str) -> Dict[str, Any]:
+        """Health record for a component, created on first use (lock held)"""
+        health = self.component_health.get(component_name)
+        if health is None:
+            health = self.component_health[component_name] = _new_health()
+        return health
+
+    def _open_circuit(self, health: Dict[str, Any]):
+        """Stop admitting calls until the recovery timeout has passed (lock held)"""
+        health["status"] = "failed"
+        health["half_open_calls"] = 0
+        health["half_open_successes"] = 0
+
     def is_component_healthy(self, component_name: str) -> bool:
-        """Check if component is healthy"""
-        if component_name not in self.component_health:
-            return True  # Assume healthy if not tracked
+        """
+        Check if a call to the component may go ahead
 
-        health = self.component_health[component_name]
+        A failed component moves to half-open ("recovering") once the
+        recovery timeout passes and then admits half_open_max_calls probes;
+        further calls are refused until those probes report back.
+        """
+        with self._lock:
+            if component_name not in self.component_health:
+                return True  # Assume healthy if not tracked
 
-        if health["status"] == "healthy":
-            return True
+            health = self.component_health[component_name]
 
-        if health["status"] == "degraded":
-            return True  # Still operational but with issues
+            if health["status"] == "healthy":
+                return True
 
-        if health["status"] == "failed":
-            # Check if recovery timeout has passed
-            if health["last_failure"]:
-                last_failure = datetime.fromisoformat(health["last_failure"])
-                if datetime.now() - last_failure > timedelta(seconds=self.circuit_breaker["recovery_timeout"]):
-                    # Try to recover
-                    health["status"] = "recovering"
-                    self._save_component_health()
-                    return True
-            return False
+            if health["status"] == "degraded":
+                return True  # Still operational but with issues
 
-        if health["status"] == "recovering":
-            # In half-open state, allow limited calls
-            return True
+            if health["status"] == "failed":
+                # Check if recovery timeout has passed
+                if not health["last_failure"]:
+                    return False
+                last_failure = datetime.fromisoformat(health["last_failure"])
+                if datetime.now() - last_failure <= timedelta(seconds=self.circuit_breaker["recovery_timeout"]):
+                    return False
+                # Try to recover
+                health["status"] = "recovering"
+                health["half_open_calls"] = 0
+                health["half_open_successes"] = 0
+                self.logger.info(f"Component {component_name} is HALF-OPEN, admitting probes")
+
+            if health["status"] == "recovering":
+                # In half-open state, allow limited calls
+                if health["half_open_calls"] >= self.circuit_breaker["half_open_max_calls"]:
+                    return False
+                health["half_open_calls"] += 1
+                self._mark_dirty()
+                return True
 
-        return False
+            return False
 
     def record_component_failure(self, component_name: str, error: str):
         """Record a component failure"""
-        if component_name not in self.component_health:
-            self.component_health[component_name] = {
-                "status": "healthy",
-                "failures": 0,
-                "last_failure": None
-            }
-
-        health = self.component_health[component_name]
-        health["failures"] += 1
-        health["last_failure"] = datetime.now().isoformat()
-
-        # Update status based on failure count
-        if health["failures"] >= self.circuit_breaker["failure_threshold"]:
-            health["status"] = "failed"
-            self.logger.critical(f"Component {component_name} marked as FAILED")
+        with self._lock:
+            health = self._health(component_name)
+            health["failures"] += 1
+            health["last_failure"] = datetime.now().isoformat()
+            self._mark_dirty()
+
+            opened = False
+            if health["status"] == "recovering":
+                # A failed probe re-opens the circuit for another timeout
+                self._open_circuit(health)
+                opened = True
+                self.logger.critical(f"Component {component_name} failed while recovering, marked as FAILED")
+            elif health["failures"] >= self.circuit_breaker["failure_threshold"]:
+                opened = health["status"] != "failed"
+                self._open_circuit(health)
+                if opened:
+                    self.logger.critical(f"Component {component_name} marked as FAILED")
+            elif health["failures"] >= self.circuit_breaker["failure_threshold"] // 2:
+                if health["status"] != "degraded":
+                    health["status"] = "degraded"
+                    self.logger.warning(f"Component {component_name} marked as DEGRADED")
+            failure_count = health["failures"]
+
+        if opened:
             self.audit_logger.log_error(
                 error_type="COMPONENT_FAILURE",
                 error_message=f"Component {component_name} exceeded failure threshold",
-                context={"component": component_name, "failure_count": health["failures"]}
+                context={"component": component_name, "failure_count": failure_count, "error": error}
             )
-        elif health["failures"] >= self.circuit_breaker["failure_threshold"] // 2:
-            health["status"] = "degraded"
-            self.logger.warning(f"Component {component_name} marked as DEGRADED")
-
-        self._save_component_health()
 
     def record_component_success(self, component_name: str):
         """Record a component success"""
-        if component_name not in self.component_health:
-            return
-
-        health = self.component_health[component_name]
-
-        # If component was recovering, check if it's fully recovered
-        if health["status"] == "recovering":
-            # This would track successful calls during recovery
-            pass
-
-        # Reset failure count on success
-        if health["status"] in ["failed", "degraded"]:
-            # Gradual recovery
-            health["failures"] = max(0, health["failures"] - 1)
+        with self._lock:
+            if component_name not in self.component_health:
+                return
+
+            health = self.component_health[component_name]
+            recovered = False
+
+            if health["status"] == "recovering":
+                # Close the circuit once every admitted probe has succeeded
+                health["half_open_successes"] += 1
+                if health["half_open_successes"] >= self.circuit_breaker["half_open_max_calls"]:
+                    health.update({**_new_health(), "last_failure": health["last_failure"]})
+                    recovered = True
+                self._mark_dirty()
+
+            elif health["status"] in ["failed", "degraded"]:
+                # Gradual recovery
+                health["failures"] = max(0, health["failures"] - 1)
+                if health["failures"] == 0:
+                    health["status"] = "healthy"
+                    recovered = True
+                self._mark_dirty()
+
+        if recovered:
+            self.logger.info(f"Component {component_name} recovered to HEALTHY")
+            self.audit_logger.log_action(
+                action_type="component_recovered",
+                actor="ErrorRecoverySystem",
+                details={"component": component_name}
+            )
 
-            if health["failures"] == 0:
-                health["status"] = "healthy"
-                self.logger.info(f"Component {component_name} recovered to HEALTHY")
-                self.audit_logger.log_action(
-                    action_type="component_recovered",
-                    actor="ErrorRecoverySystem",
-                    details={"component": component_name}
+    def _retry_budget(self, component_name: str) -> RetryBudget:
+        with self._lock:
+            budget = self._retry_budgets.get(component_name)
+            if budget is None:
+                budget = self._retry_budgets[component_name] = RetryBudget(
+                    self.retry_config["budget_ratio"],
+                    self.retry_config["budget_min_retries"],
+                    self.retry_config["budget_window"]
                 )
-
-        self._save_component_health()
+            return budget
+
+    def _spend_retry(self, component_name: str) -> bool:
+        """Take a retry from the component's budget, logging when it is exhausted"""
+        with self._lock:
+            allowed = self._retry_budget(component_name).try_spend()
+        if allowed:
+            RETRIES.inc(component=component_name)
+        else:
+            self.logger.warning(f"Retry budget exhausted for {component_name}, not retrying")
+        return allowed
+
+    def _release_probe(self, component_name: str):
+        """Give back a half-open probe slot whose call never reported an outcome"""
+        with self._lock:
+            health = self.component_health.get(component_name)
+            if health and health["status"] == "recovering" and health["half_open_calls"] > 0:
+                health["half_open_calls"] -= 1
+
+    def _jittered_delay(self, previous: float) -> float:
+        """Decorrelated jitter: random between the base delay and 3x the previous one"""
+        base = self.retry_config["base_delay"]
+        return min(self.retry_config["max_delay"], random.uniform(base, max(base, previous * 3)))
 
     def with_retry(self, func: Callable, component_name: str, *args, **kwargs) -> Any:
         """
@@ -182,8 +373,9 @@ class ErrorRecoverySystem:
         if not self.is_component_healthy(component_name):
             error_msg = f"Component {component_name} is not healthy"
             self.logger.error(error_msg)
-            raise Exception(error_msg)
+            raise CircuitOpenError(error_msg)
 
+        self._retry_budget(component_name).record_call()
         last_exception = None
 
         for attempt in range(self.retry_config["max_retries"]):
@@ -207,6 +399,10 @@ class ErrorRecoverySystem:
                     context={"attempt": attempt + 1, "component": component_name}
                 )
 
+                # No retries left, or the component's shared budget is spent
+                if attempt + 1 == self.retry_config["max_retries"] or not self._spend_retry(component_name):
+                    break
+
                 # Calculate delay with exponential backoff
                 delay = min(
                     self.retry_config["base_delay"] * (2 ** attempt),
@@ -216,8 +412,8 @@ class ErrorRecoverySystem:
                 self.logger.info(f"Retrying in {delay} seconds...")
                 time.sleep(delay)
 
-                # If component is now unhealthy, stop retrying
-                if not self.is_component_healthy(component_name):
+                # If the circuit has opened, stop retrying
+                if self.get_component_status(component_name) == "failed":
                     break
 
         # All retries failed
@@ -299,13 +495,141 @@ class ErrorRecoverySystem:
             # Re-raise if no fallback
             raise
 
+    async def with_retry_async(self, func: Callable, component_name: str, *args,
+                               deadline: Optional[float] = None, **kwargs) -> Any:
+        """
+        Awaitable with_retry: sleeps without blocking the event loop
+
+        Args:
+            func: Coroutine function, or plain function (run in a thread)
+            component_name: Name of component for health tracking
+            deadline: time.monotonic() by which the call must finish; pass the
+                same value down so nested calls share one deadline
+            *args, **kwargs: Arguments for the function
+
+        Returns:
+            Function result
+
+        Raises:
+            CircuitOpenError if the breaker refuses the call, TimeoutError if
+            the deadline passes, or the last exception once retries stop.
+            Exceptions with retryable = False and calls that timed out are
+            never repeated. Cancellation is propagated and never counted as
+            a failure.
+        """
+        if not self.is_component_healthy(component_name):
+            error_msg = f"Component {component_name} is not healthy"
+            self.logger.error(error_msg)
+            raise CircuitOpenError(error_msg)
+
+        self._retry_budget(component_name).record_call()
+        delay = self.retry_config["base_delay"]
+
+        try:
+            for attempt in range(self.retry_config["max_retries"]):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"Deadline passed for {component_name}")
+
+                try:
+                    if inspect.iscoroutinefunction(func):
+                        call = func(*args, **kwargs)
+                    else:
+                        call = asyncio.to_thread(func, *args, **kwargs)
+                    result = await asyncio.wait_for(call, remaining)
+                    self.record_component_success(component_name)
+                    return result
+
+                except Exception as e:
+                    timed_out = isinstance(e, asyncio.TimeoutError)
+                    if timed_out:
+                        e = TimeoutError(f"{component_name} did not finish before the deadline")
+                    self.logger.warning(f"Attempt {attempt + 1} failed for {component_name}: {e}")
+                    self.record_component_failure(component_name, str(e))
+                    self.audit_logger.log_error(
+                        error_type=f"{component_name}_ERROR",
+                        error_message=str(e),
+                        stack_trace=traceback.format_exc(),
+                        context={"attempt": attempt + 1, "component": component_name}
+                    )
+
+                    # A timed-out call may still be running in its thread
+                    if timed_out or not getattr(e, 'retryable', True) or \
+                            attempt + 1 == self.retry_config["max_retries"] or \
+                            self.get_component_status(component_name) == "failed" or \
+                            not self._spend_retry(component_name):
+                        raise e
+
+                    delay = self._jittered_delay(delay)
+                    if deadline is not None and time.monotonic() + delay >= deadline:
+                        raise e
+                    self.logger.info(f"Retrying {component_name} in {delay:.1f} seconds...")
+                    await asyncio.sleep(delay)
+
+        except asyncio.CancelledError:
+            self._release_probe(component_name)
+            raise
+
+    async def graceful_degradation_async(self, primary_func: Callable, backup_func: Callable,
+                                         component_name: str, *args, deadline: Optional[float] = None,
+                                         **kwargs) -> Any:
+        """
+        Awaitable graceful_degradation; the deadline bounds the primary's
+        attempts, and the backup (usually local and cheap) still runs once
+        it has passed
+        """
+        try:
+            result = await self.with_retry_async(primary_func, component_name, *args,
+                                                 deadline=deadline, **kwargs)
+            self.logger.info(f"Primary function succeeded for {component_name}")
+            return result
+
+        except Exception as e:
+            self.logger.warning(f"Primary failed for {component_name}, trying backup: {e}")
+
+            try:
+                if inspect.iscoroutinefunction(backup_func):
+                    result = await backup_func(*args, **kwargs)
+                else:
+                    result = await asyncio.to_thread(backup_func, *args, **kwargs)
+                self.logger.info(f"Backup function succeeded for {component_name}")
+
+                self.audit_logger.log_action(
+                    action_type="graceful_degradation",
+                    actor="ErrorRecoverySystem",
+                    details={
+                        "component": component_name,
+                        "reason": str(e),
+                        "fallback_used": True
+                    }
+                )
+
+                return result
+
+            except Exception as backup_e:
+                self.logger.error(f"Backup also failed for {component_name}: {backup_e}")
+                self.audit_logger.log_error(
+                    error_type="BACKUP_FAILED",
+                    error_message=str(backup_e),
+                    context={"component": component_name}
+                )
+                raise
+
+    def get_component_status(self, component_name: str) -> str:
+        """Current breaker status without admitting a call"""
+        with self._lock:
+            return self.component_health.get(component_name, {}).get("status", "healthy")
+
     def get_system_health_report(self) -> Dict[str, Any]:
         """Get overall system health report"""
         healthy_count = 0
         degraded_count = 0
         failed_count = 0
 
-        for component, health in self.component_health.items():
+        with self._lock:
+            component_health = copy.deepcopy(self.component_health)
+
+        for component, health in component_health.items():
             status = health["status"]
             if status == "healthy":
                 healthy_count += 1
@@ -314,7 +638,7 @@ class ErrorRecoverySystem:
             elif status in ["failed", "recovering"]:
                 failed_count += 1
 
-        total_components = len(self.component_health)
+        total_components = len(component_health)
 
         return {
             "timestamp": datetime.now().isoformat(),
@@ -325,7 +649,7 @@ class ErrorRecoverySystem:
                 "degraded": degraded_count,
                 "failed": failed_count
             },
-            "components": self.component_health,
+            "components": component_health,
             "system_operational": failed_count < total_components
         }
 
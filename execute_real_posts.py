@@ -11,6 +11,8 @@ from pathlib import Path
 from datetime import datetime
 import logging
 
+from archive_layout import archive_file
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -219,14 +221,8 @@ The future of business automation is NOW! Our digital workforce never sleeps. #A
 
             logger.info(f"📤 Posting to {platform} via MCP server...")
 
-            # Move to Done to simulate posting completion
-            done_path = self.done_path / post.name
-            # Handle potential file conflicts
-            if done_path.exists():
-                # Add timestamp to avoid conflicts
-                timestamp = int(datetime.now().timestamp())
-                done_path = self.done_path / f"{post.stem}_{timestamp}{post.suffix}"
-            post.rename(done_path)
+            # Move to Done (its month shard) to simulate posting completion
+            done_path = archive_file(self.vault_path, post, 'Done')
             logger.info(f"✅ Posted to {platform}: {done_path.name}")
             executed_posts.append(done_path)
 
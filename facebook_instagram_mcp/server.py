@@ -23,6 +23,13 @@ from mcp.types import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+from rate_limiter import get_rate_limiter
+from metrics import counter, histogram, start_exporter
+
+# Metrics
+TOOL_CALLS = counter('ai_employee_mcp_tool_calls_total', 'MCP tool calls', ['server', 'tool', 'result'])
+TOOL_SECONDS = histogram('ai_employee_mcp_tool_seconds', 'MCP tool call latency', ['server', 'tool'])
+
 # Initialize server
 server = Server("facebook-instagram-mcp-server")
 
@@ -141,6 +148,18 @@ async def list_tools() -> List[Tool]:
 
 @server.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+    """Handle Facebook/Instagram tool calls"""
+    result = 'error'
+    try:
+        with TOOL_SECONDS.time(server='facebook_instagram', tool=name):
+            response = await _call_tool(name, arguments)
+        result = 'ok'
+        return response
+    finally:
+        TOOL_CALLS.inc(server='facebook_instagram', tool=name, result=result)
+
+
+async def _call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle Facebook/Instagram tool calls"""
     config = get_config()
 
@@ -220,6 +239,7 @@ async def _facebook_post_message(config: Dict, args: Dict[str, Any]) -> List[Tex
         if 'link' in args:
             data['link'] = args['link']
 
+        await get_rate_limiter().acquire_async('facebook')
         response = requests.post(url, data=data)
         result = response.json()
 
@@ -240,6 +260,7 @@ async def _facebook_post_photo(config: Dict, args: Dict[str, Any]) -> List[TextC
             'caption': args.get('caption', ''),
             'access_token': config['facebook_access_token']
         }
+        await get_rate_limiter().acquire_async('facebook')
         response = requests.post(url, data=data)
         result = response.json()
 
@@ -269,6 +290,7 @@ async def _instagram_post_photo(config: Dict, args: Dict[str, Any]) -> List[Text
             return [TextContent(type="text", text=f"Container creation failed: {container_result}")]
 
         # Publish
+        await get_rate_limiter().acquire_async('instagram')
         publish_url = f"https://graph.facebook.com/v18.0/{config['instagram_user_id']}/media_publish"
         publish_data = {
             'creation_id': container_result['id'],
@@ -326,6 +348,7 @@ async def _instagram_post_carousel(config: Dict, args: Dict[str, Any]) -> List[T
             return [TextContent(type="text", text=f"Carousel creation failed: {carousel_result}")]
 
         # Publish
+        await get_rate_limiter().acquire_async('instagram')
         publish_resp = requests.post(
             f"https://graph.facebook.com/v18.0/{config['instagram_user_id']}/media_publish",
             data={
@@ -430,6 +453,8 @@ async def main():
     """Run the MCP server"""
     from mcp.server.stdio import stdio_server
 
+    start_exporter('facebook_instagram_mcp')
+
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
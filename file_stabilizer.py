@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+File Stabilizer - Debounced write-completion detection for vault file events
+Coalesces created/modified/moved events per path and fires a callback once
+the file's size and mtime have stopped changing for a quiet period, instead
+of sleeping a fixed second and hoping the writer has finished.
+"""
+
+import os
+import time
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds a file must be unchanged before it is treated as fully written
+DEFAULT_QUIET_PERIOD = 0.5
+
+# How often pending files are re-checked
+DEFAULT_POLL_INTERVAL = 0.1
+
+
+class _PendingFile:
+    """Last observed state of a file that is still settling"""
+
+    __slots__ = ('signature', 'changed_at')
+
+    def __init__(self, now: float):
+        self.signature: Optional[Tuple[int, int]] = None
+        self.changed_at = now
+
+
+class FileStabilizer:
+    """
+    Fires callback(path) once per burst of events, after the file settles
+
+    Feed it from a watchdog handler: call touch() for created events and for
+    the destination of moved events (atomic-rename writes), and
+    touch(create=False) for modified events so edits to files that are not
+    already pending are ignored.
+    """
+
+    def __init__(self, callback: Callable[[Path], None], quiet_period: Optional[float] = None,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.callback = callback
+        if quiet_period is None:
+            quiet_period = float(os.getenv('VAULT_QUIET_PERIOD', DEFAULT_QUIET_PERIOD))
+        self.quiet_period = quiet_period
+        self.poll_interval = poll_interval
+
+        self._pending: Dict[str, _PendingFile] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending_count(self) -> int:
+        """Files waiting to settle"""
+        with self._lock:
+            return len(self._pending)
+
+    def touch(self, path, create: bool = True):
+        """
+        Record an event for a path
+
+        Args:
+            path: File the event refers to
+            create: Start tracking the path if it is not already pending
+        """
+        key = str(path)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is not None:
+                entry.changed_at = now
+            elif create:
+                self._pending[key] = _PendingFile(now)
+            else:
+                return
+            self._ensure_thread()
+        self._wake.set()
+
+    def forget(self, path):
+        """Stop tracking a path (e.g. it was deleted or moved away)"""
+        with self._lock:
+            self._pending.pop(str(path), None)
+
+    def _ensure_thread(self):
+        """Start the checker thread on first use (lock held)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='file-stabilizer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """Poll pending files and fire callbacks for settled ones"""
+        while not self._stopped.is_set():
+            ready = self._collect_ready()
+            for path in ready:
+                try:
+                    self.callback(Path(path))
+                except Exception as e:
+                    logger.error(f"Stabilized-file callback failed for {path}: {e}", exc_info=True)
+
+            with self._lock:
+                idle = not self._pending
+            # Sleep until the next event when idle, otherwise poll
+            self._wake.wait(None if idle else self.poll_interval)
+            self._wake.clear()
+
+    def _collect_ready(self):
+        """Return paths whose size and mtime held still for the quiet period"""
+        now = time.monotonic()
+        ready = []
+        with self._lock:
+            for key, entry in list(self._pending.items()):
+                try:
+                    stat = os.stat(key)
+                except OSError:
+                    # Deleted or renamed away before it settled
+                    del self._pending[key]
+                    continue
+
+                signature = (stat.st_size, stat.st_mtime_ns)
+                if signature != entry.signature:
+                    entry.signature = signature
+                    entry.changed_at = now
+                elif now - entry.changed_at >= self.quiet_period:
+                    del self._pending[key]
+                    ready.append(key)
+        return ready
+
+    def stop(self):
+        """Stop the checker thread; pending files are dropped"""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        with self._lock:
+            self._pending.clear()
@@ -9,6 +9,11 @@ import time
 from enum import Enum
 from typing import Dict, List, Optional, Any, Tuple
 from collections import Counter
+from pathlib import Path
+
+from dashboard_cache import DashboardCache
+from log_tail import tail_lines
+from vault_index import open_index
 
 class SystemStatus(Enum):
     GREEN = "🟢"
@@ -21,13 +26,19 @@ class DashboardUpdater:
     The Dashboard Updater maintains real-time statistics and status information on the main dashboard.
     """
 
-    def __init__(self):
+    def __init__(self, watch: bool = False):
         # Configuration variables from skill definition
         self.DASHBOARD_PATH = "Dashboard.md"
         self.LOGS_PATH = "Logs"
         self.UPDATE_INTERVAL = 60  # seconds
         self.MAX_ACTIVITY_LOG_ENTRIES = 10
 
+        # Folder counts and log counters, maintained incrementally and
+        # persisted between runs; watch=True keeps them current from events
+        self.cache = DashboardCache(logs_path=self.LOGS_PATH)
+        if watch:
+            self.cache.watch()
+
         # Initialize dashboard if it doesn't exist
         self.initialize_dashboard_if_needed()
 
@@ -96,11 +107,7 @@ class DashboardUpdater:
         """Get current unread email count"""
         # This would typically connect to email API to get actual count
         # For simulation, we'll look for email files in Needs_Action
-        needs_action_path = "Needs_Action"
-        if not os.path.exists(needs_action_path):
-            return 0
-
-        email_files = [f for f in os.listdir(needs_action_path) if f.startswith("EMAIL_")]
+        email_files = [f for f in self.cache.entries("Needs_Action") if f.startswith("EMAIL_")]
         return len(email_files)
 
     def get_unread_whatsapp_count(self) -> int:
@@ -120,32 +127,21 @@ class DashboardUpdater:
 
     def get_tasks_needs_action_count(self) -> int:
         """Get count of tasks in Needs_Action folder"""
-        needs_action_path = "Needs_Action"
-        if not os.path.exists(needs_action_path):
-            return 0
-
-        return len(os.listdir(needs_action_path))
+        return self.cache.count("Needs_Action")
 
     def get_tasks_done_count(self) -> int:
         """Get count of completed tasks in Done folder"""
-        done_path = "Done"
-        if not os.path.exists(done_path):
-            return 0
-
-        return len(os.listdir(done_path))
+        return self.cache.count("Done")
 
     def get_total_monitored_count(self) -> int:
         """Get total count of all processed items"""
         total = 0
         for folder in ["Inbox", "Needs_Action", "Done"]:
-            if os.path.exists(folder):
-                total += len(os.listdir(folder))
+            total += self.cache.count(folder)
 
         # Add log entries as proxy for monitored items
-        if os.path.exists(self.LOGS_PATH):
-            for log_file in os.listdir(self.LOGS_PATH):
-                if log_file.endswith('.log'):
-                    total += self.count_lines_in_file(os.path.join(self.LOGS_PATH, log_file)) // 10
+        for lines in self.cache.log_lines().values():
+            total += lines // 10
 
         return total
 
@@ -156,22 +152,12 @@ class DashboardUpdater:
 
     def get_error_count(self) -> int:
         """Get count of system errors"""
-        error_count = 0
-        if os.path.exists(self.LOGS_PATH):
-            for log_file in os.listdir(self.LOGS_PATH):
-                if log_file.endswith('.log'):
-                    log_content = self.read_file_safely(os.path.join(self.LOGS_PATH, log_file))
-                    error_count += log_content.lower().count('error')
-
-        return error_count
+        # Only bytes appended since the last refresh are read
+        return self.cache.error_count()
 
     def get_inbox_count(self) -> int:
         """Get count of items in Inbox folder"""
-        inbox_path = "Inbox"
-        if not os.path.exists(inbox_path):
-            return 0
-
-        return len(os.listdir(inbox_path))
+        return self.cache.count("Inbox")
 
     def get_recent_activities(self) -> List[str]:
         """Get recent activity log entries"""
@@ -181,12 +167,9 @@ class DashboardUpdater:
         if os.path.exists(self.LOGS_PATH):
             for log_file in os.listdir(self.LOGS_PATH):
                 if log_file.endswith('.log'):
-                    log_content = self.read_file_safely(os.path.join(self.LOGS_PATH, log_file))
-                    lines = log_content.strip().split('\n')
-
-                    # Take the most recent entries
-                    recent_lines = [line for line in lines if line.strip()][-self.MAX_ACTIVITY_LOG_ENTRIES:]
-                    for line in recent_lines[-3:]:  # Take up to 3 recent activities
+                    # Take up to 3 recent activities, reading backwards from the end
+                    recent_lines = tail_lines(os.path.join(self.LOGS_PATH, log_file), 3)
+                    for line in recent_lines:
                         if line.strip():
                             # Clean up the log entry for display
                             clean_line = re.sub(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2} - \w+ - ', '', line)
@@ -201,11 +184,18 @@ class DashboardUpdater:
         priorities = []
 
         # Check for urgent items in Needs_Action
-        needs_action_path = "Needs_Action"
-        if os.path.exists(needs_action_path):
-            for item in os.listdir(needs_action_path):
-                if any(keyword in item.lower() for keyword in ['urgent', 'invoice', 'payment']):
-                    priorities.append(f"- ⚠️ High priority: {item}")
+        for item in self.cache.entries("Needs_Action"):
+            if any(keyword in item.lower() for keyword in ['urgent', 'invoice', 'payment']):
+                priorities.append(f"- ⚠️ High priority: {item}")
+
+        # Items marked urgent in their frontmatter
+        if len(priorities) < 5 and os.path.isdir("Needs_Action"):
+            flagged = open_index(Path('.')).notes("Needs_Action", where={"priority": ["high", "urgent", "critical"]},
+                                                  order='-mtime')
+            for note in flagged:
+                line = f"- ⚠️ High priority: {note['filename']}"
+                if line not in priorities:
+                    priorities.append(line)
 
         return priorities[:5]  # Limit to 5 priority items
 
@@ -482,6 +472,7 @@ class DashboardUpdater:
 
             # Step 6: Verify update success
             success = self.verify_update_success()
+            self.cache.save()
 
             result = {
                 'success': success,
@@ -520,13 +511,35 @@ class DashboardUpdater:
         return self.update_dashboard()
 
 
+    def run_continuous(self):
+        """Refresh the dashboard every UPDATE_INTERVAL seconds until interrupted"""
+        self.cache.watch()
+        index = open_index(Path('.'))
+        index.watch()
+        try:
+            while True:
+                result = self.update_dashboard()
+                print(f"{datetime.datetime.now().strftime('%H:%M:%S')} - {result['message']}")
+                time.sleep(self.UPDATE_INTERVAL)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.cache.stop()
+            index.stop()
+
+
 # Example usage:
 if __name__ == "__main__":
+    import sys
+
     # Initialize the dashboard updater
     updater = DashboardUpdater()
 
-    # Update the dashboard
-    result = updater.update_dashboard()
+    if '--watch' in sys.argv:
+        updater.run_continuous()
+    else:
+        # Update the dashboard
+        result = updater.update_dashboard()
 
-    print("Dashboard Update Result:")
-    print(json.dumps(result, indent=2, default=str))
\ No newline at end of file
+        print("Dashboard Update Result:")
+        print(json.dumps(result, indent=2, default=str))
\ No newline at end of file
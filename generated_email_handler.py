@@ -7,6 +7,8 @@ import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Any, Tuple
 
+from search_index import keyword_matcher
+
 class UrgencyLevel(Enum):
     CRITICAL = "Critical"
     HIGH = "High"
@@ -59,11 +61,9 @@ class EmailHandler:
         - Email requires human review based on content analysis
         - System detects financial transaction or business opportunity
         """
-        # Check for monitored keywords
-        content_lower = (email_content + " " + email_subject).lower()
-        for keyword in self.MONITORED_KEYWORDS:
-            if keyword.lower() in content_lower:
-                return True
+        # Check for monitored keywords (one pass over the words of the email)
+        if keyword_matcher(self.MONITORED_KEYWORDS).matches(email_content + " " + email_subject):
+            return True
 
         # Additional analysis could go here
         return False
@@ -6,8 +6,11 @@ import json
 import datetime
 import shutil
 from enum import Enum
+from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
+from trace_store import TraceStore, stamp_trace_id, record_stage
+
 class ProcessingResult(Enum):
     NEEDS_ACTION = "Needs_Action"
     DONE = "Done"
@@ -32,6 +35,7 @@ class InboxProcessor:
         self.FINANCIAL_KEYWORDS = ["invoice", "payment", "bill", "amount", "cost", "fee", "charge", "expense"]
         self.URGENT_KEYWORDS = ["urgent", "asap", "immediate", "today", "now"]
         self.SECURITY_CHECKS = True
+        self._traces = None
 
         # Pre-requisites validation
         self.validate_prerequisites()
@@ -221,6 +225,26 @@ class InboxProcessor:
 
         return result
 
+    @property
+    def traces(self) -> TraceStore:
+        """Item lifecycle trace store, opened on first use"""
+        if self._traces is None:
+            self._traces = TraceStore.for_vault(Path('.'))
+        return self._traces
+
+    def start_trace(self, file_path: str) -> Optional[str]:
+        """
+        Stamp a trace ID into a markdown item and record its time in Inbox
+        """
+        if not file_path.endswith('.md'):
+            return None
+        try:
+            trace_id = stamp_trace_id(Path(file_path))
+        except Exception as e:
+            print(f"Error stamping trace ID: {e}")
+            return None
+        return record_stage(self.traces, Path(file_path), 'Inbox', 'inbox_processor', trace_id)
+
     def move_item_to_folder(self, source_path: str, destination_folder: str) -> bool:
         """
         Move item to appropriate folder (Needs_Action, Done, etc.)
@@ -304,10 +328,16 @@ class InboxProcessor:
             # Step 2: Apply workflow rules
             action_result = self.apply_workflow_rules(analysis)
 
-            # Step 3: Move item to appropriate folder
+            # Step 3: Move item to appropriate folder, tracing the move
+            # (stamped after analysis so the ID is not scanned as content)
+            trace_id = self.start_trace(file_path)
             move_success = self.move_item_to_folder(file_path, action_result['folder_destination'])
 
             if move_success:
+                if trace_id:
+                    record_stage(self.traces, Path(action_result['folder_destination']) / filename,
+                                 action_result['folder_destination'], 'inbox_processor', trace_id)
+
                 # Step 4: Log the action
                 self.log_action(analysis, action_result, file_path)
 
@@ -31,18 +31,23 @@ logger = logging.getLogger(__name__)
 class InstagramPlaywright:
     """Instagram automation using Playwright - no API required"""
 
-    def __init__(self):
+    def __init__(self, pool=None):
         self.session_path = os.getenv('INSTAGRAM_SESSION_PATH', './instagram_session')
         self.username = os.getenv('INSTAGRAM_USERNAME')
         self.password = os.getenv('INSTAGRAM_PASSWORD')
         self.browser = None
         self.context = None
         self.page = None
+        self.pool = pool  # Optional BrowserPool to lease a warm context from
+        self.lease = None
 
         Path(self.session_path).mkdir(parents=True, exist_ok=True)
 
     async def _init_browser(self, headless: bool = False):
         """Initialize browser with persistent context"""
+        if self.pool is not None:
+            return await self._lease_browser(headless)
+
         try:
             from playwright.async_api import async_playwright
 
@@ -68,8 +73,33 @@ class InstagramPlaywright:
             logger.error(f"Failed to init browser: {e}")
             return False
 
+    async def _lease_browser(self, headless: bool = False) -> bool:
+        """Lease the warm Instagram context from the browser pool"""
+        if self.lease is not None:
+            return True
+        try:
+            self.lease = await self.pool.acquire(
+                self.session_path,
+                headless=headless,
+                viewport={'width': 430, 'height': 932},  # Mobile viewport
+                user_agent='Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Mobile/15E148 Safari/604.1'
+            )
+            self.context = self.lease.context
+            self.page = self.lease.page
+            return True
+        except Exception as e:
+            logger.error(f"Failed to lease browser: {e}")
+            return False
+
     async def _close_browser(self):
         """Close browser"""
+        if self.pool is not None:
+            # Hand the context back to the pool instead of closing it
+            if self.lease is not None:
+                lease, self.lease = self.lease, None
+                await lease.release()
+            return
+
         try:
             if self.context:
                 await self.context.close()
@@ -77,9 +107,16 @@ class InstagramPlaywright:
                 await self.playwright.stop()
         except Exception as e:
             logger.error(f"Error closing browser: {e}")
+        finally:
+            # Safe to call again from a finally block
+            self.context = None
+            self.playwright = None
 
     async def _check_login(self) -> bool:
         """Check if logged into Instagram"""
+        if self.lease is not None and self.lease.is_logged_in():
+            return True
+
         try:
             await self.page.goto('https://www.instagram.com/', wait_until='domcontentloaded')
             await self.page.wait_for_timeout(3000)
@@ -91,6 +128,8 @@ class InstagramPlaywright:
 
             # Check for home feed elements
             home = await self.page.query_selector('svg[aria-label="Home"]')
+            if self.lease is not None:
+                self.lease.mark_logged_in(home is not None)
             return home is not None
 
         except Exception as e:
@@ -177,7 +216,6 @@ class InstagramPlaywright:
                 logger.warning("Not logged in, attempting login...")
                 login_result = await self.login()
                 if not login_result.get('success'):
-                    await self._close_browser()
                     return {"success": False, "error": "Not logged in"}
                 await self._init_browser()
 
@@ -215,7 +253,6 @@ class InstagramPlaywright:
             await self.page.wait_for_timeout(5000)
 
             logger.info("Image posted successfully")
-            await self._close_browser()
 
             return {
                 "success": True,
@@ -227,8 +264,9 @@ class InstagramPlaywright:
 
         except Exception as e:
             logger.error(f"Post failed: {e}")
-            await self._close_browser()
             return {"success": False, "error": str(e)}
+        finally:
+            await self._close_browser()
 
     async def post_story(self, image_path: str) -> Dict[str, Any]:
         """
@@ -245,7 +283,6 @@ class InstagramPlaywright:
                 return {"success": False, "error": "Failed to init browser"}
 
             if not await self._check_login():
-                await self._close_browser()
                 return {"success": False, "error": "Not logged in"}
 
             await self.page.goto('https://www.instagram.com/')
@@ -267,7 +304,6 @@ class InstagramPlaywright:
             await self.page.wait_for_timeout(3000)
 
             logger.info("Story posted successfully")
-            await self._close_browser()
 
             return {
                 "success": True,
@@ -278,8 +314,9 @@ class InstagramPlaywright:
 
         except Exception as e:
             logger.error(f"Story post failed: {e}")
-            await self._close_browser()
             return {"success": False, "error": str(e)}
+        finally:
+            await self._close_browser()
 
     async def send_dm(self, username: str, message: str) -> Dict[str, Any]:
         """
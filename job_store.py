@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Job Store - Durable SQLite job table for vault file processing
+Replaces in-memory "processed files" sets so processors survive restarts
+without re-processing items, and "have I seen this" checks stay O(1).
+
+Jobs are keyed by (queue, path, content hash), so an edited file is a new
+job while an unchanged one is never processed twice.
+"""
+
+import os
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+DEFAULT_MAX_RETRIES = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    queue TEXT NOT NULL,
+    path TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    state TEXT NOT NULL,
+    retries INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    UNIQUE (queue, path, content_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_queue_state ON jobs (queue, state);
+"""
+
+
+def bytes_hash(data: bytes) -> str:
+    """SHA-256 of already-read file content"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def content_hash(file_path: Path) -> str:
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class JobStore:
+    """WAL-mode SQLite job table shared by the vault processors"""
+
+    def __init__(self, db_path: Path, max_retries: Optional[int] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_retries = max_retries or int(os.getenv('JOB_MAX_RETRIES', DEFAULT_MAX_RETRIES))
+
+        # One connection guarded by a lock; watchdog threads and the main
+        # thread may both touch the store
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    @classmethod
+    def for_vault(cls, vault_path: Path) -> 'JobStore':
+        """Open the default job store for a vault"""
+        return cls(Path(vault_path) / 'state' / 'jobs.db')
+
+    def _now(self) -> str:
+        return datetime.now().isoformat()
+
+    def enqueue(self, queue: str, path: Path, digest: Optional[str] = None) -> Optional[int]:
+        """
+        Queue a file unless this exact content was already handled
+
+        Args:
+            queue: Logical queue name (e.g. 'approved', 'needs_action')
+            path: File path
+            digest: Content hash; computed from the file if omitted
+
+        Returns:
+            Job id if the job is queued and ready to claim, None if it is
+            already running, done, or out of retries
+        """
+        digest = digest or content_hash(path)
+        key = (queue, str(path), digest)
+        now = self._now()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, state, retries FROM jobs WHERE queue = ? AND path = ? AND content_hash = ?",
+                key
+            ).fetchone()
+
+            if row is None:
+                cursor = self._conn.execute(
+                    "INSERT INTO jobs (queue, path, content_hash, state, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, QUEUED, now, now)
+                )
+                return cursor.lastrowid
+
+            job_id, state, retries = row
+            if state == QUEUED:
+                return job_id
+            if state == FAILED and retries < self.max_retries:
+                self._conn.execute(
+                    "UPDATE jobs SET state = ?, updated_at = ? WHERE id = ?",
+                    (QUEUED, now, job_id)
+                )
+                return job_id
+            return None
+
+    def claim(self, job_id: int) -> bool:
+        """Atomically move a queued job to running; False if someone else has it"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = ?, updated_at = ? WHERE id = ? AND state = ?",
+                (RUNNING, self._now(), job_id, QUEUED)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: int):
+        """Mark a job done"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, last_error = NULL, updated_at = ? WHERE id = ?",
+                (DONE, self._now(), job_id)
+            )
+
+    def fail(self, job_id: int, error: str = ""):
+        """Mark a job failed and count the attempt"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, retries = retries + 1, last_error = ?, updated_at = ? WHERE id = ?",
+                (FAILED, (error or "")[:1000], self._now(), job_id)
+            )
+
+    def state_of(self, queue: str, path: Path, digest: str) -> Optional[str]:
+        """State of a job, or None if it was never seen"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM jobs WHERE queue = ? AND path = ? AND content_hash = ?",
+                (queue, str(path), digest)
+            ).fetchone()
+        return row[0] if row else None
+
+    def recover(self, queue: str) -> List[Tuple[int, str]]:
+        """
+        Requeue jobs left running by a crashed process
+
+        Returns:
+            (job id, path) of every queued job in the queue
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, updated_at = ? WHERE queue = ? AND state = ?",
+                (QUEUED, self._now(), queue, RUNNING)
+            )
+            rows = self._conn.execute(
+                "SELECT id, path FROM jobs WHERE queue = ? AND state = ? ORDER BY id",
+                (queue, QUEUED)
+            ).fetchall()
+        if rows:
+            logger.info(f"Recovered {len(rows)} queued jobs in '{queue}'")
+        return rows
+
+    def stats(self, queue: Optional[str] = None) -> Dict[str, Any]:
+        """Job counts by state"""
+        sql = "SELECT state, COUNT(*) FROM jobs"
+        params: tuple = ()
+        if queue:
+            sql += " WHERE queue = ?"
+            params = (queue,)
+        sql += " GROUP BY state"
+
+        with self._lock:
+            counts = dict(self._conn.execute(sql, params).fetchall())
+
+        return {
+            "queue": queue or "all",
+            "total": sum(counts.values()),
+            "by_state": counts
+        }
+
+    def prune(self, days_to_keep: int = 90) -> int:
+        """Delete finished jobs older than the retention window"""
+        cutoff = (datetime.now() - timedelta(days=days_to_keep)).isoformat()
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE state IN (?, ?) AND updated_at < ?",
+                (DONE, FAILED, cutoff)
+            )
+        return cursor.rowcount
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    """Main function for CLI usage"""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Vault Job Store')
+    parser.add_argument('action', choices=['stats', 'prune'], help='Action to perform')
+    parser.add_argument('--queue', help='Queue name')
+    parser.add_argument('--days-to-keep', type=int, default=90, help='Days of finished jobs to keep')
+
+    args = parser.parse_args()
+
+    store = JobStore.for_vault(Path(__file__).parent)
+
+    if args.action == 'stats':
+        print(json.dumps(store.stats(args.queue), indent=2))
+    elif args.action == 'prune':
+        removed = store.prune(args.days_to_keep)
+        print(f"Pruned {removed} finished jobs older than {args.days_to_keep} days")
+
+
+if __name__ == '__main__':
+    main()
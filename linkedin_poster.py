@@ -30,19 +30,29 @@ logger = logging.getLogger(__name__)
 class LinkedInPoster:
     """LinkedIn Poster using Playwright automation"""
 
-    def __init__(self):
-        """Initialize LinkedIn Poster"""
+    def __init__(self, pool=None):
+        """
+        Initialize LinkedIn Poster
+
+        Args:
+            pool: Optional BrowserPool to lease a warm context from
+        """
         self.cookies_path = os.getenv('LINKEDIN_COOKIES_PATH', 'linkedin_cookies.json')
         self.session_path = os.getenv('LINKEDIN_SESSION_PATH', './linkedin_session')
         self.browser = None
         self.context = None
         self.page = None
+        self.pool = pool
+        self.lease = None
 
         # Ensure directories exist
         Path(self.session_path).mkdir(parents=True, exist_ok=True)
 
     async def _init_browser(self, headless: bool = False):
         """Initialize browser with persistent context"""
+        if self.pool is not None:
+            return await self._lease_browser(headless)
+
         try:
             from playwright.async_api import async_playwright
 
@@ -74,18 +84,51 @@ class LinkedInPoster:
             logger.error(f"Failed to initialize browser: {e}")
             return False
 
+    async def _lease_browser(self, headless: bool = False) -> bool:
+        """Lease the warm LinkedIn context from the browser pool"""
+        if self.lease is not None:
+            return True
+        try:
+            self.lease = await self.pool.acquire(
+                self.session_path,
+                headless=headless,
+                viewport={'width': 1280, 'height': 900},
+                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+            )
+            self.context = self.lease.context
+            self.page = self.lease.page
+            if not self.lease.warm:
+                await self._load_cookies()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to lease browser: {e}")
+            return False
+
     async def _close_browser(self):
         """Close browser and save cookies"""
-        try:
-            # Save cookies before closing
-            await self._save_cookies()
+        if self.pool is not None:
+            # Hand the context back to the pool instead of closing it
+            if self.lease is not None:
+                lease, self.lease = self.lease, None
+                try:
+                    await self._save_cookies()
+                finally:
+                    await lease.release()
+            return
 
+        try:
             if self.context:
+                # Save cookies before closing
+                await self._save_cookies()
                 await self.context.close()
             if hasattr(self, 'playwright') and self.playwright:
                 await self.playwright.stop()
         except Exception as e:
             logger.error(f"Error closing browser: {e}")
+        finally:
+            # Safe to call again from a finally block
+            self.context = None
+            self.playwright = None
 
     async def _load_cookies(self):
         """Load saved cookies"""
@@ -111,6 +154,9 @@ class LinkedInPoster:
 
     async def _check_login_status(self) -> bool:
         """Check if logged into LinkedIn"""
+        if self.lease is not None and self.lease.is_logged_in():
+            return True
+
         try:
             await self.page.goto('https://www.linkedin.com/feed/', wait_until='domcontentloaded')
             await self.page.wait_for_timeout(3000)
@@ -122,6 +168,8 @@ class LinkedInPoster:
 
             # Check for feed content (indicates logged in)
             feed = await self.page.query_selector('.feed-shared-update-v2, .share-box-feed-entry__trigger')
+            if self.lease is not None:
+                self.lease.mark_logged_in(feed is not None)
             return feed is not None
 
         except Exception as e:
@@ -190,7 +238,6 @@ class LinkedInPoster:
             if not await self._check_login_status():
                 logger.warning("Not logged in, attempting login...")
                 if not await self.login():
-                    await self._close_browser()
                     return {"success": False, "error": "Not logged in to LinkedIn. Please login first."}
 
             # Go to feed
@@ -225,7 +272,6 @@ class LinkedInPoster:
 
             except Exception as e:
                 logger.error(f"Failed to click post button: {e}")
-                await self._close_browser()
                 return {"success": False, "error": f"Could not open post dialog: {e}"}
 
             # Type content in editor
@@ -251,7 +297,6 @@ class LinkedInPoster:
 
             except Exception as e:
                 logger.error(f"Failed to enter content: {e}")
-                await self._close_browser()
                 return {"success": False, "error": f"Could not enter post content: {e}"}
 
             # Add image if provided
@@ -291,7 +336,6 @@ class LinkedInPoster:
 
             except Exception as e:
                 logger.error(f"Failed to click post button: {e}")
-                await self._close_browser()
                 return {"success": False, "error": f"Could not submit post: {e}"}
 
             # Verify post was created
@@ -299,7 +343,6 @@ class LinkedInPoster:
             modal_closed = await self.page.query_selector('.share-box-feed-entry__trigger')
 
             logger.info("LinkedIn post created successfully")
-            await self._close_browser()
 
             return {
                 "success": True,
@@ -311,8 +354,9 @@ class LinkedInPoster:
 
         except Exception as e:
             logger.error(f"Post creation failed: {e}")
-            await self._close_browser()
             return {"success": False, "error": str(e)}
+        finally:
+            await self._close_browser()
 
     async def post_article(
         self,
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Log Archive - Seekable block-compressed JSONL archives and a shared reader
+Archived logs are written as a series of independently gzip-compressed
+chunks followed by an empty gzip member whose header extra field holds an
+index of each chunk's first timestamp, offset and length. The result is
+still a valid .gz file (gzip/zcat read it unchanged), but readers that know
+the index can jump straight to the chunks covering a time range.
+
+iter_log_sources() and iter_log_entries() let log consumers walk live
+.json/.jsonl files, .gz archives and members of monthly .tar archives the
+same way.
+"""
+
+import io
+import os
+import gzip
+import json
+import zlib
+import fnmatch
+import tarfile
+import tempfile
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Iterator, Tuple, Union, IO
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Uncompressed bytes per independently compressed chunk
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+# Gzip extra subfield id carrying the chunk index
+INDEX_SUBFIELD = b'LX'
+INDEX_VERSION = 1
+
+# Lock file guarding the per-day sidecars (indexes, rollups) in a logs folder
+SIDECAR_LOCK = '.sidecars.lock'
+
+# Empty raw-deflate stream plus a zero CRC32 and size: the end of the footer
+_EMPTY_DEFLATE = b'\x03\x00'
+_EMPTY_TRAILER = b'\x00' * 8
+
+# Largest payload a gzip extra field can hold (XLEN is 16 bits)
+_MAX_EXTRA = 65535 - 4
+
+TIMESTAMP_FIELDS = ('timestamp', 'time', 'ts')
+
+LIVE_SUFFIXES = ('.json', '.jsonl')
+ARCHIVE_SUFFIXES = ('.json.gz', '.jsonl.gz')
+
+TimeBound = Optional[Union[datetime, str]]
+
+
+def _entry_timestamp(line: bytes) -> Optional[str]:
+    """Timestamp string of a JSONL line, if it has one"""
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    if isinstance(entry, dict):
+        for field in TIMESTAMP_FIELDS:
+            value = entry.get(field)
+            if isinstance(value, str):
+                return value
+    return None
+
+
+def _bound(value: TimeBound) -> Optional[str]:
+    """Normalize a datetime/ISO string bound for string comparison"""
+    if value is None:
+        return None
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def _footer(index: Dict[str, Any]) -> bytes:
+    """Empty gzip member carrying the index in its FEXTRA field"""
+    payload = json.dumps(index, separators=(',', ':')).encode('utf-8')
+    payload += len(payload).to_bytes(4, 'little')
+    if len(payload) > _MAX_EXTRA:
+        raise ValueError("Archive index too large for gzip footer; use a larger chunk size")
+    extra = INDEX_SUBFIELD + len(payload).to_bytes(2, 'little') + payload
+    header = b'\x1f\x8b\x08\x04' + b'\x00' * 4 + b'\x00\xff' + len(extra).to_bytes(2, 'little')
+    return header + extra + _EMPTY_DEFLATE + _EMPTY_TRAILER
+
+
+def compress_log(src: Path, dest: Optional[Path] = None, chunk_size: Optional[int] = None,
+                 level: int = 6) -> Dict[str, Any]:
+    """
+    Write a JSONL log as a seekable block-compressed .gz archive
+
+    Args:
+        src: Log file to compress
+        dest: Archive path (default: src + '.gz'); written atomically
+        chunk_size: Uncompressed bytes per chunk
+        level: zlib compression level
+
+    Returns:
+        Dict with dest, original_size, compressed_size, chunks and lines
+    """
+    src = Path(src)
+    dest = Path(dest) if dest else src.with_suffix(src.suffix + '.gz')
+    chunk_size = chunk_size or int(os.getenv('LOG_ARCHIVE_CHUNK_SIZE', DEFAULT_CHUNK_SIZE))
+    tmp_dest = dest.with_suffix(dest.suffix + '.tmp')
+
+    chunks: List[List[Any]] = []
+    total_lines = 0
+    original_size = 0
+
+    with open(src, 'rb') as f_in, open(tmp_dest, 'wb') as f_out:
+        buffer: List[bytes] = []
+        buffered = 0
+        first_ts: Optional[str] = None
+        last_ts: Optional[str] = None
+
+        def flush_chunk():
+            nonlocal buffer, buffered, first_ts
+            if not buffer:
+                return
+            data = gzip.compress(b''.join(buffer), compresslevel=level, mtime=0)
+            chunks.append([first_ts, f_out.tell(), len(data), len(buffer)])
+            f_out.write(data)
+            buffer, buffered, first_ts = [], 0, None
+
+        for line in f_in:
+            original_size += len(line)
+            if not line.endswith(b'\n'):
+                line += b'\n'
+            ts = _entry_timestamp(line)
+            if ts is not None:
+                last_ts = ts
+            if not buffer:
+                first_ts = ts or last_ts
+            buffer.append(line)
+            buffered += len(line)
+            total_lines += 1
+            if buffered >= chunk_size:
+                flush_chunk()
+        flush_chunk()
+
+        f_out.write(_footer({
+            'v': INDEX_VERSION,
+            'lines': total_lines,
+            'bytes': original_size,
+            'last_ts': last_ts,
+            'chunks': chunks
+        }))
+        f_out.flush()
+        os.fsync(f_out.fileno())
+
+    os.replace(tmp_dest, dest)
+    return {
+        'dest': dest,
+        'original_size': original_size,
+        'compressed_size': dest.stat().st_size,
+        'chunks': len(chunks),
+        'lines': total_lines
+    }
+
+
+def read_index(fileobj: IO[bytes], size: int) -> Optional[Dict[str, Any]]:
+    """Chunk index of a block-compressed archive, or None for plain gzip"""
+    if size < 30:
+        return None
+    tail_size = min(size, _MAX_EXTRA + 30)
+    fileobj.seek(size - tail_size)
+    tail = fileobj.read(tail_size)
+
+    if tail[-10:] != _EMPTY_DEFLATE + _EMPTY_TRAILER:
+        return None
+    length = int.from_bytes(tail[-14:-10], 'little')
+    payload_end = len(tail) - 14
+    payload_start = payload_end - length
+    if payload_start < 4 or tail[payload_start - 4:payload_start - 2] != INDEX_SUBFIELD:
+        return None
+    try:
+        index = json.loads(tail[payload_start:payload_end])
+    except ValueError:
+        return None
+    return index if isinstance(index, dict) and index.get('v') == INDEX_VERSION else None
+
+
+def select_chunks(index: Dict[str, Any], start: TimeBound = None,
+                  end: TimeBound = None) -> List[List[Any]]:
+    """Chunks that may hold entries between start and end (inclusive)"""
+    start, end = _bound(start), _bound(end)
+    chunks = index.get('chunks', [])
+    selected = []
+    for i, chunk in enumerate(chunks):
+        first_ts = chunk[0]
+        next_ts = chunks[i + 1][0] if i + 1 < len(chunks) else None
+        if end is not None and first_ts is not None and first_ts > end:
+            break
+        if start is not None and next_ts is not None and next_ts < start:
+            continue
+        selected.append(chunk)
+    return selected
+
+
+def _iter_file_lines(fileobj: IO[bytes], size: int, name: str, start: TimeBound = None,
+                     end: TimeBound = None) -> Iterator[bytes]:
+    """Raw lines of a live, gzip or block-compressed log"""
+    if not name.endswith('.gz'):
+        fileobj.seek(0)
+        yield from fileobj
+        return
+
+    index = read_index(fileobj, size)
+    if index is None:
+        # Whole-file gzip from before the block format: stream it
+        fileobj.seek(0)
+        with gzip.GzipFile(fileobj=fileobj, mode='rb') as gz:
+            yield from gz
+        return
+
+    for _, offset, length, _ in select_chunks(index, start, end):
+        fileobj.seek(offset)
+        yield from io.BytesIO(gzip.decompress(fileobj.read(length)))
+
+
+class LogSource:
+    """One live log file, archive file, or member of a monthly tar archive"""
+
+    def __init__(self, name: str, path: Path, member: Optional[str] = None):
+        self.name = name
+        self.path = Path(path)
+        self.member = member
+
+    def __repr__(self):
+        return f"LogSource({self.path}{'::' + self.member if self.member else ''})"
+
+    @property
+    def archived(self) -> bool:
+        return self.member is not None or self.name.endswith('.gz')
+
+    @contextmanager
+    def open(self) -> Iterator[Tuple[IO[bytes], int]]:
+        """Binary seekable file object and its size"""
+        if self.member is None:
+            with open(self.path, 'rb') as f:
+                yield f, self.path.stat().st_size
+            return
+
+        with tarfile.open(self.path, 'r:*') as tar:
+            info = tar.getmember(self.member)
+            f = tar.extractfile(info)
+            try:
+                yield f, info.size
+            finally:
+                f.close()
+
+    def iter_lines(self, start: TimeBound = None, end: TimeBound = None) -> Iterator[bytes]:
+        """Raw lines, skipping archive chunks outside the time range"""
+        with self.open() as (f, size):
+            yield from _iter_file_lines(f, size, self.name, start, end)
+
+    def iter_entries(self, start: TimeBound = None, end: TimeBound = None) -> Iterator[Dict[str, Any]]:
+        """Parsed JSON entries, filtered to the time range when one is given"""
+        start_bound, end_bound = _bound(start), _bound(end)
+        for line in self.iter_lines(start, end):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if start_bound or end_bound:
+                ts = next((entry.get(f) for f in TIMESTAMP_FIELDS
+                           if isinstance(entry, dict) and isinstance(entry.get(f), str)), None)
+                if ts is not None:
+                    if start_bound and ts < start_bound:
+                        continue
+                    if end_bound and ts > end_bound:
+                        continue
+            yield entry
+
+
+def _is_log_name(name: str) -> bool:
+    return name.endswith(LIVE_SUFFIXES) or name.endswith(ARCHIVE_SUFFIXES)
+
+
+def log_stem(name: str) -> str:
+    """'2026-01-05.json.gz' -> '2026-01-05'"""
+    for suffix in ARCHIVE_SUFFIXES + LIVE_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def iter_log_sources(directory: Path, pattern: str = '*', include_live: bool = True,
+                     include_archived: bool = True) -> Iterator[LogSource]:
+    """
+    Every log in a directory and its archives/ folder, in name order
+
+    Args:
+        directory: Log directory (e.g. Logs/actions)
+        pattern: fnmatch pattern on the log name without suffixes
+        include_live: Include uncompressed .json/.jsonl files
+        include_archived: Include .gz files and monthly .tar members
+    """
+    directory = Path(directory)
+    sources: List[LogSource] = []
+
+    for folder in (directory, directory / 'archives'):
+        if not folder.is_dir():
+            continue
+        for path in folder.iterdir():
+            name = path.name
+            if name.endswith(('.tar', '.tar.gz')):
+                if not include_archived:
+                    continue
+                try:
+                    with tarfile.open(path, 'r:*') as tar:
+                        for member in tar.getmembers():
+                            if member.isfile() and _is_log_name(member.name) and \
+                                    fnmatch.fnmatch(log_stem(member.name), pattern):
+                                sources.append(LogSource(member.name, path, member.name))
+                except (tarfile.TarError, OSError) as e:
+                    logger.warning(f"Unreadable log archive {path}: {e}")
+                continue
+
+            if not path.is_file() or not _is_log_name(name):
+                continue
+            if not fnmatch.fnmatch(log_stem(name), pattern):
+                continue
+            archived = name.endswith('.gz')
+            if (archived and include_archived) or (not archived and include_live):
+                sources.append(LogSource(name, path))
+
+    sources.sort(key=lambda source: (log_stem(source.name), source.archived))
+    return iter(sources)
+
+
+def iter_log_entries(directory: Path, pattern: str = '*', start: TimeBound = None,
+                     end: TimeBound = None) -> Iterator[Dict[str, Any]]:
+    """Entries from live and archived logs alike, limited to a time range"""
+    for source in iter_log_sources(directory, pattern):
+        try:
+            yield from source.iter_entries(start, end)
+        except (OSError, EOFError, zlib.error, tarfile.TarError) as e:
+            logger.warning(f"Failed to read {source}: {e}")
+
+
+def archived_path(log_file: Path) -> Path:
+    """Where compress_log puts the archive of a live log"""
+    log_file = Path(log_file)
+    return log_file.with_suffix(log_file.suffix + '.gz')
+
+
+def log_size(log_file: Path) -> Optional[int]:
+    """
+    Uncompressed size of a log, whether live or archived
+
+    Returns:
+        Size in bytes, 0 if neither exists, None for a legacy whole-file
+        gzip archive whose size is not recorded
+    """
+    log_file = Path(log_file)
+    try:
+        return log_file.stat().st_size
+    except OSError:
+        pass
+
+    archive = archived_path(log_file)
+    if not archive.exists():
+        return 0
+    with open(archive, 'rb') as f:
+        index = read_index(f, archive.stat().st_size)
+    return index.get('bytes') if index else None
+
+
+def iter_lines_from(log_file: Path, offset: int = 0) -> Iterator[bytes]:
+    """
+    Lines of a log starting at an uncompressed byte offset
+
+    Reads the live file if it exists, otherwise its archive; lets
+    incremental sidecars keep working after their log is compressed.
+    """
+    log_file = Path(log_file)
+    if log_file.exists():
+        with open(log_file, 'rb') as f:
+            f.seek(offset)
+            yield from f
+        return
+
+    archive = archived_path(log_file)
+    if not archive.exists():
+        return
+    position = 0
+    for line in open_log(archive).iter_lines():
+        if position >= offset:
+            yield line
+        position += len(line)
+
+
+@contextmanager
+def sidecar_lock(folder: Path) -> Iterator[None]:
+    """
+    Exclusive lock shared by every process refreshing sidecars in a folder
+
+    Held around read-extend-save, so a process that waited re-reads the
+    sidecar the other one saved instead of overwriting it with less.
+    """
+    with open(Path(folder) / SIDECAR_LOCK, 'a+b') as f:
+        f.seek(0)
+        if os.name == 'nt':
+            import msvcrt
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ten tries a second apart
+                    continue
+        else:
+            import fcntl
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == 'nt':
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def write_sidecar(path: Path, data: Dict[str, Any]):
+    """Atomically replace a JSON sidecar through a temp file of its own"""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_name, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
+def open_log(path: Path) -> LogSource:
+    """LogSource for a single file path"""
+    path = Path(path)
+    return LogSource(path.name, path)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Log Integrity - Incremental, checkpointed verification of JSONL logs
+Every log directory keeps a ledger with one checkpoint per segment (daily
+file): the byte offset and line count verified so far, a rolling hash
+chained over every line, and a hash of the bytes just before the offset.
+A run only reads what was appended since the last checkpoint, yet still
+notices truncation, rewrites at the checkpoint and deleted segments.
+
+Segments are chained in the order they appeared: each segment's hash
+starts from its predecessor's final hash, so a full verification
+(full=True) re-reads the history and detects edits anywhere in it.
+Checkpoints follow a segment into its .gz archive or monthly tar.
+"""
+
+import os
+import json
+import hashlib
+import itertools
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Iterator
+
+from log_archive import LogSource, iter_log_sources, log_stem
+
+LEDGER_VERSION = 1
+GENESIS_HASH = '0' * 64
+
+# Bytes before the checkpoint that are re-hashed on every run
+TAIL_BYTES = 4096
+
+# Problems remembered per segment (reported on every run)
+MAX_RECORDED_ERRORS = 20
+
+
+def _start_hash(prev_hash: str, stem: str) -> bytes:
+    """Chain state at the start of a segment"""
+    return hashlib.sha256(bytes.fromhex(prev_hash) + stem.encode('utf-8')).digest()
+
+
+def _new_checkpoint(prev_hash: str, stem: str) -> Dict[str, Any]:
+    return {
+        'offset': 0,
+        'lines': 0,
+        'hash': _start_hash(prev_hash, stem).hex(),
+        'tail': hashlib.sha256(b'').hexdigest(),
+        'prev': prev_hash,
+        'sealed': False,
+        'complete': False,
+        'retired': False,
+        'errors': [],
+        'verified_at': None
+    }
+
+
+class IntegrityLedger:
+    """Checkpoints and hash chain for the log segments in one directory"""
+
+    def __init__(self, log_dir: Path, ledger_file: Optional[Path] = None):
+        self.log_dir = Path(log_dir)
+        # Kept outside the log directory so it is never mistaken for a log
+        self.ledger_file = Path(ledger_file) if ledger_file else \
+            self.log_dir.parent / 'integrity' / f'{self.log_dir.name}.json'
+        self.order: List[str] = []
+        self.segments: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    def load(self) -> 'IntegrityLedger':
+        try:
+            with open(self.ledger_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == LEDGER_VERSION:
+                self.order = data['order']
+                self.segments = data['segments']
+        except (OSError, ValueError, KeyError):
+            pass
+        return self
+
+    def save(self):
+        """Atomically write the ledger"""
+        self.ledger_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.ledger_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': LEDGER_VERSION, 'order': self.order,
+                       'segments': self.segments}, f, separators=(',', ':'))
+        os.replace(tmp_file, self.ledger_file)
+
+    @property
+    def head(self) -> str:
+        """Hash of the newest segment: the current end of the chain"""
+        return self.segments[self.order[-1]]['hash'] if self.order else GENESIS_HASH
+
+    def retire(self, path: Path):
+        """
+        Mark the segments in a file as removed by retention, so their
+        absence is not reported; call before deleting the file
+        """
+        path = Path(path)
+        names = [path.name]
+        if path.name.endswith(('.tar', '.tar.gz')):
+            names = [source.name for source in iter_log_sources(path.parent)
+                     if source.path == path]
+        for name in names:
+            checkpoint = self.segments.get(log_stem(name))
+            if checkpoint:
+                checkpoint['retired'] = True
+        self.save()
+
+    def reset(self, stem: Optional[str] = None):
+        """Forget one segment's checkpoint (or all) so it is verified afresh"""
+        if stem is None:
+            self.order, self.segments = [], {}
+        elif stem in self.segments:
+            checkpoint = self.segments[stem]
+            self.segments[stem] = _new_checkpoint(checkpoint['prev'], stem)
+        self.save()
+
+    def verify(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Verify new log data and advance the checkpoints
+
+        Args:
+            full: Re-read every segment from the start and check the chain
+
+        Returns:
+            {"issues": [...], "segments", "lines_verified", "bytes_verified", "head"}
+        """
+        sources: Dict[str, LogSource] = {}
+        for source in iter_log_sources(self.log_dir):
+            # Live file wins over an archive left behind by an interrupted move
+            sources.setdefault(log_stem(source.name), source)
+
+        result = {"issues": [], "segments": 0, "lines_verified": 0, "bytes_verified": 0}
+        prev_hash = GENESIS_HASH
+        for stem in self.order:
+            self._check(stem, sources.get(stem), prev_hash, full, result)
+            prev_hash = self.segments[stem]['hash']
+
+        # New segments join the chain in the order they were first seen,
+        # sealing the segment before them
+        for stem in sorted(set(sources) - set(self.segments)):
+            if self.order:
+                self.segments[self.order[-1]]['sealed'] = True
+            self.segments[stem] = _new_checkpoint(self.head, stem)
+            self.order.append(stem)
+            self._check(stem, sources[stem], self.segments[stem]['prev'], full, result)
+
+        self.save()
+        result["segments"] = len(self.order)
+        result["head"] = self.head
+        return result
+
+    def _check(self, stem: str, source: Optional[LogSource], prev_hash: str, full: bool,
+               result: Dict[str, Any]):
+        """Verify one segment and its link to the previous one"""
+        checkpoint = self.segments[stem]
+        if checkpoint['prev'] != prev_hash:
+            result["issues"].append(f"Hash chain broken at {stem}: predecessor hash does not match")
+
+        if source is None:
+            if not checkpoint['retired']:
+                result["issues"].append(f"Log segment {stem} is missing "
+                                        f"(verified through line {checkpoint['lines']})")
+            return
+
+        try:
+            result["issues"].extend(self._verify_segment(stem, source, checkpoint, full, result))
+        except Exception as e:
+            result["issues"].append(f"Error reading {source.name}: {e}")
+
+    def _verify_segment(self, stem: str, source: LogSource, checkpoint: Dict[str, Any], full: bool,
+                        result: Dict[str, Any]) -> List[str]:
+        """Check one segment against its checkpoint and verify what follows it"""
+        if full:
+            return self._rescan(stem, source, checkpoint, result)
+
+        if source.archived:
+            if checkpoint['complete']:
+                # Verified to the end while live; only a full check re-reads it
+                return list(checkpoint['errors'])
+            lines = _lines_after(source.iter_lines(), checkpoint['offset'])
+            return self._advance(source, checkpoint, lines, result)
+
+        with open(source.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < checkpoint['offset']:
+                return [f"{source.name} was truncated: {size} bytes, "
+                        f"{checkpoint['offset']} bytes verified"]
+
+            start = max(0, checkpoint['offset'] - TAIL_BYTES)
+            f.seek(start)
+            if hashlib.sha256(f.read(checkpoint['offset'] - start)).hexdigest() != checkpoint['tail']:
+                return [f"{source.name} was modified before line {checkpoint['lines']}"]
+
+            if size == checkpoint['offset']:
+                checkpoint['complete'] = checkpoint['sealed']
+                return list(checkpoint['errors'])
+            if checkpoint['sealed']:
+                _record(checkpoint, f"{source.name} grew after a newer log segment started")
+            return self._advance(source, checkpoint, f, result)
+
+    def _advance(self, source: LogSource, checkpoint: Dict[str, Any], lines: Iterator[bytes],
+                 result: Dict[str, Any]) -> List[str]:
+        """Validate and hash complete lines, moving the checkpoint past them"""
+        digest = bytes.fromhex(checkpoint['hash'])
+        tail = b''
+        offset, line_count = checkpoint['offset'], checkpoint['lines']
+        partial = False
+
+        for line in lines:
+            if not line.endswith(b'\n'):
+                # Still being written; picked up next time
+                partial = True
+                if checkpoint['sealed'] and line.strip():
+                    _record(checkpoint, f"Incomplete last line in {source.name} after line {line_count}")
+                break
+            line_count += 1
+            if line.strip():
+                try:
+                    json.loads(line)
+                except ValueError as e:
+                    _record(checkpoint, f"Invalid JSON in {source.name} line {line_count}: {e}")
+            digest = hashlib.sha256(digest + line).digest()
+            offset += len(line)
+            tail = (tail + line)[-TAIL_BYTES:]
+            result["lines_verified"] += 1
+            result["bytes_verified"] += len(line)
+
+        if offset > checkpoint['offset']:
+            if len(tail) < min(offset, TAIL_BYTES) and not source.archived:
+                # Short append: the tail window still reaches older bytes
+                tail = self._read_tail(source, offset)
+            checkpoint.update({
+                'offset': offset,
+                'lines': line_count,
+                'hash': digest.hex(),
+                'tail': hashlib.sha256(tail).hexdigest(),
+                'verified_at': datetime.now().isoformat()
+            })
+        checkpoint['complete'] = checkpoint['sealed'] and not partial
+        return list(checkpoint['errors'])
+
+    def _read_tail(self, source: LogSource, offset: int) -> bytes:
+        with open(source.path, 'rb') as f:
+            start = max(0, offset - TAIL_BYTES)
+            f.seek(start)
+            return f.read(offset - start)
+
+    def _rescan(self, stem: str, source: LogSource, checkpoint: Dict[str, Any],
+                result: Dict[str, Any]) -> List[str]:
+        """Recompute the chain from the segment's start and compare"""
+        digest = _start_hash(checkpoint['prev'], stem)
+        offset = 0
+        lines = source.iter_lines()
+        for line in lines:
+            if offset == checkpoint['offset'] or not line.endswith(b'\n'):
+                lines = itertools.chain([line], lines)
+                break
+            digest = hashlib.sha256(digest + line).digest()
+            offset += len(line)
+
+        if offset < checkpoint['offset']:
+            return [f"{source.name} was truncated: {offset} bytes, {checkpoint['offset']} bytes verified"]
+        if digest.hex() != checkpoint['hash']:
+            return [f"{source.name} does not match its hash chain: "
+                    f"contents changed before line {checkpoint['lines']}"]
+        return self._advance(source, checkpoint, lines, result)
+
+
+def _record(checkpoint: Dict[str, Any], issue: str):
+    """Remember a problem so it keeps being reported"""
+    if issue not in checkpoint['errors'] and len(checkpoint['errors']) < MAX_RECORDED_ERRORS:
+        checkpoint['errors'].append(issue)
+
+
+def _lines_after(lines: Iterator[bytes], offset: int) -> Iterator[bytes]:
+    """Lines of a stream that cannot seek, starting at a line-aligned offset"""
+    position = 0
+    for line in lines:
+        if position >= offset:
+            yield line
+        position += len(line)
+
+
+def main():
+    """Main function for CLI usage"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Checkpointed log integrity verification')
+    parser.add_argument('log_dir', help='Log directory (e.g. Logs/actions)')
+    parser.add_argument('--full', action='store_true', help='Re-read all history and check the hash chain')
+    parser.add_argument('--reset', nargs='?', const='*', help='Drop the checkpoint of a segment (or all)')
+
+    args = parser.parse_args()
+
+    ledger = IntegrityLedger(Path(args.log_dir))
+    if args.reset:
+        ledger.reset(None if args.reset == '*' else args.reset)
+
+    result = ledger.verify(full=args.full)
+    for issue in result["issues"]:
+        print(f"  - {issue}")
+    print(f"{result['segments']} segments, {result['lines_verified']} new lines "
+          f"({result['bytes_verified'] / 1024:.1f} KB) verified, head {result['head'][:16]}")
+
+
+if __name__ == '__main__':
+    main()
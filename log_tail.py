@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Log Tail - Read the newest lines of a log without reading the whole file
+Lines are produced newest first by reading fixed-size blocks backwards from
+the end of the file, so finding the last few matching lines costs time
+proportional to how far back they are, not to the size of the log. An
+optional mmap path (use_mmap=True or LOG_TAIL_MMAP=1) scans the mapped file
+in place instead of copying blocks.
+
+    from log_tail import tail_lines
+    tail_lines(Path('Logs/auto_processor.log'), 3)            # last 3 non-empty lines
+    tail_lines(Path('error.log'), 1, match='ERROR')           # last error
+"""
+
+import os
+import mmap
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Union
+
+# Bytes read per step backwards
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+Matcher = Union[str, Callable[[str], bool], None]
+
+
+def _mmap_enabled(use_mmap: Optional[bool]) -> bool:
+    if use_mmap is not None:
+        return use_mmap
+    return os.getenv('LOG_TAIL_MMAP', '').lower() in ('1', 'true', 'yes')
+
+
+def _reversed_blocks(f, size: int, block_size: int) -> Iterator[bytes]:
+    """Lines of an open file, newest first, read block by block from the end"""
+    position = size
+    partial = b''
+    while position > 0:
+        start = max(0, position - block_size)
+        f.seek(start)
+        block = f.read(position - start) + partial
+        position = start
+        lines = block.split(b'\n')
+        # The first piece may continue in the previous block
+        partial = lines.pop(0)
+        for line in reversed(lines):
+            yield line
+    yield partial
+
+
+def _reversed_mmap(f, size: int) -> Iterator[bytes]:
+    """Lines of an open file, newest first, found in place in a memory map"""
+    with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mapped:
+        end = size
+        while end >= 0:
+            start = mapped.rfind(b'\n', 0, end) + 1
+            yield mapped[start:end]
+            end = start - 1
+
+
+def iter_lines_reversed(path: Path, block_size: int = DEFAULT_BLOCK_SIZE,
+                        use_mmap: Optional[bool] = None) -> Iterator[bytes]:
+    """
+    Yield a file's lines newest first, without their line endings
+
+    A final line without a trailing newline is yielded first; the empty
+    string after a trailing newline is not.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            size -= 1
+        lines = _reversed_mmap(f, size) if _mmap_enabled(use_mmap) and size > 0 \
+            else _reversed_blocks(f, size, block_size)
+        for line in lines:
+            yield line[:-1] if line.endswith(b'\r') else line
+
+
+def _matcher(match: Matcher) -> Callable[[str], bool]:
+    if match is None:
+        return lambda line: bool(line.strip())
+    if isinstance(match, str):
+        return lambda line: match in line
+    return match
+
+
+def iter_matching_reversed(path: Path, match: Matcher = None, encoding: str = 'utf-8',
+                           use_mmap: Optional[bool] = None) -> Iterator[str]:
+    """
+    Decoded lines newest first, filtered by `match`
+
+    Args:
+        path: Log file
+        match: Substring, predicate, or None for any non-empty line
+        encoding: Text encoding; undecodable bytes are replaced
+        use_mmap: Force the mmap path on or off (default: LOG_TAIL_MMAP)
+    """
+    accept = _matcher(match)
+    for raw in iter_lines_reversed(path, use_mmap=use_mmap):
+        line = raw.decode(encoding, errors='replace')
+        if accept(line):
+            yield line
+
+
+def tail_lines(path: Path, n: int = 10, match: Matcher = None, encoding: str = 'utf-8',
+               use_mmap: Optional[bool] = None) -> List[str]:
+    """
+    The last n matching lines of a file, oldest first
+
+    Returns an empty list if the file does not exist or cannot be read.
+    """
+    if n <= 0:
+        return []
+    lines = []
+    try:
+        for line in iter_matching_reversed(Path(path), match, encoding, use_mmap):
+            lines.append(line)
+            if len(lines) >= n:
+                break
+    except (OSError, ValueError):
+        return []
+    lines.reverse()
+    return lines
+
+
+def last_line(path: Path, match: Matcher = None, encoding: str = 'utf-8') -> Optional[str]:
+    """The last matching line of a file, or None"""
+    lines = tail_lines(path, 1, match, encoding)
+    return lines[0] if lines else None
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Metrics - Lightweight in-process counters, gauges and histograms
+Long-running components record what they do here and export it in the
+Prometheus text format as a node-exporter textfile (Logs/metrics/<job>.prom,
+rewritten every METRICS_INTERVAL seconds) and, if METRICS_PORT is set, over
+HTTP on that port (/metrics). The textfile is always written because its
+age is the heartbeat the health monitor checks; a process that finds the
+port taken by another one keeps to the textfile. Metrics recorded before
+start_exporter() is called are simply kept in memory.
+
+    from metrics import counter, histogram
+    POSTS = counter('ai_employee_posts_total', 'Posts sent', ['platform', 'result'])
+    POSTS.inc(platform='twitter', result='success')
+"""
+
+import os
+import time
+import math
+import atexit
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, List, Tuple, Iterable, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers fast parses up to slow browser-driven posts
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+DEFAULT_EXPORT_INTERVAL = 15.0  # seconds
+
+# Where textfiles go, relative to the vault
+METRICS_DIRNAME = Path('Logs') / 'metrics'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    """Base for a named metric family with optional labels"""
+
+    type_name = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        return []
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    type_name = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    type_name = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed cumulative buckets"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._values: Dict[Tuple[str, ...], List[float]] = {}  # bucket counts..., sum
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [0.0] * (len(self.buckets) + 1)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+                    break
+            data[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a with-block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(data)) for key, data in self._values.items())
+        lines = []
+        for key, data in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, data):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, ('le', _format_value(bound)))} "
+                             f"{_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_format_value(data[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {_format_value(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics for one process; asking for a name again returns the same metric"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, documentation: str, labelnames: Iterable[str], **kwargs) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"Metric {name} is already registered as a {metric.type_name}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._get(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._get(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: Path):
+        """Atomically write the metrics for node-exporter's textfile collector"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_suffix('.prom.tmp')
+        tmp_file.write_text(self.render(), encoding='utf-8')
+        os.replace(tmp_file, path)
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+    return REGISTRY.counter(name, documentation, labelnames)
+
+
+def gauge(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+    return REGISTRY.gauge(name, documentation, labelnames)
+
+
+def histogram(name: str, documentation: str, labelnames: Iterable[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.histogram(name, documentation, labelnames, buckets)
+
+
+PROCESS_START = gauge('ai_employee_process_start_time_seconds', 'Unix time the process started', ['job'])
+HEARTBEAT = gauge('ai_employee_heartbeat_timestamp_seconds', 'Unix time of the last metrics export', ['job'])
+
+
+class MetricsExporter:
+    """Publishes a registry as a textfile on an interval, and optionally over HTTP"""
+
+    def __init__(self, job: str, vault_path: Optional[Path] = None, port: Optional[int] = None,
+                 textfile_dir: Optional[Path] = None, interval: Optional[float] = None,
+                 registry: MetricsRegistry = REGISTRY):
+        self.job = job
+        self.registry = registry
+        port = port if port is not None else os.getenv('METRICS_PORT')
+        self.port = int(port) if port else None
+        vault_path = Path(vault_path or os.getenv('VAULT_PATH') or Path(__file__).parent)
+        self.textfile = Path(textfile_dir or os.getenv('METRICS_TEXTFILE_DIR') or
+                             vault_path / METRICS_DIRNAME) / f"{job}.prom"
+        self.interval = interval if interval is not None else \
+            float(os.getenv('METRICS_INTERVAL', DEFAULT_EXPORT_INTERVAL))
+        self._stop = threading.Event()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+        PROCESS_START.set(time.time(), job=job)
+
+    def start(self) -> 'MetricsExporter':
+        if self.port:
+            try:
+                self._serve()
+            except OSError as e:
+                # Every process reads the same METRICS_PORT; only the first one gets it
+                logger.warning(f"Metrics port {self.port} unavailable for {self.job} ({e}), "
+                               f"exporting to {self.textfile} only")
+                self.port = None
+        threading.Thread(target=self._run, name=f'metrics-{self.job}', daemon=True).start()
+        atexit.register(self.stop)
+        return self
+
+    def _serve(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                HEARTBEAT.set(time.time(), job=exporter.job)
+                body = exporter.registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+        threading.Thread(target=self._server.serve_forever, name=f'metrics-http-{self.job}', daemon=True).start()
+        logger.info(f"Serving metrics for {self.job} on http://127.0.0.1:{self.port}/metrics")
+
+    def _run(self):
+        while True:
+            self.export()
+            if self._stop.wait(self.interval):
+                return
+
+    def export(self):
+        """Write the textfile now"""
+        HEARTBEAT.set(time.time(), job=self.job)
+        try:
+            self.registry.write_textfile(self.textfile)
+        except Exception as e:
+            logger.error(f"Failed to write metrics for {self.job}: {e}")
+
+    def stop(self):
+        """Final export, then stop publishing"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        self.export()
+
+
+_exporter: Optional[MetricsExporter] = None
+_exporter_lock = threading.Lock()
+
+
+def start_exporter(job: str, vault_path: Optional[Path] = None) -> MetricsExporter:
+    """Start publishing this process's metrics (once per process)"""
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = MetricsExporter(job, vault_path).start()
+        return _exporter
+
+
+def heartbeat_age(job: str, vault_path: Path) -> Optional[float]:
+    """Seconds since a process last exported its textfile, None if it never has"""
+    textfile = Path(os.getenv('METRICS_TEXTFILE_DIR') or Path(vault_path) / METRICS_DIRNAME) / f"{job}.prom"
+    try:
+        return time.time() - textfile.stat().st_mtime
+    except OSError:
+        return None
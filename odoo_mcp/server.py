@@ -25,6 +25,12 @@ from mcp.types import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+from metrics import counter, histogram, start_exporter
+
+# Metrics
+TOOL_CALLS = counter('ai_employee_mcp_tool_calls_total', 'MCP tool calls', ['server', 'tool', 'result'])
+TOOL_SECONDS = histogram('ai_employee_mcp_tool_seconds', 'MCP tool call latency', ['server', 'tool'])
+
 
 class OdooClient:
     """Odoo JSON-RPC client for accounting operations"""
@@ -210,6 +216,18 @@ async def list_tools() -> List[Tool]:
 
 @server.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+    """Handle tool calls to interact with Odoo"""
+    result = 'error'
+    try:
+        with TOOL_SECONDS.time(server='odoo', tool=name):
+            response = await _call_tool(name, arguments)
+        result = 'ok'
+        return response
+    finally:
+        TOOL_CALLS.inc(server='odoo', tool=name, result=result)
+
+
+async def _call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle tool calls to interact with Odoo"""
     client = get_odoo_client()
 
@@ -441,6 +459,8 @@ async def main():
     """Run the MCP server"""
     from mcp.server.stdio import stdio_server
 
+    start_exporter('odoo_mcp')
+
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
@@ -10,6 +10,8 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
+from search_index import open_search_index
+
 class PriorityLevel(Enum):
     CRITICAL = "Critical"
     HIGH = "High"
@@ -746,42 +748,24 @@ It outlines the approach, timeline, and resources required for successful implem
         Scan input sources for planning opportunities
         """
         opportunities = []
-
-        # Check Needs_Action folder for opportunities
-        needs_action_path = "Needs_Action"
-        if os.path.exists(needs_action_path):
-            for filename in os.listdir(needs_action_path):
-                if filename.endswith('.md'):
-                    filepath = os.path.join(needs_action_path, filename)
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        content = f.read()
-
-                    # Check if this item has planning opportunity indicators
-                    if any(keyword in content.lower() for keyword in self.KEYWORD_INDICATORS):
-                        opportunities.append({
-                            'source': f"Needs_Action/{filename}",
-                            'content': content,
-                            'filename': filename,
-                            'priority': self.determine_priority(content)
-                        })
-
-        # Check Inbox folder for opportunities
-        inbox_path = "Inbox"
-        if os.path.exists(inbox_path):
-            for filename in os.listdir(inbox_path):
-                if filename.endswith('.md'):
-                    filepath = os.path.join(inbox_path, filename)
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        content = f.read()
-
-                    # Check if this item has planning opportunity indicators
-                    if any(keyword in content.lower() for keyword in self.KEYWORD_INDICATORS):
-                        opportunities.append({
-                            'source': f"Inbox/{filename}",
-                            'content': content,
-                            'filename': filename,
-                            'priority': self.determine_priority(content)
-                        })
+        search = open_search_index(Path('.'))
+
+        # Check Needs_Action and Inbox for opportunities; unchanged notes are not re-read
+        folders = [folder for folder in self.INPUT_SOURCES if os.path.exists(folder)]
+        for folder in folders:
+            search.sync(folder)
+
+        # Only items with planning opportunity indicators are opened
+        matches = search.lookup(self.KEYWORD_INDICATORS, folders=folders)
+        for source in sorted(matches, key=lambda key: folders.index(key.rpartition('/')[0])):
+            with open(source, 'r', encoding='utf-8') as f:
+                content = f.read()
+            opportunities.append({
+                'source': source,
+                'content': content,
+                'filename': source.rpartition('/')[2],
+                'priority': self.determine_priority(content)
+            })
 
         # Sort by priority
         opportunities.sort(key=lambda x: x['priority'].value, reverse=True)
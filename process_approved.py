@@ -1,7 +1,9 @@
 import os
-import shutil
 import json
 from datetime import datetime
+from pathlib import Path
+
+from archive_layout import archive_file
 
 # Process the approved file
 filename = 'LINKEDIN_POST_post_20260115_112109.md'
@@ -33,9 +35,8 @@ if os.path.exists(approved_path):
     print(f'📝 Log created: {log_file}')
     
     # Move to Done
-    os.makedirs('Done', exist_ok=True)
-    shutil.move(approved_path, os.path.join('Done', filename))
-    print(f'📁 Moved to Done folder')
+    dest_path = archive_file(Path('.'), Path(approved_path), 'Done')
+    print(f'📁 Moved to {dest_path.parent}')
     
     # Update Dashboard
     if os.path.exists('Dashboard.md'):
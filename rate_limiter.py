@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter - Per-platform token buckets for outbound posts
+Paces posts to each platform (and each account on it) at the fastest rate
+the configured limits allow, instead of fixed sleeps between posts.
+
+Limits are read from rate_limits.json at the vault root (override with
+RATE_LIMITS_FILE). Each entry is keyed by platform or "platform:account":
+
+    {"twitter": {"rate": 300, "per": 10800, "burst": 5}}
+
+meaning 300 posts per 3 hours with bursts of up to 5. Platforms without an
+entry are not limited.
+
+The limiter for a vault keeps its bucket state in state/rate_limits.db, so
+every process posting from the vault (auto processor, MCP servers, helper
+scripts) draws from the same buckets instead of each getting the full rate.
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple, Callable
+import logging
+
+logger = logging.getLogger(__name__)
+
+CONFIG_FILENAME = 'rate_limits.json'
+
+# Used when no config file exists
+DEFAULT_LIMITS = {
+    'twitter': {'rate': 300, 'per': 10800, 'burst': 5},
+    'linkedin': {'rate': 20, 'per': 3600, 'burst': 2},
+    'instagram': {'rate': 25, 'per': 86400, 'burst': 3},
+    'instagram_story': {'rate': 25, 'per': 86400, 'burst': 3},
+    'facebook': {'rate': 200, 'per': 3600, 'burst': 10},
+    'whatsapp': {'rate': 30, 'per': 3600, 'burst': 3},
+    'email': {'rate': 100, 'per': 3600, 'burst': 10},
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out future send slots
+
+    Tokens may go negative: each caller reserves the next slot and sleeps
+    until it comes up, so waiters are served in arrival order and the
+    deficit tells how long the current backlog takes to drain. Times are
+    wall-clock so the state can be shared between processes.
+    """
+
+    def __init__(self, rate: float, per: float, burst: int = 1):
+        self.rate = rate / per  # tokens per second
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.time()
+        self.waiting = 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take a token, returning seconds to wait before using it"""
+        self._refill(time.time())
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+    def refund(self):
+        """Give back a reserved token that was not used"""
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def drain_time(self, pending: int = 0) -> float:
+        """Seconds until the current backlog plus pending sends are through"""
+        self._refill(time.time())
+        deficit = pending - self.tokens
+        return max(0.0, deficit / self.rate)
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by (platform, account), shared across threads
+
+    With a db_path the bucket state lives in SQLite and is shared by every
+    process using that file; without one it is kept in memory.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Dict[str, Any]]] = None, db_path: Optional[Path] = None):
+        self.limits = {key.lower(): value for key, value in (limits or DEFAULT_LIMITS).items()}
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+        self.db_path = Path(db_path) if db_path else None
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.db_path:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+    @classmethod
+    def from_file(cls, config_path: Path, db_path: Optional[Path] = None) -> 'RateLimiter':
+        """Load limits from a JSON file, falling back to the defaults"""
+        config_path = Path(config_path)
+        if config_path.exists():
+            try:
+                return cls(json.loads(config_path.read_text(encoding='utf-8')), db_path)
+            except Exception as e:
+                logger.error(f"Invalid rate limit config {config_path}: {e}")
+        return cls(db_path=db_path)
+
+    @classmethod
+    def for_vault(cls, vault_path: Path) -> 'RateLimiter':
+        """Open the limiter configured for a vault, with state shared through the vault"""
+        return cls.from_file(os.getenv('RATE_LIMITS_FILE') or Path(vault_path) / CONFIG_FILENAME,
+                             Path(vault_path) / 'state' / 'rate_limits.db')
+
+    def _shared(self, key: Tuple[str, str], bucket: TokenBucket, operation: Callable[[], Any]) -> Any:
+        """
+        Run a bucket operation against the state shared between processes (lock held)
+
+        The bucket row is read, updated and written back in one IMMEDIATE
+        transaction, so concurrent processes never hand out the same token.
+        """
+        if self._conn is None:
+            return operation()
+
+        name = f"{key[0]}:{key[1]}" if key[1] else key[0]
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (name,)).fetchone()
+            if row is not None:
+                bucket.tokens, bucket.updated = row
+            result = operation()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                (name, bucket.tokens, bucket.updated)
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return result
+
+    @staticmethod
+    def _key(platform: str, account: Optional[str]) -> Tuple[str, str]:
+        return (platform or '').lower(), (account or '').lower()
+
+    def _bucket(self, platform: str, account: Optional[str]) -> Optional[TokenBucket]:
+        """Bucket for a platform/account (lock held); None if unlimited"""
+        key = self._key(platform, account)
+        platform, account = key
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            limit = self.limits.get(f"{platform}:{account}") if account else None
+            limit = limit or self.limits.get(platform)
+            if not limit:
+                return None
+            bucket = self._buckets[key] = TokenBucket(
+                float(limit.get('rate', 1)), float(limit.get('per', 1)), int(limit.get('burst', 1))
+            )
+        return bucket
+
+    def reserve(self, platform: str, account: Optional[str] = None) -> float:
+        """Reserve a send slot without waiting; returns the delay until it"""
+        with self._lock:
+            bucket = self._bucket(platform, account)
+            return self._shared(self._key(platform, account), bucket, bucket.reserve) if bucket else 0.0
+
+    def acquire(self, platform: str, account: Optional[str] = None) -> float:
+        """
+        Block until a post to the platform is allowed
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            bucket = self._bucket(platform, account)
+            if bucket is None:
+                return 0.0
+            wait = self._shared(self._key(platform, account), bucket, bucket.reserve)
+            bucket.waiting += 1
+
+        try:
+            if wait > 0:
+                logger.info(f"Rate limit: waiting {wait:.1f}s for {platform}")
+                time.sleep(wait)
+        finally:
+            with self._lock:
+                bucket.waiting -= 1
+        return wait
+
+    async def acquire_async(self, platform: str, account: Optional[str] = None) -> float:
+        """
+        Wait without blocking the event loop until a post is allowed
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            bucket = self._bucket(platform, account)
+            if bucket is None:
+                return 0.0
+            wait = self._shared(self._key(platform, account), bucket, bucket.reserve)
+            bucket.waiting += 1
+
+        try:
+            if wait > 0:
+                logger.info(f"Rate limit: waiting {wait:.1f}s for {platform}")
+                await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            with self._lock:
+                self._shared(self._key(platform, account), bucket, bucket.refund)
+            raise
+        finally:
+            with self._lock:
+                bucket.waiting -= 1
+        return wait
+
+    def drain_time(self, platform: str, account: Optional[str] = None, pending: int = 0) -> float:
+        """Projected seconds to send everything waiting plus pending more posts"""
+        with self._lock:
+            bucket = self._bucket(platform, account)
+            if bucket is None:
+                return 0.0
+            return self._shared(self._key(platform, account), bucket, lambda: bucket.drain_time(pending))
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and projected drain time per bucket"""
+        with self._lock:
+            buckets = {}
+            for key, bucket in self._buckets.items():
+                name = f"{key[0]}:{key[1]}" if key[1] else key[0]
+                drain_seconds = self._shared(key, bucket, bucket.drain_time)
+                buckets[name] = {
+                    "rate_per_minute": round(bucket.rate * 60, 3),
+                    "burst": bucket.capacity,
+                    "tokens": round(max(bucket.tokens, 0.0), 3),
+                    "queue_depth": bucket.waiting,
+                    "drain_seconds": round(drain_seconds, 1)
+                }
+
+        return {
+            "buckets": buckets,
+            "queue_depth": sum(b["queue_depth"] for b in buckets.values()),
+            "drain_seconds": max((b["drain_seconds"] for b in buckets.values()), default=0.0),
+            "timestamp": datetime.now().isoformat()
+        }
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter for the vault at VAULT_PATH (or this directory)"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter.for_vault(Path(os.getenv('VAULT_PATH') or Path(__file__).parent))
+        return _limiter
+
+
+def main():
+    """Main function for CLI usage"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Outbound Post Rate Limiter')
+    parser.add_argument('action', choices=['limits', 'plan'], help='Action to perform')
+    parser.add_argument('--platform', help='Platform name')
+    parser.add_argument('--account', help='Account on the platform')
+    parser.add_argument('--count', type=int, default=1, help='Number of posts to plan')
+
+    args = parser.parse_args()
+
+    limiter = get_rate_limiter()
+
+    if args.action == 'limits':
+        print(json.dumps(limiter.limits, indent=2))
+    elif args.action == 'plan':
+        if not args.platform:
+            parser.error('--platform is required for plan')
+        seconds = limiter.drain_time(args.platform, args.account, args.count)
+        print(f"{args.count} {args.platform} posts can be sent in {seconds:.0f}s at the configured rate")
+
+
+if __name__ == '__main__':
+    main()
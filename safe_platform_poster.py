@@ -7,6 +7,7 @@ This script safely posts to all platforms with:
 - TEST_MODE flag for safe testing
 - Human-like typing delays (80-200ms)
 - Random waits between actions (3-8 seconds)
+- Per-platform rate limits between posts (rate_limits.json)
 - Hover before click behavior
 - No aggressive automation
 - Single attempt per item (no loops/retries)
@@ -37,6 +38,9 @@ from email.mime.multipart import MIMEMultipart
 from typing import Dict, Any, List, Optional
 import logging
 
+from rate_limiter import get_rate_limiter
+from vault_index import open_index
+
 # Load environment
 try:
     from dotenv import load_dotenv
@@ -150,6 +154,7 @@ def extract_content(filepath: Path) -> Dict[str, Any]:
             'content': content.strip(),
             'metadata': metadata,
             'filename': filepath.name,
+            'path': filepath,
             'platform': detect_platform(filepath.name)
         }
     except Exception as e:
@@ -570,8 +575,11 @@ def scan_done_folder() -> Dict[str, List[Dict]]:
         'unknown': []
     }
 
-    for file in DONE_FOLDER.glob('*.md'):
-        data = extract_content(file)
+    if not DONE_FOLDER.exists():
+        return items
+
+    for note in open_index(VAULT_PATH).notes('Done', pattern='*.md'):
+        data = extract_content(note['path'])
         if data:
             platform = data['platform']
             items[platform].append(data)
@@ -589,6 +597,10 @@ async def process_single_item(item: Dict) -> Dict[str, Any]:
 
     logger.info(f"Processing: {filename} ({platform})")
 
+    # Pace by the platform's rate limit rather than a fixed pause per item
+    if platform != 'unknown':
+        await get_rate_limiter().acquire_async(platform)
+
     result = None
 
     if platform == 'linkedin':
@@ -631,7 +643,8 @@ async def process_single_item(item: Dict) -> Dict[str, Any]:
 
     # Move to Sent_Test folder if successful
     if 'SUCCESS' in result.get('status', ''):
-        source = DONE_FOLDER / filename
+        # The note's own path: Done is sharded by month
+        source = item['path']
         dest = SENT_TEST_FOLDER / f"SENT_TEST_{filename}"
         if source.exists():
             try:
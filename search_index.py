@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Search Index - Incremental full-text index over vault notes with BM25 ranking
+Notes are tokenized once into a positional inverted index
+(state/search_index.db: term -> document, term frequency, positions) and
+only re-tokenized when their content hash changes, so keyword scans of
+Needs_Action or Inbox become index lookups instead of lowercasing and
+substring-searching every file on every pass.
+
+Keywords match whole words or, with prefix=True (the default for
+lookups), word prefixes - "plan" matches "plans" and "planning" but no
+longer "explanation". Multi-word keywords match as phrases.
+
+    search = open_search_index(vault_path)
+    search.sync('Needs_Action')
+    search.lookup(['proposal', 'strategic plan'], folders=['Needs_Action'])   # key -> matched keywords
+    search.search('"payment overdue" invoice', limit=5)                       # BM25-ranked hits
+
+KeywordMatcher applies the same matching to a single in-memory text.
+"""
+
+import os
+import re
+import math
+import sqlite3
+import threading
+from fnmatch import fnmatch
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterable, Callable, Tuple, Set
+import logging
+
+from vault_index import open_index
+
+logger = logging.getLogger(__name__)
+
+# Words: runs of letters and digits
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+# Quoted phrases or single words in a search query
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    folder TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_docs_folder ON docs (folder);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    positions TEXT NOT NULL,
+    PRIMARY KEY (term, doc)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings (doc);
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words of a text, in order"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class KeywordMatcher:
+    """
+    Finds keywords in one text with a single pass over its words
+
+    Compiled once per keyword list; each check tokenizes the text once
+    instead of searching it once per keyword.
+    """
+
+    def __init__(self, keywords: Iterable[str], prefix: bool = True):
+        self.keywords = list(keywords)
+        self.prefix = prefix
+        # First word -> (keyword, words) for every keyword starting with it
+        self._by_first: Dict[str, List[Tuple[str, List[str]]]] = {}
+        self._prefix_lengths: List[int] = []
+        for keyword in self.keywords:
+            words = tokenize(keyword)
+            if words:
+                self._by_first.setdefault(words[0], []).append((keyword, words))
+        if prefix:
+            self._prefix_lengths = sorted({len(words[0]) for entries in self._by_first.values()
+                                           for _, words in entries if len(words) == 1})
+
+    def _word_matches(self, token: str, word: str, last: bool) -> bool:
+        return token == word or (self.prefix and last and token.startswith(word))
+
+    def find(self, text: str) -> List[str]:
+        """Keywords present in the text, in keyword-list order"""
+        tokens = tokenize(text)
+        found: Set[str] = set()
+        for i, token in enumerate(tokens):
+            candidates = list(self._by_first.get(token, ()))
+            for length in self._prefix_lengths:
+                if length < len(token):
+                    candidates.extend(entry for entry in self._by_first.get(token[:length], ())
+                                      if len(entry[1]) == 1)
+            for keyword, words in candidates:
+                if keyword in found or i + len(words) > len(tokens):
+                    continue
+                if all(self._word_matches(tokens[i + j], word, j == len(words) - 1)
+                       for j, word in enumerate(words)):
+                    found.add(keyword)
+            if len(found) == len(self.keywords):
+                break
+        return [keyword for keyword in self.keywords if keyword in found]
+
+    def matches(self, text: str) -> bool:
+        """True if any keyword is present"""
+        return bool(self.find(text))
+
+
+@lru_cache(maxsize=64)
+def _cached_matcher(keywords: Tuple[str, ...], prefix: bool) -> KeywordMatcher:
+    return KeywordMatcher(keywords, prefix)
+
+
+def keyword_matcher(keywords: Iterable[str], prefix: bool = True) -> KeywordMatcher:
+    """Shared compiled matcher for a keyword list"""
+    return _cached_matcher(tuple(keywords), prefix)
+
+
+class SearchIndex:
+    """Positional inverted index of vault notes (WAL-mode SQLite)"""
+
+    def __init__(self, vault_path: Path, db_path: Optional[Path] = None):
+        self.vault_path = Path(vault_path).resolve()
+        self.db_path = Path(db_path) if db_path else self.vault_path / 'state' / 'search_index.db'
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None,
+                                     timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    @classmethod
+    def for_vault(cls, vault_path: Path) -> 'SearchIndex':
+        """Open the default search index for a vault"""
+        return cls(vault_path)
+
+    # ---- Updates ----
+
+    def _add(self, key: str, text: str, digest: str):
+        """Replace one document's postings (lock held, inside a transaction)"""
+        folder, _, filename = key.rpartition('/')
+        positions: Dict[str, List[int]] = {}
+        tokens = tokenize(text)
+        for position, token in enumerate(tokens):
+            positions.setdefault(token, []).append(position)
+
+        row = self._conn.execute("SELECT id FROM docs WHERE key = ?", (key,)).fetchone()
+        if row:
+            doc = row[0]
+            self._conn.execute("DELETE FROM postings WHERE doc = ?", (doc,))
+            self._conn.execute("UPDATE docs SET digest = ?, length = ? WHERE id = ?", (digest, len(tokens), doc))
+        else:
+            doc = self._conn.execute(
+                "INSERT INTO docs (key, folder, filename, digest, length) VALUES (?, ?, ?, ?, ?)",
+                (key, folder, filename, digest, len(tokens))
+            ).lastrowid
+        self._conn.executemany(
+            "INSERT INTO postings (term, doc, tf, positions) VALUES (?, ?, ?, ?)",
+            [(term, doc, len(found), ','.join(map(str, found))) for term, found in positions.items()]
+        )
+
+    def _remove(self, keys: Iterable[str]):
+        for key in keys:
+            row = self._conn.execute("SELECT id FROM docs WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._conn.execute("DELETE FROM postings WHERE doc = ?", (row[0],))
+                self._conn.execute("DELETE FROM docs WHERE id = ?", (row[0],))
+
+    def add(self, key: str, text: str, digest: str) -> bool:
+        """
+        Index a document under a vault-relative key unless its digest is unchanged
+
+        Returns:
+            True if the document was (re)indexed
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT digest FROM docs WHERE key = ?", (key,)).fetchone()
+            if row and row[0] == digest:
+                return False
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._add(key, text, digest)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def remove(self, key: str):
+        """Drop a document"""
+        with self._lock:
+            self._remove([key])
+
+    def sync(self, folder: str, pattern: str = '*.md',
+             extract: Optional[Callable[[Path], str]] = None) -> Dict[str, int]:
+        """
+        Bring one folder's documents in line with the disk
+
+        Notes are checked against the vault metadata index, so only notes
+        whose content hash changed are read and tokenized. Other files
+        (e.g. "*.json" with an `extract` function returning their text)
+        are re-read when their size or mtime changes.
+
+        Returns:
+            Counts of indexed, removed and unchanged documents
+        """
+        folder = folder.strip('/')
+        if extract is None:
+            current = {note['relpath']: note['content_hash']
+                       for note in open_index(self.vault_path).notes(folder, pattern=pattern)}
+        else:
+            current = {}
+            try:
+                for entry in os.scandir(self.vault_path / folder):
+                    if fnmatch(entry.name, pattern) and entry.is_file():
+                        stat = entry.stat()
+                        current[f"{folder}/{entry.name}" if folder else entry.name] = \
+                            f"{stat.st_size}:{stat.st_mtime_ns}"
+            except OSError:
+                pass
+
+        result = {'indexed': 0, 'removed': 0, 'unchanged': 0}
+        with self._lock:
+            known = {key: (digest, filename) for key, digest, filename in self._conn.execute(
+                "SELECT key, digest, filename FROM docs WHERE folder = ?", (folder,)
+            )}
+            changed = [key for key, digest in current.items() if known.get(key, (None,))[0] != digest]
+            removed = [key for key, (_, filename) in known.items()
+                       if key not in current and fnmatch(filename, pattern)]
+            result['unchanged'] = len(current) - len(changed)
+            if not changed and not removed:
+                return result
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key in changed:
+                    path = self.vault_path / key
+                    try:
+                        text = extract(path) if extract else path.read_text(encoding='utf-8', errors='replace')
+                    except (OSError, ValueError) as e:
+                        logger.debug(f"Skipping {key}: {e}")
+                        continue
+                    self._add(key, text or '', current[key])
+                    result['indexed'] += 1
+                self._remove(removed)
+                result['removed'] = len(removed)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return result
+
+    # ---- Queries ----
+
+    def _postings(self, word: str, prefix: bool) -> Dict[int, List[int]]:
+        """doc -> positions for a word (or every word it prefixes)"""
+        if prefix:
+            rows = self._conn.execute(
+                "SELECT doc, positions FROM postings WHERE term >= ? AND term < ?", (word, word + '\U0010ffff')
+            )
+        else:
+            rows = self._conn.execute("SELECT doc, positions FROM postings WHERE term = ?", (word,))
+        found: Dict[int, List[int]] = {}
+        for doc, positions in rows:
+            found.setdefault(doc, []).extend(int(p) for p in positions.split(','))
+        return found
+
+    def _match(self, words: List[str], prefix: bool) -> Dict[int, int]:
+        """
+        doc -> occurrences of a word sequence
+
+        Every word but the last must match exactly; the last may be a prefix.
+        """
+        if not words:
+            return {}
+        last = self._postings(words[-1], prefix)
+        if len(words) == 1:
+            return {doc: len(positions) for doc, positions in last.items()}
+
+        postings = [self._postings(word, False) for word in words[:-1]] + [last]
+        docs = set(postings[0])
+        for found in postings[1:]:
+            docs &= set(found)
+
+        counts = {}
+        for doc in docs:
+            starts = set(postings[0][doc])
+            for offset, found in enumerate(postings[1:], start=1):
+                starts &= {position - offset for position in found[doc]}
+                if not starts:
+                    break
+            if starts:
+                counts[doc] = len(starts)
+        return counts
+
+    def _filter_docs(self, docs: Iterable[int], folders: Optional[Iterable[str]],
+                     pattern: Optional[str]) -> Dict[int, Tuple[str, str, int]]:
+        """doc -> (key, folder, length) for documents passing the folder/filename filters"""
+        docs = list(docs)
+        if not docs:
+            return {}
+        folder_set = {folder.strip('/') for folder in folders} if folders is not None else None
+        found = {}
+        for start in range(0, len(docs), 500):
+            chunk = docs[start:start + 500]
+            rows = self._conn.execute(
+                f"SELECT id, key, folder, filename, length FROM docs WHERE id IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            for doc, key, folder, filename, length in rows:
+                if folder_set is not None and folder not in folder_set:
+                    continue
+                if pattern and not fnmatch(filename, pattern):
+                    continue
+                found[doc] = (key, folder, length)
+        return found
+
+    def lookup(self, keywords: Iterable[str], folders: Optional[Iterable[str]] = None,
+               pattern: Optional[str] = None, prefix: bool = True) -> Dict[str, List[str]]:
+        """
+        Documents containing any of the keywords
+
+        Args:
+            keywords: Words or phrases
+            folders: Only documents in these vault-relative folders
+            pattern: Only filenames matching this glob
+            prefix: Let the last word of each keyword match as a prefix
+
+        Returns:
+            Document key -> matched keywords (in keyword order), keys sorted
+        """
+        keywords = list(keywords)
+        hits: Dict[int, List[str]] = {}
+        with self._lock:
+            for keyword in keywords:
+                for doc in self._match(tokenize(keyword), prefix):
+                    hits.setdefault(doc, []).append(keyword)
+            docs = self._filter_docs(hits, folders, pattern)
+        return {docs[doc][0]: hits[doc] for doc in sorted(docs, key=lambda doc: docs[doc][0])}
+
+    def search(self, query: str, folders: Optional[Iterable[str]] = None, pattern: Optional[str] = None,
+               limit: Optional[int] = 20, prefix: bool = False) -> List[Dict[str, Any]]:
+        """
+        BM25-ranked documents for a query of words and "quoted phrases"
+
+        Returns:
+            Dicts with key, path, folder, score and the matched query terms,
+            best first
+        """
+        clauses = [phrase if phrase is not None and word is None else word
+                   for phrase, word in ((m.group(1), m.group(2)) for m in QUERY_PATTERN.finditer(query))]
+        clauses = [clause for clause in clauses if tokenize(clause)]
+
+        with self._lock:
+            total, average_length = self._conn.execute("SELECT COUNT(*), AVG(length) FROM docs").fetchone()
+            if not total or not clauses:
+                return []
+            average_length = average_length or 1.0
+
+            matches = [(clause, self._match(tokenize(clause), prefix)) for clause in clauses]
+            candidates = set()
+            for _, counts in matches:
+                candidates.update(counts)
+            docs = self._filter_docs(candidates, folders, pattern)
+
+        scores: Dict[int, float] = {}
+        matched: Dict[int, List[str]] = {}
+        for clause, counts in matches:
+            if not counts:
+                continue
+            idf = math.log((total - len(counts) + 0.5) / (len(counts) + 0.5) + 1)
+            for doc, tf in counts.items():
+                if doc not in docs:
+                    continue
+                length = docs[doc][2]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+                matched.setdefault(doc, []).append(clause)
+
+        ranked = sorted(scores, key=lambda doc: (-scores[doc], docs[doc][0]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [{
+            'key': docs[doc][0],
+            'path': self.vault_path / docs[doc][0],
+            'folder': docs[doc][1],
+            'score': round(scores[doc], 4),
+            'matched': matched[doc]
+        } for doc in ranked]
+
+    def stats(self) -> Dict[str, Any]:
+        """Document and term counts"""
+        with self._lock:
+            documents, average_length = self._conn.execute("SELECT COUNT(*), AVG(length) FROM docs").fetchone()
+            terms = self._conn.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()[0]
+        return {'documents': documents, 'terms': terms, 'avg_length': round(average_length or 0, 1)}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_indexes: Dict[Path, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def open_search_index(vault_path: Path) -> SearchIndex:
+    """Process-wide search index for a vault, opened on first use"""
+    key = Path(vault_path).resolve()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = SearchIndex.for_vault(key)
+        return index
+
+
+def main():
+    """Main function for CLI usage"""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Vault full-text search')
+    parser.add_argument('action', choices=['sync', 'search', 'stats'], help='Action to perform')
+    parser.add_argument('query', nargs='?', default='', help='Words and "quoted phrases" (for search)')
+    parser.add_argument('--vault-path', default=os.getenv('VAULT_PATH') or str(Path(__file__).parent),
+                        help='Vault root')
+    parser.add_argument('--folder', action='append', help='Folder to sync or search (repeatable)')
+    parser.add_argument('--prefix', action='store_true', help='Match words as prefixes (for search)')
+    parser.add_argument('--limit', type=int, default=10, help='Number of results')
+
+    args = parser.parse_args()
+
+    index = SearchIndex.for_vault(Path(args.vault_path))
+    folders = args.folder or ['Needs_Action', 'Inbox']
+
+    if args.action == 'sync':
+        for folder in folders:
+            result = index.sync(folder)
+            print(f"{folder}: {result['indexed']} indexed, {result['removed']} removed, "
+                  f"{result['unchanged']} unchanged")
+    elif args.action == 'search':
+        for folder in folders:
+            index.sync(folder)
+        for hit in index.search(args.query, folders, limit=args.limit, prefix=args.prefix):
+            print(f"{hit['score']:8.3f}  {hit['key']}  ({', '.join(hit['matched'])})")
+    elif args.action == 'stats':
+        print(json.dumps(index.stats(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
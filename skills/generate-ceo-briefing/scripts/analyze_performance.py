@@ -19,6 +19,9 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List
 import re
 
+from vault_index import open_index
+from archive_pack import packed_notes
+
 
 class PerformanceAnalyzer:
     """Analyzes business performance across financial, operational, social, and goal dimensions."""
@@ -26,6 +29,14 @@ class PerformanceAnalyzer:
     def __init__(self, vault_path: str = "Vault"):
         self.vault_path = Path(vault_path)
         self.today = datetime.now()
+        self._index = None
+
+    @property
+    def index(self):
+        """Metadata index of the vault's notes, opened on first use"""
+        if self._index is None:
+            self._index = open_index(self.vault_path)
+        return self._index
 
     def analyze(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
                 period: str = "weekly") -> Dict[str, Any]:
@@ -150,14 +161,8 @@ class PerformanceAnalyzer:
             return self._empty_operational_data()
 
         # Count completed tasks in period
-        completed_tasks = []
-        if done_folder.exists():
-            for task_file in done_folder.glob("*.md"):
-                # Check file modification time or parse metadata
-                mtime = datetime.fromtimestamp(task_file.stat().st_mtime)
-                if start_date <= mtime <= end_date:
-                    task_data = self._parse_task_metadata(task_file)
-                    completed_tasks.append(task_data)
+        completed_tasks = [self._parse_task_metadata(note)
+                           for note in self._done_notes(start_date, end_date)]
 
         completed_count = len(completed_tasks)
 
@@ -166,7 +171,7 @@ class PerformanceAnalyzer:
         avg_cycle_time = sum(cycle_times) / len(cycle_times) if cycle_times else 0
 
         # Count active and overdue tasks
-        active_count = len(list(active_folder.glob("*.md"))) if active_folder.exists() else 0
+        active_count = self.index.count("Tasks/Active") if active_folder.exists() else 0
         overdue_tasks = self._count_overdue_tasks(active_folder) if active_folder.exists() else {"high": 0, "medium": 0, "low": 0}
 
         # Completion rate
@@ -199,12 +204,8 @@ class PerformanceAnalyzer:
             return self._empty_email_data()
 
         # Find processed emails in period
-        processed_emails = []
-        for email_file in done_folder.glob("EMAIL_*.md"):
-            mtime = datetime.fromtimestamp(email_file.stat().st_mtime)
-            if start_date <= mtime <= end_date:
-                email_data = self._parse_email_metadata(email_file)
-                processed_emails.append(email_data)
+        processed_emails = [self._parse_email_metadata(note)
+                            for note in self._done_notes(start_date, end_date, pattern="EMAIL_*.md")]
 
         processed_count = len(processed_emails)
 
@@ -224,10 +225,8 @@ class PerformanceAnalyzer:
         needs_action_folder = self.vault_path / "Needs_Action"
         pending_high_priority = 0
         if needs_action_folder.exists():
-            for email_file in needs_action_folder.glob("EMAIL_*.md"):
-                metadata = self._parse_email_metadata(email_file)
-                if metadata.get("priority") == "high":
-                    pending_high_priority += 1
+            pending_high_priority = self.index.count("Needs_Action", pattern="EMAIL_*.md",
+                                                     where={"priority": "high"})
 
         print(f"    ✓ Processed: {processed_count} emails")
         print(f"    ✓ Avg response time: {avg_response_time:.1f} hours")
@@ -496,12 +495,16 @@ class PerformanceAnalyzer:
                 categories[category] = categories.get(category, 0) + abs(t["amount"])
         return categories
 
-    def _parse_task_metadata(self, task_file: Path) -> Dict:
-        """Parse task metadata from task file."""
-        content = task_file.read_text(encoding='utf-8')
-        # Would parse YAML frontmatter
+    def _done_notes(self, start_date: datetime, end_date: datetime, pattern: Optional[str] = None) -> List[Dict]:
+        """Done items in the period, packed months included."""
+        return packed_notes(self.vault_path, "Done", pattern=pattern, since=start_date, until=end_date) + \
+            self.index.notes("Done", pattern=pattern, since=start_date, until=end_date)
+
+    def _parse_task_metadata(self, note: Dict) -> Dict:
+        """Task metadata from an index entry."""
+        # Would read durations from the frontmatter
         return {
-            "title": task_file.stem,
+            "title": note["stem"],
             "actual_duration": 3  # Placeholder
         }
 
@@ -511,10 +514,11 @@ class PerformanceAnalyzer:
         # Would parse each task and check due_date
         return overdue
 
-    def _parse_email_metadata(self, email_file: Path) -> Dict:
-        """Parse email metadata."""
-        # Would parse YAML frontmatter
+    def _parse_email_metadata(self, note: Dict) -> Dict:
+        """Email metadata from an index entry."""
+        # Would compute the response time from the frontmatter timestamps
         return {
+            "priority": note["frontmatter"].get("priority", "").strip('"\'').lower(),
             "response_time": 12  # Placeholder (hours)
         }
 
@@ -23,34 +23,14 @@ import argparse
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Dict, List, Any
-import re
 
+from vault_document import load_document, parse_document
+from vault_index import open_index
 
-def parse_frontmatter(content: str) -> Dict[str, Any]:
-    """Extract YAML frontmatter from markdown file."""
-    if not content.startswith('---'):
-        return {}
 
-    try:
-        # Find the second ---
-        end_index = content.find('---', 3)
-        if end_index == -1:
-            return {}
-
-        frontmatter_text = content[3:end_index].strip()
-
-        # Simple YAML parser (basic key: value pairs)
-        metadata = {}
-        for line in frontmatter_text.split('\n'):
-            line = line.strip()
-            if ':' in line:
-                key, value = line.split(':', 1)
-                metadata[key.strip()] = value.strip()
-
-        return metadata
-    except Exception as e:
-        print(f"Warning: Error parsing frontmatter: {e}", file=sys.stderr)
-        return {}
+def parse_frontmatter(content: str) -> Dict[str, Any]:
+    """Extract YAML frontmatter from markdown file (basic key: value pairs)."""
+    return parse_document(content).raw_frontmatter
 
 
 def is_expired(expires_str: str) -> bool:
@@ -98,14 +78,15 @@ def scan_folder(folder_path: Path) -> List[Dict[str, Any]]:
 
     approvals = []
 
-    for file_path in folder_path.glob("APPROVAL_*.md"):
+    index = open_index(folder_path.parent)
+    for note in index.notes(folder_path.name, pattern="APPROVAL_*.md", order='filename'):
+        file_path = note['path']
         try:
-            content = file_path.read_text(encoding='utf-8')
-            metadata = parse_frontmatter(content)
+            metadata = note['frontmatter']
 
-            # Extract action summary (first heading after frontmatter)
-            summary_match = re.search(r'## Action Summary\s+(.+?)(?:\n|$)', content)
-            summary = summary_match.group(1).strip() if summary_match else "No summary"
+            # Extract action summary (first line of the Action Summary section)
+            summary_text = load_document(file_path).section('Action Summary')
+            summary = summary_text.split('\n', 1)[0].strip() if summary_text else "No summary"
 
             approval_info = {
                 'filename': file_path.name,
@@ -26,6 +26,8 @@ from difflib import SequenceMatcher
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from vault_document import VaultDocument, load_document
+
 # Categorization rules (from expense-rules.md)
 EXACT_TECH_VENDORS = {
     'AMAZON WEB SERVICES': {'category': 'IT & Software', 'code': 433, 'confidence': 100},
@@ -312,16 +314,16 @@ class ExpenseCategorizer:
 
         for filepath in transaction_files:
             try:
-                # Read transaction file (simplified parsing)
-                content = filepath.read_text(encoding="utf-8")
+                # Read transaction file
+                doc = load_document(filepath)
 
-                # Check if already categorized (simple check)
-                if "category: Uncategorized" not in content and "category: " in content:
+                # Check if already categorized
+                category = doc.raw_frontmatter.get('category')
+                if category is not None and category != 'Uncategorized':
                     continue  # Skip already categorized
 
-                # Extract transaction data (simplified)
-                # In production, use proper frontmatter parser
-                transaction = self.extract_transaction_from_file(content)
+                # Extract transaction data
+                transaction = self.extract_transaction_from_file(doc)
 
                 # Categorize
                 categorization = self.categorize_transaction(transaction)
@@ -345,25 +347,23 @@ class ExpenseCategorizer:
                 print(f"[ERROR] Failed to process {filepath.name}: {e}")
                 self.stats["errors"] += 1
 
-    def extract_transaction_from_file(self, content: str) -> Dict:
-        """Extract transaction data from file content (simplified)"""
-        # Simplified extraction - in production, use proper YAML parser
+    def extract_transaction_from_file(self, doc: VaultDocument) -> Dict:
+        """Extract transaction data from a parsed transaction file"""
         transaction = {}
+        frontmatter = doc.raw_frontmatter
 
         # Extract vendor
-        vendor_match = re.search(r'vendor: (.+)', content)
-        if vendor_match:
-            transaction['vendor'] = vendor_match.group(1).strip()
+        if frontmatter.get('vendor'):
+            transaction['vendor'] = frontmatter['vendor']
 
         # Extract description
-        desc_match = re.search(r'# Transaction: (.+)', content)
-        if desc_match:
-            transaction['description'] = desc_match.group(1).strip()
+        if doc.title.startswith('Transaction: '):
+            transaction['description'] = doc.title[len('Transaction: '):].strip()
 
         # Extract amount
-        amount_match = re.search(r'amount: ([\d.]+)', content)
+        amount_match = re.match(r'[\d.]+', frontmatter.get('amount', ''))
         if amount_match:
-            transaction['amount'] = float(amount_match.group(1))
+            transaction['amount'] = float(amount_match.group(0))
 
         return transaction
 
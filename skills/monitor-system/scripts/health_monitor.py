@@ -13,6 +13,8 @@ from pathlib import Path
 import psutil
 import requests
 
+from metrics import heartbeat_age
+
 
 # Configuration
 VAULT_PATH = Path(os.getenv('VAULT_PATH', 'D:/AI_Employee_Vault'))
@@ -29,6 +31,14 @@ WATCHERS = {
     'filesystem_watcher': '/tmp/filesystem_watcher.pid'
 }
 
+# A process exporting metrics this recently is alive, whatever its PID file says
+METRICS_HEARTBEAT_MAX_AGE = 120  # seconds
+
+# Watchers whose process exports metrics under another job name
+METRICS_JOBS = {
+    'gmail_watcher': 'email_watcher',
+}
+
 MCP_SERVERS = {
     'email': 8,
     'xero': 8,
@@ -50,6 +60,12 @@ class HealthMonitor:
 
         for watcher_name, pid_file in WATCHERS.items():
             try:
+                # Metrics heartbeat first: written by the process itself
+                age = heartbeat_age(METRICS_JOBS.get(watcher_name, watcher_name), VAULT_PATH)
+                if age is not None and age <= METRICS_HEARTBEAT_MAX_AGE:
+                    score += points_per_watcher
+                    continue
+
                 # Check if PID file exists
                 if not os.path.exists(pid_file):
                     self.issues.append(f"{watcher_name}: PID file not found")
@@ -64,9 +80,9 @@ class HealthMonitor:
                     # Check heartbeat (if exists)
                     heartbeat_file = f'/tmp/{watcher_name}_heartbeat'
                     if os.path.exists(heartbeat_file):
-                        heartbeat_age = time.time() - os.path.getmtime(heartbeat_file)
-                        if heartbeat_age > 600:  # 10 minutes
-                            self.issues.append(f"{watcher_name}: Heartbeat stale ({int(heartbeat_age)}s)")
+                        file_age = time.time() - os.path.getmtime(heartbeat_file)
+                        if file_age > 600:  # 10 minutes
+                            self.issues.append(f"{watcher_name}: Heartbeat stale ({int(file_age)}s)")
                             continue
 
                     score += points_per_watcher
@@ -60,6 +60,8 @@ except ImportError as e:
     print("\nInstall with: pip install tweepy python-dotenv")
     sys.exit(1)
 
+from rate_limiter import get_rate_limiter
+
 
 class TwitterAPIHelper:
     """Helper class for Twitter API v2 operations."""
@@ -181,6 +183,11 @@ class TwitterAPIHelper:
                 'dry_run': True
             }
 
+        # Wait for a send slot under the shared Twitter rate limit
+        waited = get_rate_limiter().acquire('twitter')
+        if waited:
+            print(f"    Waited {waited:.1f} seconds for rate limit")
+
         try:
             # Post tweet
             kwargs = {'text': text}
@@ -207,13 +214,16 @@ class TwitterAPIHelper:
         except tweepy.TweepyException as e:
             raise Exception(f"Failed to post tweet: {e}")
 
-    def post_thread(self, tweets: List[str], delay_seconds: int = 5) -> List[Dict]:
+    def post_thread(self, tweets: List[str], delay_seconds: Optional[float] = None) -> List[Dict]:
         """
         Post a multi-tweet thread.
 
+        Each tweet waits on the shared Twitter rate limit (rate_limits.json),
+        so a thread goes out as fast as the limit allows.
+
         Args:
             tweets: List of tweet texts (in order)
-            delay_seconds: Delay between tweets (seconds)
+            delay_seconds: Optional extra delay between tweets (seconds)
 
         Returns:
             List of tweet data dicts
@@ -235,6 +245,10 @@ class TwitterAPIHelper:
         for i, tweet_text in enumerate(tweets, 1):
             print(f"\n  Tweet {i}/{len(tweets)}:")
 
+            # Optional fixed spacing on top of the rate limit
+            if i > 1 and delay_seconds and not self.dry_run:
+                time.sleep(delay_seconds)
+
             # Post tweet
             tweet_data = self.post_tweet(tweet_text, reply_to_id=reply_to_id)
             results.append(tweet_data)
@@ -242,11 +256,6 @@ class TwitterAPIHelper:
             # Set reply_to_id for next tweet (threading)
             reply_to_id = tweet_data['id']
 
-            # Delay between tweets (except after last tweet)
-            if i < len(tweets) and not self.dry_run:
-                print(f"    Waiting {delay_seconds} seconds...")
-                time.sleep(delay_seconds)
-
         print(f"\n✓ Thread posted successfully ({len(results)} tweets)")
         if not self.dry_run and results:
             print(f"  First tweet URL: {results[0]['url']}")
@@ -9,6 +9,7 @@ import sys
 import time
 import signal
 import json
+import threading
 import subprocess
 from pathlib import Path
 from datetime import datetime
@@ -22,6 +23,10 @@ except ImportError:
     os.system("pip install schedule")
     import schedule
 
+from metrics import counter, gauge, histogram, start_exporter
+from vault_events import VaultEvent, CREATED, MOVED, listen
+from archive_pack import compact
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,6 +38,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Metrics
+TASKS = counter('ai_employee_scheduled_tasks_total', 'Scheduled task runs', ['task', 'status'])
+TASK_SECONDS = histogram('ai_employee_scheduled_task_seconds', 'Scheduled task run time', ['task'])
+FOLDER_ITEMS = gauge('ai_employee_folder_items', 'Notes waiting in a vault folder', ['folder'])
+
+# Seconds to let a burst of new Needs_Action notes land before planning
+NEEDS_ACTION_SETTLE_SECONDS = 5
+
 
 class SmartScheduler:
     """Intelligent scheduler for AI Employee tasks"""
@@ -44,6 +57,9 @@ class SmartScheduler:
         self.logs_folder = self.vault_path / 'Logs'
         self.logs_folder.mkdir(exist_ok=True)
 
+        # Set by vault events when a note lands in Needs_Action
+        self._needs_action_arrived = threading.Event()
+
         # Schedule configuration
         self.config = {
             'needs_action_check': {
@@ -74,6 +90,10 @@ class SmartScheduler:
             'email_watch': {
                 'interval_hours': 1,
                 'description': 'Check email for business opportunities'
+            },
+            'done_compaction': {
+                'time': '03:00',
+                'description': 'Pack cold Done months into monthly pack files'
             }
         }
 
@@ -98,6 +118,7 @@ class SmartScheduler:
             'status': status,
             'details': details or {}
         }
+        TASKS.inc(task=task_name, status=status)
         self._write_log(log_entry)
 
     def _write_log(self, log_entry: Dict[str, Any]):
@@ -120,6 +141,7 @@ class SmartScheduler:
                 return
 
             files = list(needs_action.glob("*.md"))
+            FOLDER_ITEMS.set(len(files), folder='Needs_Action')
 
             if not files:
                 logger.info("  No files in Needs_Action to process")
@@ -163,6 +185,11 @@ class SmartScheduler:
                 {'error': str(e)}
             )
 
+    def on_vault_event(self, event: VaultEvent):
+        """Plan for new Needs_Action notes as they arrive instead of on the next hourly check"""
+        if event.folder == 'Needs_Action':
+            self._needs_action_arrived.set()
+
     def run_linkedin_watcher(self):
         """Run LinkedIn watcher for opportunities"""
         logger.info("[TASK] Running LinkedIn watcher...")
@@ -279,6 +306,18 @@ class SmartScheduler:
             logger.error(f"  ✗ Error in weekly_report: {e}", exc_info=True)
             self.log_task_execution('weekly_report', 'failed', {'error': str(e)})
 
+    def compact_done(self):
+        """Pack Done months older than DONE_PACK_AFTER_DAYS into monthly pack files"""
+        logger.info("[TASK] Packing cold Done items...")
+
+        try:
+            packed = compact(self.vault_path, 'Done')
+            logger.info(f"  ✓ Packed {sum(packed.values())} items from {len(packed)} month(s)")
+            self.log_task_execution('done_compaction', 'success', {'packed': packed})
+        except Exception as e:
+            logger.error(f"  ✗ Error in done_compaction: {e}", exc_info=True)
+            self.log_task_execution('done_compaction', 'failed', {'error': str(e)})
+
     def run_whatsapp_watcher(self):
         """Run WhatsApp watcher for business opportunities"""
         logger.info("[TASK] Running WhatsApp watcher...")
@@ -382,9 +421,20 @@ class SmartScheduler:
         )
         logger.info(f"  [OK] Scheduled: Weekly report (Sunday at {self.config['weekly_report']['time']})")
 
+        # Daily 3 AM: Pack cold Done months
+        schedule.every().day.at(self.config['done_compaction']['time']).do(
+            self.compact_done
+        )
+        logger.info(f"  [OK] Scheduled: Done compaction (daily at {self.config['done_compaction']['time']})")
+
     def run_pending(self):
         """Run any pending scheduled tasks"""
-        schedule.run_pending()
+        # Same order as schedule.run_pending(), timing each task
+        for job in sorted(job for job in schedule.jobs if job.should_run):
+            task = getattr(job.job_func, 'func', job.job_func).__name__
+            with TASK_SECONDS.time(task=task):
+                if job.run() is schedule.CancelJob:
+                    schedule.cancel_job(job)
 
     def run_continuous(self):
         """Run scheduler continuously"""
@@ -392,6 +442,8 @@ class SmartScheduler:
         logger.info("SMART SCHEDULER - Starting Automated Task Orchestration")
         logger.info("=" * 60)
 
+        start_exporter('smart_scheduler', self.vault_path)
+
         # Set up all schedules
         self.setup_schedules()
 
@@ -399,9 +451,13 @@ class SmartScheduler:
         logger.info("\nRunning initial task check...")
         self.check_needs_action()
 
+        subscription = listen(self.vault_path, self.on_vault_event, folders=['Needs_Action'],
+                              patterns=['*.md'], kinds=[CREATED, MOVED])
+
         # Set up graceful shutdown
         def signal_handler(sig, frame):
             logger.info("\n[STOP] Shutting down Smart Scheduler...")
+            subscription.close()
             logger.info("[OK] Smart Scheduler stopped gracefully")
             sys.exit(0)
 
@@ -414,7 +470,11 @@ class SmartScheduler:
         try:
             while True:
                 self.run_pending()
-                time.sleep(60)  # Check every minute
+                # Check every minute, or as soon as new work arrives
+                if self._needs_action_arrived.wait(60):
+                    time.sleep(NEEDS_ACTION_SETTLE_SECONDS)
+                    self._needs_action_arrived.clear()
+                    self.check_needs_action()
         except KeyboardInterrupt:
             signal_handler(signal.SIGINT, None)
         except Exception as e:
@@ -0,0 +1,68 @@
+"""
+Tests for the month-sharded Done/Failed layout: items are filed by mtime,
+lookups find them across shards, and migration empties the flat folders
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from archive_layout import archive_file, find_archived, migrate, shard_folders
+
+
+def write_note(path, when=None, body='Body'):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\ntype: email\n---\n\n{body}\n", encoding='utf-8')
+    if when is not None:
+        timestamp = time.mktime(when.timetuple())
+        os.utime(path, (timestamp, timestamp))
+    return path
+
+
+def test_archive_file_uses_mtime_month_and_avoids_clashes(tmp_path):
+    first = archive_file(tmp_path, write_note(tmp_path / 'Approved' / 'POST_1.md', datetime(2026, 1, 10)), 'Done')
+    assert first == tmp_path / 'Done' / '2026' / '01' / 'POST_1.md'
+
+    second = archive_file(tmp_path, write_note(tmp_path / 'Approved' / 'POST_1.md', datetime(2026, 1, 20)), 'Done')
+    assert second.parent == first.parent and second.name.startswith('POST_1_')
+    assert first.exists() and second.exists()
+
+
+def test_shard_folders_cover_only_range(tmp_path):
+    for year, month in ((2025, 12), (2026, 1), (2026, 3)):
+        (tmp_path / 'Done' / str(year) / f'{month:02d}').mkdir(parents=True)
+    (tmp_path / 'Done' / 'misc').mkdir()
+
+    assert shard_folders(tmp_path, 'Done') == ['Done', 'Done/2025/12', 'Done/2026/01', 'Done/2026/03']
+    assert shard_folders(tmp_path, 'Done', since=datetime(2026, 1, 31), until=datetime(2026, 2, 1)) == \
+        ['Done', 'Done/2026/01']
+
+
+def test_find_archived_looks_across_shards_newest_first(tmp_path):
+    write_note(tmp_path / 'Done' / '2025' / '12' / 'EMAIL_1.md', body='old')
+    write_note(tmp_path / 'Done' / '2026' / '02' / 'EMAIL_1.md', body='new')
+    write_note(tmp_path / 'Done' / 'LEGACY.md')
+
+    assert find_archived(tmp_path, 'Done', 'EMAIL_1.md') == tmp_path / 'Done' / '2026' / '02' / 'EMAIL_1.md'
+    assert find_archived(tmp_path, 'Done', 'LEGACY.md') == tmp_path / 'Done' / 'LEGACY.md'
+    assert find_archived(tmp_path, 'Done', 'missing.md') is None
+    assert find_archived(tmp_path, 'Failed', 'EMAIL_1.md') is None
+
+
+def test_migrate_files_flat_items_into_shards(tmp_path):
+    write_note(tmp_path / 'Done' / 'EMAIL_1.md', datetime(2026, 1, 10))
+    write_note(tmp_path / 'Done' / 'EMAIL_2.md', datetime(2026, 3, 5))
+    write_note(tmp_path / 'Failed' / 'POST_1.md', datetime(2026, 3, 6))
+    write_note(tmp_path / 'Done' / '.hidden.md')
+
+    assert migrate(tmp_path, dry_run=True) == {'Done': 2, 'Failed': 1}
+    assert (tmp_path / 'Done' / 'EMAIL_1.md').exists()
+
+    assert migrate(tmp_path) == {'Done': 2, 'Failed': 1}
+    assert (tmp_path / 'Done' / '2026' / '01' / 'EMAIL_1.md').exists()
+    assert (tmp_path / 'Done' / '2026' / '03' / 'EMAIL_2.md').exists()
+    assert (tmp_path / 'Failed' / '2026' / '03' / 'POST_1.md').exists()
+    assert sorted(os.listdir(tmp_path / 'Done')) == ['.hidden.md', '2026']
+    assert migrate(tmp_path) == {'Done': 0, 'Failed': 0}
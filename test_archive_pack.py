@@ -0,0 +1,88 @@
+"""
+Tests for monthly Done packs: notes round-trip through a pack, and neither
+a lost index nor an interrupted compaction can lose or duplicate notes
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from archive_pack import MonthPack, PackIndexError, compact, read_packed
+
+
+def write_note(folder, name, body, when=None):
+    folder.mkdir(parents=True, exist_ok=True)
+    note = folder / name
+    note.write_text(f"---\ntype: email\n---\n\n# {name}\n\n{body}\n", encoding='utf-8')
+    if when is not None:
+        os.utime(note, (when, when))
+    return note
+
+
+def test_add_and_read_round_trip(tmp_path):
+    files = [write_note(tmp_path / 'in', f'EMAIL_{i}.md', f'body {i}') for i in range(3)]
+    pack = MonthPack(tmp_path / 'Done' / '2025' / '2025-01.pack.gz')
+    pack.pack_file.parent.mkdir(parents=True)
+
+    assert pack.add(files) == ['EMAIL_0.md', 'EMAIL_1.md', 'EMAIL_2.md']
+
+    reopened = MonthPack(pack.pack_file).load()
+    for file in files:
+        assert reopened.read(file.name) == file.read_text(encoding='utf-8')
+    assert [entry['filename'] for entry in reopened.entries('EMAIL_1*')] == ['EMAIL_1.md']
+    assert reopened.read('missing.md') is None
+
+
+def test_same_name_new_content_is_kept_under_new_name(tmp_path):
+    pack = MonthPack(tmp_path / '2025-01.pack.gz')
+    pack.add([write_note(tmp_path / 'a', 'EMAIL_1.md', 'first')])
+    names = pack.add([write_note(tmp_path / 'b', 'EMAIL_1.md', 'second')])
+
+    assert names[0] != 'EMAIL_1.md'
+    assert 'first' in pack.read('EMAIL_1.md') and 'second' in pack.read(names[0])
+
+
+@pytest.mark.parametrize('index', [None, '{not json', '{"version": 999, "size": 0, "items": {}}'])
+def test_add_refuses_pack_without_usable_index(tmp_path, index):
+    pack = MonthPack(tmp_path / '2025-01.pack.gz')
+    pack.add([write_note(tmp_path / 'a', 'EMAIL_1.md', 'first')])
+    size = pack.pack_file.stat().st_size
+    if index is None:
+        pack.index_file.unlink()
+    else:
+        pack.index_file.write_text(index, encoding='utf-8')
+
+    with pytest.raises(PackIndexError):
+        MonthPack(pack.pack_file).add([write_note(tmp_path / 'b', 'EMAIL_2.md', 'second')])
+    assert pack.pack_file.stat().st_size == size
+
+
+def test_compact_after_interrupted_run_does_not_duplicate(tmp_path):
+    old = time.mktime(datetime(2025, 1, 15).timetuple())
+    shard = tmp_path / 'Done' / '2025' / '01'
+    files = [write_note(shard, f'EMAIL_{i}.md', f'body {i}', old) for i in range(2)]
+
+    # A previous run packed the notes, then crashed before removing them
+    MonthPack.for_month(tmp_path, 'Done', 2025, 1).add(files)
+    assert compact(tmp_path, older_than_days=30) == {'2025-01': 2}
+
+    pack = MonthPack.for_month(tmp_path, 'Done', 2025, 1).load()
+    assert sorted(pack.items) == ['EMAIL_0.md', 'EMAIL_1.md']
+    assert not shard.exists()
+    assert 'body 1' in read_packed(tmp_path, 'Done', 'EMAIL_1.md')
+
+
+def test_compact_leaves_month_with_lost_index(tmp_path):
+    old = time.mktime(datetime(2025, 1, 15).timetuple())
+    shard = tmp_path / 'Done' / '2025' / '01'
+    note = write_note(shard, 'EMAIL_1.md', 'body 1', old)
+    pack = MonthPack.for_month(tmp_path, 'Done', 2025, 1)
+    pack.add([write_note(tmp_path / 'packed', 'EMAIL_0.md', 'body 0')])
+    pack.index_file.unlink()
+
+    assert compact(tmp_path, older_than_days=30) == {}
+    assert note.exists()
@@ -0,0 +1,116 @@
+"""
+Tests for the audit day indexes: sidecars are extended from the covered
+size only, and filtered queries agree with scanning the entries
+"""
+import os
+import sys
+import json
+import threading
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from audit_query import AuditQueryEngine, DayIndex
+
+ENTRIES = [
+    {'action_type': 'email_send', 'status': 'success', 'actor': 'auto_processor'},
+    {'action_type': 'email_send', 'status': 'failed', 'actor': 'auto_processor'},
+    {'action_type': 'linkedin_post', 'status': 'success', 'actor': 'auto_processor'},
+    {'action_type': 'email_send', 'status': 'success', 'actor': 'human'},
+    {'action_type': 'linkedin_post', 'status': 'failed', 'actor': 'human'},
+]
+
+
+def append(log_file, entries):
+    with open(log_file, 'a', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + '\n')
+
+
+def test_index_is_extended_incrementally(tmp_path):
+    log_file = tmp_path / 'audit_20260105.jsonl'
+    append(log_file, ENTRIES[:3])
+    index = DayIndex(log_file).load()
+    assert len(index.offsets) == 3
+    assert index.index_file.exists()
+
+    # Rewrite an indexed line in place: a reload must not re-parse it
+    data = log_file.read_bytes()
+    log_file.write_bytes(data.replace(b'"failed"', b'"FAILED"', 1))
+    append(log_file, ENTRIES[3:])
+    with open(log_file, 'a', encoding='utf-8') as f:
+        f.write('{"action_type": "partial"')
+
+    index = DayIndex(log_file).load()
+    assert len(index.offsets) == 5
+    assert index.counts('status') == {'success': 3, 'failed': 2}
+    assert 'partial' not in index.counts('action_type')
+    assert index.size == len(data) + sum(len(json.dumps(e)) + 1 for e in ENTRIES[3:])
+
+
+def test_truncated_log_is_reindexed(tmp_path):
+    log_file = tmp_path / 'audit_20260105.jsonl'
+    append(log_file, ENTRIES)
+    DayIndex(log_file).load()
+
+    log_file.write_text('', encoding='utf-8')
+    append(log_file, ENTRIES[:1])
+    assert len(DayIndex(log_file).load().offsets) == 1
+
+
+def test_match_intersects_filters(tmp_path):
+    log_file = tmp_path / 'audit_20260105.jsonl'
+    append(log_file, ENTRIES)
+    index = DayIndex(log_file).load()
+
+    def scan(**filters):
+        return [i for i, entry in enumerate(ENTRIES)
+                if all(entry[name] == value for name, value in filters.items())]
+
+    for filters in ({'action_type': 'email_send'},
+                    {'action_type': 'email_send', 'status': 'success'},
+                    {'status': 'failed', 'actor': 'human'},
+                    {'action_type': 'linkedin_post', 'status': 'success', 'actor': 'human'}):
+        assert index.match(filters) == [index.offsets[i] for i in scan(**filters)]
+    assert index.match({'action_type': None}) == index.offsets
+
+
+def test_engine_pages_across_days(tmp_path):
+    append(tmp_path / 'audit_20260105.jsonl', ENTRIES)
+    append(tmp_path / 'audit_20260107.jsonl', ENTRIES)
+    engine = AuditQueryEngine(tmp_path)
+    start, end = datetime(2026, 1, 1), datetime(2026, 1, 31)
+
+    assert engine.count(start, end, status='success') == 6
+    page = list(engine.iter_entries(start, end, status='success', offset=2, limit=3))
+    assert [item['date'] for item in page] == ['2026-01-05', '2026-01-07', '2026-01-07']
+    assert [item['action']['actor'] for item in page] == ['human', 'auto_processor', 'auto_processor']
+
+    summary = engine.summary(start, end)
+    assert summary['total_actions'] == 10
+    assert summary['actions_by_actor'] == {'auto_processor': 6, 'human': 4}
+
+
+def test_concurrent_loads_share_one_sidecar(tmp_path):
+    log_file = tmp_path / 'audit_20260105.jsonl'
+    append(log_file, ENTRIES * 200)
+    start = threading.Barrier(8)
+    errors = []
+
+    def load():
+        start.wait()
+        try:
+            for _ in range(5):
+                assert len(DayIndex(log_file).load().offsets) == len(ENTRIES) * 200
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=load) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert not list(tmp_path.glob('*.tmp')) and not list(tmp_path.glob('.*.tmp'))
+    assert json.loads(DayIndex(log_file).index_file.read_text())['size'] == log_file.stat().st_size
@@ -0,0 +1,100 @@
+"""
+Tests for the audit rollups: the writer keeps each day's sidecar current,
+readers fold in lines from other writers, and trends add up the days
+"""
+import os
+import sys
+import json
+import threading
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from audit_logger import AuditLogger
+from audit_rollups import AuditRollups, DayRollup
+from audit_writer import AuditWriter
+
+
+def entry(hour, action_type='email_send', status='success', platform='email'):
+    return {'timestamp': f'2026-01-05T{hour:02d}:15:00', 'action_type': action_type, 'actor': 'auto_processor',
+            'status': status, 'details': {'platform': platform}}
+
+
+def append(log_file, entries):
+    with open(log_file, 'a', encoding='utf-8') as f:
+        for item in entries:
+            f.write(json.dumps(item) + '\n')
+
+
+def test_rollup_counts_by_day_and_hour(tmp_path):
+    log_file = tmp_path / 'audit_20260105.jsonl'
+    append(log_file, [entry(9), entry(9, status='failed'), entry(14, 'error', 'error', None)])
+
+    rollup = DayRollup(log_file).load()
+    assert rollup.day['total'] == 3 and rollup.day['errors'] == 2
+    assert rollup.day['by_platform'] == {'email': 2, 'none': 1}
+    assert {hour: counts['total'] for hour, counts in rollup.hours.items()} == {'09': 2, '14': 1}
+    assert rollup.rollup_file.exists()
+
+
+def test_reader_folds_in_lines_written_elsewhere(tmp_path):
+    log_file = tmp_path / 'audit_20260105.jsonl'
+    append(log_file, [entry(9)])
+    DayRollup(log_file).load()
+
+    # Rewrite the counted line in place: only the new lines are read
+    log_file.write_bytes(log_file.read_bytes().replace(b'success', b'SUCCESS'))
+    append(log_file, [entry(10, status='failed')])
+
+    summary = AuditRollups(tmp_path).daily_summary(datetime(2026, 1, 5))
+    assert summary['total_actions'] == 2
+    assert summary['actions_by_status'] == {'success': 1, 'failed': 1}
+    assert summary['by_hour'] == {'09': {'total': 1, 'errors': 0}, '10': {'total': 1, 'errors': 1}}
+
+
+def test_writer_updates_rollup_after_each_batch(tmp_path):
+    writer = AuditWriter(tmp_path / 'Audit_Logs', durability='none')
+    logger = AuditLogger(tmp_path, writer=writer)
+    logger.log_action('email_send', 'auto_processor', {'platform': 'email'})
+    logger.log_action('linkedin_post', 'auto_processor', {'platform': 'linkedin'}, status='failed')
+    assert logger.flush()
+
+    with open(DayRollup(logger.daily_log_file).rollup_file, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved['size'] == logger.daily_log_file.stat().st_size
+    assert saved['day']['by_action_type'] == {'email_send': 1, 'linkedin_post': 1}
+
+    summary = logger.get_daily_summary()
+    assert summary['total_actions'] == 2 and summary['errors'] == 1
+    writer.close()
+
+
+def test_trend_adds_up_days(tmp_path):
+    append(tmp_path / 'audit_20260105.jsonl', [entry(9), entry(10, status='failed')])
+    append(tmp_path / 'audit_20260107.jsonl', [entry(9), entry(9), entry(9)])
+
+    trend = AuditRollups(tmp_path).trend(datetime(2026, 1, 5), datetime(2026, 1, 7))
+    assert [(day['date'], day['total']) for day in trend['days']] == \
+        [('2026-01-05', 2), ('2026-01-06', 0), ('2026-01-07', 3)]
+    assert trend['totals']['total'] == 5
+    assert trend['error_rate'] == 0.2
+
+
+def test_concurrent_loads_share_one_sidecar(tmp_path):
+    log_file = tmp_path / 'audit_20260105.jsonl'
+    append(log_file, [entry(hour % 24) for hour in range(1000)])
+    start = threading.Barrier(8)
+    totals = []
+
+    def load():
+        start.wait()
+        totals.append(DayRollup(log_file).load().day['total'])
+
+    threads = [threading.Thread(target=load) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert totals == [1000] * 8
+    assert [path.name for path in tmp_path.iterdir() if path.name.endswith('.tmp')] == []
@@ -0,0 +1,73 @@
+"""
+Tests for the batched audit writer: flush and close put every queued entry
+on disk in order, and a full or closed queue drops entries instead of blocking
+"""
+import os
+import sys
+import json
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from audit_writer import AuditWriter
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_flush_writes_queued_entries_in_order(tmp_path):
+    writer = AuditWriter(tmp_path, durability='batch', batch_size=4)
+    for i in range(10):
+        assert writer.write({'n': i})
+    writer.write({'error': 'boom'}, filename='errors.jsonl')
+
+    assert writer.flush()
+    daily = writer.daily_file(datetime.now().strftime('%Y%m%d'))
+    assert [entry['n'] for entry in read_lines(daily)] == list(range(10))
+    assert read_lines(tmp_path / 'errors.jsonl') == [{'error': 'boom'}]
+    assert writer.get_metrics()['written'] == 11
+    assert writer.get_metrics()['fsyncs'] >= 1
+    writer.close()
+
+
+def test_close_drains_queue_then_drops_later_writes(tmp_path):
+    writer = AuditWriter(tmp_path, durability='none')
+    for i in range(100):
+        writer.write({'n': i})
+
+    writer.close()
+    daily = writer.daily_file(datetime.now().strftime('%Y%m%d'))
+    assert len(read_lines(daily)) == 100
+
+    assert not writer.write({'n': 100})
+    assert writer.get_metrics()['dropped'] == 1
+    assert len(read_lines(daily)) == 100
+    assert not writer._thread.is_alive()
+
+
+def test_full_queue_drops_and_counts(tmp_path, monkeypatch):
+    writer = AuditWriter(tmp_path, max_queue=2)
+    # Hold the writer thread back so the queue fills up
+    monkeypatch.setattr(writer, '_ensure_thread', lambda: None)
+
+    assert writer.write({'n': 0}) and writer.write({'n': 1})
+    assert not writer.write({'n': 2})
+    metrics = writer.get_metrics()
+    assert metrics['dropped'] == 1 and metrics['enqueued'] == 2
+    assert metrics['queue_depth'] == 2
+
+    monkeypatch.undo()
+    writer._ensure_thread()
+    assert writer.flush()
+    daily = writer.daily_file(datetime.now().strftime('%Y%m%d'))
+    assert [entry['n'] for entry in read_lines(daily)] == [0, 1]
+    writer.close()
+
+
+def test_shared_writer_is_reused_until_closed(tmp_path):
+    writer = AuditWriter.shared(tmp_path)
+    assert AuditWriter.shared(tmp_path / '.') is writer
+    writer.close()
+    assert AuditWriter.shared(tmp_path) is not writer
+    AuditWriter.shared(tmp_path).close()
@@ -0,0 +1,189 @@
+"""
+Tests for auto_processor dispatch: posters that report failure instead of
+raising count against the platform's breaker, and only failures marked
+retryable are sent again
+"""
+import os
+import sys
+import asyncio
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import rate_limiter
+from auto_processor import ApprovedFileHandler, PostingWorkerPool
+
+
+@pytest.fixture(autouse=True)
+def vault_path(tmp_path, monkeypatch):
+    # Shared vault state, such as the rate limiter's, lives in the test's vault
+    monkeypatch.setenv('VAULT_PATH', str(tmp_path))
+    monkeypatch.setattr(rate_limiter, '_limiter', None)
+    return tmp_path
+
+
+class FakePoster:
+    def __init__(self, results, rate_limited=()):
+        self.results = list(results)
+        self.calls = 0
+        self.rate_limited = set(rate_limited)
+        self.browser_pool = None
+        self.tweeted = threading.Event()
+        self.tweets = 0
+        self.tweet_delay = 0
+        self.paces = 0
+        self.delay = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def pace(self, platform, metadata):
+        self.paces += 1
+        if platform in self.rate_limited:
+            await asyncio.Event().wait()
+
+    async def post_to_linkedin(self, content, metadata):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return self.results.pop(0)
+
+    def post_to_twitter(self, content, metadata):
+        self.tweets += 1
+        time.sleep(self.tweet_delay)
+        self.tweeted.set()
+        return {"success": True, "platform": "twitter"}
+
+
+def make_handler(tmp_path, results):
+    handler = ApprovedFileHandler(tmp_path)
+    handler.poster = FakePoster(results)
+    handler.recovery.retry_config['base_delay'] = 0
+    handler.recovery.retry_config['max_delay'] = 0
+    return handler
+
+
+def test_handler_does_not_open_the_shared_limiter(tmp_path):
+    handler = ApprovedFileHandler(tmp_path)
+    assert rate_limiter._limiter is None
+
+    assert handler.poster.rate_limiter is rate_limiter.get_rate_limiter()
+    assert (tmp_path / 'state' / 'rate_limits.db').exists()
+
+
+def test_retryable_failure_is_retried_with_a_new_rate_limit_token(tmp_path):
+    handler = make_handler(tmp_path, [{"success": False, "error": "Post button not found", "retryable": True},
+                                      {"success": True, "platform": "linkedin"}])
+    result = asyncio.run(handler._guarded_dispatch('linkedin', 'linkedin', 'Hello', {}))
+
+    assert result["success"]
+    assert handler.poster.calls == 2
+    assert handler.poster.paces == 2
+
+
+def test_other_failures_are_returned_without_retry(tmp_path):
+    failure = {"success": False, "platform": "linkedin", "error": "Not logged in"}
+    handler = make_handler(tmp_path, [failure, {"success": True, "platform": "linkedin"}])
+    result = asyncio.run(handler._guarded_dispatch('linkedin', 'linkedin', 'Hello', {}))
+
+    assert result == failure
+    assert handler.poster.calls == 1
+    assert handler.recovery.component_health['linkedin_poster']['failures'] == 1
+
+
+def test_timed_out_thread_send_is_not_retried(tmp_path):
+    handler = make_handler(tmp_path, [])
+    handler.post_deadline = 0.1
+    handler.poster.tweet_delay = 0.3
+    result = asyncio.run(handler._guarded_dispatch('twitter', 'twitter', 'Hello', {}))
+
+    assert not result["success"] and result["error"].startswith("Timed out")
+    # The first tweet is still going out in its thread
+    assert handler.poster.tweeted.wait(5)
+    assert handler.poster.tweets == 1
+
+
+def test_failed_results_count_against_breaker(tmp_path):
+    failure = {"success": False, "platform": "linkedin", "error": "Post button not found", "retryable": True}
+    handler = make_handler(tmp_path, [failure] * 3)
+    result = asyncio.run(handler._guarded_dispatch('linkedin', 'linkedin', 'Hello', {}))
+
+    assert result == failure
+    assert handler.poster.calls == 3
+    assert handler.recovery.component_health['linkedin_poster']['failures'] == 3
+
+
+def test_missing_recipient_is_not_retried(tmp_path):
+    handler = make_handler(tmp_path, [])
+    result = asyncio.run(handler._guarded_dispatch('email', 'email', 'Hello', {}))
+
+    assert not result["success"]
+    assert result["error"] == "No recipient specified"
+
+
+def test_rate_limited_platform_does_not_starve_others(tmp_path, monkeypatch):
+    monkeypatch.setenv('BROWSER_POOL_ENABLED', 'false')
+    handler = make_handler(tmp_path, [])
+    handler.poster.rate_limited.add('linkedin')
+    pool = PostingWorkerPool(handler, workers=1)
+    pool.start()
+    try:
+        for name, file_type in (('post.md', 'linkedin_post'), ('tweet.md', 'tweet')):
+            note = tmp_path / 'Approved' / name
+            note.write_text(f"---\ntype: {file_type}\n---\n\n## Post Content\nHello\n")
+            pool.submit(note)
+
+        # The only worker slot is not held by the LinkedIn post waiting on its rate limit
+        assert handler.poster.tweeted.wait(5)
+    finally:
+        pool.stop(drain=False, timeout=5)
+
+
+def test_platform_cap_comes_from_its_worker_count(tmp_path, monkeypatch):
+    monkeypatch.setenv('BROWSER_POOL_ENABLED', 'false')
+    handler = make_handler(tmp_path, [{"success": True, "platform": "linkedin"}] * 3)
+    handler.poster.delay = 0.05
+    pool = PostingWorkerPool(handler, workers=4, platform_limits={'linkedin': 1})
+    pool.start()
+    try:
+        for i in range(3):
+            note = tmp_path / 'Approved' / f'post_{i}.md'
+            note.write_text("---\ntype: linkedin_post\n---\n\n## Post Content\nHello\n")
+            pool.submit(note)
+    finally:
+        pool.stop(drain=True, timeout=10)
+
+    assert handler.poster.calls == 3
+    assert handler.poster.max_in_flight == 1
+
+
+def test_worker_slot_is_free_during_backoff(tmp_path, monkeypatch):
+    monkeypatch.setenv('BROWSER_POOL_ENABLED', 'false')
+    handler = make_handler(tmp_path, [{"success": False, "error": "Post button not found", "retryable": True},
+                                      {"success": True, "platform": "linkedin"}])
+    handler.recovery.retry_config['base_delay'] = 1
+    handler.recovery.retry_config['max_delay'] = 1
+    pool = PostingWorkerPool(handler, workers=1)
+    pool.start()
+    try:
+        note = tmp_path / 'Approved' / 'post.md'
+        note.write_text("---\ntype: linkedin_post\n---\n\n## Post Content\nHello\n")
+        pool.submit(note)
+        while handler.poster.calls == 0:
+            time.sleep(0.01)
+
+        tweet = tmp_path / 'Approved' / 'tweet.md'
+        tweet.write_text("---\ntype: tweet\n---\n\n## Post Content\nHello\n")
+        pool.submit(tweet)
+
+        # The tweet takes the only worker slot while the LinkedIn post backs off
+        assert handler.poster.tweeted.wait(0.8)
+        assert handler.poster.calls == 1
+    finally:
+        pool.stop(drain=True, timeout=10)
+
+    assert handler.poster.calls == 2
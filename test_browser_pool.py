@@ -0,0 +1,128 @@
+"""
+Tests for the warm browser pool: leases must be returned even when a
+posting call is cancelled by its deadline
+"""
+import os
+import sys
+import asyncio
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from browser_pool import BrowserPool
+
+
+class FakePage:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    def is_closed(self):
+        return False
+
+    async def goto(self, *args, **kwargs):
+        await asyncio.sleep(self.delay)
+
+    async def wait_for_timeout(self, *args):
+        pass
+
+
+class FakeContext:
+    def __init__(self, delay: float = 0.0):
+        self.pages = [FakePage(delay)]
+        self.closed = False
+
+    def on(self, *args):
+        pass
+
+    async def new_page(self):
+        return self.pages[0]
+
+    async def cookies(self):
+        return []
+
+    async def add_cookies(self, cookies):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+def make_pool(delay: float = 0.0, launch_delay: float = 0.0) -> BrowserPool:
+    pool = BrowserPool()
+
+    async def launch(entry, launch_options):
+        await asyncio.sleep(launch_delay)
+        entry.context = FakeContext(delay)
+        entry.uses = 0
+        entry.crashed = False
+
+    pool._launch = launch
+    return pool
+
+
+def test_release_returns_context_for_reuse(tmp_path):
+    async def scenario():
+        pool = make_pool()
+        lease = await pool.acquire(str(tmp_path / 'session'))
+        assert not lease.warm
+        await lease.release()
+
+        lease = await asyncio.wait_for(pool.acquire(str(tmp_path / 'session')), 1)
+        assert lease.warm
+        await lease.release()
+        return pool.get_metrics()
+
+    metrics = asyncio.run(scenario())
+    assert metrics['hits'] == 1 and metrics['misses'] == 1
+
+
+def test_cancelled_acquire_releases_session_lock(tmp_path):
+    async def scenario():
+        pool = make_pool(launch_delay=10)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(pool.acquire(str(tmp_path / 'session')), 0.1)
+
+        # The launch was interrupted: the session must be free again
+        pool._launch = make_pool()._launch
+        lease = await asyncio.wait_for(pool.acquire(str(tmp_path / 'session')), 1)
+        await lease.release()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize('poster_name', ['linkedin', 'instagram'])
+def test_cancelled_post_returns_lease(tmp_path, monkeypatch, poster_name):
+    monkeypatch.setenv('LINKEDIN_SESSION_PATH', str(tmp_path / 'linkedin_session'))
+    monkeypatch.setenv('LINKEDIN_COOKIES_PATH', str(tmp_path / 'linkedin_cookies.json'))
+    monkeypatch.setenv('INSTAGRAM_SESSION_PATH', str(tmp_path / 'instagram_session'))
+
+    async def logged_in():
+        return True
+
+    async def scenario():
+        pool = make_pool(delay=10)
+        if poster_name == 'linkedin':
+            from linkedin_poster import LinkedInPoster
+            poster = LinkedInPoster(pool=pool)
+            poster._check_login_status = logged_in
+            posting = poster.post("Hello")
+        else:
+            from instagram_playwright import InstagramPlaywright
+            poster = InstagramPlaywright(pool=pool)
+            poster._check_login = logged_in
+            image = tmp_path / 'image.png'
+            image.write_bytes(b'png')
+            posting = poster.post_image(str(image), "Caption")
+
+        # The deadline cancels the post while the page is loading
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(posting, 0.1)
+        assert poster.lease is None
+
+        # A later post for the platform gets the session straight away
+        lease = await asyncio.wait_for(pool.acquire(poster.session_path), 1)
+        assert lease.warm
+        await lease.release()
+
+    asyncio.run(scenario())
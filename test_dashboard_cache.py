@@ -0,0 +1,95 @@
+"""
+Tests for the dashboard cache: folders are re-listed only when they change,
+and log counters read only whole lines appended since the last refresh
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dashboard_cache import DashboardCache
+
+
+def make_vault(tmp_path):
+    (tmp_path / 'Inbox').mkdir()
+    (tmp_path / 'Logs').mkdir()
+    for i in range(3):
+        (tmp_path / 'Inbox' / f'NOTE_{i}.md').write_text('x', encoding='utf-8')
+    return tmp_path
+
+
+def add_behind_cache(folder, name, bump=0):
+    """Create a file, leaving the folder mtime as it was (plus bump seconds)"""
+    stat = os.stat(folder)
+    (folder / name).write_text('x', encoding='utf-8')
+    os.utime(folder, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump * 10 ** 9))
+
+
+def test_folder_is_relisted_only_when_mtime_changes(tmp_path):
+    vault = make_vault(tmp_path)
+    cache = DashboardCache(vault, folders=['Inbox'])
+    assert cache.count('Inbox') == 3
+
+    # Unchanged mtime: the cached listing is used as is
+    add_behind_cache(vault / 'Inbox', 'NOTE_3.md')
+    assert cache.count('Inbox') == 3
+
+    add_behind_cache(vault / 'Inbox', 'NOTE_4.md', bump=5)
+    assert cache.count('Inbox') == 5
+
+
+def test_events_update_listing(tmp_path):
+    vault = make_vault(tmp_path)
+    cache = DashboardCache(vault, folders=['Inbox'])
+    cache.entries('Inbox')
+
+    (vault / 'Inbox' / 'NOTE_0.md').rename(vault / 'Inbox' / 'NOTE_9.md')
+    cache.apply_event(removed=str(vault / 'Inbox' / 'NOTE_0.md'), added=str(vault / 'Inbox' / 'NOTE_9.md'))
+
+    # The event brought the listing up to date, so it is not re-listed
+    add_behind_cache(vault / 'Inbox', 'NOTE_5.md')
+    assert cache.entries('Inbox') == ['NOTE_1.md', 'NOTE_2.md', 'NOTE_9.md']
+
+
+def test_log_counters_read_only_appended_lines(tmp_path):
+    vault = make_vault(tmp_path)
+    log = vault / 'Logs' / 'app.log'
+    log.write_bytes(b'ok\nERROR one\n')
+    cache = DashboardCache(vault, folders=['Inbox'])
+    assert cache.log_lines() == {'app.log': 2}
+    assert cache.error_count() == 1
+
+    # Rewrite a counted line in place, then append a line and a partial one
+    log.write_bytes(b'ok\nFINE  one\nerror two\nERR')
+    assert cache.log_lines() == {'app.log': 3}
+    assert cache.error_count() == 2
+
+    with open(log, 'ab') as f:
+        f.write(b'OR three\n')
+    assert cache.error_count() == 3
+
+
+def test_truncated_log_is_counted_afresh(tmp_path):
+    vault = make_vault(tmp_path)
+    log = vault / 'Logs' / 'app.log'
+    log.write_bytes(b'error\n' * 10)
+    cache = DashboardCache(vault, folders=['Inbox'])
+    assert cache.error_count() == 10
+
+    log.write_bytes(b'error\n')
+    assert cache.error_count() == 1
+
+
+def test_state_persists_between_runs(tmp_path):
+    vault = make_vault(tmp_path)
+    (vault / 'Logs' / 'app.log').write_bytes(b'error\n')
+    cache = DashboardCache(vault, folders=['Inbox'])
+    cache.count('Inbox')
+    cache.error_count()
+    cache.save()
+    assert (vault / 'state' / 'dashboard_cache.json').exists()
+
+    reopened = DashboardCache(vault, folders=['Inbox'])
+    assert reopened.logs['app.log']['offset'] == 6
+    add_behind_cache(vault / 'Inbox', 'NOTE_3.md')
+    assert reopened.count('Inbox') == 3
@@ -0,0 +1,72 @@
+"""
+Tests for the append-only activity log: stats come from the sidecar, keep
+their totals across rotation and pick up lines from other writers
+"""
+import os
+import sys
+import json
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dashboard_logger import DashboardLogger
+
+
+def make_logger(tmp_path, max_bytes=1024 * 1024, backups=2):
+    logger = DashboardLogger(tmp_path)
+    logger.max_bytes = max_bytes
+    logger.backup_count = backups
+    return logger
+
+
+def test_stats_count_each_event_once(tmp_path):
+    logger = make_logger(tmp_path)
+    logger.log_twitter("hello", True, "https://example.com/1")
+    logger.log_email("a@example.com", "Hi", False, "SMTP down")
+
+    stats = logger.get_stats()
+    assert stats['total'] == 2
+    assert stats['success'] == 1 and stats['failed'] == 1
+    assert stats['by_platform'] == {'twitter': 1, 'email': 1}
+    assert len(logger.log_file.read_text(encoding='utf-8').splitlines()) == 2
+    assert logger.get_stats() == stats
+
+
+def test_stats_survive_rotation(tmp_path):
+    logger = make_logger(tmp_path, max_bytes=600, backups=2)
+    for i in range(20):
+        logger.log_whatsapp(f"+1555000{i:04d}", i % 4 != 0)
+
+    rotated = logger.log_file.with_name('activity.jsonl.1')
+    assert rotated.exists()
+    assert not logger.log_file.with_name('activity.jsonl.3').exists()
+    assert not logger.log_file.exists() or logger.log_file.stat().st_size < 600
+
+    stats = make_logger(tmp_path).get_stats()
+    assert stats['total'] == 20
+    assert stats['success'] == 15 and stats['failed'] == 5
+    assert stats['by_platform'] == {'whatsapp': 20}
+
+
+def test_lines_from_other_writers_are_folded_in(tmp_path):
+    logger = make_logger(tmp_path)
+    logger.log_linkedin("post", True)
+
+    with open(logger.log_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'platform': 'instagram', 'status': 'success'}) + '\n')
+        # Partially written line is left for the next update
+        f.write('{"platform": "instagram"')
+
+    stats = logger.get_stats()
+    assert stats['total'] == 2
+    assert stats['by_platform'] == {'linkedin': 1, 'instagram': 1}
+
+
+def test_legacy_json_log_is_converted_once(tmp_path):
+    (tmp_path / 'Logs').mkdir()
+    legacy = [{'platform': 'twitter', 'status': 'success'}, {'platform': 'email', 'status': 'failed'}]
+    (tmp_path / 'Logs' / 'activity.json').write_text(json.dumps(legacy), encoding='utf-8')
+
+    logger = make_logger(tmp_path)
+    assert logger.get_stats()['total'] == 2
+    assert (tmp_path / 'Logs' / 'activity.json.migrated').exists()
+    assert make_logger(tmp_path).get_stats()['total'] == 2
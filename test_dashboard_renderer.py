@@ -0,0 +1,85 @@
+"""
+Tests for the dashboard activity feed: only the section between the markers
+is rewritten, it holds the newest entries, and older ones go to the archive
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dashboard_renderer import DashboardRenderer, FEED_END, FEED_START
+
+DASHBOARD = """# AI Employee Dashboard
+
+## Status
+Everything is fine.
+
+{feed}
+
+## Notes
+Hand-written notes stay put.
+"""
+
+
+def feed_section(text):
+    return text[text.index(FEED_START):text.index(FEED_END)]
+
+
+def test_feed_keeps_newest_entries_between_markers(tmp_path):
+    (tmp_path / 'Dashboard.md').write_text(DASHBOARD.format(feed=f"{FEED_START}\nold feed\n{FEED_END}"),
+                                           encoding='utf-8')
+    renderer = DashboardRenderer(tmp_path, max_entries=3, interval=0)
+    for i in range(5):
+        renderer.record(f"Post {i}", {'File': f'POST_{i}.md', 'Error': None}, icon='✅',
+                        timestamp=f'2026-01-05 10:00:0{i}')
+
+    text = (tmp_path / 'Dashboard.md').read_text(encoding='utf-8')
+    feed = feed_section(text)
+    assert [f'Post {i}' in feed for i in range(5)] == [False, False, True, True, True]
+    assert feed.index('Post 4') < feed.index('Post 2')
+    assert 'Error' not in feed and 'old feed' not in text
+    assert text.count(FEED_START) == 1
+    assert 'Everything is fine.' in text and text.rstrip().endswith('Hand-written notes stay put.')
+
+    archive = (tmp_path / 'Dashboard_Archive' / '2026-01-05.md').read_text(encoding='utf-8')
+    assert archive.index('Post 0') < archive.index('Post 1')
+    assert 'Post 2' not in archive
+    renderer.close()
+
+
+def test_feed_section_is_added_once(tmp_path):
+    (tmp_path / 'Dashboard.md').write_text("# AI Employee Dashboard\n", encoding='utf-8')
+    renderer = DashboardRenderer(tmp_path, max_entries=2, interval=0)
+    renderer.record("First", {'File': 'a.md'})
+    renderer.record("Second", {'File': 'b.md'})
+
+    text = (tmp_path / 'Dashboard.md').read_text(encoding='utf-8')
+    assert text.count(FEED_START) == 1 and text.count(FEED_END) == 1
+    assert 'First' in feed_section(text) and 'Second' in feed_section(text)
+    renderer.close()
+
+
+def test_renders_are_throttled_and_flushed(tmp_path):
+    renderer = DashboardRenderer(tmp_path, max_entries=5, interval=3600)
+    renderer.record("First", {'File': 'a.md'})
+    renderer.record("Second", {'File': 'b.md'})
+
+    text = (tmp_path / 'Dashboard.md').read_text(encoding='utf-8')
+    assert 'First' in text and 'Second' not in text
+
+    renderer.flush()
+    assert 'Second' in (tmp_path / 'Dashboard.md').read_text(encoding='utf-8')
+    renderer.close()
+
+
+def test_legacy_appended_blocks_move_to_archive(tmp_path):
+    legacy = ("# AI Employee Dashboard\n\n"
+              "## 2026-01-04 09:00:00 - ✅ Twitter Posted\n\n**Platform**: twitter\n\n---\n")
+    (tmp_path / 'Dashboard.md').write_text(legacy, encoding='utf-8')
+    renderer = DashboardRenderer(tmp_path, interval=0)
+    renderer.record("New", {'File': 'a.md'})
+
+    text = (tmp_path / 'Dashboard.md').read_text(encoding='utf-8')
+    assert 'Twitter Posted' not in text
+    assert 'Twitter Posted' in (tmp_path / 'Dashboard_Archive' / '2026-01-04.md').read_text(encoding='utf-8')
+    renderer.close()
@@ -0,0 +1,80 @@
+"""
+Tests for the circuit breaker: the half-open state admits a fixed number of
+probes, closes after they succeed, re-opens on a failed probe, and state is
+written to disk as snapshots rather than on every call
+"""
+import os
+import sys
+import json
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from error_handler import ErrorRecoverySystem
+
+
+def make_recovery(tmp_path):
+    recovery = ErrorRecoverySystem(tmp_path, snapshot_interval=3600)
+    recovery.circuit_breaker.update({"failure_threshold": 4, "half_open_max_calls": 2})
+    return recovery
+
+
+def open_circuit(recovery, name='twitter_mcp'):
+    for _ in range(recovery.circuit_breaker["failure_threshold"]):
+        recovery.record_component_failure(name, "boom")
+    assert recovery.get_component_status(name) == "failed"
+    assert not recovery.is_component_healthy(name)
+    # Pretend the recovery timeout has passed
+    past = datetime.now() - timedelta(seconds=recovery.circuit_breaker["recovery_timeout"] + 1)
+    recovery.component_health[name]["last_failure"] = past.isoformat()
+
+
+def test_half_open_closes_after_max_successful_probes(tmp_path):
+    recovery = make_recovery(tmp_path)
+    open_circuit(recovery)
+
+    assert recovery.is_component_healthy('twitter_mcp')
+    assert recovery.get_component_status('twitter_mcp') == "recovering"
+    assert recovery.is_component_healthy('twitter_mcp')
+    # Probe limit reached until the admitted probes report back
+    assert not recovery.is_component_healthy('twitter_mcp')
+
+    recovery.record_component_success('twitter_mcp')
+    assert recovery.get_component_status('twitter_mcp') == "recovering"
+    recovery.record_component_success('twitter_mcp')
+
+    assert recovery.get_component_status('twitter_mcp') == "healthy"
+    assert recovery.component_health['twitter_mcp']["failures"] == 0
+    assert recovery.is_component_healthy('twitter_mcp')
+    recovery.close()
+
+
+def test_failed_probe_reopens_circuit(tmp_path):
+    recovery = make_recovery(tmp_path)
+    open_circuit(recovery)
+
+    assert recovery.is_component_healthy('twitter_mcp')
+    recovery.record_component_success('twitter_mcp')
+    assert recovery.is_component_healthy('twitter_mcp')
+    recovery.record_component_failure('twitter_mcp', "still down")
+
+    assert recovery.get_component_status('twitter_mcp') == "failed"
+    # A fresh recovery timeout starts from the failed probe
+    assert not recovery.is_component_healthy('twitter_mcp')
+    recovery.close()
+
+
+def test_state_is_snapshotted_on_close(tmp_path):
+    recovery = make_recovery(tmp_path)
+    state_file = tmp_path / 'state' / 'error_recovery_state.json'
+    recovery.record_component_success('email_mcp')
+    assert not state_file.exists()
+
+    recovery.record_component_failure('email_mcp', "boom")
+    assert not state_file.exists()
+    recovery.close()
+
+    with open(state_file, 'r') as f:
+        assert json.load(f)['email_mcp']['failures'] == 1
+    assert not state_file.with_suffix('.tmp').exists()
+    assert ErrorRecoverySystem(tmp_path).component_health['email_mcp']['failures'] == 1
@@ -0,0 +1,74 @@
+"""
+Tests for the file stabilizer: a burst of events fires the callback once,
+only after the file has stopped changing for the quiet period
+"""
+import os
+import sys
+import time
+import threading
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from file_stabilizer import FileStabilizer
+
+
+def make_stabilizer(quiet_period=0.3):
+    fired = []
+    done = threading.Event()
+
+    def callback(path):
+        fired.append((path, time.monotonic()))
+        done.set()
+
+    return FileStabilizer(callback, quiet_period=quiet_period, poll_interval=0.02), fired, done
+
+
+def test_callback_waits_for_quiet_period(tmp_path):
+    stabilizer, fired, done = make_stabilizer()
+    note = tmp_path / 'EMAIL_1.md'
+    note.write_text('partial', encoding='utf-8')
+
+    start = time.monotonic()
+    stabilizer.touch(note)
+    for i in range(5):
+        time.sleep(0.1)
+        note.write_text('partial' + 'x' * (i + 1), encoding='utf-8')
+        stabilizer.touch(note, create=False)
+    last_write = time.monotonic()
+
+    assert done.wait(5)
+    stabilizer.stop()
+    assert len(fired) == 1
+    assert fired[0][0] == note
+    assert fired[0][1] - last_write >= 0.3
+    assert fired[0][1] - start >= 0.8
+
+
+def test_modified_event_alone_is_ignored(tmp_path):
+    stabilizer, fired, done = make_stabilizer(quiet_period=0.05)
+    note = tmp_path / 'EMAIL_1.md'
+    note.write_text('body', encoding='utf-8')
+
+    stabilizer.touch(note, create=False)
+
+    assert not done.wait(0.3)
+    assert stabilizer.pending_count == 0
+    stabilizer.stop()
+
+
+def test_forgotten_or_deleted_files_do_not_fire(tmp_path):
+    stabilizer, fired, done = make_stabilizer(quiet_period=0.2)
+    kept = tmp_path / 'kept.md'
+    forgotten = tmp_path / 'forgotten.md'
+    deleted = tmp_path / 'deleted.md'
+    for path in (kept, forgotten, deleted):
+        path.write_text('body', encoding='utf-8')
+        stabilizer.touch(path)
+
+    stabilizer.forget(forgotten)
+    deleted.unlink()
+
+    assert done.wait(5)
+    time.sleep(0.3)
+    stabilizer.stop()
+    assert [path for path, _ in fired] == [kept]
@@ -0,0 +1,100 @@
+"""
+Tests for the durable job table and the draft generator's use of it
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from job_store import JobStore, QUEUED, RUNNING, DONE, FAILED
+from draft_generator import DraftGenerator, NeedsActionHandler, JOB_QUEUE
+
+
+def make_store(tmp_path, max_retries=2) -> JobStore:
+    return JobStore(tmp_path / 'state' / 'jobs.db', max_retries=max_retries)
+
+
+def test_claim_is_exclusive(tmp_path):
+    store = make_store(tmp_path)
+    job_id = store.enqueue('approved', tmp_path / 'note.md', 'abc')
+
+    assert store.claim(job_id)
+    assert not store.claim(job_id)
+    # Running: a second enqueue of the same content is refused
+    assert store.enqueue('approved', tmp_path / 'note.md', 'abc') is None
+    assert store.state_of('approved', tmp_path / 'note.md', 'abc') == RUNNING
+
+
+def test_done_content_is_never_requeued_but_edits_are(tmp_path):
+    store = make_store(tmp_path)
+    job_id = store.enqueue('approved', tmp_path / 'note.md', 'abc')
+    store.claim(job_id)
+    store.complete(job_id)
+
+    assert store.enqueue('approved', tmp_path / 'note.md', 'abc') is None
+    assert store.enqueue('approved', tmp_path / 'note.md', 'def') not in (None, job_id)
+
+
+def test_failed_jobs_retry_until_out_of_retries(tmp_path):
+    store = make_store(tmp_path, max_retries=2)
+    for _ in range(2):
+        job_id = store.enqueue('approved', tmp_path / 'note.md', 'abc')
+        assert store.claim(job_id)
+        store.fail(job_id, 'boom')
+
+    assert store.enqueue('approved', tmp_path / 'note.md', 'abc') is None
+    assert store.state_of('approved', tmp_path / 'note.md', 'abc') == FAILED
+
+
+def test_recover_requeues_running_jobs(tmp_path):
+    store = make_store(tmp_path)
+    running = store.enqueue('approved', tmp_path / 'a.md', 'a')
+    store.claim(running)
+    queued = store.enqueue('approved', tmp_path / 'b.md', 'b')
+    other = store.enqueue('needs_action', tmp_path / 'c.md', 'c')
+    store.claim(other)
+    store.close()
+
+    # A new process opens the store after a crash
+    store = make_store(tmp_path)
+    assert store.recover('approved') == [(running, str(tmp_path / 'a.md')), (queued, str(tmp_path / 'b.md'))]
+    assert store.state_of('approved', tmp_path / 'a.md', 'a') == QUEUED
+    assert store.state_of('needs_action', tmp_path / 'c.md', 'c') == RUNNING
+
+
+def test_prune_only_removes_old_finished_jobs(tmp_path):
+    store = make_store(tmp_path)
+    ids = {}
+    for name in ('old_done', 'old_failed', 'old_queued', 'new_done'):
+        ids[name] = store.enqueue('approved', tmp_path / f'{name}.md', name)
+    for name in ('old_done', 'new_done'):
+        store.claim(ids[name])
+        store.complete(ids[name])
+    store.claim(ids['old_failed'])
+    store.fail(ids['old_failed'])
+
+    old = (datetime.now() - timedelta(days=100)).isoformat()
+    for name in ('old_done', 'old_failed', 'old_queued'):
+        store._conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (old, ids[name]))
+
+    assert store.prune(days_to_keep=90) == 2
+    assert store.stats('approved')['by_state'] == {QUEUED: 1, DONE: 1}
+
+
+def test_draft_error_fails_the_job(tmp_path, monkeypatch):
+    generator = DraftGenerator(tmp_path)
+    handler = NeedsActionHandler(generator, make_store(tmp_path))
+    note = tmp_path / 'Needs_Action' / 'EMAIL_test.md'
+    note.parent.mkdir(exist_ok=True)
+    note.write_text('---\ntype: email\n---\n\nHello\n')
+
+    def broken(file_path):
+        raise RuntimeError('template missing')
+
+    monkeypatch.setattr(generator, 'process_needs_action_file', broken)
+    result = handler.handle(note)
+
+    assert not result['success']
+    rows = handler.jobs._conn.execute("SELECT state, last_error FROM jobs WHERE queue = ?", (JOB_QUEUE,)).fetchall()
+    assert rows == [(FAILED, 'template missing')]
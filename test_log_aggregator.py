@@ -0,0 +1,90 @@
+"""
+Tests for the log aggregator: old logs are compressed and tarred in a
+process pool without losing data or their age, and throughput is reported
+"""
+import os
+import sys
+import json
+import time
+import tarfile
+from datetime import datetime
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills', 'monitor-system', 'scripts'))
+
+import log_aggregator
+from log_aggregator import LogAggregator
+from log_archive import open_log
+
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_aggregator, 'LOG_DIR', tmp_path / 'Logs')
+    return tmp_path / 'Logs'
+
+
+def write_log(path, day, lines=50, age_days=0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(''.join(json.dumps({'timestamp': f'{day}T00:00:{i % 60:02d}', 'n': i}) + '\n'
+                            for i in range(lines)), encoding='utf-8')
+    when = time.time() - age_days * 86400
+    os.utime(path, (when, when))
+    return path
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_compress_old_logs_keeps_data_and_age(log_dir, workers):
+    old = [write_log(log_dir / log_type / '2026-01-05.json', '2026-01-05', age_days=10)
+           for log_type in ('actions', 'system', 'security')]
+    fresh = write_log(log_dir / 'actions' / '2026-01-14.json', '2026-01-14')
+    mtimes = [path.stat().st_mtime for path in old]
+    size = sum(path.stat().st_size for path in old)
+
+    aggregator = LogAggregator(workers=workers)
+    aggregator.compress_old_logs()
+
+    assert aggregator.stats['files_compressed'] == 3
+    assert fresh.exists()
+    for path, mtime in zip(old, mtimes):
+        archive = path.with_name(path.name + '.gz')
+        assert not path.exists()
+        assert archive.stat().st_mtime == mtime
+        assert [entry['n'] for entry in open_log(archive).iter_entries()] == list(range(50))
+
+    phase = aggregator.phases['compress']
+    assert phase['files'] == 3
+    assert phase['bytes_in'] == size
+
+
+def test_monthly_archives_stream_members_into_tar(log_dir):
+    archives = log_dir / 'actions' / 'archives'
+    archives.mkdir(parents=True)
+    for day in ('2026-01-05', '2026-01-06'):
+        source = write_log(log_dir / 'actions' / f'{day}.json', day)
+        log_aggregator.compress_log(source)
+        source.unlink()
+        os.replace(source.with_name(source.name + '.gz'), archives / f'{day}.json.gz')
+
+    aggregator = LogAggregator(workers=2)
+    aggregator.today = datetime(2026, 2, 1)
+    aggregator.create_monthly_archives()
+
+    tar_path = archives / '2026-01.tar'
+    with tarfile.open(tar_path) as tar:
+        assert sorted(tar.getnames()) == ['2026-01-05.json.gz', '2026-01-06.json.gz']
+    assert not list(archives.glob('*.json.gz'))
+    assert not (archives / '2026-01.tar.tmp').exists()
+    assert aggregator.phases['monthly_archive']['files'] == 2
+
+
+def test_stats_report_includes_throughput(log_dir):
+    write_log(log_dir / 'system' / '2026-01-05.json', '2026-01-05', age_days=10)
+    aggregator = LogAggregator(workers=1)
+    aggregator.compress_old_logs()
+    aggregator.write_stats_report(aggregator.generate_log_stats())
+
+    report = (log_dir / 'log_stats.md').read_text()
+    assert '## Throughput' in report
+    assert '| compress | 1 |' in report
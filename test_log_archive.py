@@ -0,0 +1,129 @@
+"""
+Tests for block-compressed log archives: archives stay plain gzip, their
+index round-trips, and time-range reads only decompress matching chunks
+"""
+import os
+import sys
+import gzip
+import json
+import tarfile
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from log_archive import (compress_log, read_index, select_chunks, open_log, iter_log_entries,
+                         iter_lines_from, log_size, archived_path)
+from audit_logger import AuditLogger
+from audit_rollups import DayRollup
+from audit_writer import AuditWriter
+
+
+def write_log(path, count):
+    lines = [json.dumps({'timestamp': f'2026-01-05T{i // 60:02d}:{i % 60:02d}:00', 'n': i}) + '\n'
+             for i in range(count)]
+    path.write_text(''.join(lines), encoding='utf-8')
+    return lines
+
+
+def test_compress_log_round_trips_through_index(tmp_path):
+    log = tmp_path / '2026-01-05.json'
+    lines = write_log(log, 200)
+
+    result = compress_log(log, chunk_size=1024)
+    archive = result['dest']
+    assert archive == tmp_path / '2026-01-05.json.gz'
+    assert result['lines'] == 200 and result['chunks'] > 1
+
+    # Still one valid gzip stream for external tools
+    assert gzip.decompress(archive.read_bytes()).decode('utf-8') == ''.join(lines)
+
+    with open(archive, 'rb') as f:
+        index = read_index(f, archive.stat().st_size)
+    assert index['lines'] == 200
+    assert index['bytes'] == log.stat().st_size
+    assert index['last_ts'] == '2026-01-05T03:19:00'
+    assert len(index['chunks']) == result['chunks']
+    assert index['chunks'][0][0] == '2026-01-05T00:00:00'
+
+
+def test_read_index_of_plain_gzip_is_none(tmp_path):
+    archive = tmp_path / 'legacy.json.gz'
+    archive.write_bytes(gzip.compress(b'{"timestamp": "2026-01-05T00:00:00"}\n'))
+    with open(archive, 'rb') as f:
+        assert read_index(f, archive.stat().st_size) is None
+
+    # Still readable, just not seekable
+    assert len(list(open_log(archive).iter_entries())) == 1
+
+
+def test_time_range_reads_only_matching_chunks(tmp_path):
+    log = tmp_path / '2026-01-05.json'
+    write_log(log, 200)
+    archive = compress_log(log, chunk_size=1024)['dest']
+    with open(archive, 'rb') as f:
+        index = read_index(f, archive.stat().st_size)
+
+    start, end = '2026-01-05T01:00:00', '2026-01-05T01:30:00'
+    assert len(select_chunks(index, start, end)) < len(index['chunks'])
+    entries = list(open_log(archive).iter_entries(start, end))
+    assert [entry['n'] for entry in entries] == list(range(60, 91))
+
+
+def test_live_and_archived_logs_read_alike(tmp_path):
+    write_log(tmp_path / '2026-01-04.json', 3)
+    archived = tmp_path / '2026-01-05.json'
+    write_log(archived, 3)
+    compress_log(archived)
+    archived.unlink()
+    tarred = tmp_path / '2026-01-03.json'
+    write_log(tarred, 3)
+    (tmp_path / 'archives').mkdir()
+    with tarfile.open(tmp_path / 'archives' / '2026-01.tar', 'w') as tar:
+        tar.add(tarred, arcname=tarred.name)
+    tarred.unlink()
+
+    assert len(list(iter_log_entries(tmp_path))) == 9
+
+
+def test_offsets_survive_compression(tmp_path):
+    log = tmp_path / '2026-01-05.json'
+    lines = write_log(log, 10)
+    offset = sum(len(line) for line in lines[:4])
+    size = log_size(log)
+
+    compress_log(log, chunk_size=128)
+    log.unlink()
+
+    assert log_size(log) == size
+    assert [line.decode('utf-8') for line in iter_lines_from(log, offset)] == lines[4:]
+
+
+def test_archived_audit_day_keeps_rollup_and_index(tmp_path):
+    logs = tmp_path / 'Audit_Logs'
+    logs.mkdir()
+    log_file = logs / 'audit_20260105.jsonl'
+    entries = [{'timestamp': f'2026-01-05T{9 + i % 3:02d}:00:00', 'action_type': 'email_send',
+                'actor': 'auto_processor', 'status': 'failed' if i % 4 == 0 else 'success'}
+               for i in range(12)]
+    log_file.write_text(''.join(json.dumps(entry) + '\n' for entry in entries), encoding='utf-8')
+
+    logger = AuditLogger(tmp_path, writer=AuditWriter(logs))
+    before = logger.rollups.daily_summary(datetime(2026, 1, 5))
+    assert logger.archive_old_logs(days_live=7) == 1
+    assert not log_file.exists() and archived_path(log_file).exists()
+
+    # Sidecars answer for the compressed day without rebuilding
+    rollup_mtime = DayRollup(log_file).rollup_file.stat().st_mtime_ns
+    assert logger.rollups.daily_summary(datetime(2026, 1, 5)) == before
+    assert DayRollup(log_file).rollup_file.stat().st_mtime_ns == rollup_mtime
+
+    start = end = datetime(2026, 1, 5)
+    assert logger.query_engine.count(start, end, status='failed') == 3
+    failed = list(logger.iter_audit_entries(start, end, status='failed'))
+    assert [item['action']['timestamp'] for item in failed] == \
+        ['2026-01-05T09:00:00', '2026-01-05T10:00:00', '2026-01-05T11:00:00']
+
+    # A rebuilt rollup read from the archive matches the original
+    DayRollup(log_file).rollup_file.unlink()
+    assert logger.rollups.daily_summary(datetime(2026, 1, 5)) == before
+    logger.close()
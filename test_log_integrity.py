@@ -0,0 +1,110 @@
+"""
+Tests for incremental log verification: appends are verified once, and
+truncation, rewrites and deleted segments are reported
+"""
+import os
+import sys
+import json
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from log_archive import compress_log
+from log_integrity import IntegrityLedger, TAIL_BYTES
+
+
+def append(log, start, count):
+    with open(log, 'a', encoding='utf-8') as f:
+        for i in range(start, start + count):
+            f.write(json.dumps({'timestamp': f'2026-01-05T00:00:{i % 60:02d}', 'n': i, 'pad': 'x' * 40}) + '\n')
+
+
+def make_logs(tmp_path):
+    log_dir = tmp_path / 'Logs' / 'actions'
+    log_dir.mkdir(parents=True)
+    return log_dir
+
+
+def test_only_appended_lines_are_verified(tmp_path):
+    log_dir = make_logs(tmp_path)
+    log = log_dir / '2026-01-05.json'
+    append(log, 0, 10)
+
+    first = IntegrityLedger(log_dir).verify()
+    assert first['issues'] == [] and first['lines_verified'] == 10
+
+    append(log, 10, 5)
+    second = IntegrityLedger(log_dir).verify()
+    assert second['issues'] == [] and second['lines_verified'] == 5
+    assert second['head'] != first['head']
+
+
+def test_truncation_is_reported(tmp_path):
+    log_dir = make_logs(tmp_path)
+    log = log_dir / '2026-01-05.json'
+    append(log, 0, 10)
+    IntegrityLedger(log_dir).verify()
+
+    data = log.read_bytes()
+    log.write_bytes(data[:len(data) // 2])
+
+    issues = IntegrityLedger(log_dir).verify()['issues']
+    assert any('truncated' in issue for issue in issues)
+
+
+def test_rewrite_near_checkpoint_is_reported(tmp_path):
+    log_dir = make_logs(tmp_path)
+    log = log_dir / '2026-01-05.json'
+    append(log, 0, 10)
+    IntegrityLedger(log_dir).verify()
+
+    log.write_bytes(log.read_bytes().replace(b'"n": 9', b'"n": 8'))
+
+    issues = IntegrityLedger(log_dir).verify()['issues']
+    assert any('modified' in issue for issue in issues)
+
+
+def test_deep_edit_needs_full_verification(tmp_path):
+    log_dir = make_logs(tmp_path)
+    log = log_dir / '2026-01-05.json'
+    append(log, 0, 200)
+    assert log.stat().st_size > 2 * TAIL_BYTES
+    IntegrityLedger(log_dir).verify()
+
+    # Same length, outside the re-hashed tail
+    log.write_bytes(log.read_bytes().replace(b'"n": 1,', b'"n": 7,', 1))
+
+    assert IntegrityLedger(log_dir).verify()['issues'] == []
+    issues = IntegrityLedger(log_dir).verify(full=True)['issues']
+    assert any('hash chain' in issue for issue in issues)
+
+
+def test_missing_segment_is_reported_unless_retired(tmp_path):
+    log_dir = make_logs(tmp_path)
+    append(log_dir / '2026-01-04.json', 0, 3)
+    append(log_dir / '2026-01-05.json', 0, 3)
+    IntegrityLedger(log_dir).verify()
+
+    (log_dir / '2026-01-04.json').unlink()
+    issues = IntegrityLedger(log_dir).verify()['issues']
+    assert any('2026-01-04 is missing' in issue for issue in issues)
+
+    ledger = IntegrityLedger(log_dir)
+    ledger.retire(log_dir / '2026-01-04.json')
+    assert ledger.verify()['issues'] == []
+
+
+def test_checkpoint_follows_segment_into_archive(tmp_path):
+    log_dir = make_logs(tmp_path)
+    old = log_dir / '2026-01-04.json'
+    append(old, 0, 5)
+    IntegrityLedger(log_dir).verify()
+    append(old, 5, 5)
+    append(log_dir / '2026-01-05.json', 0, 3)
+
+    compress_log(old)
+    old.unlink()
+
+    result = IntegrityLedger(log_dir).verify()
+    assert result['issues'] == []
+    assert result['lines_verified'] == 8
+    assert IntegrityLedger(log_dir).verify(full=True)['issues'] == []
@@ -0,0 +1,61 @@
+"""
+Tests for the backwards log reader: lines come out newest first and whole,
+however they fall across block boundaries, with or without mmap
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from log_tail import iter_lines_reversed, last_line, tail_lines
+
+
+def write_log(path, lines, trailing_newline=True, newline='\n'):
+    data = newline.join(lines) + (newline if trailing_newline else '')
+    path.write_bytes(data.encode('utf-8'))
+
+
+@pytest.mark.parametrize('block_size', [1, 3, 7, 16, 64 * 1024])
+@pytest.mark.parametrize('trailing_newline', [True, False])
+def test_reversed_lines_across_block_boundaries(tmp_path, block_size, trailing_newline):
+    lines = [f"line {i} " + 'x' * (i % 11) for i in range(40)] + ['', 'after blank']
+    log = tmp_path / 'app.log'
+    write_log(log, lines, trailing_newline)
+
+    got = [line.decode('utf-8') for line in iter_lines_reversed(log, block_size=block_size)]
+    assert got == list(reversed(lines))
+
+
+@pytest.mark.parametrize('use_mmap', [False, True])
+def test_tail_lines_matches_full_scan(tmp_path, use_mmap):
+    lines = [f"2026-01-05 INFO step {i}" if i % 7 else f"2026-01-05 ERROR failed {i}" for i in range(500)]
+    log = tmp_path / 'app.log'
+    write_log(log, lines, newline='\r\n')
+
+    assert tail_lines(log, 3, use_mmap=use_mmap) == lines[-3:]
+    errors = [line for line in lines if 'ERROR' in line]
+    assert tail_lines(log, 4, match='ERROR', use_mmap=use_mmap) == errors[-4:]
+    assert tail_lines(log, 1000, match=lambda line: line.endswith('7'), use_mmap=use_mmap) == \
+        [line for line in lines if line.endswith('7')]
+
+
+def test_multibyte_text_split_across_blocks(tmp_path):
+    lines = ['héllo wörld ✅ ' * 3 + str(i) for i in range(20)]
+    log = tmp_path / 'app.log'
+    write_log(log, lines)
+
+    got = [line.decode('utf-8') for line in iter_lines_reversed(log, block_size=5)]
+    assert got == list(reversed(lines))
+
+
+def test_missing_empty_and_blank_files(tmp_path):
+    assert tail_lines(tmp_path / 'missing.log', 3) == []
+    empty = tmp_path / 'empty.log'
+    empty.write_bytes(b'')
+    assert tail_lines(empty, 3) == []
+    blank = tmp_path / 'blank.log'
+    blank.write_bytes(b'\n\n\nonly\n\n')
+    assert tail_lines(blank, 3) == ['only']
+    assert last_line(blank, match='missing') is None
@@ -0,0 +1,43 @@
+"""
+Tests for the metrics exporter: every process keeps a textfile heartbeat,
+even when it serves over HTTP or loses the shared port to another process
+"""
+import os
+import sys
+import time
+import socket
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from metrics import MetricsExporter, MetricsRegistry, heartbeat_age
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_http_mode_still_writes_heartbeat(tmp_path):
+    exporter = MetricsExporter('first_job', tmp_path, port=free_port(), interval=60,
+                               registry=MetricsRegistry()).start()
+    try:
+        assert exporter._server is not None
+        deadline = time.time() + 5
+        while heartbeat_age('first_job', tmp_path) is None and time.time() < deadline:
+            time.sleep(0.01)
+        assert heartbeat_age('first_job', tmp_path) is not None
+    finally:
+        exporter.stop()
+
+
+def test_taken_port_falls_back_to_textfile(tmp_path):
+    port = free_port()
+    first = MetricsExporter('first_job', tmp_path, port=port, interval=60, registry=MetricsRegistry()).start()
+    try:
+        second = MetricsExporter('second_job', tmp_path, port=port, interval=60, registry=MetricsRegistry()).start()
+        second.stop()
+        assert second.port is None
+        assert heartbeat_age('second_job', tmp_path) is not None
+    finally:
+        first.stop()
@@ -0,0 +1,55 @@
+"""
+Tests for the rate limiter: processes posting from one vault must draw
+from the same token buckets
+"""
+import os
+import sys
+import asyncio
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rate_limiter import RateLimiter
+
+LIMITS = {'twitter': {'rate': 1, 'per': 3600, 'burst': 2}}
+
+
+def test_limiters_on_one_database_share_buckets(tmp_path):
+    # Two processes (here: two limiters) on the same state file
+    first = RateLimiter(LIMITS, tmp_path / 'rate_limits.db')
+    second = RateLimiter(LIMITS, tmp_path / 'rate_limits.db')
+
+    assert first.reserve('twitter') == 0.0
+    assert second.reserve('twitter') == 0.0
+    # The burst is used up for both, and they queue behind each other
+    wait = first.reserve('twitter')
+    assert wait > 0
+    assert second.reserve('twitter') > wait
+
+
+def test_cancelled_wait_refunds_shared_token(tmp_path):
+    first = RateLimiter(LIMITS, tmp_path / 'rate_limits.db')
+    second = RateLimiter(LIMITS, tmp_path / 'rate_limits.db')
+    first.reserve('twitter')
+    first.reserve('twitter')
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(asyncio.wait_for(first.acquire_async('twitter'), 0.05))
+
+    # Nothing is waiting any more, as seen from the other process too
+    assert second.drain_time('twitter') < 1
+
+
+def test_in_memory_limiters_are_independent():
+    first, second = RateLimiter(LIMITS), RateLimiter(LIMITS)
+    for _ in range(2):
+        assert first.reserve('twitter') == 0.0
+    assert second.reserve('twitter') == 0.0
+
+
+def test_for_vault_keeps_state_in_the_vault(tmp_path, monkeypatch):
+    monkeypatch.delenv('RATE_LIMITS_FILE', raising=False)
+    limiter = RateLimiter.for_vault(tmp_path)
+    assert limiter.db_path == tmp_path / 'state' / 'rate_limits.db'
+    assert limiter.reserve('twitter') == 0.0
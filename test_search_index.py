@@ -0,0 +1,86 @@
+"""
+Tests for the full-text index: lookups agree with scanning each text, and
+sync only re-reads documents that changed
+"""
+import os
+import sys
+import json
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from search_index import SearchIndex, KeywordMatcher, tokenize
+
+TEXTS = {
+    'Needs_Action/EMAIL_1.md': "Could you send an invoice for the consulting work?",
+    'Needs_Action/EMAIL_2.md': "Happy new year! Let's schedule a meeting next week.",
+    'Needs_Action/WHATSAPP_1.md': "Urgent: the payment failed, please call me",
+    'Done/EMAIL_3.md': "Invoices attached, payment received",
+}
+KEYWORDS = ['invoice', 'payment', 'new year', 'call me', 'urgent']
+
+
+def make_index(tmp_path):
+    index = SearchIndex(tmp_path, tmp_path / 'state' / 'search.db')
+    for key, text in TEXTS.items():
+        index.add(key, text, str(hash(text)))
+    return index
+
+
+def test_tokenize_splits_on_punctuation_and_underscores():
+    assert tokenize("Re: EMAIL_42 isn't") == ['re', 'email', '42', 'isn', 't']
+
+
+def test_lookup_agrees_with_keyword_matcher(tmp_path):
+    index = make_index(tmp_path)
+    matcher = KeywordMatcher(KEYWORDS)
+    expected = {key: matcher.find(text) for key, text in sorted(TEXTS.items()) if matcher.find(text)}
+
+    assert index.lookup(KEYWORDS) == expected
+    assert index.lookup(['invoice'])['Done/EMAIL_3.md'] == ['invoice']
+    assert 'Done/EMAIL_3.md' not in index.lookup(['invoice'], prefix=False)
+
+
+def test_lookup_filters_by_folder_and_pattern(tmp_path):
+    index = make_index(tmp_path)
+
+    assert list(index.lookup(['payment'], folders=['Needs_Action'])) == ['Needs_Action/WHATSAPP_1.md']
+    assert list(index.lookup(['invoice', 'payment'], pattern='EMAIL_*')) == \
+        ['Done/EMAIL_3.md', 'Needs_Action/EMAIL_1.md']
+
+
+def test_phrases_need_adjacent_words(tmp_path):
+    index = make_index(tmp_path)
+    index.add('Needs_Action/EMAIL_4.md', "A new plan for the year", 'x')
+
+    assert list(index.lookup(['new year'])) == ['Needs_Action/EMAIL_2.md']
+    assert [hit['key'] for hit in index.search('"new year"')] == ['Needs_Action/EMAIL_2.md']
+
+
+def test_unchanged_digest_is_not_reindexed(tmp_path):
+    index = make_index(tmp_path)
+    key = 'Needs_Action/EMAIL_1.md'
+
+    assert not index.add(key, "different text", str(hash(TEXTS[key])))
+    assert index.add(key, "different text", 'new digest')
+    assert key not in index.lookup(['invoice'])
+    index.remove(key)
+    assert index.stats()['documents'] == len(TEXTS) - 1
+
+
+def test_sync_notes_and_extracted_files(tmp_path):
+    folder = tmp_path / 'Needs_Action'
+    folder.mkdir()
+    (folder / 'EMAIL_1.md').write_text("---\ntype: email\n---\n\nPlease send the invoice\n", encoding='utf-8')
+    (folder / 'EMAIL_2.md').write_text("---\ntype: email\n---\n\nLunch?\n", encoding='utf-8')
+    index = SearchIndex(tmp_path, tmp_path / 'state' / 'search.db')
+
+    assert index.sync('Needs_Action') == {'indexed': 2, 'removed': 0, 'unchanged': 0}
+    assert index.sync('Needs_Action') == {'indexed': 0, 'removed': 0, 'unchanged': 2}
+    (folder / 'EMAIL_2.md').unlink()
+    assert index.sync('Needs_Action')['removed'] == 1
+
+    (folder / 'chat.json').write_text(json.dumps({'text': 'payment overdue'}), encoding='utf-8')
+    extract = lambda path: json.loads(path.read_text(encoding='utf-8'))['text']
+    assert index.sync('Needs_Action', '*.json', extract)['indexed'] == 1
+    assert sorted(index.lookup(['invoice', 'payment'], folders=['Needs_Action'])) == \
+        ['Needs_Action/EMAIL_1.md', 'Needs_Action/chat.json']
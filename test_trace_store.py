@@ -0,0 +1,78 @@
+"""
+Tests for item lifecycle traces: each stage change closes a span, and the
+report's percentiles, open items and slowest items come from those spans
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from trace_store import TraceStore, read_trace_id, record_stage, stamp_trace_id
+
+NOTE = "---\ntype: email\n---\n\n# Invoice\n"
+
+
+def test_stamp_adds_trace_id_once_and_keeps_mtime(tmp_path):
+    note = tmp_path / 'EMAIL_1.md'
+    note.write_text(NOTE, encoding='utf-8')
+    os.utime(note, (1_700_000_000, 1_700_000_000))
+
+    trace_id = stamp_trace_id(note)
+    assert read_trace_id(note.read_text(encoding='utf-8')) == trace_id
+    assert note.read_text(encoding='utf-8').endswith(NOTE[3:])
+    assert note.stat().st_mtime == 1_700_000_000
+    assert stamp_trace_id(note, 'other') == trace_id
+
+
+def test_transitions_close_spans(tmp_path):
+    store = TraceStore(tmp_path / 'traces.db')
+    start = time.time() - 1000
+
+    assert store.transition('t1', 'EMAIL_1.md', 'Needs_Action', 'email_watcher', at=start) is None
+    assert store.transition('t1', 'DRAFT_1.md', 'Pending_Approval', 'draft_generator', at=start + 60) == 60
+    # Seeing the same stage again is not a transition
+    assert store.transition('t1', 'DRAFT_1.md', 'Pending_Approval', 'draft_generator', at=start + 70) is None
+    assert store.transition('t1', 'DRAFT_1.md', 'Approved', 'human', at=start + 660) == 600
+    store.transition('t1', 'DRAFT_1.md', 'Done', 'auto_processor', at=start + 665)
+
+    trace = store.trace('t1')
+    assert trace['status'] == 'done' and trace['stage'] == 'Done'
+    assert [(span['stage'], span['duration']) for span in trace['spans']] == \
+        [('Needs_Action', 60), ('Pending_Approval', 600), ('Approved', 5)]
+    store.close()
+
+
+def test_report_percentiles_open_and_slowest(tmp_path):
+    store = TraceStore(tmp_path / 'traces.db')
+    start = time.time() - 10_000
+    for i, wait in enumerate([10, 20, 30, 40, 1000]):
+        store.transition(f't{i}', f'EMAIL_{i}.md', 'Needs_Action', 'email_watcher', at=start)
+        store.transition(f't{i}', f'DRAFT_{i}.md', 'Pending_Approval', 'draft_generator', at=start + wait)
+        store.transition(f't{i}', f'DRAFT_{i}.md', 'Done', 'auto_processor', at=start + wait + 1)
+    store.transition('waiting', 'EMAIL_9.md', 'Needs_Action', 'email_watcher', at=start + 5000)
+
+    report = store.report(days=1, top=2)
+    stage = report['stages']['Needs_Action']
+    assert stage['count'] == 5 and stage['p50'] == 30 and stage['max'] == 1000
+    assert report['end_to_end']['count'] == 5
+    assert report['open']['Needs_Action']['count'] == 1
+    assert report['slowest'][0]['trace_id'] == 'waiting'
+    assert report['slowest'][1]['trace_id'] == 't4'
+    assert report['slowest'][1]['longest_stage'] == 'Needs_Action'
+    store.close()
+
+
+def test_record_stage_starts_trace_at_note_mtime(tmp_path):
+    store = TraceStore(tmp_path / 'traces.db')
+    note = tmp_path / 'EMAIL_1.md'
+    note.write_text(NOTE, encoding='utf-8')
+    arrived = time.time() - 300
+    os.utime(note, (arrived, arrived))
+    trace_id = stamp_trace_id(note)
+
+    assert record_stage(store, note, 'Approved', 'auto_processor') == trace_id
+    assert abs(store.trace(trace_id)['started_at'] - arrived) < 1
+    # Tracing problems never reach the caller
+    assert record_stage(store, tmp_path / 'missing.md', 'Done', 'auto_processor') is None
+    store.close()
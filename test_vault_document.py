@@ -0,0 +1,99 @@
+"""
+Tests for the shared note parser: one pass yields frontmatter, title, fields
+and sections, and the cache re-parses a file only when it changes
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from vault_document import DocumentCache, parse_document
+
+NOTE = """---
+type: email
+priority: high
+---
+
+# Invoice request
+
+**From**: alice@example.com
+**Subject:** Invoice
+
+## Content
+Please send the invoice.
+
+## Suggested Actions
+- Reply
+"""
+
+
+def test_parse_splits_note_in_one_pass():
+    doc = parse_document(NOTE)
+
+    assert doc.has_frontmatter
+    assert doc.frontmatter['type'] == 'email'
+    assert doc.title == 'Invoice request'
+    assert doc.field('Sender', 'From') == 'alice@example.com'
+    assert doc.field('Subject') == 'Invoice'
+    assert doc.section('content') == 'Please send the invoice.'
+    assert doc.section('Missing', default='') == ''
+
+
+def test_cache_reuses_unchanged_file(tmp_path):
+    cache = DocumentCache(max_size=4)
+    note = tmp_path / 'EMAIL_1.md'
+    note.write_text(NOTE, encoding='utf-8')
+
+    first = cache.load(note)
+    assert cache.load(note) is first
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_cache_reparses_on_mtime_change(tmp_path):
+    cache = DocumentCache(max_size=4)
+    note = tmp_path / 'EMAIL_1.md'
+    note.write_text(NOTE, encoding='utf-8')
+    cache.load(note)
+
+    # Same size, new content and mtime
+    note.write_text(NOTE.replace('high', 'norm'), encoding='utf-8')
+    mtime = note.stat().st_mtime + 5
+    os.utime(note, (mtime, mtime))
+
+    assert cache.load(note).frontmatter['priority'] == 'norm'
+    assert cache.stats()['misses'] == 2
+
+
+def test_cache_reparses_on_size_change(tmp_path):
+    cache = DocumentCache(max_size=4)
+    note = tmp_path / 'EMAIL_1.md'
+    note.write_text(NOTE, encoding='utf-8')
+    stat = note.stat()
+    cache.load(note)
+
+    # Keep the mtime so only the size differs
+    note.write_text(NOTE + "Extra line\n", encoding='utf-8')
+    os.utime(note, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert 'Extra line' in cache.load(note).text
+    assert cache.stats()['misses'] == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = DocumentCache(max_size=2)
+    notes = []
+    for i in range(3):
+        note = tmp_path / f'EMAIL_{i}.md'
+        note.write_text(NOTE, encoding='utf-8')
+        notes.append(note)
+
+    cache.load(notes[0])
+    cache.load(notes[1])
+    cache.load(notes[0])
+    cache.load(notes[2])
+
+    assert cache.stats()['size'] == 2
+    cache.load(notes[0])
+    assert cache.stats()['hits'] == 2
+    cache.load(notes[1])
+    assert cache.stats()['misses'] == 4
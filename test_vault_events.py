@@ -0,0 +1,54 @@
+"""
+Tests for vault event normalization: an atomic write (temp file renamed
+onto a note) must reach subscribers as a single "created" for the note
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from vault_events import VaultEventBus, CREATED, MODIFIED, DELETED, MOVED
+from dashboard_cache import DashboardCache
+
+
+def atomic_write(bus, folder, name):
+    tmp_file = folder / f".{name}.tmp"
+    tmp_file.write_text('---\nstatus: approved\n---\n')
+    bus.emit(CREATED, str(tmp_file))
+    bus.emit(MODIFIED, str(tmp_file))
+    tmp_file.rename(folder / name)
+    bus.emit(MOVED, str(folder / name), src_path=str(tmp_file))
+
+
+def test_atomic_write_is_one_created_event(tmp_path):
+    (tmp_path / 'Approved').mkdir()
+    bus = VaultEventBus(tmp_path)
+    events = []
+    bus.subscribe(events.append)
+
+    atomic_write(bus, tmp_path / 'Approved', 'note.md')
+
+    assert [(e.kind, e.path, e.src_path) for e in events] == [(CREATED, 'Approved/note.md', None)]
+
+
+def test_rename_to_temporary_name_is_a_delete(tmp_path):
+    bus = VaultEventBus(tmp_path)
+    events = []
+    bus.subscribe(events.append)
+
+    bus.emit(MOVED, str(tmp_path / 'Approved' / 'note.md~'), src_path=str(tmp_path / 'Approved' / 'note.md'))
+
+    assert [(e.kind, e.path) for e in events] == [(DELETED, 'Approved/note.md')]
+
+
+def test_dashboard_listing_does_not_drift(tmp_path):
+    approved = tmp_path / 'Approved'
+    approved.mkdir()
+    cache = DashboardCache(tmp_path, folders=['Approved'])
+    assert cache.entries('Approved') == []
+
+    bus = VaultEventBus(tmp_path)
+    bus.subscribe(cache.on_vault_event, folders=['Approved'])
+    atomic_write(bus, approved, 'note.md')
+
+    assert cache.entries('Approved') == ['note.md']
@@ -0,0 +1,75 @@
+"""
+Tests for the SQLite vault index: refresh only re-reads changed notes and
+queries see the disk as it is, including Done month shards
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from vault_index import VaultIndex
+
+
+def write_note(path, status='pending', when=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\ntype: email\nstatus: {status}\n---\n\n# {path.stem}\n\nBody\n", encoding='utf-8')
+    if when is not None:
+        os.utime(path, (when, when))
+    return path
+
+
+def test_refresh_tracks_adds_updates_and_removals(tmp_path):
+    write_note(tmp_path / 'Needs_Action' / 'EMAIL_1.md')
+    write_note(tmp_path / 'Needs_Action' / 'EMAIL_2.md')
+    write_note(tmp_path / 'state' / 'ignored.md')
+    write_note(tmp_path / '.obsidian' / 'ignored.md')
+    index = VaultIndex(tmp_path)
+
+    assert index.refresh() == {'added': 2, 'updated': 0, 'removed': 0, 'unchanged': 0}
+    assert index.refresh() == {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 2}
+
+    write_note(tmp_path / 'Needs_Action' / 'EMAIL_1.md', status='done', when=time.time() + 10)
+    (tmp_path / 'Needs_Action' / 'EMAIL_2.md').unlink()
+    write_note(tmp_path / 'Needs_Action' / 'EMAIL_3.md')
+
+    assert index.refresh('Needs_Action') == {'added': 1, 'updated': 1, 'removed': 1, 'unchanged': 0}
+    assert index.get(tmp_path / 'Needs_Action' / 'EMAIL_1.md')['frontmatter']['status'] == 'done'
+
+
+def test_refresh_of_one_folder_leaves_others_alone(tmp_path):
+    write_note(tmp_path / 'Approved' / 'POST_1.md')
+    write_note(tmp_path / 'Needs_Action' / 'EMAIL_1.md')
+    index = VaultIndex(tmp_path)
+    index.refresh()
+
+    (tmp_path / 'Approved' / 'POST_1.md').unlink()
+    assert index.refresh('Needs_Action')['removed'] == 0
+    assert index.refresh('Approved')['removed'] == 1
+
+
+def test_queries_filter_on_frontmatter_and_time(tmp_path):
+    old = time.mktime(datetime(2026, 1, 10).timetuple())
+    write_note(tmp_path / 'Needs_Action' / 'EMAIL_1.md', status='pending', when=old)
+    write_note(tmp_path / 'Needs_Action' / 'EMAIL_2.md', status='Done')
+    write_note(tmp_path / 'Needs_Action' / 'WHATSAPP_1.md', status='pending')
+    index = VaultIndex(tmp_path)
+
+    assert [n['filename'] for n in index.notes('Needs_Action', pattern='EMAIL_*', where={'status': 'done'})] == \
+        ['EMAIL_2.md']
+    assert index.count('Needs_Action', since=datetime(2026, 2, 1)) == 2
+    assert index.count('Needs_Action', where={'status': ['pending', 'done']}) == 3
+
+
+def test_done_queries_include_month_shards_in_range(tmp_path):
+    jan = time.mktime(datetime(2026, 1, 10).timetuple())
+    mar = time.mktime(datetime(2026, 3, 10).timetuple())
+    write_note(tmp_path / 'Done' / 'LEGACY.md', when=jan)
+    write_note(tmp_path / 'Done' / '2026' / '01' / 'EMAIL_1.md', when=jan)
+    write_note(tmp_path / 'Done' / '2026' / '03' / 'EMAIL_2.md', when=mar)
+    index = VaultIndex(tmp_path)
+
+    assert index.count('Done') == 3
+    assert [n['filename'] for n in index.notes('Done', since=datetime(2026, 3, 1))] == ['EMAIL_2.md']
+    assert index.count('Done', until=datetime(2026, 1, 31)) == 2
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Trace Store - Lifecycle tracing for items moving through the vault folders
+An item gets a trace_id in its frontmatter when it enters the vault, and
+every script that moves it on (Inbox -> Needs_Action -> Pending_Approval ->
+Approved -> Done/Failed) records a transition. Each transition closes a
+span covering the time the item spent in the stage it left, so the report
+can show per-stage latency percentiles, the slowest items and where
+items are currently piling up.
+
+Spans live in a WAL-mode SQLite file next to the job store (state/traces.db).
+"""
+
+import os
+import re
+import uuid
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Frontmatter key carrying the trace ID
+TRACE_FIELD = 'trace_id'
+
+# Stages in the order an item normally passes through them
+STAGES = ('Inbox', 'Needs_Action', 'Pending_Approval', 'Approved', 'Done', 'Failed')
+
+# Reaching one of these ends the trace
+TERMINAL_STAGES = ('Done', 'Failed', 'Rejected', 'Quarantine')
+
+PERCENTILES = (50, 90, 99)
+
+TRACE_ID_PATTERN = re.compile(rf'^{TRACE_FIELD}:\s*(\S+)\s*$', re.MULTILINE)
+
+# Times are Unix seconds so latencies are plain subtraction
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS traces (
+    trace_id TEXT PRIMARY KEY,
+    item TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    stage_entered_at REAL NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    status TEXT
+);
+CREATE TABLE IF NOT EXISTS spans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    trace_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    item TEXT NOT NULL,
+    component TEXT,
+    started_at REAL NOT NULL,
+    ended_at REAL NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_spans_ended ON spans (ended_at);
+CREATE INDEX IF NOT EXISTS idx_spans_trace ON spans (trace_id);
+CREATE INDEX IF NOT EXISTS idx_traces_open ON traces (finished_at, stage);
+"""
+
+
+def new_trace_id() -> str:
+    """Random 16-hex-digit trace ID"""
+    return uuid.uuid4().hex[:16]
+
+
+def read_trace_id(text: str) -> Optional[str]:
+    """Trace ID from a note's frontmatter, or None"""
+    if not text.startswith('---'):
+        return None
+    end = text.find('\n---', 3)
+    match = TRACE_ID_PATTERN.search(text, 0, end if end != -1 else len(text))
+    return match.group(1) if match else None
+
+
+def with_trace_id(text: str, trace_id: str) -> str:
+    """Note text with the trace ID added to its frontmatter (created if missing)"""
+    newline = '\r\n' if '\r\n' in text else '\n'
+    if text.startswith('---'):
+        first_line_end = text.find('\n') + 1
+        if first_line_end > 0:
+            return f"{text[:first_line_end]}{TRACE_FIELD}: {trace_id}{newline}{text[first_line_end:]}"
+    return f"---{newline}{TRACE_FIELD}: {trace_id}{newline}---{newline}{newline}{text}"
+
+
+def stamp_trace_id(file_path: Path, trace_id: Optional[str] = None) -> str:
+    """
+    Make sure a note carries a trace ID, writing it atomically if not
+
+    Args:
+        file_path: Markdown note
+        trace_id: ID to stamp; a new one is generated if omitted
+
+    Returns:
+        The note's trace ID (the existing one if it already had one)
+    """
+    file_path = Path(file_path)
+    text = file_path.read_text(encoding='utf-8')
+    existing = read_trace_id(text)
+    if existing:
+        return existing
+
+    trace_id = trace_id or new_trace_id()
+    stat = file_path.stat()
+    tmp_file = file_path.with_name(f".{file_path.name}.tmp")
+    with open(tmp_file, 'w', encoding='utf-8', newline='') as f:
+        f.write(with_trace_id(text, trace_id))
+    # Keep the original mtime: it is when the item arrived
+    os.utime(tmp_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(tmp_file, file_path)
+    return trace_id
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Linearly interpolated percentile of sorted values"""
+    if not values:
+        return 0.0
+    rank = (len(values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+
+def format_duration(seconds: float) -> str:
+    """Compact human duration: 45s, 12m, 3.5h, 2.1d"""
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}m"
+    if seconds < 86400:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 86400:.1f}d"
+
+
+class TraceStore:
+    """WAL-mode SQLite store of item traces and their stage spans"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    @classmethod
+    def for_vault(cls, vault_path: Path) -> 'TraceStore':
+        """Open the default trace store for a vault"""
+        return cls(Path(vault_path) / 'state' / 'traces.db')
+
+    def transition(self, trace_id: str, item: str, stage: str, component: str,
+                   at: Optional[float] = None, entered_at: Optional[float] = None) -> Optional[float]:
+        """
+        Record an item moving into a stage, closing the span of the stage it left
+
+        Args:
+            trace_id: Item's trace ID
+            item: File name in the new stage
+            stage: Folder the item moved into
+            component: Script that moved it
+            at: Time of the move (Unix seconds); now if omitted
+            entered_at: For a trace not seen before, when the item entered
+                the vault; the trace then starts in `stage` at that time
+
+        Returns:
+            Seconds spent in the previous stage, or None if no span was closed
+        """
+        at = at or time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT stage, stage_entered_at, item FROM traces WHERE trace_id = ?", (trace_id,)
+                ).fetchone()
+
+                duration = None
+                if row is None:
+                    # First sighting: the item has been in this stage since it arrived
+                    entered = min(entered_at or at, at)
+                    self._conn.execute(
+                        "INSERT INTO traces (trace_id, item, stage, stage_entered_at, started_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (trace_id, item, stage, entered, entered)
+                    )
+                    if stage in TERMINAL_STAGES:
+                        self._conn.execute(
+                            "UPDATE traces SET finished_at = ?, status = ? WHERE trace_id = ?",
+                            (at, stage.lower(), trace_id)
+                        )
+                elif row[0] != stage:
+                    previous_stage, entered, previous_item = row
+                    duration = max(0.0, at - entered)
+                    self._conn.execute(
+                        "INSERT INTO spans (trace_id, stage, item, component, started_at, ended_at, duration) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (trace_id, previous_stage, previous_item, component, entered, at, duration)
+                    )
+                    terminal = stage in TERMINAL_STAGES
+                    self._conn.execute(
+                        "UPDATE traces SET item = ?, stage = ?, stage_entered_at = ?, "
+                        "finished_at = ?, status = ? WHERE trace_id = ?",
+                        (item, stage, at, at if terminal else None,
+                         stage.lower() if terminal else None, trace_id)
+                    )
+                self._conn.execute("COMMIT")
+                return duration
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def spans(self, trace_id: str) -> List[Dict[str, Any]]:
+        """Every span of one trace, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT stage, item, component, started_at, ended_at, duration FROM spans "
+                "WHERE trace_id = ? ORDER BY started_at, id", (trace_id,)
+            ).fetchall()
+        return [{"stage": stage, "item": item, "component": component, "started_at": started,
+                 "ended_at": ended, "duration": duration}
+                for stage, item, component, started, ended, duration in rows]
+
+    def trace(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """Current state of one trace with its spans"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT item, stage, stage_entered_at, started_at, finished_at, status "
+                "FROM traces WHERE trace_id = ?", (trace_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        item, stage, entered, started, finished, status = row
+        return {"trace_id": trace_id, "item": item, "stage": stage, "stage_entered_at": entered,
+                "started_at": started, "finished_at": finished, "status": status or 'open',
+                "spans": self.spans(trace_id)}
+
+    def report(self, days: int = 7, top: int = 10) -> Dict[str, Any]:
+        """
+        Latency statistics over spans closed in the last N days
+
+        Returns:
+            {"stages": {stage: {"count", "p50", "p90", "p99", "max"}},
+             "end_to_end": {...}, "slowest": [...], "open": {stage: {"count", "oldest"}}}
+        """
+        now = time.time()
+        since = now - days * 86400
+
+        with self._lock:
+            span_rows = self._conn.execute(
+                "SELECT stage, duration FROM spans WHERE ended_at >= ? ORDER BY stage, duration", (since,)
+            ).fetchall()
+            finished_rows = self._conn.execute(
+                "SELECT finished_at - started_at FROM traces "
+                "WHERE finished_at >= ? ORDER BY 1", (since,)
+            ).fetchall()
+            slowest_rows = self._conn.execute(
+                "SELECT trace_id, item, stage, status, stage_entered_at, COALESCE(finished_at, ?) - started_at AS total "
+                "FROM traces WHERE COALESCE(finished_at, ?) >= ? ORDER BY total DESC LIMIT ?",
+                (now, now, since, top)
+            ).fetchall()
+            open_rows = self._conn.execute(
+                "SELECT stage, COUNT(*), MIN(stage_entered_at) FROM traces "
+                "WHERE finished_at IS NULL GROUP BY stage"
+            ).fetchall()
+
+        durations: Dict[str, List[float]] = {}
+        for stage, duration in span_rows:
+            durations.setdefault(stage, []).append(duration)
+
+        def summarize(values: List[float]) -> Dict[str, Any]:
+            summary = {"count": len(values), "max": values[-1] if values else 0.0}
+            for pct in PERCENTILES:
+                summary[f"p{pct}"] = _percentile(values, pct)
+            return summary
+
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        slowest = []
+        for trace_id, item, stage, status, entered, total in slowest_rows:
+            durations_by_stage = [(span['duration'], span['stage']) for span in self.spans(trace_id)]
+            if status is None:
+                # Still open: the current stage counts too
+                durations_by_stage.append((now - entered, stage))
+            longest_duration, longest_stage = max(durations_by_stage, default=(total, stage))
+            slowest.append({"trace_id": trace_id, "item": item, "stage": stage,
+                            "status": status or 'open', "total": total,
+                            "longest_stage": longest_stage, "longest_duration": longest_duration})
+
+        return {
+            "period_days": days,
+            "stages": {stage: summarize(values) for stage, values in
+                       sorted(durations.items(), key=lambda kv: order.get(kv[0], len(order)))},
+            "end_to_end": summarize([row[0] for row in finished_rows]),
+            "slowest": slowest,
+            "open": {stage: {"count": count, "oldest": now - oldest}
+                     for stage, count, oldest in sorted(open_rows, key=lambda r: order.get(r[0], len(order)))}
+        }
+
+    def prune(self, days_to_keep: int = 90) -> int:
+        """Delete finished traces and their spans older than the retention window"""
+        cutoff = (datetime.now() - timedelta(days=days_to_keep)).timestamp()
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM spans WHERE trace_id IN "
+                "(SELECT trace_id FROM traces WHERE finished_at < ?)", (cutoff,)
+            )
+            cursor = self._conn.execute("DELETE FROM traces WHERE finished_at < ?", (cutoff,))
+        return cursor.rowcount
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def record_stage(store: TraceStore, file_path: Path, stage: str, component: str,
+                 trace_id: Optional[str] = None) -> Optional[str]:
+    """
+    Record that a note is now in a stage, never failing the caller
+
+    The trace ID comes from `trace_id` or the note's frontmatter; a note
+    without one starts a trace at its modification time.
+
+    Returns:
+        The trace ID used, or None if tracing failed
+    """
+    try:
+        file_path = Path(file_path)
+        if trace_id is None:
+            trace_id = read_trace_id(file_path.read_text(encoding='utf-8')) or new_trace_id()
+        entered_at = file_path.stat().st_mtime if file_path.exists() else None
+        store.transition(trace_id, file_path.name, stage, component, entered_at=entered_at)
+        return trace_id
+    except Exception as e:
+        logger.warning(f"Failed to record {stage} for {Path(file_path).name}: {e}")
+        return None
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Markdown rendering of TraceStore.report()"""
+    lines = [
+        f"# Item Lifecycle Latency (last {report['period_days']} days)",
+        "",
+        "## Time Spent per Stage",
+        "",
+        "| Stage | Items | p50 | p90 | p99 | Max |",
+        "|-------|-------|-----|-----|-----|-----|"
+    ]
+    rows = list(report['stages'].items()) + [('**End to end**', report['end_to_end'])]
+    for stage, stats in rows:
+        lines.append(f"| {stage} | {stats['count']} | {format_duration(stats['p50'])} | "
+                     f"{format_duration(stats['p90'])} | {format_duration(stats['p99'])} | "
+                     f"{format_duration(stats['max'])} |")
+
+    lines += ["", "## Waiting Now", "", "| Stage | Items | Oldest |", "|-------|-------|--------|"]
+    for stage, stats in report['open'].items():
+        lines.append(f"| {stage} | {stats['count']} | {format_duration(stats['oldest'])} |")
+
+    lines += ["", "## Slowest Items", "",
+              "| Item | Trace | Status | Total | Longest Stage |",
+              "|------|-------|--------|-------|---------------|"]
+    for item in report['slowest']:
+        lines.append(f"| {item['item']} | `{item['trace_id']}` | {item['status']} | "
+                     f"{format_duration(item['total'])} | "
+                     f"{item['longest_stage']} ({format_duration(item['longest_duration'])}) |")
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    """Main function for CLI usage"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Vault item lifecycle traces')
+    parser.add_argument('action', choices=['report', 'show', 'prune'], help='Action to perform')
+    parser.add_argument('trace_id', nargs='?', help='Trace ID (for show)')
+    parser.add_argument('--days', type=int, default=7, help='Report window in days')
+    parser.add_argument('--top', type=int, default=10, help='Number of slowest items to list')
+    parser.add_argument('--days-to-keep', type=int, default=90, help='Days of finished traces to keep')
+    parser.add_argument('--output', help='Write the report to this file as well')
+
+    args = parser.parse_args()
+
+    store = TraceStore.for_vault(Path(os.getenv('VAULT_PATH') or Path(__file__).parent))
+
+    if args.action == 'report':
+        text = format_report(store.report(args.days, args.top))
+        print(text)
+        if args.output:
+            Path(args.output).write_text(text, encoding='utf-8')
+    elif args.action == 'show':
+        trace = store.trace(args.trace_id or '')
+        if trace is None:
+            print(f"No trace {args.trace_id}")
+            return
+        print(f"{trace['trace_id']} {trace['item']} - {trace['status']} (now in {trace['stage']})")
+        for span in trace['spans']:
+            started = datetime.fromtimestamp(span['started_at']).strftime('%Y-%m-%d %H:%M:%S')
+            print(f"  {started}  {span['stage']:<18} {format_duration(span['duration']):>8}  "
+                  f"-> {span['component']}")
+    elif args.action == 'prune':
+        removed = store.prune(args.days_to_keep)
+        print(f"Pruned {removed} finished traces older than {args.days_to_keep} days")
+
+
+if __name__ == '__main__':
+    main()
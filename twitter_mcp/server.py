@@ -31,6 +31,13 @@ except ImportError:
     logger.warning("Tweepy library not installed. Install with: pip install tweepy")
     TWEEPY_AVAILABLE = False
 
+from rate_limiter import get_rate_limiter
+from metrics import counter, histogram, start_exporter
+
+# Metrics
+TOOL_CALLS = counter('ai_employee_mcp_tool_calls_total', 'MCP tool calls', ['server', 'tool', 'result'])
+TOOL_SECONDS = histogram('ai_employee_mcp_tool_seconds', 'MCP tool call latency', ['server', 'tool'])
+
 
 # Initialize server
 server = Server("twitter-mcp-server")
@@ -160,6 +167,18 @@ async def list_tools() -> List[Tool]:
 
 @server.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+    """Handle Twitter tool calls"""
+    result = 'error'
+    try:
+        with TOOL_SECONDS.time(server='twitter', tool=name):
+            response = await _call_tool(name, arguments)
+        result = 'ok'
+        return response
+    finally:
+        TOOL_CALLS.inc(server='twitter', tool=name, result=result)
+
+
+async def _call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle Twitter tool calls"""
     client, api = get_twitter_client()
 
@@ -215,6 +234,7 @@ async def _post_tweet(client, api, args: Dict[str, Any]) -> List[TextContent]:
             logger.warning(f"Failed to upload media: {e}")
 
     try:
+        await get_rate_limiter().acquire_async('twitter')
         response = client.create_tweet(text=text, media_ids=media_ids)
         tweet_id = response.data['id']
         return [TextContent(
@@ -231,6 +251,7 @@ async def _reply_to_tweet(client, args: Dict[str, Any]) -> List[TextContent]:
     text = args.get('text', '')
 
     try:
+        await get_rate_limiter().acquire_async('twitter')
         response = client.create_tweet(text=text, in_reply_to_tweet_id=tweet_id)
         reply_id = response.data['id']
         return [TextContent(
@@ -355,6 +376,8 @@ async def main():
     """Run the MCP server"""
     from mcp.server.stdio import stdio_server
 
+    start_exporter('twitter_mcp')
+
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Vault Document Parser - Single-pass markdown parser shared by vault scripts
+Splits a note into YAML frontmatter, its first "#" heading, "**Label**: value"
+fields and a dict of "##" sections in one pass over the lines, and caches
+parsed files by (path, mtime, size) with LRU eviction.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+import logging
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+from metrics import counter, histogram
+
+logger = logging.getLogger(__name__)
+
+PARSE_SECONDS = histogram('ai_employee_document_parse_seconds', 'Time to read and parse a vault note',
+                          buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1))
+CACHE_LOOKUPS = counter('ai_employee_document_cache_total', 'Parsed document cache lookups', ['result'])
+
+# Number of parsed files kept in the cache
+DEFAULT_CACHE_SIZE = 512
+
+# "**Label**: value" and "**Label:** value"
+FIELD_PATTERN = re.compile(r'^\*\*(.+?)(?::\*\*|\*\*:)\s*(.*)$')
+
+
+class VaultDocument:
+    """Parsed view of one markdown note"""
+
+    def __init__(self, path: Optional[Path], text: str):
+        self.path = path
+        self.text = text
+        self.has_frontmatter = False
+        self.frontmatter_text = ""
+        self.raw_frontmatter: Dict[str, str] = {}
+        self.body = text
+        self.title = ""
+        self.fields: Dict[str, str] = {}
+        self.sections: Dict[str, str] = {}
+        self._section_index: Dict[str, str] = {}
+        self._frontmatter: Optional[Dict[str, Any]] = None
+
+    @property
+    def frontmatter(self) -> Dict[str, Any]:
+        """Frontmatter parsed as YAML (typed values), falling back to raw strings"""
+        if self._frontmatter is None:
+            parsed = None
+            if yaml is not None and self.frontmatter_text:
+                try:
+                    parsed = yaml.safe_load(self.frontmatter_text)
+                except Exception:
+                    parsed = None
+            self._frontmatter = parsed if isinstance(parsed, dict) else dict(self.raw_frontmatter)
+        return self._frontmatter
+
+    def section(self, *names: str, default: Optional[str] = None) -> Optional[str]:
+        """Content of the first "##" section matching any name (case-insensitive)"""
+        for name in names:
+            content = self._section_index.get(name.strip().lower())
+            if content is not None:
+                return content
+        return default
+
+    def field(self, *labels: str, default: Optional[str] = None) -> Optional[str]:
+        """Value of the first "**Label**: value" line matching any label"""
+        for label in labels:
+            if label in self.fields:
+                return self.fields[label]
+        return default
+
+
+def parse_document(text: str, path: Optional[Path] = None) -> VaultDocument:
+    """
+    Tokenize a markdown note in a single pass
+
+    Args:
+        text: Note content
+        path: Optional source path, kept on the result
+
+    Returns:
+        VaultDocument with frontmatter, title, fields and sections
+    """
+    doc = VaultDocument(path, text)
+    lines = text.split('\n')
+    index = 0
+
+    # Frontmatter: a "---" first line up to the next "---" line
+    if lines and lines[0].strip() == '---':
+        for end in range(1, len(lines)):
+            if lines[end].strip() == '---':
+                frontmatter_lines = lines[1:end]
+                doc.has_frontmatter = True
+                doc.frontmatter_text = '\n'.join(frontmatter_lines)
+                for line in frontmatter_lines:
+                    if ':' in line and not line.startswith((' ', '\t', '-')):
+                        key, value = line.split(':', 1)
+                        doc.raw_frontmatter[key.strip()] = value.strip()
+                index = end + 1
+                break
+
+    body_lines = lines[index:]
+    doc.body = '\n'.join(body_lines)
+
+    current: Optional[str] = None
+    current_lines = []
+
+    def close_section():
+        if current is not None:
+            content = '\n'.join(current_lines).strip()
+            # First occurrence wins, matching a regex search
+            doc.sections.setdefault(current, content)
+            doc._section_index.setdefault(current.lower(), content)
+
+    for line in body_lines:
+        if line.startswith('## '):
+            close_section()
+            current = line[3:].strip()
+            current_lines = []
+            continue
+
+        if not doc.title and line.startswith('# '):
+            doc.title = line[2:].strip()
+        elif line.startswith('**'):
+            match = FIELD_PATTERN.match(line)
+            if match:
+                doc.fields.setdefault(match.group(1).strip(), match.group(2).strip())
+
+        if current is not None:
+            current_lines.append(line)
+
+    close_section()
+    return doc
+
+
+class DocumentCache:
+    """LRU cache of parsed documents keyed by (path, mtime, size)"""
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size or int(os.getenv('VAULT_PARSE_CACHE_SIZE', DEFAULT_CACHE_SIZE))
+        self._entries: 'OrderedDict[str, Tuple[int, int, VaultDocument]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, path: Path) -> VaultDocument:
+        """Parse a file, reusing the cached result if it has not changed"""
+        path = Path(path)
+        stat = path.stat()
+        key = str(path.resolve())
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                CACHE_LOOKUPS.inc(result='hit')
+                return entry[2]
+            self.misses += 1
+        CACHE_LOOKUPS.inc(result='miss')
+
+        with PARSE_SECONDS.time():
+            doc = parse_document(path.read_text(encoding='utf-8'), path)
+
+        with self._lock:
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, doc)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return doc
+
+    def invalidate(self, path: Path):
+        """Drop a path from the cache"""
+        with self._lock:
+            self._entries.pop(str(Path(path).resolve()), None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache hit/miss counters"""
+        with self._lock:
+            return {"size": len(self._entries), "max_size": self.max_size,
+                    "hits": self.hits, "misses": self.misses}
+
+
+# Shared process-wide cache
+_cache = DocumentCache()
+
+
+def load_document(path: Path) -> VaultDocument:
+    """Parse a vault note through the shared cache"""
+    return _cache.load(path)
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Statistics for the shared cache"""
+    return _cache.stats()
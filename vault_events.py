@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Vault Events - One filesystem watcher for the whole vault, shared by every component
+A single watchdog Observer watches the vault tree and turns raw events into
+normalized VaultEvents (created, modified, deleted, moved) with
+vault-relative paths. Temporary files are never published: an atomic
+write (temp file renamed onto a note) arrives as one "created" event for
+the note. Events are delivered to
+in-process subscribers and, over a local Unix socket, to other processes,
+each subscriber choosing the folders, filename globs and kinds it wants.
+
+The workflow orchestrator (or `python vault_events.py serve`) runs the
+service. Components call listen(): they attach to the running service if
+there is one and otherwise watch the vault themselves, so they work
+standalone as before.
+
+    subscription = listen(vault_path, on_event, folders=['Approved'], patterns=['*.md'])
+    ...
+    subscription.close()
+"""
+
+import os
+import json
+import time
+import queue
+import socket
+import hashlib
+import tempfile
+import threading
+import socketserver
+from fnmatch import fnmatch
+from pathlib import Path
+from dataclasses import dataclass, asdict, field
+from typing import Dict, Any, Optional, List, Callable, Iterable
+import logging
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+logger = logging.getLogger(__name__)
+
+CREATED = 'created'
+MODIFIED = 'modified'
+DELETED = 'deleted'
+MOVED = 'moved'
+KINDS = (CREATED, MODIFIED, DELETED, MOVED)
+
+# Directories whose events are never published (hidden directories neither)
+IGNORED_DIRS = {'state', '__pycache__', 'node_modules', 'venv', 'env'}
+
+# Events queued per socket client before new ones are dropped
+CLIENT_QUEUE_SIZE = 10000
+
+# Unix socket paths are limited to ~108 bytes
+MAX_SOCKET_PATH = 100
+
+
+def _is_temporary(name: str) -> bool:
+    """Names used for files that are written and then renamed into place"""
+    return name.startswith('.') or name.endswith(('.tmp', '.swp', '~'))
+
+
+@dataclass
+class VaultEvent:
+    """One normalized change to a file or folder in the vault"""
+
+    kind: str
+    path: str                       # Vault-relative POSIX path
+    vault_path: str
+    src_path: Optional[str] = None  # Previous path, for moves
+    is_directory: bool = False
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def folder(self) -> str:
+        return self.path.rpartition('/')[0]
+
+    @property
+    def src_folder(self) -> Optional[str]:
+        return self.src_path.rpartition('/')[0] if self.src_path is not None else None
+
+    @property
+    def name(self) -> str:
+        return self.path.rpartition('/')[2]
+
+    @property
+    def full_path(self) -> Path:
+        return Path(self.vault_path) / self.path
+
+    @property
+    def full_src_path(self) -> Optional[Path]:
+        return Path(self.vault_path) / self.src_path if self.src_path is not None else None
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'VaultEvent':
+        return cls(**{key: data.get(key) for key in ('kind', 'path', 'vault_path', 'src_path')},
+                   is_directory=bool(data.get('is_directory')), timestamp=data.get('timestamp') or time.time())
+
+
+class Subscription:
+    """A callback and the events it wants"""
+
+    def __init__(self, callback: Callable[[VaultEvent], None], folders: Optional[Iterable[str]] = None,
+                 patterns: Optional[Iterable[str]] = None, kinds: Optional[Iterable[str]] = None,
+                 directories: bool = False, bus: Optional['VaultEventBus'] = None):
+        self.callback = callback
+        self.folders = {folder.strip('/') for folder in folders} if folders is not None else None
+        # "Done/**" also matches every folder below Done
+        self._trees = {folder[:-3] for folder in self.folders or () if folder.endswith('/**')}
+        self.patterns = list(patterns) if patterns is not None else None
+        self.kinds = set(kinds) if kinds is not None else None
+        self.directories = directories
+        self._bus = bus
+
+    @property
+    def filters(self) -> Dict[str, Any]:
+        return {
+            'folders': sorted(self.folders) if self.folders is not None else None,
+            'patterns': self.patterns,
+            'kinds': sorted(self.kinds) if self.kinds is not None else None,
+            'directories': self.directories
+        }
+
+    def _in_folders(self, folder: str) -> bool:
+        return folder in self.folders or any(folder == tree or folder.startswith(tree + '/')
+                                             for tree in self._trees)
+
+    def matches(self, event: VaultEvent) -> bool:
+        """True if the event's kind, folder and name pass the filters"""
+        if event.is_directory and not self.directories:
+            return False
+        if self.kinds is not None and event.kind not in self.kinds:
+            return False
+
+        # A move matches on either end, so moves out of a folder are seen too
+        candidates = [event.path] + ([event.src_path] if event.src_path is not None else [])
+        if self.folders is not None:
+            candidates = [path for path in candidates if self._in_folders(path.rpartition('/')[0])]
+        if self.patterns is not None and not event.is_directory:
+            candidates = [path for path in candidates
+                          if any(fnmatch(path.rpartition('/')[2], pattern) for pattern in self.patterns)]
+        return bool(candidates)
+
+    def close(self):
+        """Stop receiving events"""
+        if self._bus is not None:
+            self._bus.unsubscribe(self)
+            self._bus = None
+
+
+class _BusEventHandler(FileSystemEventHandler):
+    """Normalizes watchdog events and publishes them on the bus"""
+
+    def __init__(self, bus: 'VaultEventBus'):
+        self.bus = bus
+
+    def on_created(self, event):
+        self.bus.emit(CREATED, event.src_path, is_directory=event.is_directory)
+
+    def on_modified(self, event):
+        # A folder's mtime changes with every entry; the entry's own event says more
+        if not event.is_directory:
+            self.bus.emit(MODIFIED, event.src_path)
+
+    def on_deleted(self, event):
+        self.bus.emit(DELETED, event.src_path, is_directory=event.is_directory)
+
+    def on_moved(self, event):
+        self.bus.emit(MOVED, event.dest_path, src_path=event.src_path, is_directory=event.is_directory)
+
+
+class VaultEventBus:
+    """Publishes normalized vault events to in-process and socket subscribers"""
+
+    def __init__(self, vault_path: Path):
+        self.vault_path = Path(vault_path).resolve()
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._observer = None
+        self._server: Optional[socketserver.BaseServer] = None
+        self.socket_path: Optional[Path] = None
+
+    # ---- Subscribers ----
+
+    def subscribe(self, callback: Callable[[VaultEvent], None], folders: Optional[Iterable[str]] = None,
+                  patterns: Optional[Iterable[str]] = None, kinds: Optional[Iterable[str]] = None,
+                  directories: bool = False) -> Subscription:
+        """
+        Call `callback` for every matching event
+
+        Args:
+            callback: Called on the watcher thread; keep it short
+            folders: Vault-relative folders, e.g. ["Approved"] (None for all);
+                "Done/**" matches Done and every folder below it
+            patterns: Filename globs, e.g. ["*.md"]
+            kinds: Any of created, modified, deleted, moved
+            directories: Also deliver events for folders themselves
+                (patterns only apply to files)
+        """
+        subscription = Subscription(callback, folders, patterns, kinds, directories, bus=self)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def _relative(self, path: str) -> Optional[str]:
+        """Vault-relative path, or None if events there are not published"""
+        try:
+            relative = Path(path).relative_to(self.vault_path)
+        except ValueError:
+            try:
+                relative = Path(path).resolve().relative_to(self.vault_path)
+            except (ValueError, OSError):
+                return None
+        parts = relative.parts
+        if not parts or any(part in IGNORED_DIRS or part.startswith('.') for part in parts[:-1]):
+            return None
+        return relative.as_posix()
+
+    def emit(self, kind: str, path: str, src_path: Optional[str] = None, is_directory: bool = False):
+        """Normalize one raw event and publish it"""
+        relative = self._relative(path)
+        src_relative = self._relative(src_path) if src_path is not None else None
+        if not is_directory:
+            # Subscribers only ever see the file a temp file is renamed to
+            if relative is not None and _is_temporary(relative.rpartition('/')[2]):
+                relative = None
+            if src_relative is not None and _is_temporary(src_relative.rpartition('/')[2]):
+                src_relative = None
+
+        if kind == MOVED:
+            if relative is None and src_relative is None:
+                return
+            if relative is None:
+                # Moved somewhere unwatched (or to a temp name): gone as far as subscribers are concerned
+                kind, relative, src_relative = DELETED, src_relative, None
+            elif src_relative is None:
+                # Atomic write: temp file renamed onto the note
+                kind = CREATED
+        elif relative is None:
+            return
+
+        self.publish(VaultEvent(kind, relative, str(self.vault_path), src_relative, is_directory))
+
+    def publish(self, event: VaultEvent):
+        """Deliver an event to every matching subscriber"""
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if s.matches(event)]
+        for subscription in subscriptions:
+            try:
+                subscription.callback(event)
+            except Exception as e:
+                logger.error(f"Event subscriber failed on {event.kind} {event.path}: {e}", exc_info=True)
+
+    # ---- Watcher ----
+
+    @property
+    def running(self) -> bool:
+        return self._observer is not None
+
+    def start(self) -> bool:
+        """Start watching the vault (once); False without watchdog"""
+        with self._lock:
+            if self._observer is not None:
+                return True
+            if Observer is None:
+                logger.warning("watchdog is not installed; vault events are unavailable")
+                return False
+            self._observer = Observer()
+            self._observer.schedule(_BusEventHandler(self), str(self.vault_path), recursive=True)
+            self._observer.daemon = True
+            self._observer.start()
+        logger.info(f"Watching vault: {self.vault_path}")
+        return True
+
+    def stop(self):
+        """Stop the socket server and the watcher"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+        with self._lock:
+            observer, self._observer = self._observer, None
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+    # ---- Socket service ----
+
+    def serve(self, socket_path: Optional[Path] = None) -> bool:
+        """
+        Publish events to other processes over a Unix socket
+
+        Returns False if the platform has no Unix sockets or another
+        service already owns the socket.
+        """
+        if not hasattr(socket, 'AF_UNIX'):
+            logger.warning("Unix sockets are not available; vault events stay in-process")
+            return False
+        if self._server is not None:
+            return True
+
+        path = Path(socket_path) if socket_path else default_socket_path(self.vault_path)
+        if path.exists():
+            if _connect(path) is not None:
+                logger.info(f"Vault event service already running on {path}")
+                return False
+            path.unlink()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        bus = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                bus._serve_client(self.rfile, self.connection)
+
+        self._server = socketserver.ThreadingUnixStreamServer(str(path), Handler)
+        self._server.daemon_threads = True
+        self.socket_path = path
+        threading.Thread(target=self._server.serve_forever, name='vault-events-server', daemon=True).start()
+        logger.info(f"Serving vault events on {path}")
+        return True
+
+    def _serve_client(self, rfile, connection: socket.socket):
+        """Stream matching events to one connected process until it goes away"""
+        try:
+            filters = json.loads(rfile.readline() or b'{}')
+        except ValueError:
+            return
+        events: 'queue.Queue[Optional[VaultEvent]]' = queue.Queue(CLIENT_QUEUE_SIZE)
+
+        def enqueue(event: VaultEvent):
+            try:
+                events.put_nowait(event)
+            except queue.Full:
+                logger.warning(f"Event client is not keeping up, dropped {event.kind} {event.path}")
+
+        subscription = self.subscribe(enqueue, filters.get('folders'), filters.get('patterns'),
+                                      filters.get('kinds'), bool(filters.get('directories')))
+        try:
+            connection.sendall(b'{"ready": true}\n')
+            while self._server is not None:
+                try:
+                    event = events.get(timeout=1)
+                except queue.Empty:
+                    continue
+                connection.sendall(event.to_json().encode('utf-8') + b'\n')
+        except OSError:
+            pass
+        finally:
+            subscription.close()
+
+
+class RemoteSubscription:
+    """Events from the event service, read on a background thread"""
+
+    def __init__(self, connection: socket.socket, vault_path: Path, callback: Callable[[VaultEvent], None],
+                 subscription: Subscription):
+        self.vault_path = vault_path
+        self.callback = callback
+        self.subscription = subscription
+        self._connection = connection
+        self._fallback: Optional[Subscription] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='vault-events-client', daemon=True)
+
+    def start(self) -> 'RemoteSubscription':
+        self._connection.sendall(json.dumps(self.subscription.filters).encode('utf-8') + b'\n')
+        reader = self._connection.makefile('rb')
+        if not reader.readline():
+            raise ConnectionError("Vault event service closed the connection")
+        self._reader = reader
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            for line in self._reader:
+                try:
+                    event = VaultEvent.from_dict(json.loads(line))
+                except (ValueError, TypeError):
+                    continue
+                # Paths are rebuilt against this process's view of the vault
+                event.vault_path = str(self.vault_path)
+                try:
+                    self.callback(event)
+                except Exception as e:
+                    logger.error(f"Event subscriber failed on {event.kind} {event.path}: {e}", exc_info=True)
+        except (OSError, ValueError):
+            pass
+
+        if not self._closed:
+            # The service went away; keep receiving events by watching ourselves
+            logger.warning("Vault event service disconnected, watching the vault in this process")
+            bus = get_bus(self.vault_path)
+            bus.start()
+            filters = self.subscription.filters
+            self._fallback = bus.subscribe(self.callback, filters['folders'], filters['patterns'],
+                                           filters['kinds'], filters['directories'])
+
+    def close(self):
+        """Stop receiving events"""
+        self._closed = True
+        try:
+            self._connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._connection.close()
+        if self._fallback is not None:
+            self._fallback.close()
+
+
+def default_socket_path(vault_path: Path) -> Path:
+    """VAULT_EVENTS_SOCKET, else state/vault_events.sock (or a temp path if that is too long)"""
+    configured = os.getenv('VAULT_EVENTS_SOCKET')
+    if configured:
+        return Path(configured)
+    vault_path = Path(vault_path).resolve()
+    path = vault_path / 'state' / 'vault_events.sock'
+    if len(str(path)) > MAX_SOCKET_PATH:
+        digest = hashlib.sha1(str(vault_path).encode('utf-8')).hexdigest()[:12]
+        path = Path(tempfile.gettempdir()) / f"vault_events_{digest}.sock"
+    return path
+
+
+def _connect(path: Path) -> Optional[socket.socket]:
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(path))
+        return connection
+    except OSError:
+        connection.close()
+        return None
+
+
+_buses: Dict[Path, VaultEventBus] = {}
+_buses_lock = threading.Lock()
+
+
+def get_bus(vault_path: Path) -> VaultEventBus:
+    """Process-wide bus for a vault (not started)"""
+    key = Path(vault_path).resolve()
+    with _buses_lock:
+        bus = _buses.get(key)
+        if bus is None:
+            bus = _buses[key] = VaultEventBus(key)
+        return bus
+
+
+def listen(vault_path: Path, callback: Callable[[VaultEvent], None], folders: Optional[Iterable[str]] = None,
+           patterns: Optional[Iterable[str]] = None, kinds: Optional[Iterable[str]] = None,
+           directories: bool = False):
+    """
+    Subscribe to vault events from wherever they are available
+
+    Uses the event service of another process if one is running, a bus
+    already watching in this process if not, and otherwise starts watching
+    the vault in this process. Returns an object with close(); raises
+    RuntimeError if watchdog is not installed.
+    """
+    vault_path = Path(vault_path).resolve()
+    bus = get_bus(vault_path)
+    if not bus.running:
+        path = default_socket_path(vault_path)
+        connection = _connect(path) if path.exists() else None
+        if connection is not None:
+            try:
+                remote = RemoteSubscription(connection, vault_path, callback,
+                                            Subscription(callback, folders, patterns, kinds, directories))
+                remote.start()
+                logger.info(f"Receiving vault events from {path}")
+                return remote
+            except (OSError, ConnectionError) as e:
+                logger.warning(f"Could not attach to the vault event service: {e}")
+                connection.close()
+        if not bus.start():
+            raise RuntimeError("Vault events need watchdog, which is not installed")
+    return bus.subscribe(callback, folders, patterns, kinds, directories)
+
+
+def main():
+    """Main function for CLI usage"""
+    import argparse
+    from datetime import datetime
+
+    parser = argparse.ArgumentParser(description='Vault event service')
+    parser.add_argument('action', choices=['serve', 'tail'], help='Run the service, or print events')
+    parser.add_argument('--vault-path', default=os.getenv('VAULT_PATH') or str(Path(__file__).parent),
+                        help='Vault root')
+    parser.add_argument('--folder', action='append', help='Only events in this folder (for tail, repeatable)')
+    parser.add_argument('--pattern', action='append', help='Only filenames matching this glob (for tail)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.action == 'serve':
+        bus = get_bus(Path(args.vault_path))
+        if not bus.start():
+            return
+        bus.serve()
+        subscription = None
+    else:
+        def show(event: VaultEvent):
+            moved = f" (from {event.src_path})" if event.src_path else ''
+            print(f"{datetime.fromtimestamp(event.timestamp):%H:%M:%S.%f}  {event.kind:<8} {event.path}{moved}",
+                  flush=True)
+
+        subscription = listen(Path(args.vault_path), show, args.folder, args.pattern)
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        if subscription is not None:
+            subscription.close()
+        get_bus(Path(args.vault_path)).stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+Vault Index - SQLite metadata index of every markdown note in the vault
+One row per note (folder, filename, size, mtime, content hash, first "#"
+heading, frontmatter and a short excerpt) in state/vault_index.db, so
+scripts that need "the EMAIL_* notes in Done modified this week" or "the
+high-priority items in Needs_Action" query a table instead of globbing
+folders and re-reading and re-parsing every file.
+
+- A refresh only stats files; a note is read and parsed again only when
+  its size or mtime changed, and notes that disappeared are dropped.
+- While watch() is running the index is kept current from filesystem
+  events and queries skip the refresh. Without it, every query first
+  refreshes the folders it covers (the full-rescan fallback).
+
+    index = open_index(vault_path)
+    for note in index.notes('Done', pattern='EMAIL_*.md', since=week_ago):
+        print(note['filename'], note['frontmatter'].get('priority'))
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Iterable, Union
+import logging
+
+from archive_layout import is_sharded, shard_folders
+from job_store import bytes_hash
+from vault_document import parse_document
+from vault_events import VaultEvent, DELETED, MOVED, listen
+
+logger = logging.getLogger(__name__)
+
+# Directories never indexed (hidden directories are skipped as well)
+EXCLUDED_DIRS = {'state', 'node_modules', '__pycache__', 'venv', 'env'}
+
+# Characters of each note kept for previews
+EXCERPT_LENGTH = 200
+
+TimeBound = Union[datetime, float, None]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    title TEXT NOT NULL,
+    frontmatter TEXT NOT NULL,
+    excerpt TEXT NOT NULL,
+    indexed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_notes_folder_mtime ON notes (folder, mtime);
+CREATE INDEX IF NOT EXISTS idx_notes_folder_filename ON notes (folder, filename);
+CREATE TABLE IF NOT EXISTS note_fields (
+    path TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (path, key)
+);
+CREATE INDEX IF NOT EXISTS idx_note_fields_key_value ON note_fields (key, value);
+"""
+
+COLUMNS = "path, folder, filename, size, mtime, content_hash, title, frontmatter, excerpt"
+
+
+def _timestamp(value: TimeBound) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def _field_value(value: str) -> str:
+    """Frontmatter value as matched by queries: unquoted, lower case"""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        value = value[1:-1]
+    return value.strip().lower()
+
+
+class VaultIndex:
+    """WAL-mode SQLite table of the vault's markdown notes"""
+
+    def __init__(self, vault_path: Path, db_path: Optional[Path] = None):
+        self.vault_path = Path(vault_path).resolve()
+        self.db_path = Path(db_path) if db_path else self.vault_path / 'state' / 'vault_index.db'
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None,
+                                     timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._subscription = None
+
+    @classmethod
+    def for_vault(cls, vault_path: Path) -> 'VaultIndex':
+        """Open the default index for a vault"""
+        return cls(vault_path)
+
+    @property
+    def watching(self) -> bool:
+        return self._subscription is not None
+
+    # ---- Paths ----
+
+    def relative_path(self, path: Union[str, Path]) -> Optional[str]:
+        """Vault-relative POSIX path of a note, None if it is not indexed"""
+        path = Path(path)
+        if not path.is_absolute():
+            path = self.vault_path / path
+        try:
+            relative = path.resolve().relative_to(self.vault_path)
+        except ValueError:
+            return None
+        if path.suffix != '.md' or not self._included(relative.parts[:-1]):
+            return None
+        return relative.as_posix()
+
+    def _included(self, parts: Iterable[str]) -> bool:
+        return not any(part in EXCLUDED_DIRS or part.startswith('.') for part in parts)
+
+    def _scan(self, folder: str, recursive: bool) -> Dict[str, os.stat_result]:
+        """Stat every note under a folder"""
+        found = {}
+        pending = [folder]
+        while pending:
+            current = pending.pop()
+            if not self._included(Path(current).parts):
+                continue
+            try:
+                entries = list(os.scandir(self.vault_path / current))
+            except OSError:
+                continue
+            for entry in entries:
+                relative = f"{current}/{entry.name}" if current else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            pending.append(relative)
+                    elif entry.name.endswith('.md') and entry.is_file():
+                        found[relative] = entry.stat()
+                except OSError:
+                    continue
+        return found
+
+    def _scope(self, folder: Optional[str], recursive: bool):
+        """SQL condition and parameters selecting a folder"""
+        if folder is None or (folder == '' and recursive):
+            return "1 = 1", []
+        folder = folder.strip('/')
+        if not recursive:
+            return "folder = ?", [folder]
+        prefix = folder.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '/%'
+        return "(folder = ? OR folder LIKE ? ESCAPE '\\')", [folder, prefix]
+
+    # ---- Updates ----
+
+    def _index_file(self, relative: str, stat: os.stat_result) -> bool:
+        """(Re)parse one note into the table; False if it could not be read"""
+        try:
+            data = (self.vault_path / relative).read_bytes()
+        except OSError as e:
+            logger.debug(f"Skipping {relative}: {e}")
+            return False
+
+        doc = parse_document(data.decode('utf-8', errors='replace'))
+        folder, _, filename = relative.rpartition('/')
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO notes ({COLUMNS}, mtime_ns, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (relative, folder, filename, stat.st_size, stat.st_mtime, bytes_hash(data), doc.title,
+             json.dumps(doc.raw_frontmatter, ensure_ascii=False), doc.text[:EXCERPT_LENGTH],
+             stat.st_mtime_ns, datetime.now().isoformat())
+        )
+        self._conn.execute("DELETE FROM note_fields WHERE path = ?", (relative,))
+        self._conn.executemany(
+            "INSERT INTO note_fields (path, key, value) VALUES (?, ?, ?)",
+            [(relative, key, _field_value(value)) for key, value in doc.raw_frontmatter.items()]
+        )
+        return True
+
+    def _delete(self, paths: Iterable[str]):
+        for relative in paths:
+            self._conn.execute("DELETE FROM notes WHERE path = ?", (relative,))
+            self._conn.execute("DELETE FROM note_fields WHERE path = ?", (relative,))
+
+    def refresh(self, folder: str = '', recursive: bool = True) -> Dict[str, int]:
+        """
+        Bring a folder's rows in line with the disk
+
+        Only notes whose size or mtime changed are read again.
+
+        Args:
+            folder: Vault-relative folder, '' for the whole vault
+            recursive: Include subfolders
+
+        Returns:
+            Counts of added, updated, removed and unchanged notes
+        """
+        folder = folder.strip('/')
+        on_disk = self._scan(folder, recursive)
+        condition, params = self._scope(folder, recursive)
+        result = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+
+        with self._lock:
+            known = {path: (size, mtime_ns) for path, size, mtime_ns in self._conn.execute(
+                f"SELECT path, size, mtime_ns FROM notes WHERE {condition}", params
+            )}
+            changed = [(path, stat) for path, stat in on_disk.items()
+                       if known.get(path) != (stat.st_size, stat.st_mtime_ns)]
+            removed = set(known) - set(on_disk)
+            result['unchanged'] = len(on_disk) - len(changed)
+            if not changed and not removed:
+                return result
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for path, stat in changed:
+                    if self._index_file(path, stat):
+                        result['updated' if path in known else 'added'] += 1
+                    elif path in known:
+                        removed.add(path)
+                self._delete(removed)
+                result['removed'] = len(removed)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return result
+
+    def rebuild(self) -> Dict[str, int]:
+        """Drop every row and index the whole vault again"""
+        with self._lock:
+            self._conn.execute("DELETE FROM notes")
+            self._conn.execute("DELETE FROM note_fields")
+        return self.refresh()
+
+    def update_path(self, path: Union[str, Path]) -> bool:
+        """Index one note now; True if its row changed"""
+        relative = self.relative_path(path)
+        if relative is None:
+            return False
+        try:
+            stat = os.stat(self.vault_path / relative)
+        except OSError:
+            return self.remove_path(path)
+
+        with self._lock:
+            row = self._conn.execute("SELECT size, mtime_ns FROM notes WHERE path = ?", (relative,)).fetchone()
+            if row is not None and tuple(row) == (stat.st_size, stat.st_mtime_ns):
+                return False
+            return self._index_file(relative, stat)
+
+    def remove_path(self, path: Union[str, Path]) -> bool:
+        """Drop one note; True if it was indexed"""
+        relative = self.relative_path(path)
+        if relative is None:
+            return False
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM notes WHERE path = ?", (relative,))
+            self._conn.execute("DELETE FROM note_fields WHERE path = ?", (relative,))
+            return cursor.rowcount > 0
+
+    def on_vault_event(self, event: VaultEvent):
+        """Apply one vault event to the index"""
+        try:
+            if event.is_directory:
+                # A whole folder appeared, went away or moved: rescan both ends
+                for folder in {event.path, event.src_path} - {None}:
+                    self.refresh(folder)
+                return
+            if event.kind in (DELETED, MOVED):
+                self.remove_path(event.full_src_path or event.full_path)
+            if event.kind != DELETED:
+                self.update_path(event.full_path)
+        except Exception as e:
+            logger.error(f"Failed to index {event.kind} {event.path}: {e}")
+
+    def watch(self) -> bool:
+        """Keep the index current from vault events; False without watchdog"""
+        if self._subscription is not None:
+            return True
+
+        # Catch up on anything that changed while nothing was watching
+        self.refresh()
+        try:
+            self._subscription = listen(self.vault_path, self.on_vault_event, patterns=['*.md'], directories=True)
+        except RuntimeError as e:
+            logger.warning(f"{e}; queries will rescan instead")
+            return False
+        return True
+
+    def stop(self):
+        """Stop watching"""
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+
+    # ---- Queries ----
+
+    def _row(self, row) -> Dict[str, Any]:
+        path, folder, filename, size, mtime, digest, title, frontmatter, excerpt = row
+        return {
+            'path': self.vault_path / path,
+            'relpath': path,
+            'folder': folder,
+            'filename': filename,
+            'stem': filename[:-3] if filename.endswith('.md') else filename,
+            'size': size,
+            'mtime': mtime,
+            'modified': datetime.fromtimestamp(mtime),
+            'content_hash': digest,
+            'title': title,
+            'frontmatter': json.loads(frontmatter),
+            'excerpt': excerpt
+        }
+
+    def _where(self, folder: Optional[str], pattern: Optional[str], since: TimeBound, until: TimeBound,
+               where: Optional[Dict[str, Any]], recursive: bool):
+        """Refresh the queried folder if needed, then build the WHERE clause"""
+        if folder is not None and not recursive and is_sharded(folder):
+            # Done/Failed items live in month shards; only the shards in range are looked at
+            folders = shard_folders(self.vault_path, folder, since, until)
+            if not self.watching:
+                for shard in folders:
+                    self.refresh(shard, recursive=False)
+            clauses = [f"folder IN ({', '.join('?' * len(folders))})"]
+            params = list(folders)
+        else:
+            if not self.watching:
+                self.refresh(folder or '', recursive or folder is None)
+            condition, params = self._scope(folder, recursive)
+            clauses = [condition]
+
+        if pattern:
+            clauses.append("filename GLOB ?")
+            params.append(pattern)
+        if since is not None:
+            clauses.append("mtime >= ?")
+            params.append(_timestamp(since))
+        if until is not None:
+            clauses.append("mtime <= ?")
+            params.append(_timestamp(until))
+        for key, value in (where or {}).items():
+            values = [value] if isinstance(value, str) else list(value)
+            placeholders = ', '.join('?' * len(values))
+            clauses.append(f"path IN (SELECT path FROM note_fields WHERE key = ? AND value IN ({placeholders}))")
+            params.extend([key] + [_field_value(str(v)) for v in values])
+        return ' AND '.join(clauses), params
+
+    def notes(self, folder: Optional[str] = None, pattern: Optional[str] = None,
+              since: TimeBound = None, until: TimeBound = None,
+              where: Optional[Dict[str, Any]] = None, recursive: bool = False,
+              order: str = 'mtime', limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Notes matching all of the given filters
+
+        Args:
+            folder: Vault-relative folder, e.g. "Done" ('' for the vault root);
+                Done and Failed include their YYYY/MM shards
+            pattern: Filename glob, e.g. "EMAIL_*.md"
+            since: Modified at or after (datetime or Unix time)
+            until: Modified at or before
+            where: Frontmatter key -> value (or list of values), case-insensitive
+            recursive: Include subfolders of `folder`
+            order: "mtime" (oldest first), "-mtime" (newest first) or "filename"
+            limit: Maximum number of notes
+
+        Returns:
+            Dicts with path, relpath, folder, filename, stem, size, mtime,
+            modified, content_hash, title, frontmatter and excerpt
+        """
+        condition, params = self._where(folder, pattern, since, until, where, recursive)
+        order_by = {'mtime': 'mtime', '-mtime': 'mtime DESC', 'filename': 'filename'}.get(order, 'mtime')
+        sql = f"SELECT {COLUMNS} FROM notes WHERE {condition} ORDER BY {order_by}, path"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row(row) for row in rows]
+
+    def count(self, folder: Optional[str] = None, pattern: Optional[str] = None,
+              since: TimeBound = None, until: TimeBound = None,
+              where: Optional[Dict[str, Any]] = None, recursive: bool = False) -> int:
+        """Number of notes matching the filters (see notes())"""
+        condition, params = self._where(folder, pattern, since, until, where, recursive)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM notes WHERE {condition}", params).fetchone()[0]
+
+    def get(self, path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+        """Row for one note, indexing it first if it changed"""
+        relative = self.relative_path(path)
+        if relative is None:
+            return None
+        if not self.watching:
+            self.update_path(relative)
+        with self._lock:
+            row = self._conn.execute(f"SELECT {COLUMNS} FROM notes WHERE path = ?", (relative,)).fetchone()
+        return self._row(row) if row else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Note counts per folder"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT folder, COUNT(*), SUM(size) FROM notes GROUP BY folder ORDER BY folder"
+            ).fetchall()
+        return {
+            'notes': sum(count for _, count, _ in rows),
+            'bytes': sum(size or 0 for _, _, size in rows),
+            'folders': {folder or '.': count for folder, count, _ in rows}
+        }
+
+    def close(self):
+        """Stop watching and close the database"""
+        self.stop()
+        with self._lock:
+            self._conn.close()
+
+
+_indexes: Dict[Path, VaultIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def open_index(vault_path: Path) -> VaultIndex:
+    """Process-wide index for a vault, opened on first use"""
+    key = Path(vault_path).resolve()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = VaultIndex.for_vault(key)
+        return index
+
+
+def main():
+    """Main function for CLI usage"""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Vault metadata index')
+    parser.add_argument('action', choices=['refresh', 'rebuild', 'query', 'stats', 'watch'],
+                        help='Action to perform')
+    parser.add_argument('--vault-path', default=os.getenv('VAULT_PATH') or str(Path(__file__).parent),
+                        help='Vault root')
+    parser.add_argument('--folder', help='Vault-relative folder')
+    parser.add_argument('--pattern', help='Filename glob (for query)')
+    parser.add_argument('--where', action='append', default=[], metavar='KEY=VALUE',
+                        help='Frontmatter filter (for query, repeatable)')
+    parser.add_argument('--since-days', type=float, help='Only notes modified in the last N days (for query)')
+    parser.add_argument('--recursive', action='store_true', help='Include subfolders (for query)')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+
+    args = parser.parse_args()
+
+    index = VaultIndex.for_vault(Path(args.vault_path))
+
+    if args.action in ('refresh', 'rebuild'):
+        started = time.time()
+        result = index.rebuild() if args.action == 'rebuild' else index.refresh(args.folder or '')
+        print(json.dumps(result) if args.json else
+              f"{result['added']} added, {result['updated']} updated, {result['removed']} removed, "
+              f"{result['unchanged']} unchanged in {time.time() - started:.2f}s")
+    elif args.action == 'query':
+        where = dict(item.split('=', 1) for item in args.where if '=' in item)
+        since = time.time() - args.since_days * 86400 if args.since_days else None
+        notes = index.notes(args.folder, args.pattern, since=since, where=where, recursive=args.recursive)
+        if args.json:
+            print(json.dumps([{**note, 'path': str(note['path']), 'modified': note['modified'].isoformat()}
+                              for note in notes], indent=2, ensure_ascii=False))
+        else:
+            for note in notes:
+                print(f"{note['modified']:%Y-%m-%d %H:%M}  {note['relpath']}  {note['title']}")
+    elif args.action == 'stats':
+        stats = index.stats()
+        if args.json:
+            print(json.dumps(stats, indent=2))
+        else:
+            print(f"{stats['notes']} notes, {stats['bytes']} bytes")
+            for folder, count in stats['folders'].items():
+                print(f"  {folder}: {count}")
+    elif args.action == 'watch':
+        if not index.watch():
+            print("watchdog is not installed; run 'refresh' periodically instead")
+            return
+        print(f"Watching {index.vault_path} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            index.stop()
+
+
+if __name__ == '__main__':
+    main()
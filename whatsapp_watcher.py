@@ -9,13 +9,24 @@ import sys
 import json
 import logging
 import time
+import queue
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+
+from metrics import counter, histogram, start_exporter
+from trace_store import TraceStore, new_trace_id, with_trace_id, record_stage
+from vault_events import VaultEvent, CREATED, MODIFIED, MOVED, listen
+from search_index import open_search_index
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Metrics
+ACTION_FILES = counter('ai_employee_action_files_total', 'Action files created in Needs_Action', ['watcher', 'type'])
+CHECK_SECONDS = histogram('ai_employee_watcher_check_seconds', 'Time for one watcher check', ['watcher'])
+CHECK_ERRORS = counter('ai_employee_watcher_errors_total', 'Watcher checks that failed', ['watcher'])
+
 
 class WhatsAppWatcher:
     """Watches WhatsApp for business opportunities and messages"""
@@ -27,8 +38,13 @@ class WhatsAppWatcher:
 
         # Initialize WhatsApp MCP connection
         self.mcp_client = None
+        self._traces = None
         self._initialize_mcp()
 
+        # Message files written by the WhatsApp MCP, fed by vault events
+        self._arrivals: 'queue.Queue[Path]' = queue.Queue()
+        self._handled: Dict[str, int] = {}
+
     def _initialize_mcp(self):
         """Initialize WhatsApp MCP connection"""
         try:
@@ -49,24 +65,9 @@ class WhatsAppWatcher:
                 return messages
 
             for file in output_dir.glob("*.json"):
-                try:
-                    with open(file, 'r') as f:
-                        data = json.load(f)
-
-                    # Check if this is a pending message that needs attention
-                    if data.get('status') == 'pending':
-                        messages.append({
-                            'platform': 'whatsapp',
-                            'type': 'pending_message',
-                            'phone': data.get('phone'),
-                            'message': data.get('message'),
-                            'timestamp': datetime.fromtimestamp(data.get('timestamp', time.time())).isoformat(),
-                            'filename': str(file),
-                            'priority': self._determine_priority(data.get('message', '')),
-                            'status': 'pending'
-                        })
-                except Exception as e:
-                    logger.error(f"Error reading WhatsApp message file {file}: {e}")
+                message = self._read_pending_message(file)
+                if message:
+                    messages.append(message)
 
             logger.info(f"Found {len(messages)} pending WhatsApp messages")
 
@@ -75,6 +76,39 @@ class WhatsAppWatcher:
 
         return messages
 
+    def _read_pending_message(self, file: Path) -> Optional[Dict[str, Any]]:
+        """Message item for one MCP output file, None unless it is pending"""
+        try:
+            with open(file, 'r') as f:
+                data = json.load(f)
+
+            # Check if this is a pending message that needs attention
+            if data.get('status') == 'pending':
+                return {
+                    'platform': 'whatsapp',
+                    'type': 'pending_message',
+                    'phone': data.get('phone'),
+                    'message': data.get('message'),
+                    'timestamp': datetime.fromtimestamp(data.get('timestamp', time.time())).isoformat(),
+                    'filename': str(file),
+                    'priority': self._determine_priority(data.get('message', '')),
+                    'status': 'pending'
+                }
+        except Exception as e:
+            logger.error(f"Error reading WhatsApp message file {file}: {e}")
+        return None
+
+    @staticmethod
+    def _pending_text(file: Path) -> str:
+        """Searchable text of an MCP output file: the message if it is still pending"""
+        with open(file, 'r') as f:
+            data = json.load(f)
+        return (data.get('message') or '') if data.get('status') == 'pending' else ''
+
+    def on_vault_event(self, event: VaultEvent):
+        """Queue message files as the WhatsApp MCP writes them"""
+        self._arrivals.put(event.full_path)
+
     def check_new_incoming_messages(self) -> List[Dict[str, Any]]:
         """Simulate checking for new incoming WhatsApp messages"""
         # Since we don't have a real WhatsApp API connection for incoming messages,
@@ -106,12 +140,14 @@ class WhatsAppWatcher:
 
         try:
             # In a real implementation, this would search WhatsApp groups, broadcasts, etc.
-            # For now, we'll check for any WhatsApp messages containing these keywords
-            pending_messages = self.check_pending_messages()
-
-            for msg in pending_messages:
-                message_text = msg.get('message', '').lower()
-                if any(keyword in message_text for keyword in keywords):
+            # For now, we'll check for any WhatsApp messages containing these keywords.
+            # Message files are only re-read when they change.
+            search = open_search_index(self.vault_path)
+            search.sync('Output/WhatsApp', pattern='*.json', extract=self._pending_text)
+
+            for key in search.lookup(keywords, folders=['Output/WhatsApp']):
+                msg = self._read_pending_message(self.vault_path / key)
+                if msg:
                     opportunities.append({
                         'platform': 'whatsapp',
                         'type': 'business_opportunity',
@@ -145,6 +181,13 @@ class WhatsAppWatcher:
         else:
             return 'medium'
 
+    @property
+    def traces(self) -> TraceStore:
+        """Item lifecycle trace store, opened on first use"""
+        if self._traces is None:
+            self._traces = TraceStore.for_vault(self.vault_path)
+        return self._traces
+
     def create_action_file(self, item: Dict[str, Any]) -> Path:
         """Create action file in Needs_Action folder"""
         try:
@@ -156,9 +199,13 @@ class WhatsAppWatcher:
             filename = f"WHATSAPP_{timestamp}_{message_type.replace(' ', '_').replace('-', '_')}.md"
             filepath = self.needs_action / filename
 
-            content = self._generate_whatsapp_content(item)
+            # The item enters the vault here, so its trace starts here
+            trace_id = new_trace_id()
+            content = with_trace_id(self._generate_whatsapp_content(item), trace_id)
             filepath.write_text(content)
             logger.info(f"Created WhatsApp action file: {filepath}")
+            record_stage(self.traces, filepath, 'Needs_Action', 'whatsapp_watcher', trace_id)
+            ACTION_FILES.inc(watcher='whatsapp', type=message_type)
             return filepath
 
         except Exception as e:
@@ -234,8 +281,11 @@ status: pending
     def run_continuous(self, check_interval: int = 300):
         """Run watcher continuously"""
         logger.info(f"Starting WhatsApp watcher (interval: {check_interval}s)")
+        subscription = listen(self.vault_path, self.on_vault_event, folders=['Output/WhatsApp'],
+                              patterns=['*.json'], kinds=[CREATED, MODIFIED, MOVED])
 
         while True:
+            started = time.perf_counter()
             try:
                 # Check for WhatsApp activity
                 pending_msgs = self.check_pending_messages()
@@ -252,20 +302,47 @@ status: pending
                     for opportunity in opportunities:
                         self.create_action_file(opportunity)
 
+                CHECK_SECONDS.observe(time.perf_counter() - started, watcher='whatsapp')
                 logger.info("WhatsApp check complete, sleeping...")
-                time.sleep(check_interval)
+                self._wait_for_arrivals(check_interval)
 
             except KeyboardInterrupt:
                 logger.info("WhatsApp watcher stopped by user")
+                subscription.close()
                 break
             except Exception as e:
                 logger.error(f"Error in WhatsApp watcher: {e}")
+                CHECK_ERRORS.inc(watcher='whatsapp')
                 time.sleep(60)
 
+    def _wait_for_arrivals(self, timeout: float):
+        """Handle message files as they are written, until the next full check"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                file = self._arrivals.get(timeout=remaining)
+            except queue.Empty:
+                return
+            try:
+                mtime = file.stat().st_mtime_ns
+            except OSError:
+                continue
+            # A file is written in several steps; handle each version once
+            if self._handled.get(str(file)) == mtime:
+                continue
+            message = self._read_pending_message(file)
+            if message:
+                self._handled[str(file)] = mtime
+                self.create_action_file(message)
+
     def run_once(self):
         """Run a single check"""
         try:
             logger.info("Running WhatsApp check")
+            started = time.perf_counter()
 
             all_items = []
 
@@ -297,11 +374,13 @@ status: pending
                 if filepath:
                     files_created.append(str(filepath))
 
+            CHECK_SECONDS.observe(time.perf_counter() - started, watcher='whatsapp')
             logger.info(f"Created {len(files_created)} WhatsApp action files")
             return files_created
 
         except Exception as e:
             logger.error(f"Error in WhatsApp run_once: {e}")
+            CHECK_ERRORS.inc(watcher='whatsapp')
             return []
 
 
@@ -319,6 +398,8 @@ def main():
 
     watcher = WhatsAppWatcher(vault_path)
 
+    start_exporter('whatsapp_watcher', vault_path)
+
     if args.once:
         result = watcher.run_once()
         print(json.dumps(result, indent=2))
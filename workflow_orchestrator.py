@@ -23,6 +23,9 @@ except ImportError:
     os.system("pip install schedule")
     import schedule
 
+from metrics import gauge, histogram, start_exporter
+from vault_events import get_bus
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -34,6 +37,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Metrics
+TASK_SECONDS = histogram('ai_employee_scheduled_task_seconds', 'Scheduled task run time', ['task'])
+FOLDER_ITEMS = gauge('ai_employee_folder_items', 'Notes waiting in a vault folder', ['folder'])
+COMPONENT_UP = gauge('ai_employee_component_up', 'Whether an orchestrated component is running', ['component'])
+
 
 class WorkflowOrchestrator:
     """Master orchestrator for the complete AI Employee system"""
@@ -48,6 +56,7 @@ class WorkflowOrchestrator:
 
         # Component status tracking
         self.component_status = {
+            'event_service': False,
             'auto_processor': False,
             'smart_scheduler': False,
             'reddit_watcher': False,
@@ -87,6 +96,16 @@ class WorkflowOrchestrator:
 
         logger.info("[OK] Directory structure verified")
 
+    def start_event_service(self):
+        """Watch the vault once and share its events with every component over a local socket"""
+        bus = get_bus(self.vault_path)
+        if not bus.start():
+            logger.warning("[WARN] Vault event service unavailable, components will watch the vault themselves")
+            return
+        bus.serve()
+        self.component_status['event_service'] = True
+        logger.info("[OK] Vault event service started")
+
     def start_auto_processor(self):
         """Start the auto processor in a separate thread"""
         def run_processor():
@@ -355,6 +374,12 @@ class WorkflowOrchestrator:
             if folder.exists():
                 count = len(list(folder.glob("*.md")))
                 status[f'{folder_name.lower()}_count'] = count
+                FOLDER_ITEMS.set(count, folder=folder_name)
+
+        for component, started in self.component_status.items():
+            thread = self.threads.get(component)
+            running = thread.is_alive() if thread else started
+            COMPONENT_UP.set(1 if running else 0, component=component)
 
         # Save status report
         status_file = self.vault_path / 'Logs' / f"status_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -364,6 +389,14 @@ class WorkflowOrchestrator:
 
         return status
 
+    def run_pending(self):
+        """Run due scheduled checks in schedule.run_pending() order, timing each"""
+        for job in sorted(job for job in schedule.jobs if job.should_run):
+            task = getattr(job.job_func, 'func', job.job_func).__name__
+            with TASK_SECONDS.time(task=task):
+                if job.run() is schedule.CancelJob:
+                    schedule.cancel_job(job)
+
     def run_continuous(self):
         """Run the complete orchestration system"""
         logger.info("Starting AI Employee Automation System...")
@@ -381,9 +414,14 @@ class WorkflowOrchestrator:
         )
         print("=" * 70 + "\n")
 
+        start_exporter('workflow_orchestrator', self.vault_path)
+
         # Start all components
         logger.info("Starting system components...")
 
+        # Before the components, so they attach to it instead of each watching the vault
+        self.start_event_service()
+
         self.start_auto_processor()
         time.sleep(2)  # Give processor time to start
 
@@ -409,6 +447,7 @@ class WorkflowOrchestrator:
         logger.info("[OK] ALL SYSTEMS OPERATIONAL")
         logger.info("=" * 70)
         logger.info(f"📁 Vault: {self.vault_path}")
+        logger.info(f"📡 Vault Events: {'Shared' if self.component_status['event_service'] else 'Per component'}")
         logger.info(f"🔄 Auto Processor: {'Running' if self.component_status['auto_processor'] else 'Failed'}")
         logger.info(f"📅 Smart Scheduler: {'Running' if self.component_status['smart_scheduler'] else 'Failed'}")
         logger.info(f"(WhatsApp) WhatsApp Watcher: {'Running' if self.component_status['whatsapp_watcher'] else 'Failed'}")
@@ -423,6 +462,7 @@ class WorkflowOrchestrator:
 
             # Generate final status
             final_status = self.generate_system_status()
+            get_bus(self.vault_path).stop()
 
             logger.info(f"[OK] System stopped. Final status logged.")
             logger.info("=" * 70)
@@ -438,7 +478,7 @@ class WorkflowOrchestrator:
         # Main loop
         try:
             while True:
-                schedule.run_pending()
+                self.run_pending()
                 time.sleep(60)  # Check every minute
 
                 # Periodic status generation (every hour)